@@ -0,0 +1,114 @@
+"""
+Steps thousands of PID loops (e.g., the zone temperature loops of a campus) with a BatchPIDEngine
+and with a PID evaluated one loop at a time, and reports the loops evaluated per second.
+
+    python -m benchmarks.batch_pid [--loops N] [--steps N]
+
+Outputs of the last step are checked to be the same for both, then written to the actuators.
+"""
+import argparse
+import time
+from datetime import datetime
+import numpy as np
+from metamenth.controls.pid_controls.abstract_pid_controls import AbstractPIDControl
+from metamenth.controls.pid_controls.batch_pid_engine import BatchPIDEngine
+from metamenth.datatypes.measure import Measure
+from metamenth.enumerations import BoilerCategory
+from metamenth.enumerations import MeasurementUnit
+from metamenth.enumerations import PowerState
+from metamenth.enumerations import RecordingType
+from metamenth.enumerations import SensorMeasure
+from metamenth.enumerations import SensorMeasureType
+from metamenth.misc import MeasureFactory
+from metamenth.subsystem.hvac_components.boiler import Boiler
+from metamenth.subsystem.hvac_components.controller import Controller
+from metamenth.transducers.actuator import Actuator
+from metamenth.transducers.sensor import Sensor
+
+
+class ValvePIDControl(AbstractPIDControl):
+
+    def acquire_process_value_data(self) -> float:
+        return self.process_value_sensor.current_value
+
+    def execute_control(self, process_value: float):
+        pass
+
+
+def scalar_step(controls, states, set_points, process_values, elapsed):
+    """
+    Evaluates the PID loops one at a time
+    """
+    outputs = []
+    for control, state, set_point, value in zip(controls, states, set_points, process_values):
+        error = set_point - value
+        change = 0.0 if state[2] is None else value - state[2]
+        state[1] = (control.derivative_filter_time * state[1] - control.derivative_gain * change) / \
+                   (control.derivative_filter_time + elapsed)
+        growth = control.integral_gain * error * elapsed
+        unsaturated = control.proportional_gain * error + state[0] + growth + state[1]
+        output = min(max(unsaturated, control.control_thresholds.minimum), control.control_thresholds.maximum)
+        if not ((unsaturated > control.control_thresholds.maximum and growth > 0) or
+                (unsaturated < control.control_thresholds.minimum and growth < 0)):
+            state[0] += growth
+        state[2] = value
+        outputs.append(output)
+    return outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--loops', type=int, default=10000)
+    parser.add_argument('--steps', type=int, default=100)
+    arguments = parser.parse_args()
+
+    controller = Controller('CAMPUS.CTR')
+    output_limits = MeasureFactory.create_measure(RecordingType.CONTINUOUS.value,
+                                                  Measure(MeasurementUnit.PERCENTAGE, 0, 100))
+    controls = []
+    for position in range(arguments.loops):
+        sensor = Sensor(f"TEMP.SENSOR.{position}", SensorMeasure.TEMPERATURE, MeasurementUnit.DEGREE_CELSIUS,
+                        SensorMeasureType.THERMO_COUPLE_TYPE_B, 60)
+        actuator = Actuator(f"VALVE.ACT.{position}",
+                            Boiler(f"BOILER.{position}", BoilerCategory.NATURAL_GAS, PowerState.ON), controller)
+        controller.add_transducer(sensor)
+        controller.add_transducer(actuator)
+        controller.add_set_point(MeasureFactory.create_measure(RecordingType.BINARY.value,
+                                                               Measure(MeasurementUnit.DEGREE_CELSIUS,
+                                                                       20 + position % 5)),
+                                 (sensor.name, actuator.name))
+        controls.append(ValvePIDControl(sensor, actuator, output_limits, 8.0, 0.02, 30.0, 120.0))
+
+    engine = BatchPIDEngine()
+    engine.add_controls(controls)
+    random = np.random.default_rng(0)
+    process_values = random.uniform(15, 28, (arguments.steps, arguments.loops))
+
+    started = time.perf_counter()
+    for step in range(arguments.steps):
+        outputs = engine.step(process_values[step], 60)
+    vectorized = time.perf_counter() - started
+
+    set_points = [controller.get_set_point(control.process_value_sensor.name, control.process_actuator.name).value
+                  for control in controls]
+    states = [[0.0, 0.0, None] for _ in controls]
+    started = time.perf_counter()
+    for step in range(arguments.steps):
+        scalar_outputs = scalar_step(controls, states, set_points, process_values[step].tolist(), 60)
+    scalar = time.perf_counter() - started
+    assert np.allclose(outputs, scalar_outputs)
+
+    evaluations = arguments.loops * arguments.steps
+    print(f'{arguments.loops} loops, {arguments.steps} steps')
+    print(f'one loop at a time: {scalar:.3f} s ({evaluations / scalar:,.0f} loops per second)')
+    print(f'batch engine:       {vectorized:.3f} s ({evaluations / vectorized:,.0f} loops per second), '
+          f'{scalar / vectorized:.1f}x faster')
+
+    engine.record_outputs(datetime.now().replace(microsecond=0))
+    started = time.perf_counter()
+    written = engine.write_outputs()
+    print(f'wrote {written} outputs to the actuators in {time.perf_counter() - started:.3f} s')
+
+
+if __name__ == '__main__':
+    main()
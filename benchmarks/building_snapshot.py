@@ -0,0 +1,85 @@
+"""
+Measures the time taken to build a building with many rooms and sensors through the constructors
+and setters of the model, and to save and load it as a snapshot file.
+
+    python -m benchmarks.building_snapshot [--rooms N] [--days N]
+
+Every room has a temperature sensor that recorded a reading every 5 minutes, added as SensorData
+objects the way services load readings from their source systems.
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+from datetime import timedelta
+from metamenth.datatypes.address import Address
+from metamenth.datatypes.measure import Measure
+from metamenth.enumerations import BuildingType
+from metamenth.enumerations import FloorType
+from metamenth.enumerations import HVACType
+from metamenth.enumerations import MeasurementUnit
+from metamenth.enumerations import RecordingType
+from metamenth.enumerations import RoomType
+from metamenth.enumerations import SensorMeasure
+from metamenth.enumerations import SensorMeasureType
+from metamenth.enumerations import ZoneType
+from metamenth.measure_instruments.sensor_data import SensorData
+from metamenth.misc import MeasureFactory
+from metamenth.storage.snapshot_file import SnapshotFile
+from metamenth.structure.building import Building
+from metamenth.structure.floor import Floor
+from metamenth.structure.room import Room
+from metamenth.transducers.sensor import Sensor
+from metamenth.virtual.zone import Zone
+
+
+def build_building(room_count: int, days: int) -> Building:
+    area = MeasureFactory.create_measure(RecordingType.BINARY.value, Measure(MeasurementUnit.SQUARE_METERS, 45))
+    rooms = [Room(area, f"Room {position}", RoomType.OFFICE) for position in range(room_count)]
+    floor = Floor(area=area, number=1, floor_type=FloorType.REGULAR, rooms=rooms)
+    building = Building(2009, area, area, area, Address("Montreal", "6399 Rue Sherbrooke", "QC", "H1N 2Z3", "Canada"),
+                        BuildingType.COMMERCIAL, [floor])
+    zone = Zone("HVAC_ZONE", ZoneType.HVAC, HVACType.INTERIOR)
+    start = datetime(2024, 1, 1)
+    timestamps = [(start + timedelta(minutes=5 * step)).strftime('%Y-%m-%d %H:%M:%S')
+                  for step in range(days * 288)]
+    for position, room in enumerate(rooms):
+        room.add_zone(zone, building)
+        sensor = Sensor(f"TEMP.SENSOR.{position}", SensorMeasure.TEMPERATURE, MeasurementUnit.DEGREE_CELSIUS,
+                        SensorMeasureType.THERMO_COUPLE_TYPE_B, 300)
+        sensor.add_data([SensorData(20.0 + step % 50 / 10, timestamp) for step, timestamp in enumerate(timestamps)])
+        room.add_transducer(sensor)
+    return building
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rooms', type=int, default=50)
+    parser.add_argument('--days', type=int, default=30)
+    arguments = parser.parse_args()
+
+    started = time.perf_counter()
+    building = build_building(arguments.rooms, arguments.days)
+    build_time = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'building.snapshot')
+        started = time.perf_counter()
+        size = SnapshotFile.save(building, path)
+        save_time = time.perf_counter() - started
+        started = time.perf_counter()
+        loaded = SnapshotFile.load(path)
+        load_time = time.perf_counter() - started
+
+    rooms = loaded.get_floors()[0].get_rooms()
+    assert rooms[0].zones[0] is rooms[-1].zones[0]
+    readings = sum(len(room.get_transducers()[0].get_data()) for room in rooms)
+    print(f'{arguments.rooms} rooms, {readings} readings, snapshot of {size / 1e6:.1f} MB')
+    print(f'constructors: {build_time * 1000:.0f} ms')
+    print(f'save: {save_time * 1000:.0f} ms')
+    print(f'load: {load_time * 1000:.0f} ms ({build_time / load_time:.1f}x faster than constructors)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Measures the cold import time of metamenth modules, each import running in a new interpreter.
+
+    python benchmarks/cold_import.py [module ...] [--repeat N]
+
+The reported time is the median wall time of the interpreter importing the module,
+minus the median time of an interpreter importing nothing.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+DEFAULT_MODULES = ['metamenth.enumerations', 'metamenth.structure.building', 'metamenth.transducers.sensor']
+
+
+def interpreter_time(statement: str, repeat: int) -> float:
+    """
+    Returns the median seconds taken by a new interpreter running a statement
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-c', statement], check=True)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def loaded_modules(module: str, prefixes: tuple) -> list:
+    """
+    Returns the heavy third party modules loaded by importing a module
+    """
+    statement = f'import sys, {module}; print(" ".join(sorted(sys.modules)))'
+    output = subprocess.run([sys.executable, '-c', statement], check=True, capture_output=True, text=True).stdout
+    return sorted({name.split('.')[0] for name in output.split() if name.split('.')[0] in prefixes})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('--repeat', type=int, default=15)
+    arguments = parser.parse_args()
+
+    baseline = interpreter_time('pass', arguments.repeat)
+    print(f'interpreter start up: {baseline * 1000:.1f} ms')
+    for module in arguments.modules:
+        elapsed = interpreter_time(f'import {module}', arguments.repeat) - baseline
+        heavy_modules = loaded_modules(module, ('numpy', 'rapidfuzz', 'fuzzywuzzy', 'Levenshtein'))
+        print(f'{module}: {elapsed * 1000:.1f} ms (loads: {", ".join(heavy_modules) or "-"})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Replays a year of recorded temperatures (e.g., trend logs of the zones of a building) through
+on/off control strategies with a ReplayHarness and reports the simulated hours per second.
+
+    python -m benchmarks.control_replay [--sensors N] [--controls-per-sensor N] [--days N]
+                                        [--interval SECONDS] [--workers N]
+
+The trigger history logged on the actuators is the same with and without workers.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import numpy as np
+from metamenth.controls.binary_controls.abstract_binary_control import AbstractBinaryControl
+from metamenth.controls.replay_harness import ReplayHarness
+from metamenth.datatypes.measure import Measure
+from metamenth.enumerations import BoilerCategory
+from metamenth.enumerations import MeasurementUnit
+from metamenth.enumerations import PowerState
+from metamenth.enumerations import RecordingType
+from metamenth.enumerations import SensorMeasure
+from metamenth.enumerations import SensorMeasureType
+from metamenth.enumerations import TriggerType
+from metamenth.misc import MeasureFactory
+from metamenth.subsystem.hvac_components.boiler import Boiler
+from metamenth.transducers.actuator import Actuator
+from metamenth.transducers.sensor import Sensor
+
+
+class OnOffControl(AbstractBinaryControl):
+
+    def acquire_process_value_data(self) -> float:
+        return self.process_value_sensor.current_value
+
+    def execute_control(self, process_value: float):
+        if process_value is None:
+            return None
+        if process_value > self.control_thresholds.maximum:
+            return TriggerType.OFF
+        if process_value < self.control_thresholds.minimum:
+            return TriggerType.ON
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sensors', type=int, default=20)
+    parser.add_argument('--controls-per-sensor', type=int, default=2)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--interval', type=int, default=300)
+    parser.add_argument('--workers', type=int, default=0)
+    arguments = parser.parse_args()
+
+    start = np.datetime64(datetime(2023, 1, 1), 's')
+    readings = arguments.days * 86400 // arguments.interval
+    timestamps = start + np.arange(readings) * np.timedelta64(arguments.interval, 's')
+    hours = np.arange(readings) * arguments.interval / 3600
+    random = np.random.default_rng(0)
+    thresholds = MeasureFactory.create_measure(RecordingType.CONTINUOUS.value,
+                                               Measure(MeasurementUnit.DEGREE_CELSIUS, 20, 23))
+
+    executor = ThreadPoolExecutor(arguments.workers) if arguments.workers else None
+    harness = ReplayHarness(executor=executor)
+    actuators = []
+    for position in range(arguments.sensors):
+        sensor = Sensor(f"TEMP.SENSOR.{position}", SensorMeasure.TEMPERATURE, MeasurementUnit.DEGREE_CELSIUS,
+                        SensorMeasureType.THERMO_COUPLE_TYPE_B, arguments.interval)
+        # a daily cycle around 21.5 degrees with noise
+        sensor.add_data_arrays(timestamps, 21.5 + 2.5 * np.sin(2 * np.pi * hours / 24 + position) +
+                               random.normal(0, 0.5, readings))
+        for control in range(arguments.controls_per_sensor):
+            actuator = Actuator(f"BOILER.ACT.{position}.{control}",
+                                Boiler(f"BOILER.{position}.{control}", BoilerCategory.NATURAL_GAS, PowerState.ON))
+            actuators.append(actuator)
+            harness.add_control(OnOffControl(sensor, actuator, thresholds))
+
+    metrics = harness.run()
+    if executor is not None:
+        executor.shutdown()
+    print(f'{arguments.sensors} sensors, {len(actuators)} strategies, {arguments.days} days of readings every '
+          f'{arguments.interval} s, {arguments.workers} workers')
+    print(f'replayed {metrics.simulated_seconds / 3600:,.0f} simulated hours in {metrics.wall_seconds:.2f} s: '
+          f'{metrics.simulated_hours_per_second:,.0f} simulated hours per second')
+    print(f'ticks: {metrics.ticks} ({metrics.ticks_per_second:,.0f} per second), strategies executed: '
+          f'{metrics.controls_executed}, triggers logged: {metrics.triggers}, errors: {metrics.errors}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Runs thousands of on/off control strategies (e.g., one per VAV box of a campus) in a ControlScheduler
+and reports the ticks, jitter and overruns of their control loops.
+
+    python -m benchmarks.control_scheduler [--controls N] [--sensors N] [--frequency SECONDS] [--duration SECONDS]
+
+Strategies are spread over the sensors, so strategies sharing a sensor have their ticks coalesced.
+"""
+import argparse
+import random
+import time
+from metamenth.controls.binary_controls.abstract_binary_control import AbstractBinaryControl
+from metamenth.controls.control_scheduler import ControlScheduler
+from metamenth.datatypes.measure import Measure
+from metamenth.enumerations import BoilerCategory
+from metamenth.enumerations import MeasurementUnit
+from metamenth.enumerations import PowerState
+from metamenth.enumerations import RecordingType
+from metamenth.enumerations import SensorMeasure
+from metamenth.enumerations import SensorMeasureType
+from metamenth.misc import MeasureFactory
+from metamenth.subsystem.hvac_components.boiler import Boiler
+from metamenth.transducers.actuator import Actuator
+from metamenth.transducers.sensor import Sensor
+
+
+class OnOffControl(AbstractBinaryControl):
+
+    def acquire_process_value_data(self) -> float:
+        return random.uniform(10, 30)
+
+    def execute_control(self, process_value: float):
+        if process_value > self.control_thresholds.maximum:
+            self.process_actuator.trigger_output.power_state = PowerState.OFF
+        elif process_value < self.control_thresholds.minimum:
+            self.process_actuator.trigger_output.power_state = PowerState.ON
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--controls', type=int, default=5000)
+    parser.add_argument('--sensors', type=int, default=2500)
+    parser.add_argument('--frequency', type=float, default=0.5)
+    parser.add_argument('--duration', type=float, default=5)
+    arguments = parser.parse_args()
+
+    thresholds = MeasureFactory.create_measure(RecordingType.CONTINUOUS.value,
+                                               Measure(MeasurementUnit.DEGREE_CELSIUS, 18, 24))
+    sensors = [Sensor(f"TEMP.SENSOR.{position}", SensorMeasure.TEMPERATURE, MeasurementUnit.DEGREE_CELSIUS,
+                      SensorMeasureType.THERMO_COUPLE_TYPE_B, arguments.frequency)
+               for position in range(arguments.sensors)]
+    scheduler = ControlScheduler()
+    for position in range(arguments.controls):
+        actuator = Actuator(f"BOILER.ACT.{position}",
+                            Boiler(f"BOILER.{position}", BoilerCategory.NATURAL_GAS, PowerState.ON))
+        scheduler.add_control(OnOffControl(sensors[position % len(sensors)], actuator, thresholds,
+                                           arguments.duration / 3600))
+
+    started = time.perf_counter()
+    scheduler.start()
+    elapsed = time.perf_counter() - started
+    summary = scheduler.summary()
+    print(f'{arguments.controls} controls on {arguments.sensors} sensors ticking every {arguments.frequency} s '
+          f'for {arguments.duration} s, ran {elapsed:.2f} s')
+    print(f'ticks: {summary.ticks} ({summary.ticks / elapsed:.0f} per second)')
+    print(f'jitter: mean {summary.mean_jitter * 1000:.2f} ms, max {summary.max_jitter * 1000:.2f} ms')
+    print(f'overruns: {summary.overruns}, skipped ticks: {summary.skipped_ticks}, errors: {summary.errors}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Measures the time taken to compute the hourly load curve of a building with many electricity meters,
+by iterating the measures of every meter in Python and with Building.aggregate_meter_readings.
+
+    python -m benchmarks.meter_aggregation [--meters N] [--days N] [--columnar]
+
+Meters record the power (kW) every 15 minutes; half of them are read as energy (kWh) to exercise
+unit conversions. With --columnar, the measures are kept in ColumnarTimeSeriesStore instead of
+the default list store.
+"""
+import argparse
+import time
+from collections import defaultdict
+import numpy as np
+from metamenth.datatypes.address import Address
+from metamenth.datatypes.measure import Measure
+from metamenth.enumerations import BuildingType
+from metamenth.enumerations import FloorType
+from metamenth.enumerations import MeasurementUnit
+from metamenth.enumerations import MeterMeasureMode
+from metamenth.enumerations import MeterType
+from metamenth.enumerations import RecordingType
+from metamenth.enumerations import RoomType
+from metamenth.measure_instruments.meter import Meter
+from metamenth.measure_instruments.meter_measure import MeterMeasure
+from metamenth.misc import MeasureFactory
+from metamenth.structure.building import Building
+from metamenth.structure.floor import Floor
+from metamenth.structure.room import Room
+from metamenth.storage.columnar_time_series_store import ColumnarTimeSeriesStore
+
+
+def build_building(meter_count: int, days: int, columnar: bool = False) -> Building:
+    area = MeasureFactory.create_measure(RecordingType.BINARY.value, Measure(MeasurementUnit.SQUARE_METERS, 45))
+    floor = Floor(area=area, number=1, floor_type=FloorType.REGULAR, rooms=[Room(area, "Room 1", RoomType.OFFICE)])
+    building = Building(2009, area, area, area, Address("Montreal", "6399 Rue Sherbrooke", "QC", "H1N 2Z3", "Canada"),
+                        BuildingType.COMMERCIAL, [floor])
+    timestamps = np.datetime64('2024-01-01T00:00:00') + np.arange(0, days * 86400, 900).astype('timedelta64[s]')
+    random = np.random.default_rng(7)
+    for position in range(meter_count):
+        unit = MeasurementUnit.KILOWATTS if position % 2 == 0 else MeasurementUnit.KILOWATTS_PER_HOUR
+        meter = Meter("huz.cab.err", 900, unit, MeterType.ELECTRICITY, MeterMeasureMode.AUTOMATIC)
+        if columnar:
+            meter.data_store = ColumnarTimeSeriesStore(MeterMeasure)
+        power = random.uniform(5, 50, len(timestamps))
+        meter.add_meter_measure_arrays(timestamps, power if unit == MeasurementUnit.KILOWATTS else power / 4)
+        building.add_meter(meter)
+    return building
+
+
+def python_load_curve(building: Building) -> dict:
+    """
+    The hourly consumption (kWh), computed from the measures of each meter
+    """
+    load_curve = defaultdict(float)
+    for meter in building.get_meters():
+        for measure in meter.get_meter_measures():
+            hour = measure.timestamp.replace(minute=0, second=0)
+            load_curve[hour] += measure.value / 4 if meter.measurement_unit == MeasurementUnit.KILOWATTS \
+                else measure.value
+    return load_curve
+
+
+def vectorized_load_curve(building: Building) -> np.ndarray:
+    return building.aggregate_meter_readings(MeterType.ELECTRICITY, 3600,
+                                             unit=MeasurementUnit.KILOWATTS_PER_HOUR).total()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--meters', type=int, default=50)
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--columnar', action='store_true')
+    arguments = parser.parse_args()
+
+    building = build_building(arguments.meters, arguments.days, arguments.columnar)
+    started = time.perf_counter()
+    expected = python_load_curve(building)
+    python_time = time.perf_counter() - started
+    started = time.perf_counter()
+    load_curve = vectorized_load_curve(building)
+    vectorized_time = time.perf_counter() - started
+
+    assert np.allclose(load_curve, [expected[hour] for hour in sorted(expected)])
+    print(f'{arguments.meters} meters, {arguments.days} days of 15 minute measures')
+    print(f'python loop: {python_time * 1000:.0f} ms')
+    print(f'aggregate_meter_readings: {vectorized_time * 1000:.0f} ms ({python_time / vectorized_time:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
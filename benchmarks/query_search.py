@@ -0,0 +1,76 @@
+"""
+Compares Query conditions answered from the search index of a building with filtering every
+meter in Python, e.g., meters measuring at least every minute or with a location prefix.
+
+    python -m benchmarks.query_search [--meters N] [--repeat N]
+
+The meters are indexed on measurement_frequency and meter_location; range and prefix conditions
+read only the matching buckets of the sorted index keys.
+"""
+import argparse
+import time
+from metamenth.datatypes.address import Address
+from metamenth.datatypes.measure import Measure
+from metamenth.enumerations import BuildingType
+from metamenth.enumerations import FloorType
+from metamenth.enumerations import MeasurementUnit
+from metamenth.enumerations import MeterMeasureMode
+from metamenth.enumerations import MeterType
+from metamenth.enumerations import RecordingType
+from metamenth.enumerations import RoomType
+from metamenth.measure_instruments.meter import Meter
+from metamenth.misc import MeasureFactory
+from metamenth.structure.building import Building
+from metamenth.structure.floor import Floor
+from metamenth.structure.room import Room
+from metamenth.utils import Query
+
+FREQUENCIES = [1, 5, 15, 60, 300, 900, 3600]
+
+
+def build_building(meter_count: int) -> Building:
+    area = MeasureFactory.create_measure(RecordingType.BINARY.value, Measure(MeasurementUnit.SQUARE_METERS, 45))
+    floor = Floor(area=area, number=1, floor_type=FloorType.REGULAR, rooms=[Room(area, "Room 1", RoomType.OFFICE)])
+    building = Building(2009, area, area, area, Address("Montreal", "6399 Rue Sherbrooke", "QC", "H1N 2Z3", "Canada"),
+                        BuildingType.COMMERCIAL, [floor])
+    building.enable_search_index(['meter_type', 'measurement_frequency', 'meter_location'])
+    for position in range(meter_count):
+        building.add_meter(Meter(meter_location=f"bldg{position % 50}.mtr.{position}",
+                                 measurement_frequency=FREQUENCIES[position % len(FREQUENCIES)],
+                                 measurement_unit=MeasurementUnit.KILOWATTS_PER_HOUR,
+                                 meter_type=MeterType.ELECTRICITY, measure_mode=MeterMeasureMode.AUTOMATIC))
+    return building
+
+
+def timed(search, repeat: int) -> tuple:
+    found = len(search())
+    started = time.perf_counter()
+    for _ in range(repeat):
+        search()
+    return found, (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--meters', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=20)
+    arguments = parser.parse_args()
+
+    building = build_building(arguments.meters)
+    print(f'{arguments.meters} meters')
+    searches = [
+        ('measurement_frequency <= 5', {'measurement_frequency': Query.le(5)},
+         lambda meter: meter.measurement_frequency <= 5),
+        ('meter_location starts with bldg7.', {'meter_location': Query.prefix('bldg7.')},
+         lambda meter: meter.meter_location.startswith('bldg7.')),
+    ]
+    for label, criteria, condition in searches:
+        found, query_time = timed(lambda: building.get_meters(criteria), arguments.repeat)
+        _, filter_time = timed(lambda: [meter for meter in building.get_meters() if condition(meter)],
+                               arguments.repeat)
+        print(f'{label}: {found} meters, indexed query {query_time * 1000:.2f} ms, '
+              f'python filter {filter_time * 1000:.2f} ms ({filter_time / query_time:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
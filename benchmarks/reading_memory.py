@@ -0,0 +1,90 @@
+"""
+Measures the memory taken by readings (sensor data, meter measures, weather data, ...), in bytes per reading.
+
+    python -m benchmarks.reading_memory [--count N]
+
+Readings are created through their constructors, with their UID read once so that lazily
+generated UIDs are counted, and through the bulk loading path of ListTimeSeriesStore.
+Shared objects (e.g., enum members and the weather data measure unit) are not counted.
+"""
+import argparse
+import gc
+import tracemalloc
+from datetime import datetime
+from datetime import timedelta
+from metamenth.datatypes.measure import Measure
+from metamenth.enumerations import MeasurementUnit
+from metamenth.enumerations import OperationType
+from metamenth.enumerations import TriggerType
+from metamenth.measure_instruments.damper_position import DamperPosition
+from metamenth.measure_instruments.electric_vehicle_connectivity import ElectricVehicleConnectivity
+from metamenth.measure_instruments.meter_measure import MeterMeasure
+from metamenth.measure_instruments.sensor_data import SensorData
+from metamenth.measure_instruments.status_measure import StatusMeasure
+from metamenth.measure_instruments.trigger_history import TriggerHistory
+from metamenth.measure_instruments.weather_data import WeatherData
+from metamenth.misc import MeasureFactory
+from metamenth.enumerations import RecordingType
+from metamenth.storage.list_time_series_store import ListTimeSeriesStore
+
+
+def bytes_per_reading(create, count: int) -> float:
+    """
+    Returns the bytes allocated per reading by a function creating a list of readings
+    """
+    gc.collect()
+    tracemalloc.start()
+    started = tracemalloc.get_traced_memory()[0]
+    readings = create(count)
+    allocated = tracemalloc.get_traced_memory()[0] - started
+    tracemalloc.stop()
+    # the list holding the readings is not part of their size
+    allocated -= readings.__sizeof__() if isinstance(readings, list) else 0
+    return allocated / count
+
+
+def constructed(reading_type, arguments):
+    def create(count: int):
+        readings = [reading_type(*arguments(position)) for position in range(count)]
+        for reading in readings:
+            reading.UID
+        return readings
+    return create
+
+
+def bulk_loaded(count: int):
+    import numpy as np
+    timestamps = np.datetime64('2024-01-01T00:00:00') + np.arange(count).astype('timedelta64[s]')
+    values = np.arange(count, dtype=np.float64)
+    timestamps, values = timestamps.tolist(), values.tolist()
+    store = ListTimeSeriesStore(SensorData)
+    store.add_arrays(timestamps, values)
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=100000)
+    arguments = parser.parse_args()
+
+    start = datetime(2024, 1, 1)
+    timestamp = (lambda position: str(start + timedelta(seconds=position)))
+    unit = MeasureFactory.create_measure(RecordingType.BINARY.value, Measure(MeasurementUnit.DEGREE_CELSIUS, 0))
+    cases = {
+        'SensorData': constructed(SensorData, lambda position: (float(position), timestamp(position))),
+        'MeterMeasure': constructed(MeterMeasure, lambda position: (float(position), timestamp(position))),
+        'TriggerHistory': constructed(TriggerHistory, lambda position: (TriggerType.ON, float(position),
+                                                                        timestamp(position))),
+        'StatusMeasure': constructed(StatusMeasure, lambda position: ('on', timestamp(position))),
+        'DamperPosition': constructed(DamperPosition, lambda position: (float(position), timestamp(position))),
+        'ElectricVehicleConnectivity': constructed(ElectricVehicleConnectivity, lambda position: (
+            float(position), timestamp(position), timestamp(position + 60), OperationType.CHARGING, 'EV-1')),
+        'WeatherData': constructed(WeatherData, lambda position: (unit, timestamp(position))),
+        'SensorData (bulk loaded, UIDs not read)': bulk_loaded,
+    }
+    for name, create in cases.items():
+        print(f'{name}: {bytes_per_reading(create, arguments.count):.0f} bytes per reading')
+
+
+if __name__ == '__main__':
+    main()
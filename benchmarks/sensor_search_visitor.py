@@ -0,0 +1,114 @@
+"""
+Measures a full SensorSearchVisitor run over a building, and reads of the transducers property of
+every space, appliance and HVAC component, the way control loops poll them.
+
+    python -m benchmarks.sensor_search_visitor [--floors N] [--rooms N] [--repeat N]
+
+Every room has two sensors and an appliance with a sensor, every tenth room is a mechanical room
+with a boiler that has a sensor. Property reads are compared with copying the transducers into a
+new list, as the property did before it returned read-only views.
+"""
+import argparse
+import time
+from metamenth.datatypes.address import Address
+from metamenth.datatypes.measure import Measure
+from metamenth.enumerations import ApplianceCategory
+from metamenth.enumerations import ApplianceType
+from metamenth.enumerations import BoilerCategory
+from metamenth.enumerations import BuildingType
+from metamenth.enumerations import FloorType
+from metamenth.enumerations import MeasurementUnit
+from metamenth.enumerations import PowerState
+from metamenth.enumerations import RecordingType
+from metamenth.enumerations import RoomType
+from metamenth.enumerations import SensorMeasure
+from metamenth.enumerations import SensorMeasureType
+from metamenth.misc import MeasureFactory
+from metamenth.structure.building import Building
+from metamenth.structure.floor import Floor
+from metamenth.structure.room import Room
+from metamenth.subsystem.appliance import Appliance
+from metamenth.subsystem.hvac_components.boiler import Boiler
+from metamenth.transducers.sensor import Sensor
+from metamenth.visitors.sensor_search_visitor import SensorSearchVisitor
+
+
+def temperature_sensor(name: str) -> Sensor:
+    return Sensor(name, SensorMeasure.TEMPERATURE, MeasurementUnit.DEGREE_CELSIUS,
+                  SensorMeasureType.THERMO_COUPLE_TYPE_A, 900)
+
+
+def build_building(floor_count: int, room_count: int) -> Building:
+    area = MeasureFactory.create_measure(RecordingType.BINARY.value, Measure(MeasurementUnit.SQUARE_METERS, 45))
+    floors = []
+    for number in range(1, floor_count + 1):
+        rooms = []
+        for position in range(room_count):
+            name = f"Room {number}.{position}"
+            room = Room(area, name, RoomType.MECHANICAL if position % 10 == 0 else RoomType.OFFICE)
+            room.add_transducer(temperature_sensor(f"{name}.TEMP"))
+            room.add_transducer(Sensor(f"{name}.CO2", SensorMeasure.CARBON_DIOXIDE, MeasurementUnit.PARTS_PER_MILLION,
+                                       SensorMeasureType.THERMO_COUPLE_TYPE_A, 900))
+            camera = Appliance(f"{name}.CAMERA", [ApplianceCategory.OFFICE], ApplianceType.CAMERA)
+            camera.add_transducer(Sensor(f"{name}.PRESENCE", SensorMeasure.OCCUPANCY, MeasurementUnit.PRESENCE,
+                                         SensorMeasureType.THERMO_COUPLE_TYPE_A, 0))
+            room.add_appliance(camera)
+            if room.room_type == RoomType.MECHANICAL:
+                boiler = Boiler(f"{name}.BOILER", BoilerCategory.NATURAL_GAS, PowerState.ON)
+                boiler.add_transducer(temperature_sensor(f"{name}.BOILER.TEMP"))
+                room.add_hvac_component(boiler)
+            rooms.append(room)
+        floors.append(Floor(area=area, number=number, floor_type=FloorType.REGULAR, rooms=rooms))
+    return Building(2009, area, area, area, Address("Montreal", "6399 Rue Sherbrooke", "QC", "H1N 2Z3", "Canada"),
+                    BuildingType.COMMERCIAL, floors)
+
+
+def poll(entities, copy: bool) -> int:
+    """
+    Reads the transducers of entities, returns the number of transducers read
+    """
+    count = 0
+    for entity in entities:
+        transducers = list(entity.transducers) if copy else entity.transducers
+        for _ in transducers:
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--floors', type=int, default=10)
+    parser.add_argument('--rooms', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=20)
+    arguments = parser.parse_args()
+
+    building = build_building(arguments.floors, arguments.rooms)
+    entities = []
+    for floor in building.get_floors():
+        for room in floor.get_rooms():
+            entities.extend([room] + room.get_appliances() + room.get_hvac_components())
+
+    def search():
+        visitor = SensorSearchVisitor(sensor_criteria={'measure': SensorMeasure.TEMPERATURE.value})
+        building.accept(visitor)
+        return visitor.found_entities
+
+    found = len(search())
+    started = time.perf_counter()
+    for _ in range(arguments.repeat):
+        search()
+    search_time = (time.perf_counter() - started) / arguments.repeat
+    print(f'{arguments.floors} floors of {arguments.rooms} rooms, {found} temperature sensors found')
+    print(f'SensorSearchVisitor: {search_time * 1000:.1f} ms per run')
+
+    for label, copy in (('copies', True), ('views', False)):
+        poll(entities, copy)
+        started = time.perf_counter()
+        for _ in range(arguments.repeat):
+            poll(entities, copy)
+        poll_time = (time.perf_counter() - started) / arguments.repeat
+        print(f'transducers ({label}): {poll_time * 1000:.2f} ms per poll of {len(entities)} entities')
+
+
+if __name__ == '__main__':
+    main()
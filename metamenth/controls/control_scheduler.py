@@ -0,0 +1,222 @@
+import asyncio
+import inspect
+import logging
+import math
+from concurrent.futures import Executor
+from functools import partial
+from typing import Dict
+from typing import List
+from metamenth.controls.abstract_control import AbstractControl
+from metamenth.datatypes.control_loop_metrics import ControlLoopMetrics
+
+logger = logging.getLogger(__name__)
+
+
+class _SensorLoop:
+    """
+    The control strategies ticked by the same process value sensor
+    """
+
+    def __init__(self, sensor):
+        self.sensor = sensor
+        self.controls: List[AbstractControl] = []
+        # the loop time at which each strategy (keyed by id) stops, None for strategies that run forever
+        self.end_times: Dict[int, float] = {}
+        self.metrics = ControlLoopMetrics(sensor.UID)
+        self.task: asyncio.Task = None
+
+    def start_control(self, control: AbstractControl, now: float):
+        self.end_times[id(control)] = None if control.run_duration is None else now + control.run_duration * 3600
+
+    def expire_controls(self, now: float):
+        """
+        Removes the strategies whose run duration is over
+        """
+        for control in list(self.controls):
+            end_time = self.end_times.get(id(control))
+            if end_time is not None and now >= end_time:
+                self.controls.remove(control)
+                del self.end_times[id(control)]
+
+
+class ControlScheduler:
+    """
+    Runs many control strategies (e.g., on/off or PID controls of the VAV boxes of a campus)
+    concurrently in an asyncio event loop instead of a thread and a sleep loop per strategy.
+
+    Each strategy is ticked every data_frequency seconds of its process value sensor until its
+    run_duration (in hours) is over: the process value is acquired and passed to execute_control.
+    Ticks of strategies sharing a sensor are coalesced, the process value being acquired once
+    (with the first strategy of the sensor) for all of them. Ticks are due at fixed times from
+    the start, so they do not drift; jitter, overruns and errors are kept per sensor.
+
+    acquire_process_value_data and execute_control may be coroutine functions. Other functions
+    run in the event loop, or in an executor for strategies that block (e.g., on API calls).
+    """
+
+    def __init__(self, executor: Executor = None):
+        """
+        :param executor: the optional executor running the functions of the strategies that are not coroutines
+        """
+        self._executor = executor
+        self._loops: Dict[str, _SensorLoop] = {}
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def metrics(self) -> Dict[str, ControlLoopMetrics]:
+        """
+        The metrics of the control loop of each process value sensor, keyed by sensor UID
+        """
+        return {uid: sensor_loop.metrics for uid, sensor_loop in self._loops.items()}
+
+    def summary(self) -> ControlLoopMetrics:
+        """
+        Returns the metrics of all the control loops
+        """
+        summary = ControlLoopMetrics()
+        for sensor_loop in self._loops.values():
+            summary.merge(sensor_loop.metrics)
+        return summary
+
+    def add_control(self, control: AbstractControl, controller=None):
+        """
+        Schedules a control strategy, e.g., while the scheduler is running
+        :param control: the control strategy
+        :param controller: the optional controller executing the strategy, which checks that
+        the sensor and actuator of the strategy are its transducers
+        """
+        if controller is not None:
+            controller.validate_control(control)
+        if not control.process_value_sensor:
+            raise ValueError('Sensor for process variable must be specified')
+        if not control.process_actuator:
+            raise ValueError('Actuator for process variable must be specified')
+        if not control.process_value_sensor.data_frequency or control.process_value_sensor.data_frequency <= 0:
+            raise ValueError('Data frequency for the process variable sensor must be specified')
+
+        sensor = control.process_value_sensor
+        sensor_loop = self._loops.get(sensor.UID)
+        if sensor_loop is None:
+            sensor_loop = self._loops[sensor.UID] = _SensorLoop(sensor)
+        if any(scheduled is control for scheduled in sensor_loop.controls):
+            raise ValueError('control strategy is already scheduled')
+        sensor_loop.controls.append(control)
+        if self._running:
+            sensor_loop.start_control(control, asyncio.get_running_loop().time())
+            self._start_loop(sensor_loop)
+
+    def remove_control(self, control: AbstractControl):
+        """
+        Stops ticking a control strategy
+        :param control: the control strategy
+        """
+        sensor_loop = self._loops.get(control.process_value_sensor.UID) if control.process_value_sensor else None
+        if sensor_loop is None or not any(scheduled is control for scheduled in sensor_loop.controls):
+            raise ValueError('control strategy is not scheduled')
+        sensor_loop.controls.remove(control)
+        sensor_loop.end_times.pop(id(control), None)
+        if not sensor_loop.controls and sensor_loop.task is not None:
+            # a strategy added before the cancelled loop ends starts a new loop
+            sensor_loop.task.cancel()
+            sensor_loop.task = None
+
+    def get_controls(self) -> List[AbstractControl]:
+        """
+        Returns the scheduled control strategies whose run duration is not over
+        """
+        return [control for sensor_loop in self._loops.values() for control in sensor_loop.controls]
+
+    async def run(self):
+        """
+        Ticks the control strategies until their run duration is over or the scheduler is stopped
+        """
+        if self._running:
+            raise ValueError('control scheduler is already running')
+        self._running = True
+        now = asyncio.get_running_loop().time()
+        try:
+            for sensor_loop in self._loops.values():
+                for control in sensor_loop.controls:
+                    sensor_loop.start_control(control, now)
+                self._start_loop(sensor_loop)
+            while True:
+                # loops of the strategies added while running are awaited as well
+                tasks = [sensor_loop.task for sensor_loop in self._loops.values()
+                         if sensor_loop.task is not None and not sensor_loop.task.done()]
+                if not tasks:
+                    break
+                await asyncio.wait(tasks)
+        finally:
+            for sensor_loop in self._loops.values():
+                if sensor_loop.task is not None:
+                    sensor_loop.task.cancel()
+                    sensor_loop.task = None
+            self._running = False
+
+    def start(self):
+        """
+        Runs the scheduler in a new event loop, until the run duration of all the strategies is over
+        """
+        asyncio.run(self.run())
+
+    def stop(self):
+        """
+        Stops the running control loops, e.g., from a strategy or a signal handler
+        """
+        for sensor_loop in self._loops.values():
+            if sensor_loop.task is not None:
+                sensor_loop.task.cancel()
+
+    def _start_loop(self, sensor_loop: _SensorLoop):
+        if sensor_loop.controls and (sensor_loop.task is None or sensor_loop.task.done()):
+            sensor_loop.task = asyncio.get_running_loop().create_task(self._tick_loop(sensor_loop))
+
+    async def _tick_loop(self, sensor_loop: _SensorLoop):
+        event_loop = asyncio.get_running_loop()
+        metrics = sensor_loop.metrics
+        due = event_loop.time()
+        while True:
+            started = event_loop.time()
+            sensor_loop.expire_controls(started)
+            if not sensor_loop.controls:
+                return
+            await self._tick(sensor_loop)
+            finished = event_loop.time()
+            metrics.record_tick(started - due, finished - started)
+
+            period = sensor_loop.sensor.data_frequency
+            due += period
+            if finished > due:
+                # the ticks due while this tick ran are skipped
+                skipped = math.ceil((finished - due) / period)
+                metrics.overruns += 1
+                metrics.skipped_ticks += skipped
+                due += skipped * period
+            await asyncio.sleep(due - event_loop.time())
+
+    async def _tick(self, sensor_loop: _SensorLoop):
+        controls = list(sensor_loop.controls)
+        try:
+            process_value = await self._call(controls[0].acquire_process_value_data)
+        except Exception:
+            sensor_loop.metrics.errors += 1
+            logger.exception('Acquiring the process value of sensor %s failed', sensor_loop.sensor.name)
+            return
+        for control in controls:
+            try:
+                await self._call(control.execute_control, process_value)
+            except Exception:
+                sensor_loop.metrics.errors += 1
+                logger.exception('Control of actuator %s failed', getattr(control.process_actuator, 'name', None))
+
+    async def _call(self, function, *args):
+        if self._executor is not None and not inspect.iscoroutinefunction(function):
+            return await asyncio.get_running_loop().run_in_executor(self._executor, partial(function, *args))
+        result = function(*args)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
@@ -0,0 +1,46 @@
+from abc import abstractmethod
+from metamenth.transducers.sensor import Sensor
+from metamenth.transducers.actuator import Actuator
+from metamenth.datatypes.continuous_measure import ContinuousMeasure
+from metamenth.controls.abstract_control import AbstractControl
+
+
+class AbstractPIDControl(AbstractControl):
+
+    def __init__(self, process_value_sensor: Sensor, process_actuator: Actuator,
+                 control_thresholds: ContinuousMeasure, proportional_gain: float, integral_gain: float = 0.0,
+                 derivative_gain: float = 0.0, derivative_filter_time: float = 0.0, run_duration: float = None):
+        """
+        :param process_value_sensor: the sensor for the process value to be monitored
+        :param process_actuator: the actuator that executes the control output, e.g., a damper or valve position
+        :param control_thresholds: the minimum and maximum values of the control output
+        :param proportional_gain: the proportional gain (negative gains for reverse acting loops, e.g., cooling)
+        :param integral_gain: the integral gain, per second
+        :param derivative_gain: the derivative gain, in seconds
+        :param derivative_filter_time: the time constant (seconds) of the low pass filter of the derivative term,
+        0 for an unfiltered derivative
+        :param run_duration: indicates how long the control strategy will be executed. The default None value indicates
+        that the strategy will execute 'forever'
+        """
+        super().__init__(process_value_sensor, process_actuator, control_thresholds, run_duration)
+        self.proportional_gain = proportional_gain
+        self.integral_gain = integral_gain
+        self.derivative_gain = derivative_gain
+        self.derivative_filter_time = derivative_filter_time
+
+    @abstractmethod
+    def acquire_process_value_data(self) -> float:
+        """
+        This method executes periodically based on the data frequency defined
+        by the process value sensor. It retrieves the process values for control decisions
+        :return: the process value, e.g., temperature, relative humidity
+        """
+        pass
+
+    @abstractmethod
+    def execute_control(self, process_value: float):
+        """
+        Computes the control output from the process value and applies it through the process actuator
+        :param process_value: the process value being monitored
+        """
+        pass
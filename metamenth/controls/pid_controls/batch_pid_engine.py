@@ -0,0 +1,236 @@
+from datetime import datetime
+from typing import List
+import numpy as np
+from metamenth.controls.pid_controls.abstract_pid_controls import AbstractPIDControl
+from metamenth.enumerations import TriggerType
+from metamenth.subsystem.hvac_components.controller import Controller
+
+
+class BatchPIDEngine:
+    """
+    Evaluates many PID loops (e.g., the zone temperature loops of a campus) together. The gains,
+    set points, output limits and the state of the loops (integrators, filtered derivatives and
+    previous process values) are kept in numpy arrays, and step() advances all the loops at once
+    from an array of process values.
+
+    Set points are read with Controller.get_set_point for the sensor and actuator of each loop:
+    the value of binary measures, the middle of the band of range measures. Output limits are the
+    minimum and maximum of the control thresholds of the loops. The derivative acts on the process
+    value (no kick on set point changes) through a first order filter, and integrators stop growing
+    while outputs are saturated (anti-windup). Loops whose process value is NaN keep their state
+    and output for the step.
+
+    Outputs recorded with record_outputs() are written to the actuators of the loops by write_outputs(),
+    as one column of trigger history per actuator.
+    """
+
+    def __init__(self, trigger_type: TriggerType = TriggerType.OPEN_CLOSE):
+        """
+        :param trigger_type: the trigger type of the trigger history written to the actuators
+        """
+        self._trigger_type = trigger_type
+        self._controls: List[AbstractPIDControl] = []
+        self._controllers: List[Controller] = []
+        self._proportional_gains = np.empty(0)
+        self._integral_gains = np.empty(0)
+        self._derivative_gains = np.empty(0)
+        self._filter_times = np.empty(0)
+        self._set_points = np.empty(0)
+        self._output_minimums = np.empty(0)
+        self._output_maximums = np.empty(0)
+        self._integrals = np.empty(0)
+        self._derivatives = np.empty(0)
+        self._previous_values = np.empty(0)
+        self._outputs = np.empty(0)
+        # outputs recorded and not yet written to the actuators
+        self._recorded_timestamps: List[datetime] = []
+        self._recorded_outputs: List[np.ndarray] = []
+
+    @property
+    def set_points(self) -> np.ndarray:
+        return self._set_points.copy()
+
+    @property
+    def outputs(self) -> np.ndarray:
+        return self._outputs.copy()
+
+    @property
+    def integrals(self) -> np.ndarray:
+        return self._integrals.copy()
+
+    def get_controls(self) -> List[AbstractPIDControl]:
+        """
+        Returns the control strategies of the loops, in the order of the arrays of the engine
+        """
+        return list(self._controls)
+
+    def add_controls(self, controls: List[AbstractPIDControl], controllers: List[Controller] = None):
+        """
+        Adds PID loops to the engine
+        :param controls: the PID control strategies
+        :param controllers: the controller with the set point of each strategy, defaults to the
+        controller of the actuator of each strategy
+        :return: the position of the first added loop in the arrays of the engine
+        """
+        if controllers is None:
+            controllers = [getattr(control.process_actuator, 'controller', None) for control in controls]
+        if len(controllers) != len(controls):
+            raise ValueError('controllers must have one controller per control strategy')
+        for control, controller in zip(controls, controllers):
+            if controller is None:
+                raise ValueError('A controller with the set point of the control strategy must be specified')
+            controller.validate_control(control)
+        parameters = np.array([BatchPIDEngine._parameters(control, controller)
+                               for control, controller in zip(controls, controllers)], dtype=np.float64)
+        parameters = parameters.reshape(len(controls), 7)
+
+        position = len(self._controls)
+        self._controls.extend(controls)
+        self._controllers.extend(controllers)
+        self._proportional_gains, self._integral_gains, self._derivative_gains, self._filter_times, \
+            self._set_points, self._output_minimums, self._output_maximums = \
+            [np.concatenate((current, added)) for current, added in zip(
+                (self._proportional_gains, self._integral_gains, self._derivative_gains, self._filter_times,
+                 self._set_points, self._output_minimums, self._output_maximums), parameters.T)]
+        self._integrals = np.concatenate((self._integrals, np.zeros(len(controls))))
+        self._derivatives = np.concatenate((self._derivatives, np.zeros(len(controls))))
+        self._previous_values = np.concatenate((self._previous_values, np.full(len(controls), np.nan)))
+        self._outputs = np.concatenate((self._outputs, np.full(len(controls), np.nan)))
+        if self._recorded_outputs:
+            self._recorded_outputs = [np.concatenate((outputs, np.full(len(controls), np.nan)))
+                                      for outputs in self._recorded_outputs]
+        return position
+
+    def add_control(self, control: AbstractPIDControl, controller: Controller = None) -> int:
+        """
+        Adds a PID loop to the engine
+        :param control: the PID control strategy
+        :param controller: the controller with the set point of the strategy, defaults to
+        the controller of the actuator of the strategy
+        :return: the position of the loop in the arrays of the engine
+        """
+        return self.add_controls([control], None if controller is None else [controller])
+
+    def refresh(self):
+        """
+        Reads the gains, set points and output limits of the loops again, e.g., after set points changed
+        """
+        parameters = np.array([BatchPIDEngine._parameters(control, controller)
+                               for control, controller in zip(self._controls, self._controllers)], dtype=np.float64)
+        parameters = parameters.reshape(len(self._controls), 7)
+        self._proportional_gains, self._integral_gains, self._derivative_gains, self._filter_times, \
+            self._set_points, self._output_minimums, self._output_maximums = [column.copy() for column in parameters.T]
+
+    def reset(self):
+        """
+        Clears the integrators, derivatives and outputs of the loops
+        """
+        self._integrals[:] = 0.0
+        self._derivatives[:] = 0.0
+        self._previous_values[:] = np.nan
+        self._outputs[:] = np.nan
+
+    def process_values(self) -> np.ndarray:
+        """
+        Returns the current value of the process value sensor of each loop, NaN for sensors without one
+        """
+        return np.array([np.nan if control.process_value_sensor.current_value is None
+                         else control.process_value_sensor.current_value for control in self._controls],
+                        dtype=np.float64)
+
+    def step(self, process_values, elapsed: float, set_points=None) -> np.ndarray:
+        """
+        Advances all the loops by one step
+        :param process_values: the process value of each loop (NaN for loops without a new value)
+        :param elapsed: the seconds since the previous step
+        :param set_points: the optional set point of each loop, instead of the set points of the controllers
+        :return: the control outputs, one per loop
+        """
+        process_values = np.asarray(process_values, dtype=np.float64)
+        if process_values.shape != self._outputs.shape:
+            raise ValueError('process_values must have one value per loop')
+        if elapsed is None or elapsed <= 0:
+            raise ValueError('elapsed must be a positive number of seconds')
+        set_points = self._set_points if set_points is None else np.asarray(set_points, dtype=np.float64)
+        if set_points.shape != self._outputs.shape:
+            raise ValueError('set_points must have one value per loop')
+
+        measured = ~np.isnan(process_values)
+        errors = set_points - process_values
+        changes = np.where(measured & ~np.isnan(self._previous_values), process_values - self._previous_values, 0.0)
+        derivatives = (self._filter_times * self._derivatives - self._derivative_gains * changes) / \
+                      (self._filter_times + elapsed)
+        growth = self._integral_gains * errors * elapsed
+        integrals = self._integrals + growth
+        unsaturated = self._proportional_gains * errors + integrals + derivatives
+        outputs = np.clip(unsaturated, self._output_minimums, self._output_maximums)
+        # anti-windup: integrators do not grow further into saturation
+        windup = ((unsaturated > self._output_maximums) & (growth > 0)) | \
+                 ((unsaturated < self._output_minimums) & (growth < 0))
+        integrals = np.where(windup, self._integrals, integrals)
+
+        self._integrals = np.where(measured, integrals, self._integrals)
+        self._derivatives = np.where(measured, derivatives, self._derivatives)
+        self._previous_values = np.where(measured, process_values, self._previous_values)
+        self._outputs = np.where(measured, outputs, self._outputs)
+        return self._outputs.copy()
+
+    def record_outputs(self, timestamp: datetime = None):
+        """
+        Keeps the current outputs of the loops, to be written to their actuators by write_outputs
+        :param timestamp: the time of the outputs, defaults to now
+        """
+        self._recorded_timestamps.append(datetime.now().replace(microsecond=0) if timestamp is None else timestamp)
+        self._recorded_outputs.append(self._outputs.copy())
+
+    def write_outputs(self) -> int:
+        """
+        Adds the recorded outputs of each loop to the trigger history of its actuator, in one
+        column per actuator. Outputs of loops that did not have an output yet are left out
+        :return: the number of trigger history records written
+        """
+        if not self._recorded_outputs:
+            return 0
+        timestamps = np.array(self._recorded_timestamps, dtype='datetime64[s]')
+        outputs = np.vstack(self._recorded_outputs)
+        written = 0
+        for position, control in enumerate(self._controls):
+            column = outputs[:, position]
+            valid = ~np.isnan(column)
+            if valid.any():
+                control.process_actuator.add_data_arrays(timestamps[valid], column[valid],
+                                                         tags={'trigger_type': self._trigger_type})
+                written += int(valid.sum())
+        self._recorded_timestamps = []
+        self._recorded_outputs = []
+        return written
+
+    def __len__(self):
+        return len(self._controls)
+
+    @staticmethod
+    def _parameters(control: AbstractPIDControl, controller: Controller) -> List[float]:
+        """
+        Returns the gains, filter time, set point and output limits of a loop
+        """
+        gains = [control.proportional_gain, control.integral_gain, control.derivative_gain,
+                 control.derivative_filter_time]
+        if any(gain is None for gain in gains):
+            raise ValueError('PID gains and derivative filter time must be numbers')
+        if control.derivative_filter_time < 0:
+            raise ValueError('derivative_filter_time must not be negative')
+
+        set_point = controller.get_set_point(control.process_value_sensor.name, control.process_actuator.name)
+        if set_point is None:
+            raise ValueError(f'There is no set point for sensor {control.process_value_sensor.name} '
+                             f'and actuator {control.process_actuator.name}')
+        if hasattr(set_point, 'value'):
+            set_point_value = set_point.value
+        else:
+            set_point_value = set_point.minimum if set_point.maximum is None else \
+                (set_point.minimum + set_point.maximum) / 2
+
+        thresholds = control.control_thresholds
+        minimum = getattr(thresholds, 'minimum', None)
+        maximum = getattr(thresholds, 'maximum', None)
+        return gains + [set_point_value, -np.inf if minimum is None else minimum, np.inf if maximum is None else maximum]
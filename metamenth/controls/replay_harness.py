@@ -0,0 +1,274 @@
+import heapq
+import logging
+import time
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import Dict
+from typing import List
+import numpy as np
+from metamenth.controls.abstract_control import AbstractControl
+from metamenth.controls.simulation_clock import SimulationClock
+from metamenth.datatypes.replay_metrics import ReplayMetrics
+from metamenth.enumerations import TriggerType
+from metamenth.measure_instruments.sensor_data import SensorData
+from metamenth.measure_instruments.trigger_history import TriggerHistory
+from metamenth.storage.time_series_reader import TimeSeriesReader
+
+logger = logging.getLogger(__name__)
+
+
+class _ReplayLoop:
+    """
+    The control strategies ticked by the same process value sensor, and the recorded data of the sensor
+    """
+
+    def __init__(self, sensor, timestamps: np.ndarray, values: np.ndarray):
+        self.sensor = sensor
+        self.controls: List[AbstractControl] = []
+        order = np.argsort(timestamps, kind='stable')
+        self.timestamps = timestamps[order]
+        self.values = values[order]
+        # set for each run
+        self.tick_values: List[float] = []
+        self.active_controls: List[AbstractControl] = []
+        self.end_times: Dict[int, float] = {}
+
+    def prepare(self, start: np.datetime64, duration: float):
+        """
+        Computes the value of the sensor at each tick of a run: the last reading at or before the tick
+        :param start: the start of the run
+        :param duration: the simulated seconds of the run
+        """
+        period = self.sensor.data_frequency
+        tick_offsets = np.arange(int(duration // period) + 1) * period
+        reading_offsets = (self.timestamps - start) / np.timedelta64(1, 's')
+        positions = np.searchsorted(reading_offsets, tick_offsets, side='right') - 1
+        if len(self.values):
+            self.tick_values = np.where(positions >= 0, self.values[np.maximum(positions, 0)], np.nan).tolist()
+        else:
+            self.tick_values = [float('nan')] * len(tick_offsets)
+        self.active_controls = list(self.controls)
+        self.end_times = {id(control): control.run_duration * 3600
+                          for control in self.controls if control.run_duration is not None}
+
+    def expire_controls(self, elapsed: float):
+        """
+        Removes the strategies whose run duration is over
+        """
+        if not self.end_times:
+            return
+        for control in list(self.active_controls):
+            end_time = self.end_times.get(id(control))
+            if end_time is not None and elapsed >= end_time:
+                self.active_controls.remove(control)
+
+
+class ReplayHarness:
+    """
+    Replays recorded sensor data through control strategies on a simulated clock, e.g., to
+    regression test the tuning of controls against a year of history in minutes.
+
+    Each strategy is ticked every data_frequency seconds of simulated time of its process value
+    sensor, from the start to the end of the replay. At each tick the current_value of the sensor
+    is set to its last reading at or before the simulated time (None before its first reading),
+    and restored to its value from before the replay once the replay is over. The process value
+    is acquired once (with the first strategy of the sensor) and passed to the execute_control of
+    every strategy of the sensor, as the ControlScheduler does. Strategies should read the current
+    value of their sensor and the time of the harness clock.
+
+    Values returned by execute_control are logged as trigger history of the actuator of the strategy,
+    at the simulated time: a TriggerType, a TriggerHistory (whose timestamp is replaced) or a number
+    (logged with the trigger type of the harness). Ticks due at the same simulated time may run in
+    an executor; results are still logged in a fixed order, so replays are deterministic.
+    """
+
+    def __init__(self, speed_up: float = None, executor: Executor = None,
+                 trigger_type: TriggerType = TriggerType.OPEN_CLOSE):
+        """
+        :param speed_up: the simulated seconds per wall-clock second, None to replay as fast as possible
+        :param executor: the optional executor running the strategies ticked at the same simulated time
+        :param trigger_type: the trigger type of the numbers returned by execute_control
+        """
+        if speed_up is not None and speed_up <= 0:
+            raise ValueError('speed_up must be a positive number')
+        self._speed_up = speed_up
+        self._executor = executor
+        self._trigger_type = trigger_type
+        self._loops: Dict[str, _ReplayLoop] = {}
+        self._clock: SimulationClock = None
+
+    @property
+    def clock(self) -> SimulationClock:
+        """
+        The simulated clock of the current or last replay
+        """
+        return self._clock
+
+    def add_control(self, control: AbstractControl, controller=None, history: List[SensorData] = None):
+        """
+        Adds a control strategy to the replay
+        :param control: the control strategy
+        :param controller: the optional controller executing the strategy, which checks that
+        the sensor and actuator of the strategy are its transducers
+        :param history: the recorded data of the process value sensor, defaults to the data of
+        the sensor. The history given last is replayed for strategies sharing a sensor
+        """
+        if controller is not None:
+            controller.validate_control(control)
+        if not control.process_value_sensor:
+            raise ValueError('Sensor for process variable must be specified')
+        if not control.process_actuator:
+            raise ValueError('Actuator for process variable must be specified')
+        if not control.process_value_sensor.data_frequency or control.process_value_sensor.data_frequency <= 0:
+            raise ValueError('Data frequency for the process variable sensor must be specified')
+
+        sensor = control.process_value_sensor
+        replay_loop = self._loops.get(sensor.UID)
+        if replay_loop is None or history is not None:
+            if history is None:
+                timestamps, values = sensor.get_data_arrays()
+            else:
+                timestamps, values = TimeSeriesReader.to_arrays([reading.timestamp for reading in history],
+                                                                [reading.value for reading in history])
+            controls = [] if replay_loop is None else replay_loop.controls
+            replay_loop = self._loops[sensor.UID] = _ReplayLoop(sensor, timestamps, values)
+            replay_loop.controls = controls
+        if any(added is control for added in replay_loop.controls):
+            raise ValueError('control strategy is already added')
+        replay_loop.controls.append(control)
+
+    def get_controls(self) -> List[AbstractControl]:
+        return [control for replay_loop in self._loops.values() for control in replay_loop.controls]
+
+    def run(self, start: datetime = None, end: datetime = None) -> ReplayMetrics:
+        """
+        Replays the recorded data through the strategies
+        :param start: the simulated start, defaults to the first recorded reading
+        :param end: the simulated end, defaults to the last recorded reading
+        :return: the throughput of the replay
+        """
+        if not self._loops:
+            raise ValueError('there are no control strategies to replay')
+        recorded = [replay_loop.timestamps for replay_loop in self._loops.values() if len(replay_loop.timestamps)]
+        if (start is None or end is None) and not recorded:
+            raise ValueError('there is no recorded data to replay')
+        start = np.datetime64(start, 's') if start is not None else min(timestamps[0] for timestamps in recorded)
+        end = np.datetime64(end, 's') if end is not None else max(timestamps[-1] for timestamps in recorded)
+        if end < start:
+            raise ValueError('end must not be before start')
+        duration = float((end - start) / np.timedelta64(1, 's'))
+
+        self._clock = clock = SimulationClock(start.astype(datetime))
+        metrics = ReplayMetrics(simulated_seconds=duration)
+        # trigger history (simulated seconds, values and trigger types) logged per actuator, keyed by id,
+        # and added to the actuators at the end of the replay
+        triggers: Dict[int, tuple] = {}
+        due_ticks = []
+        for order, replay_loop in enumerate(self._loops.values()):
+            replay_loop.prepare(start, duration)
+            due_ticks.append((0.0, order, 0))
+        replay_loops = list(self._loops.values())
+        heapq.heapify(due_ticks)
+
+        # the replay sets the current value of the sensors, which is restored once it is over
+        current_values = [(replay_loop.sensor, replay_loop.sensor.current_value) for replay_loop in replay_loops]
+        wall_start = time.perf_counter()
+        try:
+            self._replay(due_ticks, replay_loops, clock, metrics, triggers, wall_start)
+        finally:
+            for sensor, current_value in current_values:
+                sensor.current_value = current_value
+
+        for actuator, offsets, values, trigger_types in triggers.values():
+            timestamps = start + np.round(np.array(offsets) * 1e6).astype('timedelta64[us]')
+            actuator.add_data_arrays(timestamps.astype('datetime64[s]'), values, tags={'trigger_type': trigger_types})
+        metrics.wall_seconds = time.perf_counter() - wall_start
+        return metrics
+
+    def _replay(self, due_ticks: list, replay_loops: List[_ReplayLoop], clock: SimulationClock,
+                metrics: ReplayMetrics, triggers: Dict[int, tuple], wall_start: float):
+        """
+        Runs the due ticks, in the order of their simulated time, until none is left
+        """
+        while due_ticks:
+            elapsed = due_ticks[0][0]
+            ticks = []
+            while due_ticks and due_ticks[0][0] == elapsed:
+                ticks.append(heapq.heappop(due_ticks))
+            clock.advance_to(elapsed)
+            if self._speed_up is not None:
+                delay = wall_start + elapsed / self._speed_up - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+            for replay_loop in (replay_loops[order] for _, order, _ in ticks):
+                replay_loop.expire_controls(elapsed)
+            if self._executor is not None and len(ticks) > 1:
+                futures = [self._executor.submit(self._tick, replay_loops[order], tick) for _, order, tick in ticks]
+                results = [future.result() for future in futures]
+            else:
+                results = [self._tick(replay_loops[order], tick) for _, order, tick in ticks]
+
+            for executed, errors, controls_results in results:
+                metrics.controls_executed += executed
+                metrics.errors += errors
+                for control, result in controls_results:
+                    if self._log_trigger(triggers, control, result, elapsed):
+                        metrics.triggers += 1
+                    else:
+                        metrics.errors += 1
+            metrics.ticks += len(ticks)
+
+            for _, order, tick in ticks:
+                replay_loop = replay_loops[order]
+                if replay_loop.active_controls and tick + 1 < len(replay_loop.tick_values):
+                    heapq.heappush(due_ticks, ((tick + 1) * replay_loop.sensor.data_frequency, order, tick + 1))
+
+    @staticmethod
+    def _tick(replay_loop: _ReplayLoop, tick: int) -> tuple:
+        """
+        Sets the value of the sensor and executes its strategies
+        :return: the strategies executed, the errors, and the strategies with the results of execute_control
+        """
+        controls = list(replay_loop.active_controls)
+        if not controls:
+            return 0, 0, []
+        value = replay_loop.tick_values[tick]
+        replay_loop.sensor.current_value = None if value != value else value
+        try:
+            process_value = controls[0].acquire_process_value_data()
+        except Exception:
+            logger.exception('Acquiring the process value of sensor %s failed', replay_loop.sensor.name)
+            return 0, 1, []
+        errors = 0
+        results = []
+        for control in controls:
+            try:
+                result = control.execute_control(process_value)
+            except Exception:
+                errors += 1
+                logger.exception('Control of actuator %s failed', getattr(control.process_actuator, 'name', None))
+                continue
+            if result is not None:
+                results.append((control, result))
+        return len(controls), errors, results
+
+    def _log_trigger(self, triggers: Dict[int, tuple], control: AbstractControl, result, elapsed: float) -> bool:
+        if isinstance(result, TriggerType):
+            trigger_type, value = result, 0.0
+        elif isinstance(result, TriggerHistory):
+            trigger_type, value = result.trigger_type, result.value
+        elif isinstance(result, (int, float)) and not isinstance(result, bool):
+            trigger_type, value = self._trigger_type, float(result)
+        else:
+            logger.error('execute_control of actuator %s returned %r, which is not a trigger',
+                         getattr(control.process_actuator, 'name', None), result)
+            return False
+        actuator = control.process_actuator
+        actuator_triggers = triggers.get(id(actuator))
+        if actuator_triggers is None:
+            actuator_triggers = triggers[id(actuator)] = (actuator, [], [], [])
+        actuator_triggers[1].append(elapsed)
+        actuator_triggers[2].append(value)
+        actuator_triggers[3].append(trigger_type)
+        return True
@@ -0,0 +1,72 @@
+from datetime import datetime
+from datetime import timedelta
+
+
+class SimulationClock:
+    """
+    A clock whose time only moves when it is advanced, e.g., by a replay harness, so that
+    control strategies reading it behave the same on every run. Time is kept as seconds
+    from the start, so repeated small advances do not accumulate rounding errors in datetimes
+    """
+
+    def __init__(self, start: datetime):
+        """
+        :param start: the simulated time the clock starts at
+        """
+        if start is None:
+            raise ValueError('start must be a datetime')
+        self._start = start
+        self._elapsed = 0.0
+
+    @property
+    def start(self) -> datetime:
+        return self._start
+
+    @property
+    def elapsed(self) -> float:
+        """
+        The simulated seconds since the start
+        """
+        return self._elapsed
+
+    def now(self) -> datetime:
+        """
+        Returns the simulated time, as datetime.now() would
+        """
+        return self._start + timedelta(seconds=self._elapsed)
+
+    def time(self) -> float:
+        """
+        Returns the simulated time in seconds since the epoch, as time.time() would
+        """
+        return self._start.timestamp() + self._elapsed
+
+    def advance(self, seconds: float):
+        """
+        Moves the clock forward
+        :param seconds: the simulated seconds to move forward by
+        """
+        if seconds < 0:
+            raise ValueError('a simulation clock cannot move backwards')
+        self._elapsed += seconds
+
+    def advance_to(self, elapsed: float):
+        """
+        Moves the clock to a number of seconds from its start
+        :param elapsed: the simulated seconds from the start
+        """
+        if elapsed < self._elapsed:
+            raise ValueError('a simulation clock cannot move backwards')
+        self._elapsed = elapsed
+
+    def reset(self, start: datetime = None):
+        """
+        Moves the clock back to its start, or to a new start
+        :param start: the optional new start of the clock
+        """
+        if start is not None:
+            self._start = start
+        self._elapsed = 0.0
+
+    def __str__(self):
+        return f"SimulationClock(Start: {self._start}, Now: {self.now()})"
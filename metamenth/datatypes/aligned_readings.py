@@ -0,0 +1,99 @@
+from __future__ import annotations
+from typing import Dict
+from typing import List
+from metamenth.enumerations import MeasurementUnit
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class AlignedReadings:
+    """
+    The readings of several meters on a common time grid: one row per interval of the grid
+    and one column per meter, NaN where a meter has no reading for an interval
+    """
+
+    def __init__(self, timestamps: np.ndarray, values: np.ndarray, meter_uids: List[str], unit: MeasurementUnit,
+                 frequency: float):
+        """
+        :param timestamps: the start of each interval (datetime64[s])
+        :param values: the readings, an array of shape (intervals, meters)
+        :param meter_uids: the UID of the meter of each column
+        :param unit: the measurement unit of the readings
+        :param frequency: the length of the intervals in seconds
+        """
+        self._timestamps = timestamps
+        self._values = values
+        self._meter_uids = list(meter_uids)
+        self._unit = unit
+        self._frequency = frequency
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._timestamps
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    @property
+    def meter_uids(self) -> List[str]:
+        return list(self._meter_uids)
+
+    @property
+    def unit(self) -> MeasurementUnit:
+        return self._unit
+
+    @property
+    def frequency(self) -> float:
+        return self._frequency
+
+    def column(self, meter_uid: str) -> np.ndarray:
+        """
+        Returns the readings of a meter
+        :param meter_uid: the UID of the meter
+        """
+        if meter_uid not in self._meter_uids:
+            raise ValueError(f'{meter_uid} is not a meter of the aligned readings')
+        return self._values[:, self._meter_uids.index(meter_uid)]
+
+    def total(self) -> np.ndarray:
+        """
+        Returns the sum of the readings of each interval, e.g., the load curve of a building.
+        Meters without a reading are left out, intervals without any reading are NaN
+        """
+        import numpy as np
+        readings = ~np.isnan(self._values)
+        return np.where(readings.any(axis=1), np.nansum(self._values, axis=1), np.nan)
+
+    def mean(self) -> np.ndarray:
+        """
+        Returns the mean of the readings of each interval, NaN for intervals without any reading
+        """
+        import numpy as np
+        counts = (~np.isnan(self._values)).sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, np.nansum(self._values, axis=1) / counts, np.nan)
+
+    def difference(self) -> np.ndarray:
+        """
+        Returns the readings of the first meter minus the readings of the others, e.g.,
+        the unmetered consumption of a main meter and its sub meters
+        """
+        import numpy as np
+        if not self._meter_uids:
+            return np.full(len(self._timestamps), np.nan)
+        return self._values[:, 0] - np.nansum(self._values[:, 1:], axis=1)
+
+    def as_dict(self) -> Dict[str, np.ndarray]:
+        """
+        Returns the columns of the readings, keyed by timestamp and meter UID, e.g., to build a pandas DataFrame
+        """
+        columns = {'timestamp': self._timestamps}
+        for position, meter_uid in enumerate(self._meter_uids):
+            columns[meter_uid] = self._values[:, position]
+        return columns
+
+    def __len__(self):
+        return len(self._timestamps)
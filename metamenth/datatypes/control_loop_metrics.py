@@ -0,0 +1,47 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class ControlLoopMetrics:
+    """
+    The timing of the ticks of a control loop, i.e., of the control strategies ticked by a
+    process value sensor. Jitter is the delay between the time a tick was due and the time it
+    started; a tick overruns when it ends after the next tick was due, the ticks that were due
+    in the meantime are skipped
+    """
+    sensor_uid: str = None
+    ticks: int = 0
+    overruns: int = 0
+    skipped_ticks: int = 0
+    errors: int = 0
+    total_jitter: float = 0.0
+    max_jitter: float = 0.0
+    max_duration: float = 0.0
+
+    @property
+    def mean_jitter(self) -> float:
+        return self.total_jitter / self.ticks if self.ticks else 0.0
+
+    def record_tick(self, jitter: float, duration: float):
+        """
+        Adds a tick to the metrics
+        :param jitter: the seconds between the time the tick was due and its start
+        :param duration: the seconds taken by the tick
+        """
+        self.ticks += 1
+        self.total_jitter += jitter
+        self.max_jitter = max(self.max_jitter, jitter)
+        self.max_duration = max(self.max_duration, duration)
+
+    def merge(self, other: 'ControlLoopMetrics'):
+        """
+        Adds the metrics of another loop to these metrics, e.g., to summarize the loops of a scheduler
+        :param other: the metrics of the other loop
+        """
+        self.ticks += other.ticks
+        self.overruns += other.overruns
+        self.skipped_ticks += other.skipped_ticks
+        self.errors += other.errors
+        self.total_jitter += other.total_jitter
+        self.max_jitter = max(self.max_jitter, other.max_jitter)
+        self.max_duration = max(self.max_duration, other.max_duration)
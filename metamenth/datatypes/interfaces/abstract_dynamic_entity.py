@@ -2,19 +2,25 @@ from abc import ABC
 from metamenth.utils import EntityInsert
 from metamenth.utils import EntityRemover
 from metamenth.utils import StructureEntitySearch
+from metamenth.utils import IndexedEntityList
+from metamenth.utils import EntityList
+from metamenth.utils import EntityView
 from metamenth.transducers.interfaces.abstract_transducer import AbstractTransducer
 from metamenth.enumerations import BuildingEntity
 from typing import Dict
+from typing import Iterator
+from typing import List
+from metamenth.utils import IndexedEntity
 
 
-class AbstractDynamicEntity(ABC):
+class AbstractDynamicEntity(IndexedEntity, ABC):
 
     def __init__(self):
-        self._transducers: [AbstractTransducer] = []
+        self._transducers: [AbstractTransducer] = EntityList()
 
     @property
-    def transducers(self) -> [AbstractTransducer]:
-        return self._transducers.copy()
+    def transducers(self) -> EntityView:
+        return self._transducers.view()
 
     def add_transducer(self, new_transducer: AbstractTransducer):
         """
@@ -32,6 +38,14 @@ class AbstractDynamicEntity(ABC):
         """
         EntityRemover.remove_building_entity(self._transducers, transducer)
 
+    def enable_search_index(self, attributes: List[str] = None):
+        """
+        Indexes the transducers of this entity by UID, name and other attributes for faster searches
+        :param attributes: the attributes indexed in addition to UID and name
+        :return:
+        """
+        IndexedEntityList.index_lists(self, ['_transducers'], attributes)
+
     def get_transducer_by_name(self, name) -> AbstractTransducer:
         """
         Search transducer by name
@@ -54,4 +68,15 @@ class AbstractDynamicEntity(ABC):
         :param search_terms: a dictionary of attributes and their values
         :return:
         """
-        return StructureEntitySearch.search(self._transducers, search_terms)
\ No newline at end of file
+        return StructureEntitySearch.search(self._transducers, search_terms)
+
+    def iter_transducers(self, search_terms: Dict = None,
+                         limit: int = None, offset: int = 0) -> Iterator['AbstractTransducer']:
+        """
+        Yields the transducers matching search terms one at a time, as get_transducers returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of transducers to yield
+        :param offset: the number of matching transducers to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._transducers, search_terms, limit, offset)
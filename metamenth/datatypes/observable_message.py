@@ -1,4 +1,6 @@
 from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
 from typing import Dict
 from datetime import datetime
 
@@ -9,4 +11,7 @@ class ObservableMessage:
     entity_id: str
     state: Dict
     message: str = None
-    timestamp = datetime.now()
+    # set, add or remove, and the value set or the list of entities added or removed by the tracked method
+    operation: str = None
+    value: Any = None
+    timestamp: datetime = field(default_factory=datetime.now)
@@ -3,10 +3,11 @@ from dataclasses import dataclass
 from typing import Type
 from metamenth.datatypes.interfaces.abstract_measure import AbstractMeasure
 from uuid import uuid4
+from metamenth.utils import IndexedEntity
 
 
 @dataclass
-class OperationalSchedule:
+class OperationalSchedule(IndexedEntity):
     UID = uuid4()
     name: str # unique name for operational schedule
     start_date: datetime
@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class ReplayMetrics:
+    """
+    The throughput of a replay of recorded data through control strategies: the simulated
+    time covered, the wall-clock time it took, and the ticks, triggers and errors of the strategies
+    """
+    simulated_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    ticks: int = 0
+    controls_executed: int = 0
+    triggers: int = 0
+    errors: int = 0
+
+    @property
+    def speed_up(self) -> float:
+        """
+        The simulated seconds per wall-clock second
+        """
+        return self.simulated_seconds / self.wall_seconds if self.wall_seconds else 0.0
+
+    @property
+    def simulated_hours_per_second(self) -> float:
+        return self.speed_up / 3600
+
+    @property
+    def ticks_per_second(self) -> float:
+        return self.ticks / self.wall_seconds if self.wall_seconds else 0.0
@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass
+class RollupBucket:
+    """
+    The aggregates of the readings of an hour, a day or a month, kept by a time series rollup.
+    For cumulative registers, these are the aggregates of the consumption between readings
+    """
+    __slots__ = ('start', 'count', 'sum', 'min', 'max')
+    start: datetime
+    count: int
+    sum: float
+    min: float
+    max: float
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else None
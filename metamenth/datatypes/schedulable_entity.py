@@ -1,15 +1,18 @@
 from typing import List
+from typing import Iterator
 from metamenth.datatypes.operational_schedule import OperationalSchedule
 from metamenth.utils import EntityRemover
 from metamenth.utils import EntityInsert
 from metamenth.utils import StructureEntitySearch
+from metamenth.utils import IndexedEntityList
+from metamenth.utils import EntityList
 from typing import Dict
 from metamenth.enumerations import BuildingEntity
 
 
 class SchedulableEntity:
     def __init__(self):
-        self._schedules: List[OperationalSchedule] = []
+        self._schedules: List[OperationalSchedule] = EntityList()
 
     def add_schedule(self, schedule: OperationalSchedule):
         """
@@ -28,6 +31,14 @@ class SchedulableEntity:
         """
         EntityRemover.remove_building_entity(self._schedules, schedule)
 
+    def enable_search_index(self, attributes: List[str] = None):
+        """
+        Indexes the schedules by UID, name and other attributes for faster searches
+        :param attributes: the attributes indexed in addition to UID and name
+        :return:
+        """
+        IndexedEntityList.index_lists(self, ['_schedules'], attributes)
+
     def get_schedule_by_name(self, name) -> OperationalSchedule:
         """
         Search schedules by name
@@ -52,3 +63,14 @@ class SchedulableEntity:
         """
         return StructureEntitySearch.search(self._schedules, search_terms)
 
+    def iter_schedules(self, search_terms: Dict = None,
+                       limit: int = None, offset: int = 0) -> Iterator[OperationalSchedule]:
+        """
+        Yields the schedules matching search terms one at a time, as get_schedules returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of schedules to yield
+        :param offset: the number of matching schedules to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._schedules, search_terms, limit, offset)
+
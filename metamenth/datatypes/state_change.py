@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+from typing import Any
+from datetime import datetime
+
+
+@dataclass
+class StateChange:
+    """
+    A change of an attribute of a tracked entity, recorded by a state change journal.
+    The operation is initial (the value before the first recorded change), set, add or remove
+    """
+    __slots__ = ('sequence', 'timestamp', 'operation', 'entity_type', 'entity_id', 'attribute',
+                 'old_value', 'new_value')
+    sequence: int
+    timestamp: datetime
+    operation: str
+    entity_type: str
+    entity_id: str
+    attribute: str
+    old_value: Any
+    new_value: Any
@@ -5,6 +5,7 @@ from metamenth.enumerations import EnergySource
 from metamenth.utils import EntityInsert
 from metamenth.utils import EntityRemover
 from metamenth.utils import StructureEntitySearch
+from metamenth.utils import EntityList
 from metamenth.enumerations import BuildingEntity
 from metamenth.enumerations import BatteryTech
 from metamenth.enumerations import CapacitorTech
@@ -17,7 +18,7 @@ class ImmobileStorageEnergySystem(AbstractEnergySystem):
         super().__init__(name, inverter, unit)
         self._energy_source = None
         self._technology = None
-        self._renewable_sources: [RenewableEnergySystem] = []
+        self._renewable_sources: [RenewableEnergySystem] = EntityList()
 
         self.energy_source = energy_source
         self.technology = tech
@@ -1,67 +1,88 @@
-from metamenth.enumerations.measurement_unit import MeasurementUnit
-from metamenth.enumerations.building_type import BuildingType
-from metamenth.enumerations.floor_type import FloorType
-from metamenth.enumerations.meter_type import MeterType
-from metamenth.enumerations.zone_type import ZoneType
-from metamenth.enumerations.open_space_type import OpenSpaceType
-from metamenth.enumerations.room_type import RoomType
-from metamenth.enumerations.data_measurement_type import DataMeasurementType
-from metamenth.enumerations.hvac_type import HVACType
-from metamenth.enumerations.material_type import MaterialType
-from metamenth.enumerations.cover_type import CoverType
-from metamenth.enumerations.building_entity import BuildingEntity
-from metamenth.enumerations.trigger_type import TriggerType
-from metamenth.enumerations.sensor_measure_type import SensorMeasureType
-from metamenth.enumerations.sensor_measure import SensorMeasure
-from metamenth.enumerations.recording_types import RecordingType
-from metamenth.enumerations.sensor_log_type import SensorLogType
-from metamenth.enumerations.meter_measure_mode import MeterMeasureMode
-from metamenth.enumerations.meter_accumulation_frequency import MeterAccumulationFrequency
-from metamenth.enumerations.appliacne_category import ApplianceCategory
-from metamenth.enumerations.appliance_type import ApplianceType
-from metamenth.enumerations.waveform import WaveForm
-from metamenth.enumerations.duct_type import DuctType
-from metamenth.enumerations.duct_sub_type import DuctSubType
-from metamenth.enumerations.heat_exchanger_flow_type import HeatExchangerFlowType
-from metamenth.enumerations.heat_exchanger_type import HeatExchangerType
-from metamenth.enumerations.power_state import PowerState
-from metamenth.enumerations.damper_type import DamperType
-from metamenth.enumerations.duct_connection_entity_type import DuctConnectionEntityType
-from metamenth.enumerations.ventilation_type import VentilationType
-from metamenth.enumerations.radiant_slab_type import RadiantSlabType
-from metamenth.enumerations.heating_type import HeatingType
-from metamenth.enumerations.compressor_type import CompressorType
-from metamenth.enumerations.boiler_category import BoilerCategory
-from metamenth.enumerations.refrigerant_type import RefrigerantType
-from metamenth.enumerations.coil_material import CoilMaterial
-from metamenth.enumerations.heat_source import HeatSource
-from metamenth.enumerations.chiller_type import ChillerType
-from metamenth.enumerations.circulation_pump_type import CirculationPumpType
-from metamenth.enumerations.air_volume_type import AirVolumeType
-from metamenth.enumerations.cell_type import CellType
-from metamenth.enumerations.solar_pv_type import SolarPVType
-from metamenth.enumerations.wind_turbine_type import WindTurbineType
-from metamenth.enumerations.engine_type import EngineType
-from metamenth.enumerations.engine_sub_type import EngineSubType
-from metamenth.enumerations.engine_mode import EngineMode
-from metamenth.enumerations.energy_source import EnergySource
-from metamenth.enumerations.capacitor_tech import CapacitorTech
-from metamenth.enumerations.battery_tech import BatteryTech
-from metamenth.enumerations.v2g_mode import V2GMode
-from metamenth.enumerations.ats_transition_type import ATSTransitionType
-from metamenth.enumerations.ats_power_source_type import ATSPowerSourceType
-from metamenth.enumerations.ats_operation_mode import ATSOperationMode
-from metamenth.enumerations.ats_switching_mechanism import ATSSwitchingMechanism
-from metamenth.enumerations.ups_phase import UPSPhase
-from metamenth.enumerations.operation_type import OperationType
-from metamenth.enumerations.filter_type import FilterType
-from metamenth.enumerations.layer_roughness import LayerRoughness
-from metamenth.enumerations.pump_type import PumpType
-from metamenth.enumerations.terrain_type import TerrainType
-from metamenth.enumerations.solar_distribution_type import SolarDistributionType
-from metamenth.enumerations.relationship_name import RelationshipName
-from metamenth.enumerations.fcu_type import FCUType
-from metamenth.enumerations.fcu_pipe_system import FCUPipeSystem
-from metamenth.enumerations.anemometer_type import AnemometerType
-from metamenth.enumerations.duct_shape import DuctShape
-from metamenth.enumerations.building_orientation import BuildingOrientation
+from importlib import import_module
+
+# enumerations are imported when first used, e.g., by from metamenth.enumerations import RoomType,
+# so importing a model does not import every enumeration module
+_ENUMERATION_MODULES = {
+    'MeasurementUnit': 'measurement_unit',
+    'BuildingType': 'building_type',
+    'FloorType': 'floor_type',
+    'MeterType': 'meter_type',
+    'ZoneType': 'zone_type',
+    'OpenSpaceType': 'open_space_type',
+    'RoomType': 'room_type',
+    'DataMeasurementType': 'data_measurement_type',
+    'HVACType': 'hvac_type',
+    'MaterialType': 'material_type',
+    'CoverType': 'cover_type',
+    'BuildingEntity': 'building_entity',
+    'TriggerType': 'trigger_type',
+    'SensorMeasureType': 'sensor_measure_type',
+    'SensorMeasure': 'sensor_measure',
+    'RecordingType': 'recording_types',
+    'SensorLogType': 'sensor_log_type',
+    'MeterMeasureMode': 'meter_measure_mode',
+    'MeterAccumulationFrequency': 'meter_accumulation_frequency',
+    'ApplianceCategory': 'appliacne_category',
+    'ApplianceType': 'appliance_type',
+    'WaveForm': 'waveform',
+    'DuctType': 'duct_type',
+    'DuctSubType': 'duct_sub_type',
+    'HeatExchangerFlowType': 'heat_exchanger_flow_type',
+    'HeatExchangerType': 'heat_exchanger_type',
+    'PowerState': 'power_state',
+    'DamperType': 'damper_type',
+    'DuctConnectionEntityType': 'duct_connection_entity_type',
+    'VentilationType': 'ventilation_type',
+    'RadiantSlabType': 'radiant_slab_type',
+    'HeatingType': 'heating_type',
+    'CompressorType': 'compressor_type',
+    'BoilerCategory': 'boiler_category',
+    'RefrigerantType': 'refrigerant_type',
+    'CoilMaterial': 'coil_material',
+    'HeatSource': 'heat_source',
+    'ChillerType': 'chiller_type',
+    'CirculationPumpType': 'circulation_pump_type',
+    'AirVolumeType': 'air_volume_type',
+    'CellType': 'cell_type',
+    'SolarPVType': 'solar_pv_type',
+    'WindTurbineType': 'wind_turbine_type',
+    'EngineType': 'engine_type',
+    'EngineSubType': 'engine_sub_type',
+    'EngineMode': 'engine_mode',
+    'EnergySource': 'energy_source',
+    'CapacitorTech': 'capacitor_tech',
+    'BatteryTech': 'battery_tech',
+    'V2GMode': 'v2g_mode',
+    'ATSTransitionType': 'ats_transition_type',
+    'ATSPowerSourceType': 'ats_power_source_type',
+    'ATSOperationMode': 'ats_operation_mode',
+    'ATSSwitchingMechanism': 'ats_switching_mechanism',
+    'UPSPhase': 'ups_phase',
+    'OperationType': 'operation_type',
+    'FilterType': 'filter_type',
+    'LayerRoughness': 'layer_roughness',
+    'PumpType': 'pump_type',
+    'TerrainType': 'terrain_type',
+    'SolarDistributionType': 'solar_distribution_type',
+    'RelationshipName': 'relationship_name',
+    'FCUType': 'fcu_type',
+    'FCUPipeSystem': 'fcu_pipe_system',
+    'AnemometerType': 'anemometer_type',
+    'DuctShape': 'duct_shape',
+    'BuildingOrientation': 'building_orientation',
+    'RollupResolution': 'rollup_resolution',
+}
+
+__all__ = list(_ENUMERATION_MODULES.keys())
+
+
+def __getattr__(name):
+    if name not in _ENUMERATION_MODULES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    enumeration = getattr(import_module(f'{__name__}.{_ENUMERATION_MODULES[name]}'), name)
+    globals()[name] = enumeration
+    return enumeration
+
+
+def __dir__():
+    return sorted(set(globals().keys()).union(__all__))
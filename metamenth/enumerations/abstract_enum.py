@@ -1,14 +1,79 @@
 from enum import Enum
-from fuzzywuzzy import fuzz
+from functools import lru_cache
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Tuple
 
 
 class AbstractEnum(Enum):
 
     @classmethod
     def get_enum_type(cls, value: str):
-        try:
-            value = value.replace(" ", "_").replace("-", "_").upper()
-            closest_key = max(cls.__members__.keys(), key=lambda k: fuzz.ratio(value.lower(), k.lower()))
-            return cls[closest_key]
-        except KeyError:
+        """
+        Returns the member whose name is the closest to a value, e.g., SensorMeasure.get_enum_type('air temperature')
+        :param value: the value, spaces and hyphens are read as underscores
+        :return: the closest member, or None if the enum has no members
+        """
+        value = AbstractEnum._normalize(value)
+        names, lowercase_names = cls._member_names()
+        if not names:
             return None
+        name = lowercase_names.get(value)
+        if name is None:
+            name = AbstractEnum._closest_name(cls, value)
+        return cls[name]
+
+    @classmethod
+    def get_enum_types(cls, values: Iterable[str]) -> List:
+        """
+        Returns the closest member of each value, e.g., a column of a BMS point list, as get_enum_type does.
+        Values without an exactly matching name are compared to all names at once
+        :param values: the values
+        :return: the closest members, None for every value if the enum has no members
+        """
+        values = [AbstractEnum._normalize(value) for value in values]
+        names, lowercase_names = cls._member_names()
+        if not names:
+            return [None] * len(values)
+        unmatched = list(dict.fromkeys(value for value in values if value not in lowercase_names))
+        closest_names = dict(zip(unmatched, AbstractEnum._closest_names(names, unmatched)))
+        return [cls[lowercase_names[value] if value in lowercase_names else closest_names[value]]
+                for value in values]
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _member_names(cls) -> Tuple[tuple, Dict[str, str]]:
+        """
+        Returns the names of the members, and the first name of each lowercase name
+        """
+        names = tuple(cls.__members__.keys())
+        lowercase_names = {}
+        for name in names:
+            lowercase_names.setdefault(name.lower(), name)
+        return names, lowercase_names
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _closest_name(cls, value: str) -> str:
+        return AbstractEnum._closest_names(cls._member_names()[0], [value])[0]
+
+    @staticmethod
+    def _closest_names(names: tuple, values: List[str]) -> List[str]:
+        """
+        Returns the name with the highest fuzz ratio to each (lowercase) value. Ratios are rounded
+        to integers and ties go to the first name, as with fuzzywuzzy
+        """
+        if not values:
+            return []
+        # imported on first use, as most programs never resolve names and the imports are slow
+        import numpy as np
+        from rapidfuzz import fuzz
+        from rapidfuzz import process
+        ratios = process.cdist(values, [name.lower() for name in names], scorer=fuzz.ratio, dtype=np.float64)
+        return [names[position] for position in np.argmax(np.rint(ratios), axis=1)]
+
+    @staticmethod
+    def _normalize(value: str) -> str:
+        # upper then lower, as names were compared to upper case values
+        return value.replace(" ", "_").replace("-", "_").upper().lower()
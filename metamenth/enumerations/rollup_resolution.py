@@ -0,0 +1,10 @@
+from metamenth.enumerations.abstract_enum import AbstractEnum
+
+
+class RollupResolution(AbstractEnum):
+    """
+    Bucket sizes of the rollups kept for meter and transducer readings
+    """
+    HOURLY = "Hourly"
+    DAILY = "Daily"
+    MONTHLY = "Monthly"
@@ -2,6 +2,7 @@ from metamenth.measure_instruments.interfaces.abstract_data_measure import Abstr
 
 
 class DamperPosition(AbstractDataMeasure):
+    __slots__ = ()
 
     def __init__(self, value: float, timestamp: str = None):
         """
@@ -11,6 +11,7 @@ class ElectricVehicleConnectivity(AbstractDataMeasure):
     Author: Peter Yefi
     Email: peteryefi@gmail.com
     """
+    __slots__ = ('_end_time', '_operation_type', '_vehicle_uid')
 
     def __init__(self, value: float, start_time: str, end_time: str, operation_type: OperationType, vehicle_id: str):
         """
@@ -3,7 +3,10 @@ from metamenth.measure_instruments.interfaces.abstract_reader import AbstractRea
 from metamenth.measure_instruments.electric_vehicle_connectivity import ElectricVehicleConnectivity
 from metamenth.utils import EntityInsert
 from metamenth.utils import StructureEntitySearch
+from metamenth.utils import TimestampIndex
+from metamenth.utils import EntityList
 from typing import Dict
+from typing import Iterator
 from metamenth.enumerations import BuildingEntity
 
 
@@ -25,7 +28,8 @@ class EVChargingMeter(AbstractReader):
         :param measurement_unit: The measurement unit of the meter data.
         """
         super().__init__(measurement_unit, meter_location, manufacturer)
-        self._vehicle_connectivity: [ElectricVehicleConnectivity] = []
+        self._vehicle_connectivity: [ElectricVehicleConnectivity] = EntityList()
+        self._vehicle_connectivity_index = TimestampIndex()
 
     def get_connectivity_data(self, search_terms: Dict = None) -> [ElectricVehicleConnectivity]:
         """
@@ -35,6 +39,17 @@ class EVChargingMeter(AbstractReader):
         """
         return StructureEntitySearch.search(self._vehicle_connectivity, search_terms)
 
+    def iter_connectivity_data(self, search_terms: Dict = None,
+                               limit: int = None, offset: int = 0) -> Iterator[ElectricVehicleConnectivity]:
+        """
+        Yields the connectivity data matching search terms one at a time, as get_connectivity_data returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of connectivity data to yield
+        :param offset: the number of matching connectivity data to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._vehicle_connectivity, search_terms, limit, offset)
+
     def get_connectivity_data_by_date(self, from_timestamp: str, to_timestamp: str = None) -> [ElectricVehicleConnectivity]:
         """
         searches meter recordings based on provided timestamp
@@ -42,14 +57,31 @@ class EVChargingMeter(AbstractReader):
         :param to_timestamp: the end timestamp
         :return: [ElectricVehicleConnectivity]
         """
-        return StructureEntitySearch.date_range_search(self._vehicle_connectivity, from_timestamp, to_timestamp)
+        return StructureEntitySearch.date_range_search(self._vehicle_connectivity_index, from_timestamp,
+                                                       to_timestamp)
+
+    def iter_connectivity_data_by_date(self, from_timestamp: str, to_timestamp: str = None, limit: int = None,
+                                       offset: int = 0) -> Iterator[ElectricVehicleConnectivity]:
+        """
+        Yields the connectivity data recorded within a time interval, as get_connectivity_data_by_date returns them
+        :param from_timestamp: the start timestamp
+        :param to_timestamp: the end timestamp
+        :param limit: the maximum number of connectivity data to yield
+        :param offset: the number of connectivity data to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_date_range(self._vehicle_connectivity_index, from_timestamp, to_timestamp,
+                                                     limit, offset)
 
     def add_meter_measure(self, connectivity_data: ElectricVehicleConnectivity):
         """
         Add vehicle connectivity for this meter
         :param connectivity_data: the recorded electric vehicle charging or discharging by the meter.
         """
+        connectivity_count = len(self._vehicle_connectivity)
         EntityInsert.insert_building_entity(self._vehicle_connectivity, connectivity_data, BuildingEntity.SCHEDULE.value)
+        if len(self._vehicle_connectivity) > connectivity_count:
+            self._vehicle_connectivity_index.add(connectivity_data)
 
     def __str__(self):
         """
@@ -14,6 +14,9 @@ class AbstractDataMeasure(ABC):
     Author: Peter Yefi
     Email: peteryefi@gmail.com
     """
+    # readings are the most numerous objects of a model, they do not have a __dict__;
+    # subclasses declare the slots of their own attributes
+    __slots__ = ('_UID', '_timestamp', '_value', '_measurement_type')
 
     def __init__(self, value: Union[float, str], timestamp: str = None, measurement_type: DataMeasurementType = None):
         """
@@ -22,7 +25,8 @@ class AbstractDataMeasure(ABC):
         :param measurement_type: the type of the measurment, e.g., electricity consumption
 
         """
-        self._UID = str(uuid.uuid4())
+        # UIDs are kept as 128 bit integers and formatted when read
+        self._UID = uuid.uuid4().int
         self._timestamp = datetime.now().replace(microsecond=0) if timestamp is None else Validate.parse_date(timestamp)
         self._value = None
         self._measurement_type = measurement_type
@@ -32,7 +36,10 @@ class AbstractDataMeasure(ABC):
 
     @property
     def UID(self) -> str:
-        return self._UID
+        if self._UID is None:
+            # records loaded in bulk get their UID when it is first read
+            self._UID = uuid.uuid4().int
+        return str(uuid.UUID(int=self._UID)) if isinstance(self._UID, int) else self._UID
 
     @property
     def value(self) -> float:
@@ -2,9 +2,10 @@ import uuid
 from metamenth.enumerations import MeasurementUnit
 from metamenth.misc import Validate
 from abc import ABC
+from metamenth.utils import IndexedEntity
 
 
-class AbstractReader(ABC):
+class AbstractReader(IndexedEntity, ABC):
     """
     Abstract representation of meters
 
@@ -3,9 +3,19 @@ from metamenth.enumerations import MeasurementUnit
 from metamenth.enumerations import MeterMeasureMode
 from metamenth.measure_instruments.meter_measure import MeterMeasure
 from metamenth.enumerations import MeterAccumulationFrequency
+from metamenth.enumerations import DataMeasurementType
+from metamenth.enumerations import RollupResolution
+from metamenth.datatypes.rollup_bucket import RollupBucket
 from typing import Dict
+from typing import List
+from typing import Iterator
+from typing import Union
 from metamenth.utils import StructureEntitySearch
 from metamenth.measure_instruments.interfaces.abstract_reader import AbstractReader
+from metamenth.storage.interfaces.abstract_time_series_store import AbstractTimeSeriesStore
+from metamenth.storage.list_time_series_store import ListTimeSeriesStore
+from metamenth.storage.time_series_reader import TimeSeriesReader
+from metamenth.storage.time_series_rollup import TimeSeriesRollup
 
 
 class Meter(AbstractReader):
@@ -35,10 +45,11 @@ class Meter(AbstractReader):
         super().__init__(measurement_unit, meter_location, manufacturer)
         self._measurement_frequency = None
         self._meter_type = None
-        self._meter_measures: [MeterMeasure] = []
+        self._meter_measures: AbstractTimeSeriesStore = ListTimeSeriesStore(MeterMeasure)
         self._measure_mode = None
         self._data_accumulated = data_accumulated
         self._accumulation_frequency = MeterAccumulationFrequency.NONE
+        self._rollup = TimeSeriesRollup(data_accumulated)
 
         # Apply validation
         self.measurement_frequency = measurement_frequency
@@ -76,6 +87,7 @@ class Meter(AbstractReader):
     def data_accumulated(self, value: bool):
         if value is not None:
             self._data_accumulated = value
+            self._rollup.cumulative = value
         else:
             raise ValueError("data_accumulated must be a boolean")
 
@@ -104,13 +116,41 @@ class Meter(AbstractReader):
         else:
             raise ValueError("Meter type must be of type MeterType")
 
+    @property
+    def data_store(self) -> AbstractTimeSeriesStore:
+        return self._meter_measures
+
+    @data_store.setter
+    def data_store(self, value: AbstractTimeSeriesStore):
+        """
+        Replaces the backend holding the measures of this meter, e.g., with a ColumnarTimeSeriesStore.
+        Measures already recorded are moved to the new store
+        """
+        if value is None:
+            raise ValueError('data_store must be of type AbstractTimeSeriesStore')
+        if value is not self._meter_measures:
+            value.add(self._meter_measures.get_records())
+            self._rollup.invalidate()
+        self._meter_measures = value
+
     def get_meter_measures(self, search_terms: Dict = None) -> [MeterMeasure]:
         """
         Search meter recordings by attributes values
         :param search_terms: a dictionary of attributes and their values
         :return [MeterMeasure]:
         """
-        return StructureEntitySearch.search(self._meter_measures, search_terms)
+        return StructureEntitySearch.search(self._meter_measures.get_records(), search_terms)
+
+    def iter_meter_measures(self, search_terms: Dict = None,
+                            limit: int = None, offset: int = 0) -> Iterator[MeterMeasure]:
+        """
+        Yields the meter measures matching search terms one at a time, as get_meter_measures returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of meter measures to yield
+        :param offset: the number of matching meter measures to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._meter_measures.iter_records(), search_terms, limit, offset)
 
     def get_meter_measure_by_date(self, from_timestamp: str, to_timestamp: str = None) -> [MeterMeasure]:
         """
@@ -119,14 +159,81 @@ class Meter(AbstractReader):
         :param to_timestamp: the end timestamp
         :return: [MeterMeasure]
         """
-        return StructureEntitySearch.date_range_search(self._meter_measures, from_timestamp, to_timestamp)
+        from_tp, to_tp = StructureEntitySearch.parse_date_range(from_timestamp, to_timestamp)
+        return self._meter_measures.get_records_by_date(from_tp, to_tp)
+
+    def iter_meter_measure_by_date(self, from_timestamp: str, to_timestamp: str = None, limit: int = None,
+                                   offset: int = 0) -> Iterator[MeterMeasure]:
+        """
+        Yields the meter measures recorded within a time interval, as get_meter_measure_by_date returns them
+        :param from_timestamp: the start timestamp
+        :param to_timestamp: the end timestamp
+        :param limit: the maximum number of meter measures to yield
+        :param offset: the number of meter measures to skip
+        :return:
+        """
+        from_tp, to_tp = StructureEntitySearch.parse_date_range(from_timestamp, to_timestamp)
+        return StructureEntitySearch.paginate(self._meter_measures.iter_records(from_tp, to_tp), limit, offset)
 
     def add_meter_measure(self, meter_measure: MeterMeasure):
         """
         Add measurement for this meter
         :param meter_measure: the recorded measurement by the meter.
         """
-        self._meter_measures.append(meter_measure)
+        self._meter_measures.add([meter_measure])
+        self._rollup.add([meter_measure])
+
+    def add_meter_measure_arrays(self, timestamps, values, timestamp_format: str = None,
+                                 measurement_type: DataMeasurementType = None):
+        """
+        Adds measurements given as columns (e.g., numpy arrays) to this meter,
+        without building a MeterMeasure object for each measurement
+        :param timestamps: the timestamps of the measurements, as strings, datetimes or datetime64 values
+        :param values: the numeric values of the measurements
+        :param timestamp_format: the optional strptime format of timestamp strings
+        :param measurement_type: the type of the measurements, e.g., electricity consumption
+        """
+        timestamps, values = TimeSeriesReader.to_arrays(timestamps, values, timestamp_format)
+        self._meter_measures.add_arrays(timestamps, values, self._measure_tags(measurement_type))
+        self._rollup.add_arrays(timestamps, values)
+
+    def add_meter_measures_from_csv(self, file_path: str, timestamp_column: Union[str, int] = 'timestamp',
+                                    value_column: Union[str, int] = 'value', timestamp_format: str = None,
+                                    delimiter: str = ',', measurement_type: DataMeasurementType = None):
+        """
+        Adds the measurements of a csv file (e.g., a trend log export) to this meter
+        :param file_path: the path of the csv file
+        :param timestamp_column: the name or position of the timestamp column
+        :param value_column: the name or position of the value column
+        :param timestamp_format: the optional strptime format of the timestamps
+        :param delimiter: the column delimiter
+        :param measurement_type: the type of the measurements, e.g., electricity consumption
+        """
+        timestamps, values = TimeSeriesReader.read_csv(file_path, timestamp_column, value_column,
+                                                       timestamp_format, delimiter)
+        self._meter_measures.add_arrays(timestamps, values, self._measure_tags(measurement_type))
+        self._rollup.add_arrays(timestamps, values)
+
+    def get_rollups(self, resolution: RollupResolution, from_timestamp: str = None,
+                    to_timestamp: str = None) -> List[RollupBucket]:
+        """
+        Returns the hourly, daily or monthly aggregates of the measures of this meter, e.g., for
+        monthly energy reports. Accumulated data is aggregated as the consumption between measures
+        :param resolution: the bucket size
+        :param from_timestamp: the start timestamp of the buckets, all the buckets are returned without it
+        :param to_timestamp: the end timestamp of the buckets
+        :return: [RollupBucket]
+        """
+        if not self._rollup.built:
+            self._rollup.rebuild_from_store(self._meter_measures)
+        if from_timestamp is None:
+            return self._rollup.get_buckets(resolution)
+        from_tp, to_tp = StructureEntitySearch.parse_date_range(from_timestamp, to_timestamp)
+        return self._rollup.get_buckets(resolution, from_tp, to_tp)
+
+    @staticmethod
+    def _measure_tags(measurement_type: DataMeasurementType):
+        return {'measurement_type': measurement_type} if measurement_type is not None else None
 
     def __str__(self):
         """
@@ -10,6 +10,7 @@ class MeterMeasure(AbstractDataMeasure):
     Author: Peter Yefi
     Email: peteryefi@gmail.com
     """
+    __slots__ = ()
 
     def __init__(self, value: float, timestamp: str = None, measurement_type: DataMeasurementType = None):
         """
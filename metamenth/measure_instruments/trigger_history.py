@@ -3,6 +3,7 @@ from metamenth.measure_instruments.interfaces.abstract_data_measure import Abstr
 
 
 class TriggerHistory(AbstractDataMeasure):
+    __slots__ = ('trigger_type',)
 
     def __init__(self, trigger_type: TriggerType, value: float = None, timestamp: str = None):
         if value is None:
@@ -1,16 +1,19 @@
 from datetime import datetime
+from uuid import UUID
 from uuid import uuid4
 from metamenth.datatypes.interfaces.abstract_measure import AbstractMeasure
 from metamenth.misc import Validate
 
 
 class WeatherData:
+    __slots__ = ('_UID', '_timestamp', '_data')
+
     def __init__(self, data: AbstractMeasure, timestamp: str = None):
         """
         :param data: The binary measure (value and unit) of the weather data.
 
         """
-        self._UID = str(uuid4())  # Generating a unique identifier
+        self._UID = uuid4().int  # Generating a unique identifier, formatted when read
         self._timestamp = datetime.now().replace(microsecond=0) if timestamp is None else Validate.parse_date(timestamp)
         self._data = None
 
@@ -18,7 +21,10 @@ class WeatherData:
 
     @property
     def UID(self) -> str:
-        return self._UID
+        if self._UID is None:
+            # records loaded in bulk get their UID when it is first read
+            self._UID = uuid4().int
+        return str(UUID(int=self._UID)) if isinstance(self._UID, int) else self._UID
 
     @property
     def data(self) -> AbstractMeasure:
@@ -1,12 +1,20 @@
 from uuid import uuid4
 from metamenth.measure_instruments.weather_data import WeatherData
 from typing import List
+from typing import Iterator
+from typing import Union
 from metamenth.misc import Validate
 from typing import Dict
 from metamenth.utils import StructureEntitySearch
+from metamenth.utils import TimestampIndex
+from metamenth.datatypes.binary_measure import BinaryMeasure
+from metamenth.enumerations import MeasurementUnit
+from metamenth.enumerations import DataMeasurementType
+from metamenth.storage.time_series_reader import TimeSeriesReader
+from metamenth.utils import IndexedEntity
 
 
-class WeatherStation:
+class WeatherStation(IndexedEntity):
     def __init__(self, name: str, location: str = None):
         """
         :param location: The location of the weather station.
@@ -15,6 +23,7 @@ class WeatherStation:
         self._name = None
         self._location = Validate.validate_what3word(location)
         self._weather_data: List[WeatherData] = []
+        self._weather_data_index = TimestampIndex()
 
         self.name = name
 
@@ -47,6 +56,51 @@ class WeatherStation:
         :param weather_data: some weather data recorded for the weather station.
         """
         self._weather_data.extend(weather_data)
+        self._weather_data_index.extend(weather_data)
+
+    def add_weather_data_arrays(self, timestamps, values, measurement_unit: MeasurementUnit,
+                                measure_type: DataMeasurementType = None, timestamp_format: str = None):
+        """
+        Adds weather data given as columns (e.g., numpy arrays) to this WeatherStation. The
+        recordings are built without running the WeatherData and BinaryMeasure constructors
+        :param timestamps: the timestamps of the recordings, as strings, datetimes or datetime64 values
+        :param values: the numeric values of the recordings
+        :param measurement_unit: the unit of the recordings
+        :param measure_type: the type of the recordings, e.g., outside temperature
+        :param timestamp_format: the optional strptime format of timestamp strings
+        """
+        timestamps, values = TimeSeriesReader.to_arrays(timestamps, values, timestamp_format)
+        weather_data = []
+        for timestamp, value in zip(timestamps.tolist(), values.tolist()):
+            measure = BinaryMeasure.__new__(BinaryMeasure)
+            measure.measurement_unit = measurement_unit
+            measure.measure_type = measure_type
+            measure.value = value
+            data = WeatherData.__new__(WeatherData)
+            data._UID = None
+            data._timestamp = timestamp
+            data._data = measure
+            weather_data.append(data)
+        self.add_weather_data(weather_data)
+
+    def add_weather_data_from_csv(self, file_path: str, measurement_unit: MeasurementUnit,
+                                  measure_type: DataMeasurementType = None,
+                                  timestamp_column: Union[str, int] = 'timestamp',
+                                  value_column: Union[str, int] = 'value', timestamp_format: str = None,
+                                  delimiter: str = ','):
+        """
+        Adds the weather data of a csv file to this WeatherStation
+        :param file_path: the path of the csv file
+        :param measurement_unit: the unit of the recordings
+        :param measure_type: the type of the recordings, e.g., outside temperature
+        :param timestamp_column: the name or position of the timestamp column
+        :param value_column: the name or position of the value column
+        :param timestamp_format: the optional strptime format of the timestamps
+        :param delimiter: the column delimiter
+        """
+        timestamps, values = TimeSeriesReader.read_csv(file_path, timestamp_column, value_column,
+                                                       timestamp_format, delimiter)
+        self.add_weather_data_arrays(timestamps, values, measurement_unit, measure_type)
 
     def get_weather_data(self, search_terms: Dict = None) -> [WeatherData]:
         """
@@ -56,6 +110,16 @@ class WeatherStation:
         """
         return StructureEntitySearch.search(self._weather_data, search_terms)
 
+    def iter_weather_data(self, search_terms: Dict = None, limit: int = None, offset: int = 0) -> Iterator[WeatherData]:
+        """
+        Yields the weather data matching search terms one at a time, as get_weather_data returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of weather data to yield
+        :param offset: the number of matching weather data to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._weather_data, search_terms, limit, offset)
+
     def get_weather_data_by_date(self, from_timestamp: str, to_timestamp: str = None) ->[WeatherData]:
         """
         searches weather data based on provided timestamp
@@ -63,7 +127,20 @@ class WeatherStation:
         :param to_timestamp: the end timestamp
         :return: [WeatherData]
         """
-        return StructureEntitySearch.date_range_search(self._weather_data, from_timestamp, to_timestamp)
+        return StructureEntitySearch.date_range_search(self._weather_data_index, from_timestamp, to_timestamp)
+
+    def iter_weather_data_by_date(self, from_timestamp: str, to_timestamp: str = None, limit: int = None,
+                                  offset: int = 0) -> Iterator[WeatherData]:
+        """
+        Yields the weather data recorded within a time interval, as get_weather_data_by_date returns them
+        :param from_timestamp: the start timestamp
+        :param to_timestamp: the end timestamp
+        :param limit: the maximum number of weather data to yield
+        :param offset: the number of weather data to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_date_range(self._weather_data_index, from_timestamp, to_timestamp,
+                                                     limit, offset)
 
     def __eq__(self, other):
         # Weather stations are equal if they share the same name
@@ -24,22 +24,62 @@ class StateTrackDecorator:
         :return:
         """
         try:
-            if getattr(instance, 'track_state'):
-                variable_name = self.func.__name__
-
-                index = variable_name.find('_')
-                # for methods such as add_room, add_open_space, remove "remove" and "add"
-                if variable_name[:3] == 'add' or variable_name[:6] == 'remove':
-                    variable_name = variable_name[index+1:]
-
-                # check if after removing add and remove prefix, the resulting output is a class instance
-                # variable. If not add s to the resulting variable
-                if not hasattr(instance, variable_name) and variable_name[-1] != 's':
-                    variable_name = variable_name + 's'
-
-                instance.notify_observers(ObservableMessage(
-                    instance.__class__.__name__,
-                    instance.UID, {variable_name: getattr(instance, '_' + variable_name)}))
+            if not getattr(instance, 'track_state'):
+                return self.func(instance, *args, **kwargs)
+            variable_name = self.func.__name__
+
+            index = variable_name.find('_')
+            # for methods such as add_room, add_open_space, remove "remove" and "add"
+            if variable_name[:3] == 'add' or variable_name[:6] == 'remove':
+                variable_name = variable_name[index+1:]
+
+            # check if after removing add and remove prefix, the resulting output is a class instance
+            # variable. If not add s to the resulting variable
+            if not hasattr(instance, variable_name) and variable_name[-1] != 's':
+                variable_name = variable_name + 's'
+
+            operation = 'set'
+            if self.func.__name__[:3] == 'add':
+                operation = 'add'
+            elif self.func.__name__[:6] == 'remove':
+                operation = 'remove'
+
+            before = getattr(instance, '_' + variable_name)
+            # the state before the change is captured now, observers are notified once the change succeeds
+            message = instance.capture_message(ObservableMessage(
+                instance.__class__.__name__,
+                instance.UID, {variable_name: before}, operation=operation))
         except AttributeError as err:
             print(err, file=sys.stderr)
-        return self.func(instance, *args, **kwargs)
+            return self.func(instance, *args, **kwargs)
+
+        # imported here, metamenth.utils imports this package
+        from metamenth.utils.entity_list import EntityList
+        version = before.version if isinstance(before, EntityList) else None
+        length = len(before) if isinstance(before, list) else None
+        result = self.func(instance, *args, **kwargs)
+        after = getattr(instance, '_' + variable_name)
+        if operation == 'set':
+            message.value = after
+        else:
+            message.value = StateTrackDecorator._changed_entities(operation, before, after, version, length,
+                                                                  args, kwargs)
+        instance.notify_observers(message)
+        return result
+
+    @staticmethod
+    def _changed_entities(operation: str, before, after, version: int, length: int, args, kwargs) -> list:
+        """
+        Returns the entities added to or removed from a tracked list by a method
+        """
+        if length is None or after is not before:
+            return []
+        if operation == 'add':
+            changes = after.changes_since(version) if version is not None else None
+            if changes is not None and changes[0] == 'add':
+                return list(changes[1])
+            return list(after[length:]) if len(after) > length else []
+        if len(after) < length:
+            # the entity given to remove, or the entity equal to it that was removed
+            return [args[0] if args else next(iter(kwargs.values()), None)]
+        return []
@@ -1,3 +1,4 @@
+import re
 from typing import Dict
 from metamenth.enumerations import SensorMeasure
 from metamenth.enumerations import MeasurementUnit
@@ -7,6 +8,10 @@ from metamenth.enumerations import EngineSubType
 from typing import List
 from typing import Any
 from metamenth.enumerations import RoomType
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class Validate:
@@ -57,6 +62,26 @@ class Validate:
         if none_variables:
             raise ValueError("{0} is/are mandatory".format(none_variables.rstrip()))
 
+    # the formats accepted by parse_date, in the order they are tried
+    DATE_FORMATS = [
+        '%Y-%m-%d %H:%M',
+        '%Y-%m-%d',
+        '%Y/%m/%d %H:%M:%S.%f',
+        '%y/%m/%d %H:%M:%S.%f',
+        '%Y/%m/%d %H:%M:%S',
+        '%Y/%m/%d %H:%M',
+        '%Y/%m/%d',
+        '%m/%d/%Y %H:%M',
+        '%Y-%m-%d %H:%M:%S.%f',
+        '%Y-%m-%d %H:%M:%S'
+    ]
+
+    # fixed width YYYY-MM-DD[ HH:MM[:SS[.ffffff]]] strings, parsed without strptime
+    _ISO_DATE = re.compile(r'(\d{4})-(\d{2})-(\d{2})(?: (\d{2}):(\d{2})(?::(\d{2})(?:\.\d{1,6})?)?)?')
+
+    # the last format that matched a string not handled by the fixed width parser
+    _last_date_format = None
+
     @staticmethod
     def parse_date(date_string):
         """
@@ -64,26 +89,102 @@ class Validate:
         :param date_string: the data string
         :return:
         """
-        formats = [
-            '%Y-%m-%d %H:%M',
-            '%Y-%m-%d',
-            '%Y/%m/%d %H:%M:%S.%f',
-            '%y/%m/%d %H:%M:%S.%f',
-            '%Y/%m/%d %H:%M:%S',
-            '%Y/%m/%d %H:%M',
-            '%Y/%m/%d',
-            '%m/%d/%Y %H:%M',
-            '%Y-%m-%d %H:%M:%S.%f',
-            '%Y-%m-%d %H:%M:%S'
-        ]
-        for fmt in formats:
+        match = Validate._ISO_DATE.fullmatch(date_string)
+        if match:
+            try:
+                return datetime(*(int(field) for field in match.groups(0)))
+            except ValueError:
+                pass
+        last_format = Validate._last_date_format
+        if last_format is not None:
+            try:
+                return datetime.strptime(date_string, last_format).replace(microsecond=0)
+            except ValueError:
+                pass
+        for fmt in Validate.DATE_FORMATS:
+            if fmt == last_format:
+                continue
             try:
                 dt = datetime.strptime(date_string, fmt)
+                # streams of readings usually share a format, it is tried first next time
+                Validate._last_date_format = fmt
                 return dt.replace(microsecond=0)  # Truncate milliseconds
-            except ValueError as err:
+            except ValueError:
                 pass
         raise ValueError("No valid date format found")
 
+    @staticmethod
+    def parse_dates(date_strings, date_format: str = None) -> 'np.ndarray':
+        """
+        Parses a batch of dates into a datetime64[s] array. Without a date format, ISO 8601 strings
+        are parsed by numpy, and the format of other strings is detected once and used for
+        the whole batch, falling back to parse_date for strings in other formats
+        :param date_strings: the date strings (datetimes and datetime64 values are also accepted)
+        :param date_format: the optional strptime format of the strings
+        :return: the dates truncated to seconds
+        """
+        # imported here, validation of single values is used where numpy is not needed
+        import numpy as np
+        dates = np.asarray(date_strings)
+        if np.issubdtype(dates.dtype, np.datetime64):
+            return dates.astype('datetime64[s]')
+        if dates.size == 0:
+            return np.empty(dates.shape, dtype='datetime64[s]')
+        # parse each distinct string once, trend logs often repeat timestamps across points
+        if date_format is not None:
+            distinct, positions = np.unique(dates.astype(str), return_inverse=True)
+            parsed = [datetime.strptime(date_string, date_format).replace(microsecond=0)
+                      for date_string in distinct.tolist()]
+            return np.array(parsed, dtype='datetime64[s]')[positions.reshape(dates.shape)]
+        # numpy also parses partial dates (e.g., 2024-01), only complete dates are left to it
+        if Validate._iso_shaped(dates):
+            try:
+                return dates.astype('datetime64[us]').astype('datetime64[s]')
+            except (TypeError, ValueError):
+                pass
+        distinct, positions = np.unique(dates.astype(str), return_inverse=True)
+        detected_format = Validate._detect_date_format(str(distinct[0]))
+        parsed = []
+        for date_string in distinct.tolist():
+            try:
+                parsed.append(datetime.strptime(date_string, detected_format).replace(microsecond=0))
+            except (TypeError, ValueError):
+                parsed.append(Validate.parse_date(date_string))
+        return np.array(parsed, dtype='datetime64[s]')[positions.reshape(dates.shape)]
+
+    @staticmethod
+    def _iso_shaped(dates: 'np.ndarray') -> bool:
+        """
+        Returns whether all the strings of an array have the YYYY-MM-DD[ HH:MM[:SS[.ffffff]]] shape,
+        with a space or a T before the time
+        """
+        import numpy as np
+        if dates.dtype.kind != 'U' or dates.dtype.itemsize // 4 > 26:
+            return False
+        lengths = np.char.str_len(dates).ravel()
+        characters = dates.astype('U26').ravel().view(np.uint32).reshape(-1, 26)
+        with_time = lengths > 10
+        with_fraction = lengths > 19
+        return bool(np.isin(lengths, (10, 16, 19, 21, 22, 23, 24, 25, 26)).all()
+                    and (characters[:, 4] == ord('-')).all() and (characters[:, 7] == ord('-')).all()
+                    and np.isin(characters[with_time, 10], (ord(' '), ord('T'))).all()
+                    and (characters[with_time, 13] == ord(':')).all()
+                    and (characters[lengths > 16, 16] == ord(':')).all()
+                    and (characters[with_fraction, 19] == ord('.')).all())
+
+    @staticmethod
+    def _detect_date_format(date_string: str):
+        """
+        Returns the first of the accepted formats that parses a date string, or None
+        """
+        for fmt in Validate.DATE_FORMATS:
+            try:
+                datetime.strptime(date_string, fmt)
+                return fmt
+            except ValueError:
+                pass
+        return None
+
     @staticmethod
     def validate_sensor_type(sensor_measure: str, unit: str) -> bool:
         """
@@ -1,5 +1,6 @@
 from abc import ABC
 from abc import abstractmethod
+from typing import List
 from metamenth.datatypes.observable_message import ObservableMessage
 
 
@@ -17,3 +18,12 @@ class Observer(ABC):
         :return:
         """
         pass
+
+    def log_states(self, messages: List[ObservableMessage]):
+        """
+        logs a batch of states, e.g., delivered by a QueuedObserverDispatcher
+        :param messages: the messages, in the order they were sent
+        :return:
+        """
+        for message in messages:
+            self.log_state(message)
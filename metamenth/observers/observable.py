@@ -1,3 +1,4 @@
+from dataclasses import replace
 from metamenth.datatypes.observable_message import ObservableMessage
 
 
@@ -8,6 +9,19 @@ class Observable:
     """
     def __init__(self):
         self._observers = []
+        self._dispatcher = None
+
+    @property
+    def dispatcher(self):
+        return self._dispatcher
+
+    @dispatcher.setter
+    def dispatcher(self, value):
+        """
+        :param value: a QueuedObserverDispatcher delivering the messages to observers
+        on a background thread, or None to notify observers synchronously
+        """
+        self._dispatcher = value
 
     def add_observer(self, observer):
         self._observers.append(observer)
@@ -15,6 +29,29 @@ class Observable:
     def remove_observer(self, observer):
         self._observers.remove(observer)
 
+    def capture_message(self, message: ObservableMessage) -> ObservableMessage:
+        """
+        Captures the state of a message before the change it reports is made, as observers are
+        given it once the change succeeds: lists (e.g., the floors of a building) are copied,
+        or captured as changes by the dispatcher
+        :param message: the message, with the tracked attributes as they are before the change
+        """
+        if not self._observers:
+            return message
+        if self._dispatcher is not None:
+            return self._dispatcher.capture(message)
+        return replace(message, state={attribute: list(value) if isinstance(value, list) else value
+                                       for attribute, value in message.state.items()})
+
     def notify_observers(self, message: ObservableMessage):
+        if self._dispatcher is not None:
+            self._dispatcher.dispatch(message, self._observers)
+            return
         for observer in self._observers:
             observer.log_state(message)
+
+    def __getstate__(self):
+        # dispatchers own a thread and are not copied with the entity
+        state = self.__dict__.copy()
+        state['_dispatcher'] = None
+        return state
@@ -0,0 +1,230 @@
+import asyncio
+import queue
+import sys
+import threading
+import weakref
+from dataclasses import replace
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+from metamenth.datatypes.observable_message import ObservableMessage
+from metamenth.observers.interfaces.observer import Observer
+from metamenth.utils import EntityList
+
+# tells the dispatch thread to stop
+_CLOSE = object()
+
+
+class _ListState:
+    """
+    The value of a list state of a queued message, as the changes to make to the copy of
+    the list kept by the dispatch thread: ('add', appended entities), ('remove', position)
+    or ('copy', the entities), with the list versions of the copy before and after the changes
+    """
+
+    __slots__ = ('key', 'change', 'entities', 'base', 'version')
+
+    def __init__(self, key: tuple, change: str, entities: Any, base: tuple = None, version: tuple = None):
+        self.key = key
+        self.change = change
+        self.entities = entities
+        self.base = base
+        self.version = version
+
+
+class QueuedObserverDispatcher:
+    """
+    Delivers the messages of observable entities (e.g., buildings tracking their state)
+    to their observers on a background thread, in batches, instead of calling every
+    observer from the tracked setter or add method.
+
+    Messages wait on a bounded queue: when it is full, notifying blocks until the
+    observers catch up (backpressure), or raises queue.Full after put_timeout.
+    The state of a message is captured when it is queued. Entity lists (e.g., the floors
+    of a building) are not copied by the caller: the dispatch thread keeps a copy of each
+    list, and a message only carries the entities added or the position removed since the
+    previous message of the list. Other lists, and entity lists changed in other ways,
+    are copied shallowly.
+
+    Once the dispatcher is closed, tracked changes are refused before they are made: capture
+    raises a ValueError. Messages captured before the dispatcher was closed are dropped.
+    """
+
+    def __init__(self, max_queue_size: int = 10000, batch_size: int = 500, put_timeout: float = None):
+        """
+        :param max_queue_size: the number of messages that can wait for observers
+        :param batch_size: the maximum number of messages given to an observer at once
+        :param put_timeout: seconds to wait for room in a full queue, None to wait as long as needed
+        """
+        if max_queue_size <= 0 or batch_size <= 0:
+            raise ValueError('max_queue_size and batch_size must be positive integers')
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._batch_size = batch_size
+        self._put_timeout = put_timeout
+        self._closed = False
+        # serializes queuing and closing, so no message is queued after the dispatch thread is told to stop
+        self._lock = threading.Lock()
+        # the list version each list state was queued with, and the copies kept by the dispatch thread,
+        # per (entity type, entity id, attribute)
+        self._versions: Dict[tuple, tuple] = {}
+        self._copies: Dict[tuple, list] = {}
+        self._thread = threading.Thread(target=self._dispatch_batches, name='observer-dispatcher', daemon=True)
+        self._thread.start()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def pending(self) -> int:
+        """
+        The approximate number of messages not yet given to observers
+        """
+        return self._queue.qsize()
+
+    def capture(self, message: ObservableMessage) -> ObservableMessage:
+        """
+        Captures the state of a message before the change it reports is made (e.g., the floors of
+        a building before a floor is added), to queue the message with dispatch() once the change succeeds
+        :param message: the message
+        :return: the message with the state as it is queued
+        """
+        with self._lock:
+            if self._closed:
+                raise ValueError('observer dispatcher is closed')
+            return replace(message, state={
+                attribute: self._capture((message.entity_type, message.entity_id, attribute), value)
+                for attribute, value in message.state.items()})
+
+    def dispatch(self, message: ObservableMessage, observers: List[Observer]):
+        """
+        Queues a message for observers
+        :param message: the message, captured or not
+        :param observers: the observers of the entity sending the message
+        """
+        with self._lock:
+            if self._closed:
+                # the change reported by the message is made, it cannot be refused anymore
+                print(f'observer dispatcher is closed, the message of {message.entity_type} '
+                      f'{message.entity_id} is dropped', file=sys.stderr)
+                return
+            if not observers:
+                return
+            state = {}
+            for attribute, value in message.state.items():
+                key = (message.entity_type, message.entity_id, attribute)
+                if not isinstance(value, _ListState):
+                    value = self._capture(key, value)
+                elif value.base is not None and self._versions.get(key) is not value.base:
+                    # another message of the list was queued since the state was captured
+                    entities = value.version[0]()
+                    value = self._capture(key, entities if entities is not None else [])
+                state[attribute] = value
+            self._queue.put((tuple(observers), replace(message, state=state)), timeout=self._put_timeout)
+            # the copies of the dispatch thread will match these versions once the message is delivered
+            for value in state.values():
+                if isinstance(value, _ListState):
+                    if value.version is not None:
+                        self._versions[value.key] = value.version
+                    else:
+                        self._versions.pop(value.key, None)
+
+    def flush(self):
+        """
+        Waits until every queued message has been given to its observers
+        """
+        self._queue.join()
+
+    async def flush_async(self):
+        """
+        Waits, without blocking the event loop, until every queued message has been given to its observers
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self.flush)
+
+    def close(self):
+        """
+        Delivers the queued messages and stops the dispatch thread
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_CLOSE)
+        self._thread.join()
+        self._versions = {}
+        self._copies = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _capture(self, key: tuple, value):
+        """
+        Returns the queued value of a state: the changes made to an entity list since its previous message,
+        a copy of other lists, or the value itself
+        """
+        if not isinstance(value, list):
+            return value
+        if not isinstance(value, EntityList):
+            return _ListState(key, 'copy', list(value))
+        version = (weakref.ref(value), value.version)
+        base = self._versions.get(key)
+        if base is not None and base[0]() is value:
+            changes = value.changes_since(base[1])
+            if changes is not None:
+                return _ListState(key, changes[0], changes[1], base, version)
+        return _ListState(key, 'copy', list(value), None, version)
+
+    def _restore(self, message: ObservableMessage) -> ObservableMessage:
+        """
+        Returns a message with the list states rebuilt from the copies of the dispatch thread
+        """
+        if not any(isinstance(value, _ListState) for value in message.state.values()):
+            return message
+        state = {}
+        for attribute, value in message.state.items():
+            if isinstance(value, _ListState):
+                if value.change == 'copy':
+                    self._copies[value.key] = value.entities
+                elif value.change == 'add':
+                    self._copies[value.key].extend(value.entities)
+                else:
+                    del self._copies[value.key][value.entities]
+                value = list(self._copies[value.key])
+            state[attribute] = value
+        return replace(message, state=state)
+
+    def _dispatch_batches(self):
+        while True:
+            items = [self._queue.get()]
+            while len(items) < self._batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            closing = any(item is _CLOSE for item in items)
+            self._deliver([(observers, self._restore(message)) for observers, message in
+                           (item for item in items if item is not _CLOSE)])
+            for _ in items:
+                self._queue.task_done()
+            if closing:
+                return
+
+    @staticmethod
+    def _deliver(items: List[Tuple[tuple, ObservableMessage]]):
+        """
+        Gives each observer its messages, in queuing order
+        """
+        batches = {}
+        for observers, message in items:
+            for observer in observers:
+                batches.setdefault(id(observer), (observer, []))[1].append(message)
+        for observer, messages in batches.values():
+            try:
+                observer.log_states(messages)
+            except Exception as err:
+                # an observer failing must not stop the delivery to other observers
+                print(err, file=sys.stderr)
@@ -0,0 +1,144 @@
+from bisect import bisect_right
+from datetime import datetime
+from typing import Any
+from typing import Dict
+from typing import List
+from metamenth.observers.interfaces.observer import Observer
+from metamenth.datatypes.observable_message import ObservableMessage
+from metamenth.datatypes.state_change import StateChange
+
+
+class StructureStateChangeJournal(Observer):
+    """
+    State logger for structure entities that keeps an append-only journal of changes
+    (e.g., a weather station added to a building) instead of a copy of the changed
+    state for every change, as StructureStateChangeLogger does. The state of the tracked
+    entities at any point of the journal is rebuilt by replaying the changes from the
+    closest checkpoint, which is taken every checkpoint_interval changes.
+
+    Values are recorded by reference: entities added to a list are not copied. Observable
+    entities notify their observers once a change succeeds, so changes rejected by a setter
+    (e.g., a building floor area set to None) are not journaled.
+    """
+
+    def __init__(self, checkpoint_interval: int = 1000):
+        """
+        :param checkpoint_interval: the number of changes between checkpoints, None to only take
+        checkpoints when checkpoint() is called
+        """
+        if checkpoint_interval is not None and checkpoint_interval <= 0:
+            raise ValueError('checkpoint_interval must be a positive integer')
+        self._checkpoint_interval = checkpoint_interval
+        self._changes: List[StateChange] = []
+        self._timestamps: List[datetime] = []
+        # the current state of the tracked attributes, per (entity type, entity id)
+        self._state: Dict[tuple, Dict[str, Any]] = {}
+        # (number of changes, state) pairs
+        self._checkpoints: List[tuple] = [(0, {})]
+
+    @property
+    def changes(self) -> List[StateChange]:
+        return list(self._changes)
+
+    @property
+    def checkpoints(self) -> List[int]:
+        """
+        The number of changes recorded when each checkpoint was taken
+        """
+        return [sequence for sequence, _ in self._checkpoints]
+
+    def log_state(self, message: ObservableMessage):
+        entity = (message.entity_type, message.entity_id)
+        for attribute, current_value in message.state.items():
+            if attribute not in self._state.get(entity, {}):
+                # the first change of an attribute records its value before the change
+                self._record(message, 'initial', attribute, None, StructureStateChangeJournal._copy(current_value))
+
+            if message.operation == 'add':
+                for added in message.value or []:
+                    self._record(message, 'add', attribute, None, added)
+            elif message.operation == 'remove':
+                for removed in message.value or []:
+                    self._record(message, 'remove', attribute, removed, None)
+            else:
+                self._record(message, 'set', attribute, current_value, message.value)
+
+    def checkpoint(self) -> int:
+        """
+        Takes a checkpoint of the current state
+        :return: the number of changes recorded at the checkpoint
+        """
+        if self._checkpoints[-1][0] != len(self._changes):
+            self._checkpoints.append((len(self._changes), StructureStateChangeJournal._copy_state(self._state)))
+        return len(self._changes)
+
+    def state_at(self, sequence: int = None, timestamp: datetime = None) -> Dict[tuple, Dict[str, Any]]:
+        """
+        Rebuilds the state of the tracked entities after some changes
+        :param sequence: the number of changes to replay, defaults to all the changes
+        :param timestamp: replays the changes made up to this time instead
+        :return: the tracked attributes, per (entity type, entity id)
+        """
+        if timestamp is not None:
+            sequence = bisect_right(self._timestamps, timestamp)
+        elif sequence is None:
+            sequence = len(self._changes)
+        if sequence < 0 or sequence > len(self._changes):
+            raise ValueError(f'sequence must be between 0 and {len(self._changes)}')
+
+        position = bisect_right([checkpoint_sequence for checkpoint_sequence, _ in self._checkpoints], sequence) - 1
+        checkpoint_sequence, checkpoint_state = self._checkpoints[position]
+        state = StructureStateChangeJournal._copy_state(checkpoint_state)
+        for change in self._changes[checkpoint_sequence:sequence]:
+            StructureStateChangeJournal._apply(state, change)
+        return state
+
+    def entity_state(self, entity_id: str, sequence: int = None, timestamp: datetime = None) -> Dict[str, Any]:
+        """
+        Rebuilds the state of a tracked entity after some changes
+        :param entity_id: the UID of the entity
+        :param sequence: the number of changes to replay, defaults to all the changes
+        :param timestamp: replays the changes made up to this time instead
+        :return: the tracked attributes of the entity
+        """
+        for (_, state_entity_id), attributes in self.state_at(sequence, timestamp).items():
+            if state_entity_id == entity_id:
+                return attributes
+        return {}
+
+    def _record(self, message: ObservableMessage, operation: str, attribute: str, old_value, new_value):
+        change = StateChange(len(self._changes), message.timestamp, operation, message.entity_type,
+                             message.entity_id, attribute, old_value, new_value)
+        self._changes.append(change)
+        # messages delivered out of order keep the timestamps sorted for lookups
+        self._timestamps.append(max(message.timestamp, self._timestamps[-1]) if self._timestamps
+                                else message.timestamp)
+        StructureStateChangeJournal._apply(self._state, change)
+        if self._checkpoint_interval and len(self._changes) - self._checkpoints[-1][0] >= self._checkpoint_interval:
+            self.checkpoint()
+
+    @staticmethod
+    def _apply(state: Dict[tuple, Dict[str, Any]], change: StateChange):
+        attributes = state.setdefault((change.entity_type, change.entity_id), {})
+        if change.operation in ('initial', 'set'):
+            attributes[change.attribute] = StructureStateChangeJournal._copy(change.new_value)
+        elif change.operation == 'add':
+            attributes.setdefault(change.attribute, []).append(change.new_value)
+        elif change.operation == 'remove':
+            values = attributes.get(change.attribute, [])
+            for position, value in enumerate(values):
+                if value is change.old_value:
+                    del values[position]
+                    return
+            if change.old_value in values:
+                # removed with an equal entity, e.g., a weather station with the same name
+                values.remove(change.old_value)
+
+    @staticmethod
+    def _copy(value):
+        return list(value) if isinstance(value, list) else value
+
+    @staticmethod
+    def _copy_state(state: Dict[tuple, Dict[str, Any]]) -> Dict[tuple, Dict[str, Any]]:
+        return {entity: {attribute: StructureStateChangeJournal._copy(value) for attribute, value in attributes.items()}
+                for entity, attributes in state.items()}
@@ -1,6 +1,8 @@
 from metamenth.observers.interfaces.observer import Observer
 from metamenth.datatypes.observable_message import ObservableMessage
 from dataclasses import asdict
+from dataclasses import replace
+from typing import List
 
 
 class StructureStateChangeLogger(Observer):
@@ -12,7 +14,17 @@ class StructureStateChangeLogger(Observer):
         self._state_log: [ObservableMessage] = []
 
     def log_state(self, message: ObservableMessage):
-        self._state_log.append(asdict(message))
+        self._state_log.append(StructureStateChangeLogger._log_entry(message))
+
+    def log_states(self, messages: List[ObservableMessage]):
+        self._state_log.extend(StructureStateChangeLogger._log_entry(message) for message in messages)
+
+    @staticmethod
+    def _log_entry(message: ObservableMessage) -> dict:
+        # the state is copied, the changed value (e.g., an added floor and its rooms) is not
+        entry = asdict(replace(message, value=None))
+        del entry['value']
+        return entry
 
     @property
     def state_log(self):
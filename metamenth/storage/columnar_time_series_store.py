@@ -0,0 +1,341 @@
+from datetime import datetime
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+from uuid import UUID
+from uuid import uuid4
+import numpy as np
+from metamenth.storage.interfaces.abstract_time_series_store import AbstractTimeSeriesStore
+from metamenth.measure_instruments.interfaces.abstract_data_measure import AbstractDataMeasure
+from metamenth.measure_instruments.sensor_data import SensorData
+
+# the low bits of derived UIDs hold the sequence number of the row in its store
+_ROW_BITS = 48
+_ROW_MASK = (1 << _ROW_BITS) - 1
+
+
+class _Chunk:
+    """
+    A fixed capacity block of the columns of a columnar store
+    """
+
+    def __init__(self, capacity: int, tag_attributes: List[str], first_row: int):
+        self.size = 0
+        # the sequence number of the first row added to this chunk, and the number of rows added to it
+        self.first_row = first_row
+        self.added = 0
+        # the offsets (from first_row) of the rows, only kept once a row is deleted
+        self.offsets: np.ndarray = None
+        # whether the rows of this chunk are in timestamp order
+        self.sorted = True
+        self.timestamps = np.empty(capacity, dtype='datetime64[s]')
+        self.values = np.empty(capacity, dtype=np.float64)
+        self.tags = {attribute: np.empty(capacity, dtype=np.int32) for attribute in tag_attributes}
+        # uids kept for rows of this chunk (keep_uids), keyed by their offset
+        self.uids: Dict[int, str] = {}
+
+    @property
+    def capacity(self) -> int:
+        return len(self.values)
+
+    def offset(self, position: int) -> int:
+        """
+        Returns the offset from first_row of the row at a position
+        """
+        return position if self.offsets is None else int(self.offsets[position])
+
+    def position(self, offset: int):
+        """
+        Returns the position of the row at an offset, or None if the row was deleted
+        """
+        if self.offsets is None:
+            return offset if 0 <= offset < self.size else None
+        position = int(np.searchsorted(self.offsets[:self.size], offset))
+        return position if position < self.size and self.offsets[position] == offset else None
+
+    def append_offsets(self, count: int):
+        """
+        Records the offsets of rows appended after a row was deleted
+        """
+        if self.offsets is not None:
+            self.offsets[self.size:self.size + count] = np.arange(self.added, self.added + count)
+        self.added += count
+
+    def delete(self, position: int):
+        """
+        Removes the row at the given position, shifting the rows after it
+        :param position: the position of the row in the chunk
+        """
+        if self.offsets is None:
+            self.offsets = np.arange(self.capacity, dtype=np.int64)
+        end = self.size
+        self.uids.pop(int(self.offsets[position]), None)
+        self.timestamps[position:end - 1] = self.timestamps[position + 1:end]
+        self.values[position:end - 1] = self.values[position + 1:end]
+        self.offsets[position:end - 1] = self.offsets[position + 1:end]
+        for column in self.tags.values():
+            column[position:end - 1] = column[position + 1:end]
+        self.size -= 1
+
+
+class ColumnarTimeSeriesStore(AbstractTimeSeriesStore):
+    """
+    A compact time series store. Timestamps are kept as datetime64[s] and values as float64
+    in growable chunks of numpy arrays. Record objects are only built when they are read.
+
+    Unless UIDs are kept, the UID of a record is derived from the store and the sequence number
+    of the row, so reading records again gives the same UIDs without keeping them.
+    """
+
+    def __init__(self, record_type: type = SensorData, chunk_size: int = 4096, keep_uids: bool = False,
+                 tag_attributes: List[str] = None):
+        """
+        :param record_type: the type of the records built when reading, e.g., SensorData, TriggerHistory
+        :param chunk_size: the number of rows held by each chunk
+        :param keep_uids: if True, the UIDs of added records are kept, otherwise UIDs are
+        derived from the position of the records in the store
+        :param tag_attributes: attributes other than the value and timestamp that should be kept,
+        e.g., trigger_type for TriggerHistory. Their values are dictionary encoded
+        """
+        if chunk_size is None or chunk_size <= 0:
+            raise ValueError('chunk_size must be a positive integer')
+        self._record_type = record_type
+        self._chunk_size = chunk_size
+        self._keep_uids = keep_uids
+        self._tag_attributes = list(tag_attributes) if tag_attributes else []
+        self._tag_codes: Dict[str, Dict] = {attribute: {} for attribute in self._tag_attributes}
+        self._tag_values: Dict[str, List] = {attribute: [] for attribute in self._tag_attributes}
+        self._chunks: List[_Chunk] = []
+        self._size = 0
+        # derived UIDs share the high bits of a random UID, their low bits are row sequence numbers
+        self._uid_base = uuid4().int & ~_ROW_MASK
+        self._next_row = 0
+
+    @property
+    def record_type(self) -> type:
+        return self._record_type
+
+    @property
+    def chunk_size(self) -> int:
+        return self._chunk_size
+
+    def add(self, records: List[AbstractDataMeasure]):
+        for record in records:
+            chunk = self._writable_chunk()
+            position = chunk.size
+            timestamp = np.datetime64(record.timestamp, 's')
+            if position > 0 and timestamp < chunk.timestamps[position - 1]:
+                chunk.sorted = False
+            chunk.timestamps[position] = timestamp
+            try:
+                chunk.values[position] = float(record.value)
+            except (TypeError, ValueError):
+                raise ValueError(f'{record.value} is not numeric and cannot be kept in a columnar store')
+            for attribute in self._tag_attributes:
+                chunk.tags[attribute][position] = self._encode_tag(attribute, getattr(record, attribute, None))
+            if self._keep_uids:
+                chunk.uids[chunk.added] = record.UID
+            chunk.append_offsets(1)
+            chunk.size += 1
+            self._size += 1
+            self._next_row += 1
+
+    def add_arrays(self, timestamps: np.ndarray, values: np.ndarray, tags: Dict[str, Any] = None):
+        timestamps, values = self._as_arrays(timestamps, values)
+        size = len(values)
+        codes = {}
+        for attribute in self._tag_attributes:
+            tag = (tags or {}).get(attribute)
+            if isinstance(tag, (list, tuple, np.ndarray)):
+                if len(tag) != size:
+                    raise ValueError(f'{attribute} must have one value per record')
+                codes[attribute] = np.fromiter((self._encode_tag(attribute, value) for value in tag),
+                                               dtype=np.int32, count=size)
+            else:
+                codes[attribute] = np.full(size, self._encode_tag(attribute, tag), dtype=np.int32)
+        start = 0
+        while start < size:
+            chunk = self._writable_chunk()
+            count = min(chunk.capacity - chunk.size, size - start)
+            block = timestamps[start:start + count]
+            if chunk.sorted and ((chunk.size > 0 and block[0] < chunk.timestamps[chunk.size - 1]) or
+                                 np.any(block[1:] < block[:-1])):
+                chunk.sorted = False
+            end = chunk.size + count
+            chunk.timestamps[chunk.size:end] = block
+            chunk.values[chunk.size:end] = values[start:start + count]
+            for attribute, column in codes.items():
+                chunk.tags[attribute][chunk.size:end] = column[start:start + count]
+            chunk.append_offsets(count)
+            chunk.size = end
+            start += count
+            self._next_row += count
+        self._size += size
+
+    def remove(self, record: AbstractDataMeasure):
+        location = self._locate(record)
+        if location is None:
+            raise ValueError(f'{record} is not in the store')
+        chunk, position = location
+        chunk.delete(position)
+        self._size -= 1
+        if chunk.size == 0 and chunk is not self._chunks[-1]:
+            self._chunks.remove(chunk)
+
+    def get_records(self) -> List[AbstractDataMeasure]:
+        return [self._build_record(chunk, position) for chunk in self._chunks for position in range(chunk.size)]
+
+    def get_records_by_date(self, from_timestamp: datetime, to_timestamp: datetime) -> List[AbstractDataMeasure]:
+        records = []
+        for chunk, positions in self._positions_in_range(from_timestamp, to_timestamp):
+            records.extend(self._build_record(chunk, position) for position in positions)
+        return records
+
+    def iter_records(self, from_timestamp: datetime = None,
+                     to_timestamp: datetime = None) -> Iterator[AbstractDataMeasure]:
+        # records are built as they are consumed, so paging through a store does not build all of them
+        if from_timestamp is None and to_timestamp is None:
+            for chunk in self._chunks:
+                for position in range(chunk.size):
+                    yield self._build_record(chunk, position)
+            return
+        for chunk, positions in self._positions_in_range(from_timestamp or datetime.min, to_timestamp or datetime.max):
+            for position in positions:
+                yield self._build_record(chunk, position)
+
+    def get_arrays(self, from_timestamp: datetime = None,
+                   to_timestamp: datetime = None) -> Tuple[np.ndarray, np.ndarray]:
+        if not self._chunks:
+            return np.empty(0, dtype='datetime64[s]'), np.empty(0, dtype=np.float64)
+        if from_timestamp is None and to_timestamp is None:
+            return (np.concatenate([chunk.timestamps[:chunk.size] for chunk in self._chunks]),
+                    np.concatenate([chunk.values[:chunk.size] for chunk in self._chunks]))
+        selection = self._positions_in_range(from_timestamp or datetime.min, to_timestamp or datetime.max)
+        if not selection:
+            return np.empty(0, dtype='datetime64[s]'), np.empty(0, dtype=np.float64)
+        return (np.concatenate([chunk.timestamps[positions] for chunk, positions in selection]),
+                np.concatenate([chunk.values[positions] for chunk, positions in selection]))
+
+    def get_value_before(self, timestamp: datetime) -> Optional[float]:
+        reading = self._reading_before(np.datetime64(timestamp, 's'))
+        return None if reading is None else reading[1]
+
+    def __len__(self):
+        return self._size
+
+    def _writable_chunk(self) -> _Chunk:
+        if not self._chunks or self._chunks[-1].size == self._chunks[-1].capacity:
+            self._chunks.append(_Chunk(self._chunk_size, self._tag_attributes, self._next_row))
+        return self._chunks[-1]
+
+    def _encode_tag(self, attribute: str, value) -> int:
+        codes = self._tag_codes[attribute]
+        if value not in codes:
+            codes[value] = len(self._tag_values[attribute])
+            self._tag_values[attribute].append(value)
+        return codes[value]
+
+    def _positions_in_range(self, from_timestamp: datetime, to_timestamp: datetime):
+        """
+        Returns (chunk, positions) pairs for rows whose timestamp is within the interval.
+        Chunks in timestamp order are searched with binary search, the others are scanned
+        """
+        start = np.datetime64(from_timestamp, 's')
+        end = np.datetime64(to_timestamp, 's')
+        selection = []
+        for chunk in self._chunks:
+            timestamps = chunk.timestamps[:chunk.size]
+            if chunk.sorted:
+                if chunk.size == 0 or timestamps[0] > end or timestamps[-1] < start:
+                    continue
+                left = np.searchsorted(timestamps, start, side='left')
+                right = np.searchsorted(timestamps, end, side='right')
+                selection.append((chunk, np.arange(left, right)))
+            else:
+                selection.append((chunk, np.flatnonzero((timestamps >= start) & (timestamps <= end))))
+        return selection
+
+    def _reading_before(self, end: np.datetime64) -> Optional[Tuple[np.datetime64, float]]:
+        """
+        Returns the timestamp and value of the last (non NaN) row before a timestamp, or None.
+        Chunks in timestamp order are searched with binary search, the others are scanned
+        """
+        reading = None
+        for chunk in self._chunks:
+            timestamps = chunk.timestamps[:chunk.size]
+            values = chunk.values[:chunk.size]
+            if chunk.sorted:
+                position = int(np.searchsorted(timestamps, end, side='left')) - 1
+                while position >= 0 and values[position] != values[position]:
+                    position -= 1
+                if position < 0:
+                    continue
+            else:
+                positions = np.flatnonzero((timestamps < end) & ~np.isnan(values))
+                if not len(positions):
+                    continue
+                position = positions[timestamps[positions] == timestamps[positions].max()][-1]
+            # rows of later chunks come later among rows with the same timestamp
+            if reading is None or timestamps[position] >= reading[0]:
+                reading = (timestamps[position], float(values[position]))
+        return reading
+
+    def _locate(self, record: AbstractDataMeasure):
+        """
+        Finds the chunk and position of a record, first by UID then by timestamp and value
+        """
+        row = self._derived_row(record)
+        if row is not None:
+            for chunk in self._chunks:
+                if chunk.first_row <= row < chunk.first_row + chunk.added:
+                    position = chunk.position(row - chunk.first_row)
+                    if position is not None:
+                        return chunk, position
+                    break
+        for chunk in self._chunks:
+            for offset, uid in chunk.uids.items():
+                if uid == record.UID:
+                    return chunk, chunk.position(offset)
+        timestamp = np.datetime64(record.timestamp, 's')
+        for chunk in self._chunks:
+            matches = np.flatnonzero((chunk.timestamps[:chunk.size] == timestamp) &
+                                     (chunk.values[:chunk.size] == record.value))
+            if len(matches):
+                return chunk, int(matches[0])
+        return None
+
+    def _derived_row(self, record: AbstractDataMeasure):
+        """
+        Returns the sequence number of the row a record was read from, or None if its UID was not derived by this store
+        """
+        uid = record._UID
+        if isinstance(uid, str):
+            try:
+                uid = UUID(uid).int
+            except ValueError:
+                return None
+        if not isinstance(uid, int) or uid & ~_ROW_MASK != self._uid_base:
+            return None
+        return uid & _ROW_MASK
+
+    def _derived_uid(self, row: int) -> int:
+        return self._uid_base | row
+
+    def _build_record(self, chunk: _Chunk, position: int) -> AbstractDataMeasure:
+        """
+        Builds a record object from a row without running the constructor (and its validation)
+        of the record type. UIDs not kept are derived from the sequence number of the row
+        """
+        position = int(position)
+        offset = chunk.offset(position)
+        uid: Union[str, int] = chunk.uids.get(offset) if chunk.uids else None
+        if uid is None:
+            uid = self._derived_uid(chunk.first_row + offset)
+        tags = {attribute: self._tag_values[attribute][chunk.tags[attribute][position]]
+                for attribute in self._tag_attributes}
+        return self.build_record(self._record_type, chunk.timestamps[position].item(),
+                                 float(chunk.values[position]), uid, tags)
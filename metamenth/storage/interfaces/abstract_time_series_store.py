@@ -0,0 +1,186 @@
+from __future__ import annotations
+from abc import ABC
+from abc import abstractmethod
+from datetime import datetime
+from datetime import timedelta
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+from metamenth.measure_instruments.interfaces.abstract_data_measure import AbstractDataMeasure
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+
+
+class AbstractTimeSeriesStore(ABC):
+    """
+    Defines the interface of the backends that hold the time series
+    recorded by transducers, e.g., sensor data and trigger history
+    """
+
+    @abstractmethod
+    def add(self, records: List[AbstractDataMeasure]):
+        """
+        Appends records to the store
+        :param records: the records (e.g., SensorData) to add
+        """
+        pass
+
+    @abstractmethod
+    def add_arrays(self, timestamps: np.ndarray, values: np.ndarray, tags: Dict[str, Any] = None):
+        """
+        Appends records given as columns, e.g., a backfill of trend logs, without
+        running the constructor of the record type for every row
+        :param timestamps: the timestamps of the records (datetime64[s])
+        :param values: the values of the records (float64)
+        :param tags: the values of other attributes of the records (e.g., trigger_type),
+        either one value for all the records or a sequence with one value per record
+        """
+        pass
+
+    @abstractmethod
+    def remove(self, record: AbstractDataMeasure):
+        """
+        Removes a record from the store
+        :param record: the record to remove
+        """
+        pass
+
+    @abstractmethod
+    def get_records(self) -> List[AbstractDataMeasure]:
+        """
+        Returns all the records in the order they were added
+        """
+        pass
+
+    @abstractmethod
+    def get_records_by_date(self, from_timestamp: datetime, to_timestamp: datetime) -> List[AbstractDataMeasure]:
+        """
+        Returns the records recorded within a time interval (both ends inclusive)
+        :param from_timestamp: the start timestamp
+        :param to_timestamp: the end timestamp
+        """
+        pass
+
+    def iter_records(self, from_timestamp: datetime = None,
+                     to_timestamp: datetime = None) -> Iterator[AbstractDataMeasure]:
+        """
+        Yields the records one at a time: all the records in the order of get_records,
+        or the records of a time interval in the order of get_records_by_date.
+        Stores override it to build or copy records as they are consumed
+        :param from_timestamp: the optional start timestamp
+        :param to_timestamp: the optional end timestamp
+        """
+        if from_timestamp is None and to_timestamp is None:
+            return iter(self.get_records())
+        return iter(self.get_records_by_date(from_timestamp or datetime.min, to_timestamp or datetime.max))
+
+    @abstractmethod
+    def get_arrays(self, from_timestamp: datetime = None,
+                   to_timestamp: datetime = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the timestamps (datetime64[s]) and values (float64) of the records
+        without building record objects
+        :param from_timestamp: the optional start timestamp
+        :param to_timestamp: the optional end timestamp
+        """
+        pass
+
+    def get_value_before(self, timestamp: datetime) -> Optional[float]:
+        """
+        Returns the value of the last reading recorded before a timestamp, skipping NaN readings,
+        e.g., the register reading the consumption of a time interval starts from.
+        Stores override it to search their timestamps instead of reading the earlier records
+        :param timestamp: the timestamp
+        :return: the value, or None if no reading was recorded before the timestamp
+        """
+        import numpy as np
+        timestamps, values = self.get_arrays(None, timestamp)
+        before = np.flatnonzero((timestamps < np.datetime64(timestamp, 's')) & ~np.isnan(values))
+        if not len(before):
+            return None
+        # the last of the latest readings, as a stable sort by timestamp orders them
+        latest = before[timestamps[before] == timestamps[before].max()]
+        return float(values[latest[-1]])
+
+    @abstractmethod
+    def __len__(self):
+        pass
+
+    def __iter__(self):
+        return iter(self.get_records())
+
+    @staticmethod
+    def build_record(record_type: type, timestamp: datetime, value: float, uid: Union[str, int] = None,
+                     tags: Dict[str, Any] = None) -> AbstractDataMeasure:
+        """
+        Builds a record without running the constructor (and the validation) of its type.
+        Records built without a UID get one the first time it is read
+        :param record_type: the type of the record, e.g., SensorData
+        :param timestamp: the timestamp of the record
+        :param value: the value of the record
+        :param uid: the optional UID of the record, as a string or as the int of a uuid
+        :param tags: the values of other attributes of the record
+        """
+        record = record_type.__new__(record_type)
+        record._UID = uid
+        record._timestamp = timestamp
+        record._value = value
+        record._measurement_type = None
+        if tags:
+            for attribute, tag in tags.items():
+                setattr(record, attribute, tag)
+        return record
+
+    @staticmethod
+    def _as_arrays(timestamps, values) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Converts timestamp and value columns to datetime64[s] and float64 arrays
+        """
+        import numpy as np
+        timestamps = np.asarray(timestamps, dtype='datetime64[s]')
+        try:
+            values = np.asarray(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise ValueError('values must be numeric')
+        if timestamps.ndim != 1 or timestamps.shape != values.shape:
+            raise ValueError('timestamps and values must be one dimensional and of the same length')
+        return timestamps, values
+
+    @staticmethod
+    def _datetime_array(timestamps: List[datetime]) -> np.ndarray:
+        """
+        Converts datetimes to a datetime64[s] array. numpy converts datetime objects one
+        at a time and slowly, counting seconds from the epoch is several times faster
+        """
+        import numpy as np
+        try:
+            return np.fromiter(((timestamp - _EPOCH) // _SECOND for timestamp in timestamps), dtype=np.int64,
+                               count=len(timestamps)).astype('datetime64[s]')
+        except TypeError:
+            # timezone aware datetimes
+            return np.array(timestamps, dtype='datetime64[s]')
+
+    @staticmethod
+    def _tag_columns(tags: Dict[str, Any], size: int) -> Dict[str, List]:
+        """
+        Returns a list of one value per record for each tag
+        """
+        import numpy as np
+        columns = {}
+        for attribute, tag in (tags or {}).items():
+            if isinstance(tag, (list, tuple, np.ndarray)):
+                if len(tag) != size:
+                    raise ValueError(f'{attribute} must have one value per record')
+                columns[attribute] = list(tag)
+            else:
+                columns[attribute] = [tag] * size
+        return columns
@@ -0,0 +1,171 @@
+from __future__ import annotations
+from collections import deque
+from datetime import datetime
+from datetime import timedelta
+from itertools import repeat
+from operator import floordiv
+from operator import is_
+from operator import sub
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from metamenth.storage.interfaces.abstract_time_series_store import AbstractTimeSeriesStore
+from metamenth.measure_instruments.interfaces.abstract_data_measure import AbstractDataMeasure
+from metamenth.measure_instruments.sensor_data import SensorData
+from metamenth.utils.search.timestamp_index import TimestampIndex
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class ListTimeSeriesStore(AbstractTimeSeriesStore):
+    """
+    The default time series store. Keeps the records as
+    objects in a python list, alongside a timestamp index for date range searches
+    """
+
+    def __init__(self, record_type: type = SensorData):
+        """
+        :param record_type: the type of the records built by add_arrays, e.g., SensorData, MeterMeasure
+        """
+        self._record_type = record_type
+        self._records: List[AbstractDataMeasure] = []
+        self._index = TimestampIndex()
+
+    @property
+    def record_type(self) -> type:
+        return self._record_type
+
+    def add(self, records: List[AbstractDataMeasure]):
+        self._records.extend(records)
+        self._index.extend(records)
+
+    def add_arrays(self, timestamps: np.ndarray, values: np.ndarray, tags: Dict[str, Any] = None):
+        timestamps, values = self._as_arrays(timestamps, values)
+        columns = self._tag_columns(tags, len(values))
+        build_record = self.build_record
+        record_type = self._record_type
+        if columns:
+            attributes = list(columns.keys())
+            records = [build_record(record_type, timestamp, value,
+                                    tags=dict(zip(attributes, row_tags)))
+                       for timestamp, value, *row_tags in zip(timestamps.tolist(), values.tolist(),
+                                                              *columns.values())]
+        else:
+            records = [build_record(record_type, timestamp, value)
+                       for timestamp, value in zip(timestamps.tolist(), values.tolist())]
+        self.add(records)
+
+    def remove(self, record: AbstractDataMeasure):
+        self._records.remove(record)
+        self._index.remove(record)
+
+    def get_records(self) -> List[AbstractDataMeasure]:
+        return self._records
+
+    def get_records_by_date(self, from_timestamp: datetime, to_timestamp: datetime) -> List[AbstractDataMeasure]:
+        return self._index.range(from_timestamp, to_timestamp)
+
+    def iter_records(self, from_timestamp: datetime = None,
+                     to_timestamp: datetime = None) -> Iterator[AbstractDataMeasure]:
+        if from_timestamp is None and to_timestamp is None:
+            return iter(self._records)
+        return self._index.iter_range(from_timestamp or datetime.min, to_timestamp or datetime.max)
+
+    def get_arrays(self, from_timestamp: datetime = None,
+                   to_timestamp: datetime = None) -> Tuple[np.ndarray, np.ndarray]:
+        import numpy as np
+        records = self._records
+        if from_timestamp is not None or to_timestamp is not None:
+            records = self.get_records_by_date(from_timestamp or datetime.min, to_timestamp or datetime.max)
+        timestamps = self._datetime_array([record.timestamp for record in records])
+        values = np.array([record.value for record in records], dtype=np.float64)
+        return timestamps, values
+
+    def get_value_before(self, timestamp: datetime) -> Optional[float]:
+        for record in self._index.iter_before(timestamp):
+            value = float(record.value)
+            if value == value:
+                return value
+        return None
+
+    def __len__(self):
+        return len(self._records)
+
+    def __getstate__(self):
+        # records are pickled as columns (e.g., for building snapshots): timestamps and float values
+        # as arrays written as raw buffers, the other attributes as lists or a single shared value.
+        # The index is rebuilt when loading. Records that cannot be written as columns are pickled as is
+        columns = ListTimeSeriesStore._columns(self._records)
+        if columns is None:
+            return self.__dict__.copy()
+        return {'_record_type': self._record_type, '_columns': columns}
+
+    def __setstate__(self, state):
+        columns = state.pop('_columns', None)
+        self.__dict__.update(state)
+        if columns is not None:
+            self._records = ListTimeSeriesStore._records_of_columns(columns)
+            self._index = TimestampIndex(self._records)
+
+    @staticmethod
+    def _columns(records: List[AbstractDataMeasure]) -> Dict[str, Any]:
+        """
+        Returns the attributes of records of the same slotted type as columns, or None
+        if the records cannot be written as columns
+        """
+        import numpy as np
+        if not records:
+            return None
+        record_type = type(records[0])
+        slots = [slot for cls in record_type.__mro__ for slot in cls.__dict__.get('__slots__', ())]
+        if '__dict__' in slots or '_timestamp' not in slots or set(map(type, records)) != {record_type}:
+            return None
+        try:
+            # maps over the slot descriptors read the attributes without a python loop
+            attributes = {slot: list(map(getattr(record_type, slot).__get__, records)) for slot in slots}
+            timestamps = attributes.pop('_timestamp')
+            if set(map(type, timestamps)) != {datetime}:
+                return None
+            # naive datetimes, as microseconds from the epoch
+            microseconds = np.fromiter(map(floordiv, map(sub, timestamps, repeat(_EPOCH)), repeat(_MICROSECOND)),
+                                       dtype=np.int64, count=len(timestamps))
+        except (AttributeError, TypeError, OverflowError):
+            # unset attributes or timezone aware datetimes
+            return None
+
+        columns = {'record_type': record_type, 'size': len(records),
+                   'timestamps': microseconds, 'shared': {}, 'lists': {}}
+        for slot, values in attributes.items():
+            if slot == '_value' and set(map(type, values)) == {float}:
+                columns['values'] = np.array(values, dtype=np.float64)
+            elif all(map(is_, values, repeat(values[0]))):
+                columns['shared'][slot] = values[0]
+            else:
+                columns['lists'][slot] = values
+        return columns
+
+    @staticmethod
+    def _records_of_columns(columns: Dict[str, Any]) -> List[AbstractDataMeasure]:
+        """
+        Builds records from columns without running the constructor of their type
+        """
+        record_type = columns['record_type']
+        size = columns['size']
+        records = list(map(record_type.__new__, repeat(record_type, size)))
+        attributes = dict(columns['lists'])
+        attributes['_timestamp'] = columns['timestamps'].astype('datetime64[us]').tolist()
+        if 'values' in columns:
+            attributes['_value'] = columns['values'].tolist()
+        attributes.update({slot: repeat(value, size) for slot, value in columns['shared'].items()})
+        for slot, values in attributes.items():
+            # the slot descriptors set the attributes of all the records without a python loop
+            deque(map(getattr(record_type, slot).__set__, records, values), maxlen=0)
+        return records
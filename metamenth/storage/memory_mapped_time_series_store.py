@@ -0,0 +1,352 @@
+import os
+import pickle
+from datetime import datetime
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from uuid import NAMESPACE_URL
+from uuid import uuid5
+import numpy as np
+from metamenth.storage.columnar_time_series_store import ColumnarTimeSeriesStore
+from metamenth.storage.columnar_time_series_store import _ROW_MASK
+from metamenth.measure_instruments.interfaces.abstract_data_measure import AbstractDataMeasure
+from metamenth.measure_instruments.sensor_data import SensorData
+
+_TAG_VALUES_FILE = 'tag_values.pickle'
+_DELETED_ROWS_FILE = 'deleted_rows.bin'
+
+
+class _Archive:
+    """
+    The rows spilled by a memory mapped store: one file of fixed width values per column
+    (timestamps, values and tag codes) in a directory, appended to and read through numpy.memmap
+    """
+
+    def __init__(self, directory: str, tag_attributes: List[str]):
+        self.directory = directory
+        self.dtypes = {'timestamps': np.dtype('datetime64[s]'), 'values': np.dtype(np.float64)}
+        self.dtypes.update({f'tag_{attribute}': np.dtype(np.int32) for attribute in tag_attributes})
+        self.writable = True
+        # uids kept for archived rows (keep_uids), keyed by row
+        self.uids: Dict[int, str] = {}
+        self._columns: Dict[str, np.ndarray] = None
+        os.makedirs(directory, exist_ok=True)
+        # removed rows, archived rows are never rewritten
+        self.deleted: Set[int] = set()
+        deleted_path = os.path.join(directory, _DELETED_ROWS_FILE)
+        if os.path.exists(deleted_path):
+            self.deleted = set(np.fromfile(deleted_path, dtype=np.int64).tolist())
+        path = self._path('timestamps')
+        self.rows = os.path.getsize(path) // self.dtypes['timestamps'].itemsize if os.path.exists(path) else 0
+        timestamps = self.column('timestamps')
+        # whether the rows are in timestamp order, so ranges are found with binary search
+        self.sorted = bool(np.all(timestamps[1:] >= timestamps[:-1]))
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Returns a read-only memory mapped column
+        """
+        if self.rows == 0:
+            return np.empty(0, dtype=self.dtypes[name])
+        if self._columns is None:
+            self._columns = {column: np.memmap(self._path(column), dtype=dtype, mode='r', shape=(self.rows,))
+                             for column, dtype in self.dtypes.items()}
+        return self._columns[name]
+
+    def append(self, columns: Dict[str, np.ndarray]):
+        """
+        Appends rows to the files of the archive
+        :param columns: the values of each column of the rows
+        """
+        if not self.writable:
+            raise ValueError(f'archive {self.directory} is read only')
+        size = len(columns['timestamps'])
+        if size == 0:
+            return
+        if self.rows and self.sorted:
+            self.sorted = columns['timestamps'][0] >= self.column('timestamps')[-1]
+        self.sorted = bool(self.sorted and np.all(columns['timestamps'][1:] >= columns['timestamps'][:-1]))
+        for name, dtype in self.dtypes.items():
+            with open(self._path(name), 'ab') as file:
+                file.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+        self.rows += size
+        self._columns = None
+
+    def delete(self, rows: List[int]):
+        """
+        Marks rows as removed
+        """
+        if not self.writable:
+            raise ValueError(f'archive {self.directory} is read only')
+        if not len(rows):
+            return
+        with open(os.path.join(self.directory, _DELETED_ROWS_FILE), 'ab') as file:
+            file.write(np.asarray(rows, dtype=np.int64).tobytes())
+        self.deleted.update(int(row) for row in rows)
+
+    def save_tag_values(self, tag_values: Dict[str, List]):
+        with open(os.path.join(self.directory, _TAG_VALUES_FILE), 'wb') as file:
+            pickle.dump(tag_values, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load_tag_values(self) -> Dict[str, List]:
+        path = os.path.join(self.directory, _TAG_VALUES_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'rb') as file:
+            return pickle.load(file)
+
+    def _path(self, column: str) -> str:
+        return os.path.join(self.directory, f'{column}.bin')
+
+    def __getstate__(self):
+        # copies (e.g., snapshots of a building) map the files again rather than pickling their content
+        state = self.__dict__.copy()
+        state['_columns'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # a copy must not append rows that the original store does not know of
+        self.writable = False
+
+
+class MemoryMappedTimeSeriesStore(ColumnarTimeSeriesStore):
+    """
+    A columnar time series store that keeps its most recent chunks in memory and spills
+    older chunks to files of fixed width columns, read through numpy.memmap. Years of
+    readings of many points are then served without holding them on the heap.
+
+    Reads cover the spilled and in-memory records transparently. Arrays of date ranges that
+    only cover spilled records are read-only views of the files (no copy) when records were
+    spilled in timestamp order.
+
+    The directory of the archive can be opened again by a new store, e.g., after a restart.
+    UIDs that are not kept are derived from the archive directory and the row of the records,
+    so a store opening the same directory reads the same UIDs. Archived rows are the sequence
+    numbers of the rows in the store: rows removed before they are spilled are archived as
+    removed rows. Copies of the store (e.g., pickled buildings) read the archive but keep new
+    records in memory.
+    """
+
+    def __init__(self, archive_directory: str, record_type: type = SensorData, chunk_size: int = 4096,
+                 memory_chunks: int = 4, keep_uids: bool = False, tag_attributes: List[str] = None):
+        """
+        :param archive_directory: the directory of the archive files, created if needed.
+        Records already archived in the directory are part of the store
+        :param record_type: the type of the records built when reading, e.g., SensorData, MeterMeasure
+        :param chunk_size: the number of rows held by each chunk
+        :param memory_chunks: the number of most recent chunks kept in memory
+        :param keep_uids: if True, the UIDs of added records are kept
+        :param tag_attributes: attributes other than the value and timestamp that should be kept,
+        e.g., trigger_type for TriggerHistory
+        """
+        if memory_chunks is None or memory_chunks <= 0:
+            raise ValueError('memory_chunks must be a positive integer')
+        super().__init__(record_type, chunk_size, keep_uids, tag_attributes)
+        self._memory_chunks = memory_chunks
+        self._archive = _Archive(archive_directory, self._tag_attributes)
+        for attribute, values in self._archive.load_tag_values().items():
+            if attribute in self._tag_values:
+                self._tag_values[attribute] = list(values)
+                self._tag_codes[attribute] = {value: code for code, value in enumerate(values)}
+        self._size = self.archived_size
+        self._uid_base = uuid5(NAMESPACE_URL, os.path.abspath(archive_directory)).int & ~_ROW_MASK
+        self._next_row = self._archive.rows
+
+    @property
+    def archive_directory(self) -> str:
+        return self._archive.directory
+
+    @property
+    def archived_size(self) -> int:
+        """
+        The number of records in the archive files
+        """
+        return self._archive.rows - len(self._archive.deleted)
+
+    def add(self, records: List[AbstractDataMeasure]):
+        super().add(records)
+        self._spill()
+
+    def add_arrays(self, timestamps: np.ndarray, values: np.ndarray, tags: Dict[str, Any] = None):
+        super().add_arrays(timestamps, values, tags)
+        self._spill()
+
+    def flush(self):
+        """
+        Moves the records kept in memory to the archive, e.g., before the program exits
+        so that a store opening the archive directory again finds all the records
+        """
+        self._spill(0)
+
+    def remove(self, record: AbstractDataMeasure):
+        if self._locate(record) is not None:
+            super().remove(record)
+            return
+        row = self._locate_archived(record)
+        if row is None:
+            raise ValueError(f'{record} is not in the store')
+        self._archive.delete([row])
+        self._size -= 1
+
+    def get_records(self) -> List[AbstractDataMeasure]:
+        return list(self.iter_records())
+
+    def get_records_by_date(self, from_timestamp: datetime, to_timestamp: datetime) -> List[AbstractDataMeasure]:
+        return list(self.iter_records(from_timestamp, to_timestamp))
+
+    def iter_records(self, from_timestamp: datetime = None,
+                     to_timestamp: datetime = None) -> Iterator[AbstractDataMeasure]:
+        if from_timestamp is None and to_timestamp is None:
+            rows = range(self._archive.rows)
+        else:
+            rows = self._archived_rows(from_timestamp or datetime.min, to_timestamp or datetime.max)
+        for row in (rows if isinstance(rows, range) else rows.tolist()):
+            if row not in self._archive.deleted:
+                yield self._build_archived_record(row)
+        yield from super().iter_records(from_timestamp, to_timestamp)
+
+    def get_arrays(self, from_timestamp: datetime = None,
+                   to_timestamp: datetime = None) -> Tuple[np.ndarray, np.ndarray]:
+        if from_timestamp is None and to_timestamp is None:
+            rows = slice(0, self._archive.rows)
+        else:
+            rows = self._archived_rows(from_timestamp or datetime.min, to_timestamp or datetime.max)
+        if isinstance(rows, range):
+            rows = slice(rows.start, rows.stop)
+        timestamps = self._archive.column('timestamps')[rows]
+        values = self._archive.column('values')[rows]
+        if self._archive.deleted:
+            kept = np.ones(len(timestamps), dtype=bool)
+            positions = np.arange(self._archive.rows)[rows]
+            kept[np.isin(positions, list(self._archive.deleted))] = False
+            timestamps, values = timestamps[kept], values[kept]
+
+        memory_timestamps, memory_values = super().get_arrays(from_timestamp, to_timestamp)
+        if len(memory_timestamps) == 0:
+            # views of the archive files
+            return timestamps, values
+        return np.concatenate((timestamps, memory_timestamps)), np.concatenate((values, memory_values))
+
+    def _spill(self, memory_chunks: int = None):
+        """
+        Moves the oldest chunks beyond the number of chunks kept in memory to the archive
+        """
+        if not self._archive.writable:
+            return
+        memory_chunks = self._memory_chunks if memory_chunks is None else memory_chunks
+        spilled = False
+        while len(self._chunks) > memory_chunks:
+            chunk = self._chunks.pop(0)
+            first_row = self._archive.rows
+            # rows of chunks emptied in memory, and rows removed from this chunk
+            gap = chunk.first_row - first_row
+            columns = {'timestamps': chunk.timestamps[:chunk.size], 'values': chunk.values[:chunk.size]}
+            columns.update({f'tag_{attribute}': column[:chunk.size] for attribute, column in chunk.tags.items()})
+            removed = []
+            if gap or chunk.offsets is not None:
+                columns, removed = self._with_removed_rows(columns, gap + chunk.offsets[:chunk.size]
+                                                           if chunk.offsets is not None
+                                                           else gap + np.arange(chunk.size), gap + chunk.added)
+            self._archive.append(columns)
+            self._archive.delete([first_row + row for row in removed])
+            self._archive.uids.update({chunk.first_row + offset: uid for offset, uid in chunk.uids.items()})
+            spilled = True
+        if spilled and self._tag_attributes:
+            self._archive.save_tag_values(self._tag_values)
+
+    def _with_removed_rows(self, columns: Dict[str, np.ndarray], kept: np.ndarray, size: int) -> tuple:
+        """
+        Spreads the rows of columns over their rows in the archive, filling the rows in between with removed rows
+        :param columns: the columns of the kept rows
+        :param kept: the archive rows (from the first spilled row) of the kept rows
+        :param size: the number of rows to archive
+        :return: the columns to archive and the removed rows
+        """
+        present = np.zeros(size, dtype=bool)
+        present[kept] = True
+        # removed rows take the timestamp of the row before them, so the archive stays in timestamp order
+        previous = np.maximum.accumulate(np.where(present, np.arange(size), -1))
+        archived = self._archive.column('timestamps')
+        if len(archived):
+            first_timestamp = archived[-1]
+        else:
+            first_timestamp = columns['timestamps'][0] if len(kept) else np.datetime64(0, 's')
+        filled = {}
+        for name, column in columns.items():
+            full = np.zeros(size, dtype=column.dtype)
+            if name == 'values':
+                full[:] = np.nan
+            full[kept] = column
+            filled[name] = full
+        timestamps = filled['timestamps']
+        timestamps[~present] = np.where(previous[~present] >= 0, timestamps[np.maximum(previous[~present], 0)],
+                                        first_timestamp)
+        return filled, np.flatnonzero(~present).tolist()
+
+    def _archived_rows(self, from_timestamp: datetime, to_timestamp: datetime):
+        """
+        Returns the archived rows whose timestamp is within an interval, as a range when the archive is sorted
+        """
+        start = np.datetime64(from_timestamp, 's')
+        end = np.datetime64(to_timestamp, 's')
+        timestamps = self._archive.column('timestamps')
+        if self._archive.sorted:
+            return range(int(np.searchsorted(timestamps, start, side='left')),
+                         int(np.searchsorted(timestamps, end, side='right')))
+        return np.flatnonzero((timestamps >= start) & (timestamps <= end))
+
+    def _reading_before(self, end: np.datetime64) -> Optional[Tuple[np.datetime64, float]]:
+        reading = None
+        timestamps = self._archive.column('timestamps')
+        values = self._archive.column('values')
+        if self._archive.sorted:
+            row = int(np.searchsorted(timestamps, end, side='left')) - 1
+            while row >= 0 and (values[row] != values[row] or row in self._archive.deleted):
+                row -= 1
+        else:
+            rows = np.flatnonzero((timestamps < end) & ~np.isnan(values))
+            if self._archive.deleted:
+                rows = rows[~np.isin(rows, list(self._archive.deleted))]
+            row = rows[timestamps[rows] == timestamps[rows].max()][-1] if len(rows) else -1
+        if row >= 0:
+            reading = (timestamps[row], float(values[row]))
+        # records in memory come after the archived records
+        memory_reading = super()._reading_before(end)
+        if memory_reading is not None and (reading is None or memory_reading[0] >= reading[0]):
+            return memory_reading
+        return reading
+
+    def _locate_archived(self, record: AbstractDataMeasure):
+        row = self._derived_row(record)
+        if row is not None and row < self._archive.rows and row not in self._archive.uids:
+            return None if row in self._archive.deleted else row
+        for row, uid in self._archive.uids.items():
+            if uid == record.UID and row not in self._archive.deleted:
+                return row
+        timestamp = np.datetime64(record.timestamp, 's')
+        timestamps = self._archive.column('timestamps')
+        values = self._archive.column('values')
+        if self._archive.sorted:
+            start = int(np.searchsorted(timestamps, timestamp, side='left'))
+            end = int(np.searchsorted(timestamps, timestamp, side='right'))
+            matches = start + np.flatnonzero(values[start:end] == record.value)
+        else:
+            matches = np.flatnonzero((timestamps == timestamp) & (values == record.value))
+        for row in matches.tolist():
+            if row not in self._archive.deleted:
+                return row
+        return None
+
+    def _build_archived_record(self, row: int) -> AbstractDataMeasure:
+        uid = self._archive.uids.get(row) if self._archive.uids else None
+        if uid is None:
+            uid = self._derived_uid(row)
+        tags = {attribute: self._tag_values[attribute][self._archive.column(f'tag_{attribute}')[row]]
+                for attribute in self._tag_attributes}
+        return self.build_record(self._record_type, self._archive.column('timestamps')[row].item(),
+                                 float(self._archive.column('values')[row]), uid, tags)
@@ -0,0 +1,78 @@
+import pickle
+import struct
+from typing import Any
+from typing import List
+
+_MAGIC = b'MMSNAP'
+_VERSION = 1
+# magic, version, number of buffers, length of the pickle stream
+_HEADER = struct.Struct('<6sHQQ')
+# buffers start at offsets aligned for any numpy dtype
+_ALIGNMENT = 64
+
+
+class SnapshotFile:
+    """
+    Saves and loads snapshots of a whole object graph, e.g., a building with its floors, rooms,
+    zones, HVAC components, ducts, transducers and data, in a compact binary file.
+
+    Objects are pickled once each, so references shared in the graph (e.g., zones shared by spaces,
+    the sources and destinations of duct connections) are shared in the loaded graph. Loading does
+    not run constructors or setters, the snapshot is not validated again and is therefore much
+    faster than building the model from its source systems. Numpy arrays (e.g., the columns of
+    time series stores) are written as raw buffers after the pickle stream and loaded without copy.
+
+    Loading a snapshot may run code stored in it, only load snapshots from trusted sources.
+    """
+
+    @staticmethod
+    def save(entity: Any, path: str) -> int:
+        """
+        Writes a snapshot of an object graph to a file
+        :param entity: the root of the graph, e.g., a building or a list of buildings
+        :param path: the path of the file, overwritten if it exists
+        :return: the size of the file in bytes
+        """
+        buffers: List[pickle.PickleBuffer] = []
+        stream = pickle.dumps(entity, protocol=5, buffer_callback=buffers.append)
+        raw_buffers = [buffer.raw() for buffer in buffers]
+        with open(path, 'wb') as file:
+            file.write(_HEADER.pack(_MAGIC, _VERSION, len(raw_buffers), len(stream)))
+            file.write(struct.pack(f'<{len(raw_buffers)}Q', *[raw.nbytes for raw in raw_buffers]))
+            file.write(stream)
+            for raw in raw_buffers:
+                file.write(bytes(-file.tell() % _ALIGNMENT))
+                file.write(raw)
+            return file.tell()
+
+    @staticmethod
+    def load(path: str) -> Any:
+        """
+        Reads the object graph of a snapshot file
+        :param path: the path of the file
+        """
+        with open(path, 'rb') as file:
+            content = bytearray(file.read())
+        if len(content) < _HEADER.size:
+            raise ValueError(f'{path} is not a snapshot file')
+        magic, version, buffer_count, stream_length = _HEADER.unpack_from(content)
+        if magic != _MAGIC:
+            raise ValueError(f'{path} is not a snapshot file')
+        if version != _VERSION:
+            raise ValueError(f'snapshot version {version} is not supported')
+
+        offset = _HEADER.size
+        lengths = struct.unpack_from(f'<{buffer_count}Q', content, offset)
+        offset += 8 * buffer_count
+        view = memoryview(content)
+        stream = view[offset:offset + stream_length]
+        offset += stream_length
+        buffers = []
+        for length in lengths:
+            offset += -offset % _ALIGNMENT
+            # writable views of the content, arrays loaded from them are not copied
+            buffers.append(view[offset:offset + length])
+            offset += length
+        if offset > len(content):
+            raise ValueError(f'{path} is truncated')
+        return pickle.loads(stream, buffers=buffers)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+import csv
+from typing import Tuple
+from typing import Union
+from metamenth.misc import Validate
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class TimeSeriesReader:
+    """
+    Turns columns of timestamps and values, e.g., from BMS trend logs,
+    into the arrays accepted by the add_arrays method of time series stores
+    """
+
+    @staticmethod
+    def parse_timestamps(timestamps, timestamp_format: str = None) -> np.ndarray:
+        """
+        Parses timestamps into a datetime64[s] array with Validate.parse_dates
+        :param timestamps: a sequence of timestamp strings, datetimes or datetime64 values
+        :param timestamp_format: the optional strptime format of the timestamps, e.g., %d/%m/%Y %H:%M.
+        Without a format, the formats accepted by Validate.parse_date are tried
+        :return: the timestamps as a datetime64[s] array
+        """
+        try:
+            return Validate.parse_dates(timestamps, timestamp_format)
+        except (TypeError, ValueError) as err:
+            raise ValueError(f'timestamps could not be parsed: {err}')
+
+    @staticmethod
+    def to_arrays(timestamps, values, timestamp_format: str = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Converts columns of timestamps and values to datetime64[s] and float64 arrays
+        :param timestamps: the timestamps of the readings
+        :param values: the values of the readings
+        :param timestamp_format: the optional strptime format of the timestamps
+        :return: the timestamps and the values
+        """
+        import numpy as np
+        timestamps = TimeSeriesReader.parse_timestamps(timestamps, timestamp_format)
+        try:
+            values = np.asarray(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise ValueError('values must be numeric')
+        if timestamps.ndim != 1 or timestamps.shape != values.shape:
+            raise ValueError('timestamps and values must be one dimensional and of the same length')
+        return timestamps, values
+
+    @staticmethod
+    def read_csv(file_path: str, timestamp_column: Union[str, int] = 'timestamp',
+                 value_column: Union[str, int] = 'value', timestamp_format: str = None,
+                 delimiter: str = ',') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Reads the timestamp and value columns of a csv file with a header row.
+        Rows with an empty value are skipped
+        :param file_path: the path of the csv file
+        :param timestamp_column: the name or position of the timestamp column
+        :param value_column: the name or position of the value column
+        :param timestamp_format: the optional strptime format of the timestamps
+        :param delimiter: the column delimiter
+        :return: the timestamps (datetime64[s]) and the values (float64)
+        """
+        with open(file_path, newline='') as csv_file:
+            reader = csv.reader(csv_file, delimiter=delimiter)
+            header = [column.strip() for column in next(reader, [])]
+            timestamp_position = TimeSeriesReader._column_position(header, timestamp_column)
+            value_position = TimeSeriesReader._column_position(header, value_column)
+            timestamps = []
+            values = []
+            for row in reader:
+                if len(row) <= max(timestamp_position, value_position) or not row[value_position].strip():
+                    continue
+                timestamps.append(row[timestamp_position].strip())
+                values.append(row[value_position])
+        return TimeSeriesReader.to_arrays(timestamps, values, timestamp_format)
+
+    @staticmethod
+    def _column_position(header, column: Union[str, int]) -> int:
+        if isinstance(column, int):
+            return column
+        try:
+            return header.index(column)
+        except ValueError:
+            raise ValueError(f'{column} is not a column of the file')
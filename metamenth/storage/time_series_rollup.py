@@ -0,0 +1,242 @@
+from __future__ import annotations
+from bisect import bisect_left
+from bisect import bisect_right
+from datetime import datetime
+from typing import Dict
+from typing import List
+from typing import Tuple
+from metamenth.datatypes.rollup_bucket import RollupBucket
+from metamenth.enumerations import RollupResolution
+from metamenth.measure_instruments.interfaces.abstract_data_measure import AbstractDataMeasure
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+    from metamenth.storage.interfaces.abstract_time_series_store import AbstractTimeSeriesStore
+
+# the numpy units of the buckets of each resolution
+_BUCKET_UNITS = {RollupResolution.HOURLY: 'h', RollupResolution.DAILY: 'D', RollupResolution.MONTHLY: 'M'}
+
+
+class TimeSeriesRollup:
+    """
+    Hourly, daily and monthly sum, min, max, mean and count of the readings of a meter or
+    a transducer, kept next to its time series store so reports read a few buckets instead
+    of scanning the readings.
+
+    The rollup is built from the store when it is first queried, then updated as readings
+    are added in timestamp order. Other changes (readings added out of order, removed
+    readings, a replaced store) discard the buckets, which are rebuilt on the next query.
+    Readings that are not numbers (e.g., status strings) are skipped, as NaN readings are.
+
+    Readings of cumulative registers (e.g., meters with accumulated data) are turned
+    into the consumption between consecutive readings, which is added to the bucket of
+    the later reading. A reading lower than the previous one is read as a register reset
+    (e.g., a register accumulating daily), the consumption being the reading itself.
+    """
+
+    def __init__(self, cumulative: bool = False):
+        """
+        :param cumulative: whether readings are the values of a cumulative register
+        """
+        self._cumulative = cumulative
+        self._built = False
+        self._buckets: Dict[RollupResolution, Dict[datetime, RollupBucket]] = {}
+        # the bucket starts of each resolution, in timestamp order
+        self._starts: Dict[RollupResolution, List[datetime]] = {}
+        self._last_timestamp: datetime = None
+        # the last (non NaN) value of a cumulative register
+        self._last_value: float = None
+        self._reset()
+
+    @property
+    def cumulative(self) -> bool:
+        return self._cumulative
+
+    @cumulative.setter
+    def cumulative(self, value: bool):
+        if value is None:
+            raise ValueError('cumulative must be a boolean')
+        if value != self._cumulative:
+            self._cumulative = value
+            self.invalidate()
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    def rebuild(self, timestamps: np.ndarray, values: np.ndarray):
+        """
+        Builds the buckets from all the readings, e.g., the arrays of a time series store
+        :param timestamps: the timestamps of the readings (datetime64[s]), in any order
+        :param values: the values of the readings (float64)
+        """
+        import numpy as np
+        self._reset()
+        order = np.argsort(timestamps, kind='stable')
+        self._add_sorted_arrays(timestamps[order], values[order])
+        self._built = True
+
+    def rebuild_from_store(self, store: AbstractTimeSeriesStore):
+        """
+        Builds the buckets from the readings of a time series store
+        :param store: the time series store, e.g., the data store of a meter
+        """
+        import numpy as np
+        try:
+            timestamps, values = store.get_arrays()
+        except (TypeError, ValueError):
+            # some readings are not numbers, they are read as NaN readings
+            records = list(store.iter_records())
+            timestamps = np.array([record.timestamp for record in records], dtype='datetime64[s]')
+            values = np.array([TimeSeriesRollup._number(record.value) for record in records], dtype=np.float64)
+        self.rebuild(timestamps, values)
+
+    def invalidate(self):
+        """
+        Discards the buckets, which are rebuilt on the next query
+        """
+        self._reset()
+        self._built = False
+
+    def add(self, records: List[AbstractDataMeasure]):
+        """
+        Adds readings recorded after the readings already in the buckets
+        :param records: the readings, e.g., MeterMeasure or SensorData
+        """
+        for record in records:
+            if not self._built:
+                return
+            self._add_value(record.timestamp, record.value)
+
+    def add_arrays(self, timestamps: np.ndarray, values: np.ndarray):
+        """
+        Adds readings given as columns, recorded after the readings already in the buckets
+        :param timestamps: the timestamps of the readings (datetime64[s])
+        :param values: the values of the readings (float64)
+        """
+        import numpy as np
+        if not self._built or not len(timestamps):
+            return
+        in_order = (self._last_timestamp is None or timestamps[0] >= np.datetime64(self._last_timestamp, 's'))
+        if not in_order or np.any(timestamps[1:] < timestamps[:-1]):
+            self.invalidate()
+            return
+        self._add_sorted_arrays(timestamps, values)
+
+    def get_buckets(self, resolution: RollupResolution, from_timestamp: datetime = None,
+                    to_timestamp: datetime = None) -> List[RollupBucket]:
+        """
+        Returns (copies of) the buckets of a resolution that start within a time interval (both ends inclusive)
+        :param resolution: the bucket size
+        :param from_timestamp: the optional start timestamp
+        :param to_timestamp: the optional end timestamp
+        """
+        if not self._built:
+            raise ValueError('rollup must be rebuilt before it is queried')
+        if resolution not in _BUCKET_UNITS:
+            raise ValueError('resolution must be of type RollupResolution')
+        starts = self._starts[resolution]
+        buckets = self._buckets[resolution]
+        first = 0 if from_timestamp is None else bisect_left(starts, from_timestamp)
+        last = len(starts) if to_timestamp is None else bisect_right(starts, to_timestamp)
+        return [RollupBucket(start, buckets[start].count, buckets[start].sum, buckets[start].min, buckets[start].max)
+                for start in starts[first:last]]
+
+    @staticmethod
+    def register_deltas(timestamps: np.ndarray, values: np.ndarray,
+                        previous_value: float = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Turns the sorted (non NaN) readings of a cumulative register into the consumption between
+        readings. A reading lower than the previous one is read as a register reset
+        :param timestamps: the timestamps of the readings
+        :param values: the values of the readings
+        :param previous_value: the reading before these readings, if any
+        :return: the timestamps and the consumption of the readings that follow another reading
+        """
+        import numpy as np
+        if previous_value is None:
+            registers = values
+            timestamps = timestamps[1:]
+        else:
+            registers = np.concatenate(([previous_value], values))
+        deltas = np.diff(registers)
+        resets = deltas < 0
+        deltas[resets] = registers[1:][resets]
+        return timestamps, deltas
+
+    def _reset(self):
+        self._buckets = {resolution: {} for resolution in _BUCKET_UNITS}
+        self._starts = {resolution: [] for resolution in _BUCKET_UNITS}
+        self._last_timestamp = None
+        self._last_value = None
+
+    def _add_value(self, timestamp: datetime, value):
+        if self._last_timestamp is not None and timestamp < self._last_timestamp:
+            self.invalidate()
+            return
+        value = TimeSeriesRollup._number(value)
+        self._last_timestamp = timestamp
+        if value != value:
+            # NaN, or not a number
+            return
+        if self._cumulative:
+            previous_value, self._last_value = self._last_value, value
+            if previous_value is None:
+                return
+            value = value - previous_value if value >= previous_value else value
+
+        for resolution in _BUCKET_UNITS:
+            start = TimeSeriesRollup._bucket_start(timestamp, resolution)
+            self._merge(resolution, start, 1, value, value, value)
+
+    def _add_sorted_arrays(self, timestamps: np.ndarray, values: np.ndarray):
+        import numpy as np
+        if not len(timestamps):
+            return
+        self._last_timestamp = timestamps[-1].astype('datetime64[s]').item()
+        readings = ~np.isnan(values)
+        timestamps, values = timestamps[readings], values[readings]
+        if self._cumulative and len(values):
+            previous_value, self._last_value = self._last_value, float(values[-1])
+            timestamps, values = TimeSeriesRollup.register_deltas(timestamps, values, previous_value)
+        if not len(values):
+            return
+
+        for resolution, unit in _BUCKET_UNITS.items():
+            keys = timestamps.astype(f'datetime64[{unit}]')
+            firsts = np.concatenate(([0], np.flatnonzero(keys[1:] != keys[:-1]) + 1))
+            counts = np.diff(np.append(firsts, len(keys)))
+            for start, count, total, minimum, maximum in zip(keys[firsts].astype('datetime64[s]').tolist(),
+                                                             counts.tolist(),
+                                                             np.add.reduceat(values, firsts).tolist(),
+                                                             np.minimum.reduceat(values, firsts).tolist(),
+                                                             np.maximum.reduceat(values, firsts).tolist()):
+                self._merge(resolution, start, count, total, minimum, maximum)
+
+    def _merge(self, resolution: RollupResolution, start: datetime, count: int, total: float, minimum: float,
+               maximum: float):
+        bucket = self._buckets[resolution].get(start)
+        if bucket is None:
+            self._buckets[resolution][start] = RollupBucket(start, count, total, minimum, maximum)
+            self._starts[resolution].append(start)
+        else:
+            bucket.count += count
+            bucket.sum += total
+            bucket.min = min(bucket.min, minimum)
+            bucket.max = max(bucket.max, maximum)
+
+    @staticmethod
+    def _number(value) -> float:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return float('nan')
+
+    @staticmethod
+    def _bucket_start(timestamp: datetime, resolution: RollupResolution) -> datetime:
+        if resolution == RollupResolution.HOURLY:
+            return timestamp.replace(minute=0, second=0, microsecond=0)
+        if resolution == RollupResolution.DAILY:
+            return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+        return timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
@@ -2,6 +2,7 @@ from uuid import uuid4
 from metamenth.enumerations import BuildingType
 from metamenth.datatypes.address import Address
 from typing import List
+from typing import Iterator
 from .floor import Floor
 from .room import Room
 from .open_space import OpenSpace
@@ -24,7 +25,13 @@ from metamenth.enumerations import SolarDistributionType
 from metamenth.observers.observable import Observable
 from metamenth.misc import StateTrackDecorator
 from metamenth.utils import StructureEntitySearch
+from metamenth.utils import IndexedEntityList
+from metamenth.utils import EntityList
+from metamenth.utils import EntityView
 from metamenth.enumerations import MeterType
+from metamenth.enumerations import MeasurementUnit
+from metamenth.datatypes.aligned_readings import AlignedReadings
+from metamenth.utils.aggregation.meter_aggregation import MeterAggregation
 from metamenth.subsystem.building_control_system import BuildingControlSystem
 from metamenth.datatypes.schedulable_entity import SchedulableEntity
 
@@ -60,11 +67,11 @@ class Building(Observable):
         self._solar_distribution = None
         self._schedulable_entity = SchedulableEntity()
         self._envelope: [Envelope] = []  # multiple envelopes indicate multiple towers of a building
-        self._floors = []
-        self._meters: [AbstractReader] = []
-        self._weather_stations: List[WeatherStation] = []
-        self._zones: List[Zone] = []
-        self._control_systems: [BuildingControlSystem] = []
+        self._floors = EntityList()
+        self._meters: [AbstractReader] = EntityList()
+        self._weather_stations: List[WeatherStation] = EntityList()
+        self._zones: List[Zone] = EntityList()
+        self._control_systems: [BuildingControlSystem] = EntityList()
         self.track_state = False
 
         # apply validation
@@ -218,8 +225,8 @@ class Building(Observable):
             raise ValueError('zones must be of type [Zone]')
 
     @property
-    def control_systems(self):
-        return self._control_systems.copy()
+    def control_systems(self) -> EntityView:
+        return self._control_systems.view()
 
     def add_control_system(self, control_system: BuildingControlSystem):
         if control_system:
@@ -257,6 +264,24 @@ class Building(Observable):
         else:
             raise ValueError("solar_distribution must be of type SolarDistributionType")
 
+    def enable_search_index(self, attributes: List[str] = None):
+        """
+        Indexes the floors, meters, weather stations, zones and control systems of this building,
+        and the entities of its floors and zones, by UID, name and other attributes (e.g., meter_type)
+        for faster searches. Entities added afterwards to these lists are indexed as well
+        :param attributes: the attributes indexed in addition to UID and name,
+        defaults to IndexedEntityList.DEFAULT_ATTRIBUTES
+        :return:
+        """
+        IndexedEntityList.index_lists(self, ['_floors', '_meters', '_weather_stations', '_zones', '_control_systems'],
+                                      attributes)
+        self.schedulable_entity.enable_search_index(attributes)
+        for floor in self._floors:
+            floor.enable_search_index(attributes)
+        for zone in self._zones:
+            zone.enable_search_index(attributes)
+        return self
+
     @StateTrackDecorator
     def add_weather_station(self, weather_station: WeatherStation):
         """
@@ -334,6 +359,16 @@ class Building(Observable):
         """
         return StructureSearch.search(self._floors, search_term)
 
+    def iter_floors(self, search_term: Dict = None, limit: int = None, offset: int = 0) -> Iterator[Floor]:
+        """
+        Yields the floors matching search terms one at a time, as get_floors returns them
+        :param search_term: a dictionary of attributes and their values
+        :param limit: the maximum number of floors to yield
+        :param offset: the number of matching floors to skip
+        :return:
+        """
+        return StructureSearch.iter_search(self._floors, search_term, limit, offset)
+
     def get_weather_station_by_name(self, name: str) -> WeatherStation:
         """
         Returns a weather station
@@ -358,6 +393,17 @@ class Building(Observable):
         """
         return StructureEntitySearch.search(self._weather_stations, search_term)
 
+    def iter_weather_stations(self, search_term: Dict = None,
+                              limit: int = None, offset: int = 0) -> Iterator[WeatherStation]:
+        """
+        Yields the weather stations matching search terms one at a time, as get_weather_stations returns them
+        :param search_term: a dictionary of attributes and their values
+        :param limit: the maximum number of weather stations to yield
+        :param offset: the number of matching weather stations to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._weather_stations, search_term, limit, offset)
+
     def get_meter_by_uid(self, uid: str) -> AbstractReader:
         """
         Returns a meter based on uid
@@ -382,6 +428,34 @@ class Building(Observable):
         """
         return StructureEntitySearch.search(self._meters, search_terms)
 
+    def iter_meters(self, search_terms: Dict = None, limit: int = None, offset: int = 0) -> Iterator[AbstractReader]:
+        """
+        Yields the meters matching search terms one at a time, as get_meters returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of meters to yield
+        :param offset: the number of matching meters to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._meters, search_terms, limit, offset)
+
+    def aggregate_meter_readings(self, meter_type: MeterType = None, frequency: float = None,
+                                 from_timestamp: str = None, to_timestamp: str = None,
+                                 unit: MeasurementUnit = None) -> AlignedReadings:
+        """
+        Aligns the readings of the meters of this building on a common time grid, e.g., to
+        compute the load curve of the building with AlignedReadings.total()
+        :param meter_type: the type of the meters, defaults to all the meters
+        :param frequency: the length of the intervals of the grid in seconds, defaults to the
+        longest measurement frequency of the meters
+        :param from_timestamp: the start timestamp, defaults to the first reading
+        :param to_timestamp: the end timestamp
+        :param unit: the unit of the aligned readings, defaults to the unit of the first meter
+        :return: AlignedReadings
+        """
+        meters = [meter for meter in self._meters
+                  if isinstance(meter, Meter) and (meter_type is None or meter.meter_type == meter_type)]
+        return MeterAggregation.align(meters, frequency, from_timestamp, to_timestamp, unit)
+
     def get_zone_by_name(self, name) -> Zone:
         """
         Search zones by name
@@ -406,6 +480,16 @@ class Building(Observable):
         """
         return StructureEntitySearch.search(self._zones, search_terms)
 
+    def iter_zones(self, search_terms: Dict = None, limit: int = None, offset: int = 0) -> Iterator[Zone]:
+        """
+        Yields the zones matching search terms one at a time, as get_zones returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of zones to yield
+        :param offset: the number of matching zones to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._zones, search_terms, limit, offset)
+
     @StateTrackDecorator
     def add_room(self, floor_uid: str, name: str, area: AbstractMeasure,
                  room_type: RoomType,
@@ -3,6 +3,7 @@ from metamenth.enumerations import CoverType
 from metamenth.enumerations import BuildingOrientation
 from metamenth.structure.layer import Layer
 from typing import List, Union
+from typing import Iterator
 from metamenth.utils import StructureSearch
 from typing import Dict
 
@@ -94,6 +95,16 @@ class Cover:
         """
         return StructureSearch.search(self._layers, search_term)
 
+    def iter_layers(self, search_term: Dict = None, limit: int = None, offset: int = 0) -> Iterator[Layer]:
+        """
+        Yields the layers matching search terms one at a time, as get_layers returns them
+        :param search_term: a dictionary of attributes and their values
+        :param limit: the maximum number of layers to yield
+        :param offset: the number of matching layers to skip
+        :return:
+        """
+        return StructureSearch.iter_search(self._layers, search_term, limit, offset)
+
     def add_neighbour(self, cover: 'Cover', neighbour_type: str):
         """
         Adds the neighbours of a cover
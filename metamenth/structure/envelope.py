@@ -1,6 +1,7 @@
 import uuid
 from metamenth.structure.cover import Cover
 from typing import List
+from typing import Iterator
 from typing import Dict
 from metamenth.utils import StructureSearch
 
@@ -60,6 +61,16 @@ class Envelope:
         """
         return StructureSearch.search(self._covers, search_term)
 
+    def iter_covers(self, search_term: Dict = None, limit: int = None, offset: int = 0) -> Iterator[Cover]:
+        """
+        Yields the covers matching search terms one at a time, as get_covers returns them
+        :param search_term: a dictionary of attributes and their values
+        :param limit: the maximum number of covers to yield
+        :param offset: the number of matching covers to skip
+        :return:
+        """
+        return StructureSearch.iter_search(self._covers, search_term, limit, offset)
+
     def __str__(self):
         cover_details = "\n".join(str(cover) for cover in self._covers)
         return (
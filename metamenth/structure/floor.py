@@ -7,7 +7,10 @@ from metamenth.utils import EntityRemover
 from metamenth.enumerations import BuildingEntity
 from metamenth.utils import EntityInsert
 from typing import Union
+from typing import Iterator
 from metamenth.utils import StructureSearch
+from metamenth.utils import IndexedEntityList
+from metamenth.utils import EntityList
 from typing import Dict
 from typing import List
 
@@ -45,8 +48,8 @@ class Floor(AbstractSpace):
         self._height = height
         self._number = None
         self._floor_type = None
-        self._open_spaces: List['OpenSpace'] = []
-        self._rooms: List['Room'] = []
+        self._open_spaces: List['OpenSpace'] = EntityList()
+        self._rooms: List['Room'] = EntityList()
 
         # apply validation
         self.number = number
@@ -131,6 +134,19 @@ class Floor(AbstractSpace):
         else:
             raise ValueError("rooms must be of type [Room]")
 
+    def enable_search_index(self, attributes: List[str] = None):
+        """
+        Indexes the rooms, open spaces and zones of this floor, and the entities in
+        its rooms and open spaces, by UID, name and other attributes for faster searches
+        :param attributes: the attributes indexed in addition to UID and name
+        :return:
+        """
+        IndexedEntityList.index_lists(self, ['_rooms', '_open_spaces', '_zones'], attributes)
+        self.schedulable_entity.enable_search_index(attributes)
+        for space in self._rooms + self._open_spaces:
+            space.enable_search_index(attributes)
+        return self
+
     def add_open_spaces(self, open_spaces: List['OpenSpace']):
         """
         Add one or multiple OpenSpaces to the floor.
@@ -204,6 +220,16 @@ class Floor(AbstractSpace):
         """
         return StructureSearch.search(self._rooms, search_term)
 
+    def iter_rooms(self, search_term: Dict = None, limit: int = None, offset: int = 0) -> Iterator[Room]:
+        """
+        Yields the rooms matching search terms one at a time, as get_rooms returns them
+        :param search_term: a dictionary of attributes and their values
+        :param limit: the maximum number of rooms to yield
+        :param offset: the number of matching rooms to skip
+        :return:
+        """
+        return StructureSearch.iter_search(self._rooms, search_term, limit, offset)
+
     def get_open_spaces(self, search_term: Dict = None) -> List[OpenSpace]:
         """
         Retrieves open spaces that match attributes and their values
@@ -212,6 +238,16 @@ class Floor(AbstractSpace):
         """
         return StructureSearch.search(self._open_spaces, search_term)
 
+    def iter_open_spaces(self, search_term: Dict = None, limit: int = None, offset: int = 0) -> Iterator[OpenSpace]:
+        """
+        Yields the open spaces matching search terms one at a time, as get_open_spaces returns them
+        :param search_term: a dictionary of attributes and their values
+        :param limit: the maximum number of open spaces to yield
+        :param offset: the number of matching open spaces to skip
+        :return:
+        """
+        return StructureSearch.iter_search(self._open_spaces, search_term, limit, offset)
+
     def accept(self, visitor):
         """
         visitor method to accept
@@ -1,10 +1,13 @@
 from typing import List
+from typing import Iterator
 from metamenth.structure.interfaces.abstract_space import AbstractSpace
 from metamenth.datatypes.interfaces.abstract_measure import AbstractMeasure
 from metamenth.utils import EntityRemover
 from metamenth.utils import EntityInsert
 from metamenth.measure_instruments.interfaces.abstract_reader import AbstractReader
 from metamenth.utils import StructureEntitySearch
+from metamenth.utils import IndexedEntityList
+from metamenth.utils import EntityList
 from typing import Dict
 from metamenth.datatypes.interfaces.abstract_dynamic_entity import AbstractDynamicEntity
 from metamenth.enumerations import BuildingEntity
@@ -43,11 +46,11 @@ class AbstractFloorSpace(AbstractSpace, AbstractDynamicEntity):
         AbstractDynamicEntity.__init__(self)
 
         self._name = None
-        self._adjacent_spaces: List[AbstractFloorSpace] = []
+        self._adjacent_spaces: List[AbstractFloorSpace] = EntityList()
         self._meter = meter
-        self._appliances: List[Appliance] = []
-        self._hvac_components: Union[List[AbstractHVACComponent], List[AbstractVentilationComponent]] = []
-        self._energy_systems: [AbstractCommonEnergySystem] = []
+        self._appliances: List[Appliance] = EntityList()
+        self._hvac_components: Union[List[AbstractHVACComponent], List[AbstractVentilationComponent]] = EntityList()
+        self._energy_systems: [AbstractCommonEnergySystem] = EntityList()
         # apply validation through setters
         self.name = name
 
@@ -89,6 +92,21 @@ class AbstractFloorSpace(AbstractSpace, AbstractDynamicEntity):
         elif isinstance(new_transducer, Actuator):
             raise ValueError(f'Actuators cannot be added to spaces directly')
 
+    def enable_search_index(self, attributes: List[str] = None):
+        """
+        Indexes the transducers, zones, adjacent spaces, appliances, hvac components and energy systems
+        of this space (and the transducers of its components) by UID, name and other attributes
+        for faster searches
+        :param attributes: the attributes indexed in addition to UID and name
+        :return:
+        """
+        AbstractDynamicEntity.enable_search_index(self, attributes)
+        IndexedEntityList.index_lists(self, ['_zones', '_adjacent_spaces', '_appliances', '_hvac_components',
+                                             '_energy_systems'], attributes)
+        self.schedulable_entity.enable_search_index(attributes)
+        for entity in self._appliances + self._hvac_components + self._energy_systems:
+            entity.enable_search_index(attributes)
+
     def add_adjacent_space(self, space: 'AbstractFloorSpace'):
         """
         specifies (adds) which spaces (room and open spaces) are adjacent to other spaces
@@ -148,6 +166,17 @@ class AbstractFloorSpace(AbstractSpace, AbstractDynamicEntity):
         """
         return StructureEntitySearch.search(self._hvac_components, search_terms)
 
+    def iter_hvac_components(self, search_terms: Dict = None, limit: int = None,
+                             offset: int = 0) -> Iterator[Union[AbstractHVACComponent, AbstractVentilationComponent]]:
+        """
+        Yields the hvac components matching search terms one at a time, as get_hvac_components returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of hvac components to yield
+        :param offset: the number of matching hvac components to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._hvac_components, search_terms, limit, offset)
+
     def get_adjacent_space_by_name(self, name) -> 'AbstractFloorSpace':
         """
         Search adjacent spaces by name
@@ -172,6 +201,17 @@ class AbstractFloorSpace(AbstractSpace, AbstractDynamicEntity):
         """
         return StructureEntitySearch.search(self._adjacent_spaces, search_terms)
 
+    def iter_adjacent_spaces(self, search_terms: Dict = None,
+                             limit: int = None, offset: int = 0) -> Iterator['AbstractFloorSpace']:
+        """
+        Yields the adjacent spaces matching search terms one at a time, as get_adjacent_spaces returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of adjacent spaces to yield
+        :param offset: the number of matching adjacent spaces to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._adjacent_spaces, search_terms, limit, offset)
+
     def get_appliance_by_name(self, name) -> Appliance:
         """
         Search appliances by name
@@ -196,6 +236,16 @@ class AbstractFloorSpace(AbstractSpace, AbstractDynamicEntity):
         """
         return StructureEntitySearch.search(self._appliances, search_terms)
 
+    def iter_appliances(self, search_terms: Dict = None, limit: int = None, offset: int = 0) -> Iterator[Appliance]:
+        """
+        Yields the appliances matching search terms one at a time, as get_appliances returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of appliances to yield
+        :param offset: the number of matching appliances to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._appliances, search_terms, limit, offset)
+
     def add_energy_system(self, energy_system: AbstractCommonEnergySystem):
         """
         adds energy system to floor spaces
@@ -220,6 +270,17 @@ class AbstractFloorSpace(AbstractSpace, AbstractDynamicEntity):
         """
         return StructureEntitySearch.search(self._energy_systems, search_terms)
 
+    def iter_energy_systems(self, search_terms: Dict = None,
+                            limit: int = None, offset: int = 0) -> Iterator[AbstractCommonEnergySystem]:
+        """
+        Yields the energy systems matching search terms one at a time, as get_energy_systems returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of energy systems to yield
+        :param offset: the number of matching energy systems to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._energy_systems, search_terms, limit, offset)
+
     def __eq__(self, other):
         # spaces on a floor are equal if they share the same name
         if isinstance(other, AbstractFloorSpace):
@@ -5,6 +5,8 @@ from metamenth.datatypes.interfaces.abstract_measure import AbstractMeasure
 from metamenth.datatypes.rated_device_measure import RatedDeviceMeasure
 from metamenth.datatypes.continuous_measure import ContinuousMeasure
 from metamenth.datatypes.interfaces.abstract_dynamic_entity import AbstractDynamicEntity
+from metamenth.utils import EntityList
+from metamenth.utils import EntityView
 
 
 class Appliance(AbstractSubsystem, AbstractDynamicEntity):
@@ -30,7 +32,7 @@ class Appliance(AbstractSubsystem, AbstractDynamicEntity):
         self._consumption_capacity = consumption_capacity
         self._rated_device_measure = rated_device_measure
         self._appliance_category: [ApplianceCategory] = []
-        self._operating_conditions: [ContinuousMeasure] = operating_conditions
+        self._operating_conditions: [ContinuousMeasure] = EntityList(operating_conditions)
 
         self.appliance_type = appliance_type
         self.appliance_category = appliance_category
@@ -82,12 +84,12 @@ class Appliance(AbstractSubsystem, AbstractDynamicEntity):
             raise ValueError("appliance_category should be a list of type ApplianceCategory")
 
     @property
-    def operating_conditions(self) -> [ContinuousMeasure]:
-        return self._operating_conditions.copy() if self._operating_conditions else []
+    def operating_conditions(self) -> EntityView:
+        return self._operating_conditions.view()
 
     @operating_conditions.setter
     def operating_conditions(self, value: [ContinuousMeasure]):
-        if value is not None and type(value) is list:
+        if value is not None and type(value) in (list, EntityView):
             self._operating_conditions.extend(value)
 
     def __str__(self):
@@ -1,10 +1,12 @@
 from metamenth.subsystem.hvac_components.interfaces.abstract_hvac_component import AbstractHVACComponent
 from typing import Dict
+from typing import Iterator
 from metamenth.subsystem.appliance import Appliance
 from typing import Union
 from metamenth.utils import StructureEntitySearch
 from metamenth.utils import EntityRemover
 from metamenth.utils import EntityInsert
+from metamenth.utils import EntityList
 from metamenth.enumerations import BuildingEntity
 from metamenth.datatypes.interfaces.abstract_measure import AbstractMeasure
 from metamenth.misc import Validate
@@ -15,7 +17,7 @@ class Controller(AbstractHVACComponent):
     def __init__(self, name: str):
         super().__init__(name)
         self._set_points: Dict[str, AbstractMeasure] = {}
-        self._controller_entities: [Union[AbstractHVACComponent, Appliance]] = []
+        self._controller_entities: [Union[AbstractHVACComponent, Appliance]] = EntityList()
 
     def add_set_point(self, set_point: AbstractMeasure, transducer_pair: tuple):
         """
@@ -81,6 +83,17 @@ class Controller(AbstractHVACComponent):
         """
         return StructureEntitySearch.search(self._controller_entities, search_terms)
 
+    def iter_controller_entities(self, search_terms: Dict = None, limit: int = None,
+                                 offset: int = 0) -> Iterator[Union[AbstractHVACComponent, Appliance]]:
+        """
+        Yields the controller entities matching search terms one at a time, as get_controller_entities returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of controller entities to yield
+        :param offset: the number of matching controller entities to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._controller_entities, search_terms, limit, offset)
+
     def control(self, control_obj: AbstractControl):
         """
         Executes various control strategies for building systems.
@@ -88,6 +101,20 @@ class Controller(AbstractHVACComponent):
         The currently existing contracting are for on/off controls and PID controls. This will be extended to include
         more complex control strategies.
         """
+        self.validate_control(control_obj)
+
+        end_time = time.time() + control_obj.run_duration * 3600 if control_obj.run_duration is not None else None
+        # Execute control logic in a loop
+        while end_time is None or time.time() < end_time:
+            process_value = control_obj.acquire_process_value_data()
+            control_obj.execute_control(process_value)
+            time.sleep(control_obj.process_value_sensor.data_frequency)
+
+    def validate_control(self, control_obj: AbstractControl):
+        """
+        Checks that a control strategy can be executed by this controller, e.g., before it is scheduled
+        :param control_obj: the control strategy
+        """
         # Ensure the process value sensor is specified
         if not control_obj.process_value_sensor:
             raise ValueError('Sensor for process variable must be specified')
@@ -107,13 +134,6 @@ class Controller(AbstractHVACComponent):
         if not control_obj.process_value_sensor.data_frequency:
             raise ValueError('Data frequency for the process variable sensor must be specified')
 
-        end_time = time.time() + control_obj.run_duration * 3600 if control_obj.run_duration is not None else None
-        # Execute control logic in a loop
-        while end_time is None or time.time() < end_time:
-            process_value = control_obj.acquire_process_value_data()
-            control_obj.execute_control(process_value)
-            time.sleep(control_obj.process_value_sensor.data_frequency)
-
 
     def __str__(self):
         return (
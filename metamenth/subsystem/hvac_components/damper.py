@@ -2,8 +2,10 @@ from metamenth.subsystem.hvac_components.interfaces.abstract_hvac_component impo
 from metamenth.enumerations import DamperType
 from metamenth.measure_instruments.damper_position import DamperPosition
 from typing import List
+from typing import Iterator
 from typing import Dict
 from metamenth.utils import StructureEntitySearch
+from metamenth.utils import TimestampIndex
 
 
 class Damper(AbstractHVACComponent):
@@ -16,6 +18,7 @@ class Damper(AbstractHVACComponent):
         super().__init__(name)
         self._damper_type = None
         self._percentage_opened: [DamperPosition] = []
+        self._percentage_opened_index = TimestampIndex()
 
         self.damper_type = damper_type
 
@@ -31,10 +34,12 @@ class Damper(AbstractHVACComponent):
             raise ValueError("damper_type must be of type DamperType")
 
     def add_damper_position(self, damper_position: DamperPosition):
-        return self._percentage_opened.append(damper_position)
+        self._percentage_opened.append(damper_position)
+        self._percentage_opened_index.add(damper_position)
 
     def remove_damper_position(self, damper_position: DamperPosition):
         self._percentage_opened.remove(damper_position)
+        self._percentage_opened_index.remove(damper_position)
 
     def get_damper_positions(self, search_terms: Dict = None) -> List[DamperPosition]:
         """
@@ -44,6 +49,17 @@ class Damper(AbstractHVACComponent):
         """
         return StructureEntitySearch.search(self._percentage_opened, search_terms)
 
+    def iter_damper_positions(self, search_terms: Dict = None,
+                              limit: int = None, offset: int = 0) -> Iterator[DamperPosition]:
+        """
+        Yields the damper positions matching search terms one at a time, as get_damper_positions returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of damper positions to yield
+        :param offset: the number of matching damper positions to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._percentage_opened, search_terms, limit, offset)
+
     def get_damper_positions_by_date(self, from_timestamp: str, to_timestamp: str = None) -> List[DamperPosition]:
         """
         searches damper positions data based on provided timestamp
@@ -51,7 +67,20 @@ class Damper(AbstractHVACComponent):
         :param to_timestamp: the end timestamp
         :return: [DamperPosition]
         """
-        return StructureEntitySearch.date_range_search(self._percentage_opened, from_timestamp, to_timestamp)
+        return StructureEntitySearch.date_range_search(self._percentage_opened_index, from_timestamp, to_timestamp)
+
+    def iter_damper_positions_by_date(self, from_timestamp: str, to_timestamp: str = None, limit: int = None,
+                                      offset: int = 0) -> Iterator[DamperPosition]:
+        """
+        Yields the damper positions recorded within a time interval, as get_damper_positions_by_date returns them
+        :param from_timestamp: the start timestamp
+        :param to_timestamp: the end timestamp
+        :param limit: the maximum number of damper positions to yield
+        :param offset: the number of damper positions to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_date_range(self._percentage_opened_index, from_timestamp, to_timestamp,
+                                                     limit, offset)
 
     def __str__(self):
         return (
@@ -7,12 +7,15 @@ from metamenth.subsystem.hvac_components.damper import Damper
 from metamenth.subsystem.hvac_components.fan import Fan
 from metamenth.subsystem.hvac_components.heat_exchanger import HeatExchanger
 from typing import List
+from typing import Iterator
 from metamenth.subsystem.hvac_components.duct_connection import DuctConnection
 from metamenth.utils import EntityInsert
 from metamenth.utils import EntityRemover
 from metamenth.enumerations import BuildingEntity
 from typing import Dict
 from metamenth.utils import StructureEntitySearch
+from metamenth.utils import IndexedEntityList
+from metamenth.utils import EntityList
 from metamenth.subsystem.hvac_components.air_volume_box import AirVolumeBox
 from metamenth.subsystem.hvac_components.filter import Filter
 from metamenth.subsystem.hvac_components.anemometer import Anemometer
@@ -35,12 +38,12 @@ class Duct(AbstractDynamicEntity, AbstractZonalEntity):
         self._width = None
         self._diameter = None
         self._shape = None
-        self._heat_exchangers: List[HeatExchanger] = []
-        self._fans: List[Fan] = []
-        self._dampers: List[Damper] = []
-        self._connected_air_volume_box: [AirVolumeBox] = []
-        self._filters: [Filter] = []
-        self._anemometers: [Anemometer] = []
+        self._heat_exchangers: List[HeatExchanger] = EntityList()
+        self._fans: List[Fan] = EntityList()
+        self._dampers: List[Damper] = EntityList()
+        self._connected_air_volume_box: [AirVolumeBox] = EntityList()
+        self._filters: [Filter] = EntityList()
+        self._anemometers: [Anemometer] = EntityList()
         self._is_insulated = False
         self.name = name
         self.duct_type = duct_type
@@ -197,6 +200,16 @@ class Duct(AbstractDynamicEntity, AbstractZonalEntity):
         """
         return StructureEntitySearch.search(self._filters, search_terms)
 
+    def iter_filters(self, search_terms: Dict = None, limit: int = None, offset: int = 0) -> Iterator[Filter]:
+        """
+        Yields the filters matching search terms one at a time, as get_filters returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of filters to yield
+        :param offset: the number of matching filters to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._filters, search_terms, limit, offset)
+
     def add_fan(self, new_fan: Fan):
         """
         Adds fans
@@ -262,6 +275,19 @@ class Duct(AbstractDynamicEntity, AbstractZonalEntity):
         """
         EntityRemover.remove_building_entity(self._anemometers, anemometer)
 
+    def enable_search_index(self, attributes: List[str] = None):
+        """
+        Indexes the transducers, zones and components of this duct
+        by UID, name and other attributes for faster searches
+        :param attributes: the attributes indexed in addition to UID and name
+        :return:
+        """
+        AbstractDynamicEntity.enable_search_index(self, attributes)
+        IndexedEntityList.index_lists(self, ['_zones', '_heat_exchangers', '_fans', '_dampers',
+                                             '_connected_air_volume_box', '_filters', '_anemometers'], attributes)
+        for component in self._heat_exchangers + self._fans + self._dampers + self._filters:
+            component.enable_search_index(attributes)
+
     def get_heat_exchangers(self, search_terms: Dict = None) -> [HeatExchanger]:
         """
         Search heat exchangers by attribute values
@@ -270,6 +296,17 @@ class Duct(AbstractDynamicEntity, AbstractZonalEntity):
         """
         return StructureEntitySearch.search(self._heat_exchangers, search_terms)
 
+    def iter_heat_exchangers(self, search_terms: Dict = None,
+                             limit: int = None, offset: int = 0) -> Iterator[HeatExchanger]:
+        """
+        Yields the heat exchangers matching search terms one at a time, as get_heat_exchangers returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of heat exchangers to yield
+        :param offset: the number of matching heat exchangers to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._heat_exchangers, search_terms, limit, offset)
+
     def get_dampers(self, search_terms: Dict = None) -> [Damper]:
         """
         Search dampers by attribute values
@@ -278,6 +315,16 @@ class Duct(AbstractDynamicEntity, AbstractZonalEntity):
         """
         return StructureEntitySearch.search(self._dampers, search_terms)
 
+    def iter_dampers(self, search_terms: Dict = None, limit: int = None, offset: int = 0) -> Iterator[Damper]:
+        """
+        Yields the dampers matching search terms one at a time, as get_dampers returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of dampers to yield
+        :param offset: the number of matching dampers to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._dampers, search_terms, limit, offset)
+
     def get_fans(self, search_terms: Dict = None) -> [Fan]:
         """
         Search fans by attribute values
@@ -286,6 +333,16 @@ class Duct(AbstractDynamicEntity, AbstractZonalEntity):
         """
         return StructureEntitySearch.search(self._fans, search_terms)
 
+    def iter_fans(self, search_terms: Dict = None, limit: int = None, offset: int = 0) -> Iterator[Fan]:
+        """
+        Yields the fans matching search terms one at a time, as get_fans returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of fans to yield
+        :param offset: the number of matching fans to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._fans, search_terms, limit, offset)
+
     def get_anemometers(self, search_terms: Dict = None) -> [Anemometer]:
         """
         Search anemometers by attribute values
@@ -294,6 +351,16 @@ class Duct(AbstractDynamicEntity, AbstractZonalEntity):
         """
         return StructureEntitySearch.search(self._anemometers, search_terms)
 
+    def iter_anemometers(self, search_terms: Dict = None, limit: int = None, offset: int = 0) -> Iterator[Anemometer]:
+        """
+        Yields the anemometers matching search terms one at a time, as get_anemometers returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of anemometers to yield
+        :param offset: the number of matching anemometers to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._anemometers, search_terms, limit, offset)
+
     def get_connected_air_volume_boxes(self, search_terms: Dict = None) -> [AirVolumeBox]:
         """
         Search air volume boxes by attribute values
@@ -302,6 +369,18 @@ class Duct(AbstractDynamicEntity, AbstractZonalEntity):
         """
         return StructureEntitySearch.search(self._connected_air_volume_box, search_terms)
 
+    def iter_connected_air_volume_boxes(self, search_terms: Dict = None,
+                                        limit: int = None, offset: int = 0) -> Iterator[AirVolumeBox]:
+        """
+        Yields the connected air volume boxes matching search terms one at a time,
+        as get_connected_air_volume_boxes returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of connected air volume boxes to yield
+        :param offset: the number of matching connected air volume boxes to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._connected_air_volume_box, search_terms, limit, offset)
+
     def __eq__(self, other):
         # ducts are equal if they share the same name
         if isinstance(other, Duct):
@@ -12,6 +12,7 @@ from metamenth.subsystem.hvac_components.chiller import Chiller
 from metamenth.subsystem.hvac_components.boiler import Boiler
 from metamenth.utils import StructureEntitySearch
 from typing import Dict
+from typing import Iterator
 from metamenth.subsystem.hvac_components.fan_coil_unit import FanCoilUnit
 
 
@@ -69,6 +70,16 @@ class DuctConnection:
         """
         return StructureEntitySearch.search(self._source_entities, search_terms)
 
+    def iter_source_entities(self, search_terms: Dict = None, limit: int = None, offset: int = 0) -> Iterator:
+        """
+        Yields the source entities matching search terms one at a time, as get_source_entities returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of source entities to yield
+        :param offset: the number of matching source entities to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._source_entities, search_terms, limit, offset)
+
     def get_destination_entities(self, search_terms: Dict = None):
         """
         Search destination entities by attribute values
@@ -77,6 +88,16 @@ class DuctConnection:
         """
         return StructureEntitySearch.search(self._destination_entities, search_terms)
 
+    def iter_destination_entities(self, search_terms: Dict = None, limit: int = None, offset: int = 0) -> Iterator:
+        """
+        Yields the destination entities matching search terms one at a time, as get_destination_entities returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of destination entities to yield
+        :param offset: the number of matching destination entities to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._destination_entities, search_terms, limit, offset)
+
     @property
     def is_loop(self) -> bool:
         return self._is_loop
@@ -1,12 +1,16 @@
 from uuid import uuid4
 from metamenth.datatypes.rated_device_measure import RatedDeviceMeasure
 from typing import List
+from typing import Iterator
 from typing import Dict
 from metamenth.datatypes.continuous_measure import ContinuousMeasure
 from metamenth.measure_instruments.meter import Meter
 from metamenth.utils import StructureEntitySearch
 from metamenth.utils import EntityRemover
 from metamenth.utils import EntityInsert
+from metamenth.utils import TimestampIndex
+from metamenth.utils import EntityList
+from metamenth.utils import EntityView
 from metamenth.datatypes.interfaces.abstract_dynamic_entity import AbstractDynamicEntity
 from metamenth.enumerations import BuildingEntity
 from metamenth.measure_instruments.status_measure import StatusMeasure
@@ -22,9 +26,10 @@ class AbstractHVACComponent(AbstractDynamicEntity):
         self._meter = meter
         self._rated_device_measure = rated_device_measure
         self._schedulable_entity = SchedulableEntity()
-        self._operating_conditions: List[ContinuousMeasure] = []
-        self._spaces = []
-        self._status_measure: [StatusMeasure] = []
+        self._operating_conditions: List[ContinuousMeasure] = EntityList()
+        self._spaces = EntityList()
+        self._status_measure: [StatusMeasure] = EntityList()
+        self._status_measure_index = TimestampIndex()
 
         self.name = name
 
@@ -60,12 +65,12 @@ class AbstractHVACComponent(AbstractDynamicEntity):
         self._rated_device_measure = value
 
     @property
-    def operating_conditions(self) -> [ContinuousMeasure]:
-        return self._operating_conditions.copy() if self._operating_conditions else []
+    def operating_conditions(self) -> EntityView:
+        return self._operating_conditions.view()
 
     @operating_conditions.setter
     def operating_conditions(self, value: [ContinuousMeasure]):
-        if value is not None and type(value) is list:
+        if value is not None and type(value) in (list, EntityView):
             self._operating_conditions.extend(value)
 
     @property
@@ -103,6 +108,16 @@ class AbstractHVACComponent(AbstractDynamicEntity):
         """
         return StructureEntitySearch.search(self._spaces, search_terms)
 
+    def iter_spaces(self, search_terms: Dict = None, limit: int = None, offset: int = 0) -> Iterator:
+        """
+        Yields the spaces matching search terms one at a time, as get_spaces returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of spaces to yield
+        :param offset: the number of matching spaces to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._spaces, search_terms, limit, offset)
+
     def add_status_measure(self, status: StatusMeasure):
         """
         Adds status of hvac component schedule to this building
@@ -110,6 +125,7 @@ class AbstractHVACComponent(AbstractDynamicEntity):
         :return:
         """
         EntityInsert.insert_building_entity(self._status_measure, status)
+        self._status_measure_index.add(status)
         return self
 
     def remove_status_measure(self, status):
@@ -119,6 +135,7 @@ class AbstractHVACComponent(AbstractDynamicEntity):
         :return:
         """
         EntityRemover.remove_building_entity(self._status_measure, status)
+        self._status_measure_index.remove(status)
 
     def get_status_measure(self, search_terms: Dict = None) -> [StatusMeasure]:
         """
@@ -128,6 +145,17 @@ class AbstractHVACComponent(AbstractDynamicEntity):
         """
         return StructureEntitySearch.search(self._status_measure, search_terms)
 
+    def iter_status_measure(self, search_terms: Dict = None,
+                            limit: int = None, offset: int = 0) -> Iterator[StatusMeasure]:
+        """
+        Yields the status measure matching search terms one at a time, as get_status_measure returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of status measure to yield
+        :param offset: the number of matching status measure to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._status_measure, search_terms, limit, offset)
+
     def get_status_measure_by_date(self, from_timestamp: str, to_timestamp: str = None) -> [StatusMeasure]:
         """
         searches status data based on provided timestamp
@@ -135,7 +163,20 @@ class AbstractHVACComponent(AbstractDynamicEntity):
         :param to_timestamp: the end timestamp
         :return: [StatusMeasure]
         """
-        return StructureEntitySearch.date_range_search(self._status_measure, from_timestamp, to_timestamp)
+        return StructureEntitySearch.date_range_search(self._status_measure_index, from_timestamp, to_timestamp)
+
+    def iter_status_measure_by_date(self, from_timestamp: str, to_timestamp: str = None, limit: int = None,
+                                    offset: int = 0) -> Iterator[StatusMeasure]:
+        """
+        Yields the status measures recorded within a time interval, as get_status_measure_by_date returns them
+        :param from_timestamp: the start timestamp
+        :param to_timestamp: the end timestamp
+        :param limit: the maximum number of status measures to yield
+        :param offset: the number of status measures to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_date_range(self._status_measure_index, from_timestamp, to_timestamp,
+                                                     limit, offset)
 
     def __eq__(self, other):
         # subsystems are equal if they share the same name
@@ -1,21 +1,23 @@
 from uuid import uuid4
 from typing import List
 from metamenth.subsystem.ventilation_system import VentilationSystem
+from metamenth.utils import EntityList
+from metamenth.utils import EntityView
 
 
 class HVACSystem:
 
     def __init__(self):
         self._UID = str(uuid4())
-        self._ventilation_systems: List[VentilationSystem] = []
+        self._ventilation_systems: List[VentilationSystem] = EntityList()
 
     @property
     def UID(self) -> str:
         return self._UID
 
     @property
-    def ventilation_systems(self) -> [VentilationSystem]:
-        return self._ventilation_systems.copy() if self._ventilation_systems else []
+    def ventilation_systems(self) -> EntityView:
+        return self._ventilation_systems.view()
 
     def add_ventilation_system(self, ventilation_system:  VentilationSystem):
         if ventilation_system is not None:
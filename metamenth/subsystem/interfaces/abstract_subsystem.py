@@ -1,8 +1,9 @@
 from uuid import uuid4
 from abc import ABC
+from metamenth.utils import IndexedEntity
 
 
-class AbstractSubsystem(ABC):
+class AbstractSubsystem(IndexedEntity, ABC):
     def __init__(self, name: str):
         """
         Defines parent class of all subsystems
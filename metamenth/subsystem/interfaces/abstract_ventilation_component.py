@@ -2,6 +2,8 @@ from uuid import uuid4
 from typing import List
 from metamenth.datatypes.continuous_measure import ContinuousMeasure
 from metamenth.datatypes.interfaces.abstract_dynamic_entity import AbstractDynamicEntity
+from metamenth.utils import EntityList
+from metamenth.utils import EntityView
 
 
 class AbstractVentilationComponent(AbstractDynamicEntity):
@@ -10,7 +12,7 @@ class AbstractVentilationComponent(AbstractDynamicEntity):
         super().__init__()
         self._UID = str(uuid4())
         self._name = None
-        self._operating_conditions: List[ContinuousMeasure] = []
+        self._operating_conditions: List[ContinuousMeasure] = EntityList()
 
         self.name = name
 
@@ -30,12 +32,12 @@ class AbstractVentilationComponent(AbstractDynamicEntity):
             raise ValueError("name must be of type str")
 
     @property
-    def operating_conditions(self) -> [ContinuousMeasure]:
-        return self._operating_conditions.copy() if self._operating_conditions else []
+    def operating_conditions(self) -> EntityView:
+        return self._operating_conditions.view()
 
     @operating_conditions.setter
     def operating_conditions(self, value: [ContinuousMeasure]):
-        if value is not None and type(value) is list:
+        if value is not None and type(value) in (list, EntityView):
             self._operating_conditions.extend(value)
 
     def __eq__(self, other):
@@ -5,7 +5,9 @@ from metamenth.subsystem.interfaces.abstract_ventilation_component import Abstra
 from metamenth.utils import EntityRemover
 from metamenth.utils import EntityInsert
 from metamenth.utils import StructureEntitySearch
+from metamenth.utils import EntityList
 from typing import Dict
+from typing import Iterator
 from typing import Union
 from metamenth.energysystem.engine import Engine
 from typing import List
@@ -21,7 +23,7 @@ class VentilationSystem:
         self._UID = str(uuid4())
         self._ventilation_type = None
         self._principal_duct = None
-        self._components: [Union[AbstractVentilationComponent, Engine]] = []
+        self._components: [Union[AbstractVentilationComponent, Engine]] = EntityList()
 
         self.ventilation_type = ventilation_type
         self.principal_duct = principal_duct
@@ -60,6 +62,17 @@ class VentilationSystem:
         """
         return StructureEntitySearch.search(self._components, search_terms)
 
+    def iter_components(self, search_terms: Dict = None,
+                        limit: int = None, offset: int = 0) -> Iterator[Union[AbstractVentilationComponent, Engine]]:
+        """
+        Yields the components matching search terms one at a time, as get_components returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of components to yield
+        :param offset: the number of matching components to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._components, search_terms, limit, offset)
+
     def add_component(self, component: Union[AbstractVentilationComponent, Engine]):
         """
         Adds a ventilation component to the ventilation system
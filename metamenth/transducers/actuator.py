@@ -4,6 +4,8 @@ from metamenth.subsystem.hvac_components.interfaces.abstract_hvac_component impo
 from metamenth.subsystem.hvac_components.controller import Controller
 from typing import Union
 from metamenth.subsystem.appliance import Appliance
+from metamenth.measure_instruments.trigger_history import TriggerHistory
+from metamenth.storage.list_time_series_store import ListTimeSeriesStore
 
 
 class Actuator(AbstractTransducer, ABC):
@@ -22,6 +24,7 @@ class Actuator(AbstractTransducer, ABC):
         :param trigger_output: the device or equipment which is actuated
         """
         super().__init__(name)
+        self._data = ListTimeSeriesStore(TriggerHistory)
         self._trigger_output = trigger_output
         self._controller = None
         self._actuation_interval = actuation_interval
@@ -1,16 +1,30 @@
+from __future__ import annotations
 from abc import ABC
 from typing import Dict, Any
+from typing import Iterator
 from metamenth.datatypes.continuous_measure import ContinuousMeasure
 from uuid import uuid4
 import sys
 from metamenth.utils import StructureEntitySearch
 from typing import List
 from typing import Union
+from typing import Tuple
 from metamenth.measure_instruments.sensor_data import SensorData
 from metamenth.measure_instruments.trigger_history import TriggerHistory
+from metamenth.storage.interfaces.abstract_time_series_store import AbstractTimeSeriesStore
+from metamenth.storage.list_time_series_store import ListTimeSeriesStore
+from metamenth.storage.time_series_reader import TimeSeriesReader
+from metamenth.storage.time_series_rollup import TimeSeriesRollup
+from metamenth.enumerations import RollupResolution
+from metamenth.datatypes.rollup_bucket import RollupBucket
+from typing import TYPE_CHECKING
+from metamenth.utils import IndexedEntity
 
+if TYPE_CHECKING:
+    import numpy as np
 
-class AbstractTransducer(ABC):
+
+class AbstractTransducer(IndexedEntity, ABC):
     def __init__(self,
                  name: str,
                  registry_id: str = None,
@@ -35,15 +49,66 @@ class AbstractTransducer(ABC):
         self.output_current_range = output_current_range
         self.output_voltage_range = output_voltage_range
         self.meta_data: Dict[str, Any] = {}
-        self._data = []
+        self._data: AbstractTimeSeriesStore = ListTimeSeriesStore()
+        self._rollup = TimeSeriesRollup()
+
+    @property
+    def data_store(self) -> AbstractTimeSeriesStore:
+        return self._data
+
+    @data_store.setter
+    def data_store(self, value: AbstractTimeSeriesStore):
+        """
+        Replaces the backend holding the data of this transducer, e.g., with a ColumnarTimeSeriesStore.
+        Data already recorded is moved to the new store
+        """
+        if value is None:
+            raise ValueError('data_store must be of type AbstractTimeSeriesStore')
+        if value is not self._data:
+            value.add(self._data.get_records())
+            self._rollup.invalidate()
+        self._data = value
 
     def add_data(self, data: Union[List[TriggerHistory], List[SensorData]]):
         if data is None:
             raise ValueError('data should be a list of SensorData or TriggerHistory')
-        self._data.extend(data)
+        self._data.add(data)
+        self._rollup.add(data)
+
+    def add_data_arrays(self, timestamps, values, timestamp_format: str = None, tags: Dict[str, Any] = None):
+        """
+        Adds readings given as columns (e.g., numpy arrays) to the data store of this transducer,
+        without building a SensorData or TriggerHistory object for each reading
+        :param timestamps: the timestamps of the readings, as strings, datetimes or datetime64 values
+        :param values: the numeric values of the readings
+        :param timestamp_format: the optional strptime format of timestamp strings
+        :param tags: other attributes of the readings (e.g., trigger_type), either one value
+        for all the readings or one value per reading
+        """
+        timestamps, values = TimeSeriesReader.to_arrays(timestamps, values, timestamp_format)
+        self._data.add_arrays(timestamps, values, tags)
+        self._rollup.add_arrays(timestamps, values)
+
+    def add_data_from_csv(self, file_path: str, timestamp_column: Union[str, int] = 'timestamp',
+                          value_column: Union[str, int] = 'value', timestamp_format: str = None,
+                          delimiter: str = ',', tags: Dict[str, Any] = None):
+        """
+        Adds the readings of a csv file (e.g., a trend log export) to the data store of this transducer
+        :param file_path: the path of the csv file
+        :param timestamp_column: the name or position of the timestamp column
+        :param value_column: the name or position of the value column
+        :param timestamp_format: the optional strptime format of the timestamps
+        :param delimiter: the column delimiter
+        :param tags: other attributes of the readings, e.g., trigger_type
+        """
+        timestamps, values = TimeSeriesReader.read_csv(file_path, timestamp_column, value_column,
+                                                       timestamp_format, delimiter)
+        self._data.add_arrays(timestamps, values, tags)
+        self._rollup.add_arrays(timestamps, values)
 
     def remove_data(self, data: Union[TriggerHistory, SensorData]):
         self._data.remove(data)
+        self._rollup.invalidate()
 
     def add_meta_data(self, key, value):
         """
@@ -71,7 +136,18 @@ class AbstractTransducer(ABC):
         :param search_terms: a dictionary of attributes and their values
         :return [SensorData|TriggerHistory]:
         """
-        return StructureEntitySearch.search(self._data, search_terms)
+        return StructureEntitySearch.search(self._data.get_records(), search_terms)
+
+    def iter_data(self, search_terms: Dict = None,
+                  limit: int = None, offset: int = 0) -> Iterator[Union[SensorData, TriggerHistory]]:
+        """
+        Yields the data matching search terms one at a time, as get_data returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of data to yield
+        :param offset: the number of matching data to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._data.iter_records(), search_terms, limit, offset)
 
     def get_data_by_date(self, from_timestamp: str, to_timestamp: str = None) -> Union[List[SensorData],
                                                                                        List[TriggerHistory]]:
@@ -81,7 +157,52 @@ class AbstractTransducer(ABC):
         :param to_timestamp: the end timestamp
         :return: [SensorData|TriggerHistory]
         """
-        return StructureEntitySearch.date_range_search(self._data, from_timestamp, to_timestamp)
+        from_tp, to_tp = StructureEntitySearch.parse_date_range(from_timestamp, to_timestamp)
+        return self._data.get_records_by_date(from_tp, to_tp)
+
+    def iter_data_by_date(self, from_timestamp: str, to_timestamp: str = None, limit: int = None,
+                          offset: int = 0) -> Iterator[Union[SensorData, TriggerHistory]]:
+        """
+        Yields the data recorded within a time interval, as get_data_by_date returns them
+        :param from_timestamp: the start timestamp
+        :param to_timestamp: the end timestamp
+        :param limit: the maximum number of data to yield
+        :param offset: the number of data to skip
+        :return:
+        """
+        from_tp, to_tp = StructureEntitySearch.parse_date_range(from_timestamp, to_timestamp)
+        return StructureEntitySearch.paginate(self._data.iter_records(from_tp, to_tp), limit, offset)
+
+    def get_data_arrays(self, from_timestamp: str = None, to_timestamp: str = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the data of this transducer as arrays, without building SensorData or TriggerHistory objects
+        :param from_timestamp: the optional start timestamp
+        :param to_timestamp: the optional end timestamp
+        :return: the timestamps (datetime64[s]) and values (float64)
+        """
+        if from_timestamp is None:
+            if to_timestamp is None:
+                return self._data.get_arrays()
+            # the upper bound alone, with the end of day of dates without time
+            return self._data.get_arrays(None, StructureEntitySearch.parse_date_range(to_timestamp, to_timestamp)[1])
+        from_tp, to_tp = StructureEntitySearch.parse_date_range(from_timestamp, to_timestamp)
+        return self._data.get_arrays(from_tp, to_tp)
+
+    def get_rollups(self, resolution: RollupResolution, from_timestamp: str = None,
+                    to_timestamp: str = None) -> List[RollupBucket]:
+        """
+        Returns the hourly, daily or monthly aggregates of the numeric data of this transducer
+        :param resolution: the bucket size
+        :param from_timestamp: the start timestamp of the buckets, all the buckets are returned without it
+        :param to_timestamp: the end timestamp of the buckets
+        :return: [RollupBucket]
+        """
+        if not self._rollup.built:
+            self._rollup.rebuild_from_store(self._data)
+        if from_timestamp is None:
+            return self._rollup.get_buckets(resolution)
+        from_tp, to_tp = StructureEntitySearch.parse_date_range(from_timestamp, to_timestamp)
+        return self._rollup.get_buckets(resolution, from_tp, to_tp)
 
     def get(self, attribute):
         return getattr(self, attribute, None)
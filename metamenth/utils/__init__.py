@@ -1,4 +1,11 @@
+from .entity_list import EntityList
+from .entity_view import EntityView
 from .entity_remover import EntityRemover
 from .entity_insert import EntityInsert
 from .search.structure_search import StructureSearch
+from .search.query import Query
+from .search.criteria_matcher import CriteriaMatcher
 from .search.structure_entity_search import StructureEntitySearch
+from .search.timestamp_index import TimestampIndex
+from .search.indexed_entity import IndexedEntity
+from .search.indexed_entity_list import IndexedEntityList
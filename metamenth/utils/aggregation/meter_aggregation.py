@@ -0,0 +1,196 @@
+from __future__ import annotations
+from datetime import timedelta
+from typing import List
+from typing import Tuple
+from metamenth.datatypes.aligned_readings import AlignedReadings
+from metamenth.enumerations import MeasurementUnit
+from metamenth.storage.time_series_rollup import TimeSeriesRollup
+from metamenth.utils.search.structure_entity_search import StructureEntitySearch
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# the quantity measured in each unit, the scale of the unit to the base unit of the quantity
+# (joules, cubic meters), and whether the unit is a rate of the quantity per second
+_UNIT_SCALES = {
+    MeasurementUnit.WATTS: ('energy', 1.0, True),
+    MeasurementUnit.KILOWATTS: ('energy', 1e3, True),
+    MeasurementUnit.MEGAWATTS: ('energy', 1e6, True),
+    MeasurementUnit.KILOWATTS_PER_HOUR: ('energy', 3.6e6, False),
+    MeasurementUnit.CUBIC_METER_PER_SECOND: ('volume', 1.0, True),
+    MeasurementUnit.LITERS_PER_SECOND: ('volume', 1e-3, True),
+    MeasurementUnit.CUBIC_METERS_PER_HOUR: ('volume', 1 / 3600, True),
+    MeasurementUnit.CUBIC_FEET_PER_MINUTE: ('volume', 0.028316846592 / 60, True),
+    MeasurementUnit.GALLONS_PER_SECOND: ('volume', 0.003785411784, True),
+    MeasurementUnit.CUBIC_METER: ('volume', 1.0, False),
+    MeasurementUnit.LITER: ('volume', 1e-3, False),
+    MeasurementUnit.CUBIC_CENTIMETER: ('volume', 1e-6, False),
+    MeasurementUnit.CUBIC_FEET: ('volume', 0.028316846592, False),
+}
+
+
+class MeterAggregation:
+    """
+    Aligns the readings of many meters (e.g., the electricity meters of a building or a portfolio)
+    on a common time grid with numpy, so they are summed, averaged or subtracted as arrays.
+
+    Readings of rates (e.g., kW, l/s) are averaged over each interval of the grid, readings of
+    quantities (e.g., kWh, m3) are summed, and accumulated data is first turned into the consumption
+    between readings. Intervals are labelled with their start. Rates are held for the measurement
+    frequency of their meter from their timestamp, and quantities are the consumption of the
+    measurement frequency before their timestamp, spread over the intervals it overlaps. Meters
+    read less often than the grid still fill each interval, and grids of any frequency add up to
+    the same consumption.
+    Readings are converted to the requested unit, rates and quantities being converted to each
+    other with the length of the intervals (e.g., kW meters and kWh meters are aligned in kWh).
+    Frequencies are in seconds.
+    """
+
+    @staticmethod
+    def align(meters: List, frequency: float = None, from_timestamp: str = None, to_timestamp: str = None,
+              unit: MeasurementUnit = None) -> AlignedReadings:
+        """
+        Aligns the readings of meters on a common time grid
+        :param meters: the meters
+        :param frequency: the length of the intervals of the grid in seconds, defaults to the longest
+        measurement frequency of the meters
+        :param from_timestamp: the start timestamp, defaults to the first reading
+        :param to_timestamp: the end timestamp, defaults to now if from_timestamp is given, else to the last reading
+        :param unit: the unit of the aligned readings, defaults to the measurement unit of the first meter
+        :return: AlignedReadings
+        """
+        import numpy as np
+        meters = list(meters)
+        if frequency is None:
+            frequency = max((meter.measurement_frequency for meter in meters), default=3600)
+        if frequency < 1:
+            raise ValueError('frequency must be at least one second')
+        step = int(frequency)
+        if unit is None and meters:
+            unit = meters[0].measurement_unit
+        for meter in meters:
+            MeterAggregation._check_unit(meter.measurement_unit, unit)
+
+        from_tp = to_tp = None
+        if from_timestamp is not None:
+            from_tp, to_tp = StructureEntitySearch.parse_date_range(from_timestamp, to_timestamp)
+        readings = [MeterAggregation._readings(meter, from_tp, to_tp, step) for meter in meters]
+
+        # the seconds covered by the readings: rates from their timestamp, quantities up to it
+        first, last = [], []
+        for meter, (seconds, _) in zip(meters, readings):
+            if len(seconds):
+                duration = 0 if MeterAggregation._scale(meter)[1] else MeterAggregation._duration(meter)
+                first.append(int(seconds[0] - duration))
+                last.append(int(seconds[-1] - min(duration, 1)))
+        start = MeterAggregation._seconds(from_tp) if from_tp is not None else min(first, default=None)
+        end = MeterAggregation._seconds(to_tp) if to_tp is not None else max(last, default=None)
+        if start is None or end < start:
+            return AlignedReadings(np.array([], dtype='datetime64[s]'), np.empty((0, len(meters))),
+                                   [meter.UID for meter in meters], unit, step)
+        start -= start % step
+        count = (end - start) // step + 1
+
+        values = np.full((count, len(meters)), np.nan)
+        for column, (meter, (seconds, meter_values)) in enumerate(zip(meters, readings)):
+            values[:, column] = MeterAggregation._resample(meter, seconds, meter_values, start, step, count, unit)
+        timestamps = (start + step * np.arange(count, dtype=np.int64)).astype('datetime64[s]')
+        return AlignedReadings(timestamps, values, [meter.UID for meter in meters], unit, step)
+
+    @staticmethod
+    def _check_unit(meter_unit: MeasurementUnit, unit: MeasurementUnit):
+        if meter_unit == unit:
+            return
+        if (meter_unit not in _UNIT_SCALES or unit not in _UNIT_SCALES or
+                _UNIT_SCALES[meter_unit][0] != _UNIT_SCALES[unit][0]):
+            raise ValueError(f'{meter_unit.value} readings cannot be converted to {unit.value}')
+
+    @staticmethod
+    def _scale(meter) -> Tuple[float, bool]:
+        """
+        Returns the scale of the readings of a meter to the base unit of their quantity, and whether they are rates
+        """
+        _, scale, rate = _UNIT_SCALES.get(meter.measurement_unit, (None, 1.0, not meter.data_accumulated))
+        if meter.data_accumulated and rate:
+            # registers labelled with a rate accumulate the rate over hours, e.g., kW as kWh
+            rate, scale = False, scale * 3600
+        return scale, rate
+
+    @staticmethod
+    def _duration(meter) -> float:
+        """
+        Returns the seconds covered by a reading of a meter, at least the second before a quantity
+        """
+        return max(float(meter.measurement_frequency or 0), 1.0)
+
+    @staticmethod
+    def _readings(meter, from_timestamp, to_timestamp, step: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the sorted timestamps (in seconds) and values of the readings of a meter, turning
+        accumulated data into the consumption between readings
+        """
+        import numpy as np
+        if to_timestamp is not None and not MeterAggregation._scale(meter)[1]:
+            # the consumption of the last interval is read after it
+            to_timestamp = to_timestamp + timedelta(seconds=step + MeterAggregation._duration(meter))
+        timestamps, values = meter.data_store.get_arrays(from_timestamp, to_timestamp)
+        order = np.argsort(timestamps, kind='stable')
+        timestamps, values = timestamps[order], values[order]
+        readings = ~np.isnan(values)
+        timestamps, values = timestamps[readings], values[readings]
+        if meter.data_accumulated and len(values):
+            # the consumption of the first reading of a range comes from the reading before it
+            previous_value = None if from_timestamp is None else meter.data_store.get_value_before(from_timestamp)
+            timestamps, values = TimeSeriesRollup.register_deltas(timestamps, values, previous_value)
+        return timestamps.astype('datetime64[s]').astype(np.int64), values
+
+    @staticmethod
+    def _resample(meter, seconds: np.ndarray, values: np.ndarray, start: int, step: int, count: int,
+                  unit: MeasurementUnit) -> np.ndarray:
+        """
+        Returns the readings of a meter on the grid, in the unit of the aligned readings
+        """
+        import numpy as np
+        scale, rate = MeterAggregation._scale(meter)
+
+        if rate:
+            bins = (seconds - start) // step
+            in_grid = (bins >= 0) & (bins < count)
+            bins, values = bins[in_grid], values[in_grid]
+            # the number of intervals covered by each reading
+            span = max(1, int(np.ceil((meter.measurement_frequency or 0) / step)))
+            positions = np.arange(count)
+            counts = np.bincount(bins, minlength=count)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                column = np.where(counts > 0, np.bincount(bins, values, minlength=count) / counts, np.nan)
+            if span > 1:
+                latest = np.maximum.accumulate(np.where(counts > 0, positions, -1))
+                held = (counts == 0) & (latest >= 0) & (positions - latest < span)
+                column[held] = column[latest[held]]
+        else:
+            # a reading is the consumption of (timestamp - duration, timestamp], split over the intervals
+            # it overlaps in proportion to the overlap
+            duration = MeterAggregation._duration(meter)
+            ends = (seconds - start).astype(np.float64)[:, None]
+            begins = ends - duration
+            bins = np.floor(begins / step).astype(np.int64) + np.arange(int(np.ceil(duration / step)) + 1)
+            overlaps = np.minimum((bins + 1) * step, ends) - np.maximum(bins * step, begins)
+            in_grid = (bins >= 0) & (bins < count) & (overlaps > 0)
+            bins, values = bins[in_grid], (values[:, None] * overlaps / duration)[in_grid]
+            counts = np.bincount(bins, minlength=count)
+            column = np.where(counts > 0, np.bincount(bins, values, minlength=count), np.nan)
+
+        if unit in _UNIT_SCALES:
+            _, target_scale, target_rate = _UNIT_SCALES[unit]
+            column *= scale / target_scale
+            if rate and not target_rate:
+                column *= step
+            elif not rate and target_rate:
+                column /= step
+        return column
+
+    @staticmethod
+    def _seconds(timestamp) -> int:
+        import numpy as np
+        return int(np.datetime64(timestamp, 's').astype(np.int64))
@@ -60,5 +60,6 @@ class EntityInsert:
 
     @staticmethod
     def _insert_unique(entity_list, entity):
+        # EntityList answers membership with a hash lookup, plain lists are scanned
         if not entity in entity_list:
             entity_list.append(entity)
@@ -0,0 +1,305 @@
+from typing import Any
+from typing import Dict
+from typing import List
+from metamenth.utils.entity_view import EntityView
+from metamenth.utils.search.indexed_entity import IndexedEntity
+
+
+class EntityList(list):
+    """
+    A list of building entities (e.g., rooms, transducers, zones) that keeps a hashed membership
+    structure on the attributes compared by the entities' __eq__, e.g., the name of spaces,
+    the number of floors or the UID of meters. Membership checks, such as the uniqueness
+    checks of EntityInsert, therefore compare the entity only with the entities sharing one
+    of these attributes, which are the entities a scan of the list could find equal.
+
+    IndexedEntity entities know the lists holding them, and changes to these attributes (e.g.,
+    renaming a room) update the keys of the changed entity in these lists only. Lists holding
+    entities whose changes cannot be seen, or whose __eq__ is not known, fall back to a scan.
+
+    view() returns a read-only snapshot of the entities, kept until the list changes, and
+    changes_since() the changes made since a version of the list, to keep copies of it current.
+    """
+
+    # the key attribute compared by __eq__, per class defining __eq__
+    IDENTITY_ATTRIBUTES = {
+        'AbstractFloorSpace': 'name',
+        'Floor': 'number',
+        'Zone': 'name',
+        'AbstractTransducer': 'name',
+        'AbstractHVACComponent': 'name',
+        'Duct': 'name',
+        'AbstractVentilationComponent': 'name',
+        'AbstractSubsystem': 'name',
+        'VentilationSystem': 'UID',
+        'WeatherStation': 'name',
+        'AbstractReader': 'UID',
+        'TriggerHistory': 'UID',
+        'AbstractCommonEnergySystem': 'name',
+        'OperationalSchedule': 'name',
+    }
+    # the attributes entities are keyed on
+    KEY_ATTRIBUTES = ('name', 'number', 'UID')
+    # the attributes whose changes update the keys of an entity, with their private attributes
+    watched_attributes = frozenset(KEY_ATTRIBUTES + tuple(f'_{attribute}' for attribute in KEY_ATTRIBUTES))
+
+    # attributes rebuilt from the elements of the list
+    _DERIVED_ATTRIBUTES = ('_keys', '_view', '_entries')
+
+    def __init__(self, entities: List[Any] = None):
+        """
+        :param entities: the initial entities of the list
+        """
+        super().__init__(entities or [])
+        self._keys: Dict[Any, List[Any]] = {}
+        # [entity, keys, number of occurrences] of the entities in the list, keyed by id
+        self._entries: Dict[int, list] = {}
+        self._view: EntityView = None
+        # the entities whose key changes cannot be seen, and the entities without keys
+        self._unwatched = 0
+        self._unkeyed = 0
+        # the number of changes, the version from which the changes are appends,
+        # and the (version, position) of the last removal
+        self._version = 0
+        self._appends_from = 0
+        self._removal = None
+        self._reset()
+
+    @property
+    def version(self) -> int:
+        """
+        The number of changes made to the list
+        """
+        return self._version
+
+    def changes_since(self, version: int):
+        """
+        Returns the changes made to the list since one of its versions, e.g., to update a copy
+        of the list without copying it again
+        :param version: the version
+        :return: ('add', the appended entities), ('remove', the position of the removed entity),
+        or None if other changes were made
+        """
+        if version > self._version:
+            return None
+        if self._appends_from <= version:
+            return 'add', self[len(self) - (self._version - version):] if version < self._version else []
+        if self._removal is not None and self._removal[0] == self._version == version + 1:
+            return 'remove', self._removal[1]
+        return None
+
+    def view(self) -> EntityView:
+        """
+        Returns the entities as a read-only snapshot, which is reused until the list changes
+        """
+        if self._view is None:
+            self._view = EntityView(self)
+        return self._view
+
+    def rekey(self):
+        """
+        Rebuilds the membership keys (and other structures kept by subclasses) from the entities in the list
+        """
+        self._reset()
+
+    def __contains__(self, entity):
+        keys = EntityList.identity_keys(entity)
+        if keys is None or self._unkeyed:
+            return super().__contains__(entity)
+        for key in keys:
+            if any(element is entity or element == entity for element in self._keys.get(key, ())):
+                return True
+        # the keys of entities whose changes cannot be seen may be stale
+        return super().__contains__(entity) if self._unwatched else False
+
+    def append(self, entity):
+        super().append(entity)
+        self._on_add(entity)
+
+    def extend(self, entities):
+        entities = list(entities)
+        super().extend(entities)
+        for entity in entities:
+            self._on_add(entity)
+
+    def __iadd__(self, entities):
+        self.extend(entities)
+        return self
+
+    def __imul__(self, count):
+        super().__imul__(count)
+        self._reset()
+        return self
+
+    def remove(self, entity):
+        position = self.index(entity)
+        removed = self[position]
+        super().__delitem__(position)
+        self._on_remove(removed)
+        self._removal = (self._version, position)
+
+    def pop(self, position: int = -1):
+        entity = super().pop(position)
+        self._on_remove(entity)
+        self._removal = (self._version, position if position >= 0 else len(self) + position + 1)
+        return entity
+
+    def clear(self):
+        super().clear()
+        self._reset()
+
+    def insert(self, position: int, entity):
+        super().insert(position, entity)
+        self._reset()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._reset()
+
+    def reverse(self):
+        super().reverse()
+        self._reset()
+
+    def __setitem__(self, position, value):
+        super().__setitem__(position, value)
+        self._reset()
+
+    def __delitem__(self, position):
+        super().__delitem__(position)
+        self._reset()
+
+    def __reduce_ex__(self, protocol):
+        # the elements are restored with the other attributes, after the list is created;
+        # the structures kept next to the list are rebuilt instead of being pickled
+        state = {name: value for name, value in self.__dict__.items() if name not in self._DERIVED_ATTRIBUTES}
+        state['_elements'] = list(self)
+        return self.__class__, (), state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        elements = state.pop('_elements')
+        self.__dict__.update(state)
+        super().clear()
+        super().extend(elements)
+        self._reset()
+
+    def _on_add(self, entity):
+        """
+        Updates the structures kept next to the list after an entity is added
+        """
+        self._version += 1
+        self._view = None
+        self._key_entity(entity)
+
+    def _on_remove(self, entity):
+        """
+        Updates the structures kept next to the list after an entity is removed
+        """
+        self._version += 1
+        self._appends_from = self._version
+        self._view = None
+        if not isinstance(entity, IndexedEntity):
+            self._unwatched -= 1
+        entry = self._entries[id(entity)]
+        # the keys the entity was added with, which are the current keys of watched entities
+        self._unkey_entity(entity, entry[1], 1)
+        entry[2] -= 1
+        if not entry[2]:
+            del self._entries[id(entity)]
+            if isinstance(entity, IndexedEntity):
+                entity._remove_list(self)
+
+    def _reset(self):
+        """
+        Rebuilds the structures kept next to the list
+        """
+        self._version += 1
+        self._appends_from = self._version
+        self._removal = None
+        self._view = None
+        previous_entries = self.__dict__.get('_entries') or {}
+        self._keys = {}
+        self._entries = {}
+        self._unwatched = 0
+        self._unkeyed = 0
+        for entity in self:
+            self._key_entity(entity)
+        for entity_id, (entity, _, _) in previous_entries.items():
+            entry = self._entries.get(entity_id)
+            if (entry is None or entry[0] is not entity) and isinstance(entity, IndexedEntity):
+                entity._remove_list(self)
+
+    def _key_entity(self, entity):
+        entry = self._entries.get(id(entity))
+        if entry is None:
+            entry = self._entries[id(entity)] = [entity, EntityList.identity_keys(entity), 0]
+            if isinstance(entity, IndexedEntity):
+                # the entity tells the list when its keys change
+                entity._add_list(self)
+        entry[2] += 1
+        if not isinstance(entity, IndexedEntity):
+            self._unwatched += 1
+        self._add_keys(entity, entry[1], 1)
+
+    def _entity_changed(self, entity):
+        """
+        Updates the keys of an entity of the list after a watched attribute of the entity changed
+        """
+        entry = self._entries.get(id(entity))
+        if entry is None or entry[0] is not entity:
+            return
+        keys = EntityList.identity_keys(entity)
+        if keys != entry[1]:
+            self._unkey_entity(entity, entry[1], entry[2])
+            self._add_keys(entity, keys, entry[2])
+            entry[1] = keys
+
+    def _add_keys(self, entity, keys: list, count: int):
+        if keys is None:
+            self._unkeyed += count
+            return
+        for key in keys:
+            self._keys.setdefault(key, []).extend([entity] * count)
+
+    def _unkey_entity(self, entity, keys: list, count: int):
+        """
+        Removes occurrences of an entity from the keys it was added with
+        """
+        if keys is None:
+            self._unkeyed -= count
+            return
+        for key in keys:
+            elements = self._keys.get(key, [])
+            for _ in range(count):
+                for position, element in enumerate(elements):
+                    if element is entity:
+                        del elements[position]
+                        break
+            if not elements:
+                self._keys.pop(key, None)
+
+    @staticmethod
+    def identity_keys(entity):
+        """
+        Returns hashable keys of an entity, one per key attribute it has; entities equal
+        according to __eq__ share a key
+        :param entity: the entity
+        :return: the keys, or None if the attributes compared by the __eq__ of the entity are not known
+        """
+        for cls in type(entity).__mro__:
+            if '__eq__' in cls.__dict__:
+                if cls is not object and cls.__name__ not in EntityList.IDENTITY_ATTRIBUTES:
+                    return None
+                break
+        keys = []
+        for attribute in EntityList.KEY_ATTRIBUTES:
+            try:
+                key = (attribute, getattr(entity, attribute))
+                hash(key)
+            except AttributeError:
+                continue
+            except TypeError:
+                return None
+            keys.append(key)
+        # entities compared by identity
+        return keys or [('id', id(entity))]
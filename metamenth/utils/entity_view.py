@@ -0,0 +1,39 @@
+class EntityView(tuple):
+    """
+    A read-only snapshot of the entities of an EntityList, returned by properties such as
+    transducers or control_systems instead of a copy of the list. The list keeps its view
+    until it changes, so reading a property in a loop does not allocate.
+
+    Views compare equal to lists and tuples with the same entities, and adding a list
+    (or another view) to a view returns a new list, as adding the copies returned before.
+    """
+
+    __slots__ = ()
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(entity is other_entity or entity == other_entity
+                                                   for entity, other_entity in zip(self, other))
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    # like lists, views of entities that compare by value are not hashable
+    __hash__ = None
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def copy(self) -> list:
+        """
+        Returns the entities as a new list
+        """
+        return list(self)
+
+    def __repr__(self):
+        return repr(list(self))
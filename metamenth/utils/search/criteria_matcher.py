@@ -0,0 +1,191 @@
+from operator import attrgetter
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Union
+from metamenth.enumerations.abstract_enum import AbstractEnum
+from metamenth.utils.search.query import EntityQuery
+from metamenth.utils.search.query import ValueQuery
+
+
+class CriteriaMatcher:
+    """
+    Search criteria compiled into a predicate, e.g., once per visitor or search rather than once per
+    entity: attribute getters are built once, enum criteria are replaced by their values, and list
+    criteria become sets. Every criterion must match; the attribute values of entities are compared
+    with the value of their enum members. Criteria values may be conditions built with Query
+    (e.g., Query.le(60)), and the criteria an entity query combining criteria with and, or and not.
+    Dotted keys (e.g., area.value) read attributes of attributes
+
+    By default, criteria are matched as the visitors do: missing attributes are None, entities that
+    are None match (e.g., spaces without a meter, whose components are still searched), and a list
+    criterion matches attributes in the list, or list attributes sharing an item with it. Strict
+    matchers, as used by StructureEntitySearch.search, raise AttributeError for missing attributes
+    and compare list criteria with list attributes. Matchers are pickled as their criteria and
+    compiled again when loaded, e.g., with the visitors sent to worker processes
+    """
+
+    __slots__ = ('criteria', 'matches', '_strict', '_ignored_keys')
+
+    def __init__(self, criteria: Union[Dict, EntityQuery], strict: bool = False, ignored_keys: Iterable[str] = ()):
+        """
+        :param criteria: key value pairs of attributes and their values (or conditions on them), or an entity
+        query, None or empty to match every entity
+        :param strict: whether missing attributes raise AttributeError and list criteria are compared as values
+        :param ignored_keys: keys of the criteria that are not attributes, e.g., component_class
+        """
+        self.criteria = criteria
+        self._strict = strict
+        self._ignored_keys = tuple(ignored_keys)
+        self.matches: Callable[[object], bool] = CriteriaMatcher._compile_criteria(criteria, strict,
+                                                                                  set(ignored_keys))
+
+    def __call__(self, entity) -> bool:
+        """
+        Checks if an entity meets the criteria
+        :param entity: the entity
+        """
+        return self.matches(entity)
+
+    def __reduce__(self):
+        return CriteriaMatcher, (self.criteria, self._strict, self._ignored_keys)
+
+    def __repr__(self):
+        return f"CriteriaMatcher({self.criteria})"
+
+    @staticmethod
+    def _normalize(value):
+        return value.value if isinstance(value, AbstractEnum) else value
+
+    @staticmethod
+    def _compile_criteria(criteria: Union[Dict, EntityQuery], strict: bool, ignored_keys: set) -> Callable:
+        """
+        Returns the predicate of criteria, or of an entity query and the criteria it combines
+        """
+        if not isinstance(criteria, EntityQuery):
+            return CriteriaMatcher._combine([CriteriaMatcher._compile(key, value, strict)
+                                             for key, value in (criteria or {}).items() if key not in ignored_keys])
+        tests = [CriteriaMatcher._compile_criteria(criterion, strict, ignored_keys) for criterion in criteria.criteria]
+        if criteria.operator == 'and':
+            matches = CriteriaMatcher._combine(tests)
+        elif criteria.operator == 'or':
+            def matches(entity) -> bool:
+                for test in tests:
+                    if test(entity):
+                        return True
+                return False
+        else:
+            test = tests[0]
+
+            def matches(entity) -> bool:
+                return not test(entity)
+        if strict:
+            return matches
+
+        def matches_entity(entity) -> bool:
+            # entities that are None match any criteria, negated or not
+            return entity is None or matches(entity)
+        return matches_entity
+
+    @staticmethod
+    def _compile(key: str, value, strict: bool) -> Callable[[object], bool]:
+        """
+        Returns the test of one criterion on an entity. Enum members are read through _value_,
+        as the value property of enums is slow to call for every entity
+        """
+        get = attrgetter(key)
+        if isinstance(value, ValueQuery):
+            return CriteriaMatcher._compile_query(get, value, strict)
+        if isinstance(value, list) and not strict:
+            values = [CriteriaMatcher._normalize(item) for item in value]
+            try:
+                members = frozenset(values)
+            except TypeError:
+                # unhashable criteria are compared one at a time
+                members = values
+
+            def test(entity) -> bool:
+                if entity is None:
+                    return True
+                try:
+                    att_value = get(entity)
+                except AttributeError:
+                    att_value = None
+                if isinstance(att_value, AbstractEnum):
+                    att_value = att_value._value_
+                elif isinstance(att_value, list):
+                    return any(CriteriaMatcher._contains(members, values, item) for item in att_value)
+                try:
+                    return att_value in members
+                except TypeError:
+                    return att_value in values
+            return test
+
+        value = CriteriaMatcher._normalize(value)
+        if strict:
+            def test(entity) -> bool:
+                att_value = get(entity)
+                # enum members are not equal to their values, so a member is compared after a mismatch
+                return att_value == value or (isinstance(att_value, AbstractEnum) and att_value._value_ == value)
+        else:
+            def test(entity) -> bool:
+                if entity is None:
+                    return True
+                try:
+                    att_value = get(entity)
+                except AttributeError:
+                    att_value = None
+                return att_value == value or (isinstance(att_value, AbstractEnum) and att_value._value_ == value)
+        return test
+
+    @staticmethod
+    def _compile_query(get: Callable, query: ValueQuery, strict: bool) -> Callable[[object], bool]:
+        """
+        Returns the test of a condition on an attribute. Without strict, a list attribute meets
+        the condition if one of its items does, as with list criteria
+        """
+        condition = query.test
+        if strict:
+            def test(entity) -> bool:
+                att_value = get(entity)
+                return condition(att_value._value_ if isinstance(att_value, AbstractEnum) else att_value)
+        else:
+            def test(entity) -> bool:
+                if entity is None:
+                    return True
+                try:
+                    att_value = get(entity)
+                except AttributeError:
+                    att_value = None
+                if isinstance(att_value, AbstractEnum):
+                    att_value = att_value._value_
+                elif isinstance(att_value, list):
+                    return any(condition(item._value_ if isinstance(item, AbstractEnum) else item)
+                               for item in att_value)
+                return condition(att_value)
+        return test
+
+    @staticmethod
+    def _contains(members, values: list, item) -> bool:
+        try:
+            return item in members
+        except TypeError:
+            return item in values
+
+    @staticmethod
+    def _combine(tests: list) -> Callable[[object], bool]:
+        """
+        Returns a predicate checking all the tests, specialized for no test and a single test
+        """
+        if not tests:
+            def matches(entity) -> bool:
+                return True
+        elif len(tests) == 1:
+            matches = tests[0]
+        else:
+            def matches(entity) -> bool:
+                for test in tests:
+                    if not test(entity):
+                        return False
+                return True
+        return matches
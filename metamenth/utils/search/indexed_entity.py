@@ -0,0 +1,76 @@
+import weakref
+
+
+class _ListRegistry(dict):
+    """
+    The entity lists holding an entity, as weak references keyed by the id of the list.
+    Registries are not copied or pickled with their entity: lists register the entities
+    they hold when they are built
+    """
+
+    __slots__ = ('owner',)
+
+    def __init__(self, owner=None):
+        super().__init__()
+        # the id of the entity, copies sharing the registry of an entity are not registered
+        self.owner = id(owner) if owner is not None else None
+
+    def add(self, entity_list):
+        key = id(entity_list)
+        if key not in self:
+            self[key] = weakref.ref(entity_list, lambda _: self.pop(key, None))
+
+    def __reduce__(self):
+        return _ListRegistry, ()
+
+
+class IndexedEntity:
+    """
+    Base of the entities kept in entity lists (e.g., spaces, meters, transducers).
+    Entities know the lists holding them: setting an attribute watched by one of these
+    lists (see EntityList and IndexedEntityList), directly or through the private attribute
+    of its property (e.g., name or _name), updates the keys and indexes of the entity in
+    that list only.
+    """
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        # set after the assignment, so a setter rejecting the value does not change the lists
+        lists = self.__dict__.get('_listed')
+        if lists and lists.owner == id(self):
+            for entity_list in [reference() for reference in lists.values()]:
+                if entity_list is not None and name in entity_list.watched_attributes:
+                    entity_list._entity_changed(self)
+
+    def __setstate__(self, state):
+        lists = self.__dict__.get('_listed')
+        self.__dict__.update(state)
+        if lists is None:
+            # the lists of the copied or pickled entity do not hold this entity
+            self.__dict__.pop('_listed', None)
+            return
+        # lists restored before the entity (e.g., lists of its parent) registered it without its state
+        self.__dict__['_listed'] = lists
+        for entity_list in [reference() for reference in lists.values()]:
+            if entity_list is not None:
+                entity_list._entity_changed(self)
+
+    def _add_list(self, entity_list):
+        """
+        Registers a list holding this entity
+        """
+        lists = self.__dict__.get('_listed')
+        if lists is None or lists.owner != id(self):
+            lists = self.__dict__['_listed'] = _ListRegistry(self)
+        lists.add(entity_list)
+
+    def _remove_list(self, entity_list):
+        """
+        Unregisters a list that no longer holds this entity
+        """
+        lists = self.__dict__.get('_listed')
+        if lists is None or lists.owner != id(self):
+            return
+        lists.pop(id(entity_list), None)
+        if not lists:
+            del self.__dict__['_listed']
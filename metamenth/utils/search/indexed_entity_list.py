@@ -0,0 +1,308 @@
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from metamenth.enumerations.abstract_enum import AbstractEnum
+from metamenth.utils.entity_list import EntityList
+
+# marks entities that do not have an indexed attribute
+_MISSING = object()
+
+
+class IndexedEntityList(EntityList):
+    """
+    A list of entities (e.g., meters, zones, transducers) that keeps hash indexes
+    on their UID, name and some frequently searched attributes. The indexes are
+    kept up to date by the list operations used by EntityInsert and EntityRemover,
+    so searches on indexed attributes do not scan the list.
+
+    Changes to indexed attributes of IndexedEntity entities (e.g., renaming a room) move
+    the changed entity to its new buckets in the lists holding it. Lists holding other
+    entities, whose changes cannot be seen, do not answer lookups: their searches scan
+    the list. The keys of an index are sorted on the first range or prefix query after a
+    change, so such queries (see Query) only read the matching buckets. Entities found through
+    several keys are returned in list order, as searches scanning the list find them.
+    """
+
+    KEY_ATTRIBUTES = ['UID', 'name']
+    DEFAULT_ATTRIBUTES = ['meter_type', 'measure', 'measure_type', 'zone_type', 'room_type', 'space_type',
+                          'floor_type', 'hvac_type', 'duct_type']
+    _DERIVED_ATTRIBUTES = EntityList._DERIVED_ATTRIBUTES + ('_indexes', '_indexed_values', '_sorted_keys', '_positions')
+
+    def __init__(self, entities: List[Any] = None, attributes: List[str] = None):
+        """
+        :param entities: the initial entities of the list
+        :param attributes: the attributes indexed in addition to UID and name,
+        defaults to IndexedEntityList.DEFAULT_ATTRIBUTES
+        """
+        self._attributes = []
+        # the attributes whose changes update the keys and indexes of an entity
+        self.watched_attributes = set(EntityList.watched_attributes)
+        self._indexes: Dict[str, Dict[Any, List[Any]]] = {}
+        # the values of the indexed attributes each entity is indexed with, keyed by id
+        self._indexed_values: Dict[int, tuple] = {}
+        self._sorted_keys: Dict[str, Optional[List[Any]]] = {}
+        # the positions of the entities in the list, keyed by id, built on the first lookup needing them,
+        # and the position of the next appended entity
+        self._positions: Optional[Dict[int, int]] = None
+        self._next_position = 0
+        super().__init__(entities)
+        self.add_indexes(self.KEY_ATTRIBUTES + (self.DEFAULT_ATTRIBUTES if attributes is None else list(attributes)))
+
+    @property
+    def indexed_attributes(self) -> List[str]:
+        return list(self._indexes.keys())
+
+    def add_indexes(self, attributes: List[str]):
+        """
+        Indexes more attributes of the entities in this list
+        :param attributes: the names of the attributes
+        """
+        for attribute in attributes:
+            if attribute not in self._attributes:
+                self._attributes.append(attribute)
+                self.watched_attributes.update((attribute, f'_{attribute}'))
+        self.reindex()
+
+    def reindex(self):
+        """
+        Rebuilds the indexes from the entities in the list
+        """
+        self._reset()
+
+    def lookup(self, attribute: str, value) -> List[Any]:
+        """
+        Returns the entities whose (enum values are compared by value) attribute equals a value
+        :param attribute: the attribute name
+        :param value: the attribute value
+        :return: the matching entities, or None if the attribute is not indexed
+        """
+        index = self._current_index(attribute)
+        if index is None:
+            return None
+        try:
+            return index.get(value, [])
+        except TypeError:
+            # unhashable search values cannot be looked up
+            return None
+
+    def lookup_query(self, attribute: str, query) -> List[Any]:
+        """
+        Returns the entities whose attribute may meet a query condition, e.g., Query.le(60),
+        read from the buckets of the index keys selected by the condition
+        :param attribute: the attribute name
+        :param query: the condition, a ValueQuery
+        :return: the candidate entities in list order, or None if the index cannot answer the condition
+        """
+        index = self._current_index(attribute)
+        if index is None:
+            return None
+        keys = query.index_keys(lambda: self.sorted_keys(attribute))
+        if keys is None:
+            return None
+        entities = []
+        for key in dict.fromkeys(keys) if len(keys) > 1 else keys:
+            try:
+                entities.extend(index.get(key, ()))
+            except TypeError:
+                return None
+        # the entities of one key are in list order already
+        return self.in_list_order(entities) if len(keys) > 1 else entities
+
+    def in_list_order(self, entities: List[Any]) -> List[Any]:
+        """
+        Sorts entities of this list (e.g., found through several index keys) by their position in the list
+        :param entities: the entities, each in the list
+        :return: the entities in list order
+        """
+        if len(entities) < 2:
+            return entities
+        positions = self._list_positions()
+        return sorted(entities, key=lambda entity: positions[id(entity)])
+
+    def _list_positions(self) -> Dict[int, int]:
+        """
+        Returns the positions of the entities in the list, keyed by id, built after the list changed
+        """
+        if self._positions is None:
+            positions = {}
+            for position, entity in enumerate(self):
+                positions.setdefault(id(entity), position)
+            self._positions = positions
+            self._next_position = len(self)
+        return self._positions
+
+    def sorted_keys(self, attribute: str) -> Optional[List[Any]]:
+        """
+        Returns the sorted keys of an index, without None, cached until the list changes
+        :param attribute: the attribute name
+        :return: the keys, or None if the attribute is not indexed or its values cannot be sorted
+        """
+        index = self._current_index(attribute)
+        if attribute in self._sorted_keys:
+            return self._sorted_keys[attribute]
+        keys = None
+        if index is not None:
+            try:
+                keys = sorted(key for key in index.keys() if key is not None)
+            except TypeError:
+                keys = None
+        self._sorted_keys[attribute] = keys
+        return keys
+
+    def _current_index(self, attribute: str):
+        """
+        Returns the index of an attribute, or None if the attribute is not indexed or the list
+        holds entities whose changes cannot be seen
+        """
+        if self._unwatched:
+            return None
+        return self._indexes.get(attribute)
+
+    def _on_add(self, entity):
+        super()._on_add(entity)
+        self._sorted_keys = {}
+        if self._positions is not None:
+            # appended entities come last
+            self._positions.setdefault(id(entity), self._next_position)
+            self._next_position += 1
+        self._index_entity(entity)
+
+    def _on_remove(self, entity):
+        super()._on_remove(entity)
+        self._sorted_keys = {}
+        self._positions = None
+        self._unindex_entity(entity)
+
+    def _reset(self):
+        super()._reset()
+        self._sorted_keys = {}
+        self._positions = None
+        self._indexes = {attribute: {} for attribute in self._attributes}
+        self._indexed_values = {}
+        for entity in self:
+            self._index_entity(entity)
+
+    def _entity_changed(self, entity):
+        super()._entity_changed(entity)
+        values = self._indexed_values.get(id(entity))
+        entry = self._entries.get(id(entity))
+        if values is None or entry is None or entry[0] is not entity:
+            return
+        new_values = self._attribute_values(entity)
+        for attribute, value, new_value in zip(self._attributes, values, new_values):
+            if new_value is not value and attribute in self._indexes:
+                self._remove_from_index(attribute, value, entity, entry[2])
+                self._insert_in_index(attribute, new_value, entity, entry[2])
+                self._sorted_keys.pop(attribute, None)
+        self._indexed_values[id(entity)] = new_values
+
+    def _index_entity(self, entity):
+        values = self._indexed_values.get(id(entity))
+        if values is None:
+            values = self._indexed_values[id(entity)] = self._attribute_values(entity)
+        for attribute, value in zip(self._attributes, values):
+            self._add_to_index(attribute, value, entity, 1)
+
+    def _unindex_entity(self, entity):
+        # the values the entity was indexed with, which are the current values of watched entities
+        values = self._indexed_values.get(id(entity), ())
+        for attribute, value in zip(self._attributes, values):
+            entities = self._remove_from_index(attribute, value, entity, 1)
+            if entities and id(entity) in self._entries:
+                # the removed occurrence of the entity may not be its first one in the bucket
+                self._order_bucket(entities)
+        if id(entity) not in self._entries:
+            self._indexed_values.pop(id(entity), None)
+
+    def _add_to_index(self, attribute: str, value, entity, count: int):
+        index = self._indexes.get(attribute)
+        if index is None or value is _MISSING:
+            return
+        try:
+            index.setdefault(value, []).extend([entity] * count)
+        except TypeError:
+            # attributes with unhashable values are not indexed
+            del self._indexes[attribute]
+
+    def _insert_in_index(self, attribute: str, value, entity, count: int):
+        """
+        Adds the occurrences of an entity to the bucket of a value, keeping the bucket in list order
+        """
+        index = self._indexes.get(attribute)
+        if index is None or value is _MISSING:
+            return
+        try:
+            entities = index.setdefault(value, [])
+        except TypeError:
+            # attributes with unhashable values are not indexed
+            del self._indexes[attribute]
+            return
+        if len(entities) == 0:
+            entities.extend([entity] * count)
+        elif count == 1 and len({id(element) for element in entities}) == len(entities):
+            positions = self._list_positions()
+            position = positions[id(entity)]
+            entities.insert(next((number for number, element in enumerate(entities)
+                                  if positions[id(element)] > position), len(entities)), entity)
+        else:
+            # the occurrences of entities in the list several times are between those of other entities
+            entities.extend([entity] * count)
+            self._order_bucket(entities)
+
+    def _remove_from_index(self, attribute: str, value, entity, count: int):
+        index = self._indexes.get(attribute)
+        if index is None or value is _MISSING:
+            return
+        try:
+            entities = index.get(value, [])
+        except TypeError:
+            return
+        for _ in range(count):
+            for position, indexed_entity in enumerate(entities):
+                if indexed_entity is entity:
+                    del entities[position]
+                    break
+        if not entities:
+            index.pop(value, None)
+        return entities
+
+    def _order_bucket(self, entities: List[Any]):
+        """
+        Puts the entities of a bucket in list order, with the occurrences of entities in the list
+        several times between those of the other entities
+        """
+        members = {id(entity) for entity in entities}
+        entities[:] = [entity for entity in self if id(entity) in members]
+
+    def _attribute_values(self, entity) -> tuple:
+        """
+        Returns the values of the indexed attributes of an entity, in the order of the attributes
+        """
+        return tuple(IndexedEntityList._attribute_value(entity, attribute) for attribute in self._attributes)
+
+    @staticmethod
+    def _attribute_value(entity, attribute):
+        """
+        Returns the indexed value of an attribute, or _MISSING for entities without the attribute
+        """
+        try:
+            value = getattr(entity, attribute)
+        except AttributeError:
+            return _MISSING
+        return value.value if isinstance(value, AbstractEnum) else value
+
+    @staticmethod
+    def index_lists(owner, list_names: List[str], attributes: List[str] = None):
+        """
+        Replaces the entity lists of an object with indexed lists
+        :param owner: the object holding the lists, e.g., a building
+        :param list_names: the names of the list attributes, e.g., _meters
+        :param attributes: the attributes indexed in addition to UID and name
+        """
+        for list_name in list_names:
+            entity_list = getattr(owner, list_name)
+            if isinstance(entity_list, IndexedEntityList):
+                entity_list.add_indexes(IndexedEntityList.DEFAULT_ATTRIBUTES if attributes is None else attributes)
+            elif entity_list is not None:
+                setattr(owner, list_name, IndexedEntityList(entity_list, attributes))
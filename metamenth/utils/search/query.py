@@ -0,0 +1,350 @@
+import re
+from abc import ABC
+from abc import abstractmethod
+from bisect import bisect_left
+from bisect import bisect_right
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Union
+from metamenth.enumerations.abstract_enum import AbstractEnum
+
+
+def _normalize(value):
+    return value.value if isinstance(value, AbstractEnum) else value
+
+
+class ValueQuery(ABC):
+    """
+    A condition on the value of one attribute, used as the value of a search criterion,
+    e.g., {'measurement_frequency': Query.le(60)}. Conditions on the same attribute are
+    combined with &, | and ~
+    """
+
+    @abstractmethod
+    def test(self, value) -> bool:
+        """
+        Checks if an attribute value (enum members are given by value) meets the condition.
+        Values that cannot be compared, e.g., None with a number, do not meet it
+        :param value: the attribute value
+        """
+        pass
+
+    def index_keys(self, sorted_keys: Callable[[], Optional[list]]) -> Optional[list]:
+        """
+        Returns the keys of a hash index whose entities may meet the condition, or None if the index cannot tell
+        :param sorted_keys: returns the sorted keys of the index, or None if they cannot be sorted
+        """
+        return None
+
+    def __and__(self, other: 'ValueQuery') -> 'ValueQuery':
+        return _AllValues([self, other])
+
+    def __or__(self, other: 'ValueQuery') -> 'ValueQuery':
+        return _AnyValue([self, other])
+
+    def __invert__(self) -> 'ValueQuery':
+        return _NotValue(self)
+
+
+class _Comparison(ValueQuery):
+
+    def __init__(self, operator: str, value):
+        self.operator = operator
+        self.value = _normalize(value)
+
+    def test(self, value) -> bool:
+        try:
+            if self.operator == 'eq':
+                return value == self.value
+            if self.operator == 'ne':
+                return value != self.value
+            if self.operator == 'lt':
+                return value < self.value
+            if self.operator == 'le':
+                return value <= self.value
+            if self.operator == 'gt':
+                return value > self.value
+            return value >= self.value
+        except TypeError:
+            return False
+
+    def index_keys(self, sorted_keys: Callable[[], Optional[list]]) -> Optional[list]:
+        if self.operator == 'eq':
+            return [self.value]
+        if self.operator == 'ne':
+            return None
+        keys = sorted_keys()
+        if keys is None:
+            return None
+        try:
+            if self.operator == 'lt':
+                return keys[:bisect_left(keys, self.value)]
+            if self.operator == 'le':
+                return keys[:bisect_right(keys, self.value)]
+            if self.operator == 'gt':
+                return keys[bisect_right(keys, self.value):]
+            return keys[bisect_left(keys, self.value):]
+        except TypeError:
+            return None
+
+    def __repr__(self):
+        return f"Query.{self.operator}({self.value!r})"
+
+
+class _Between(ValueQuery):
+
+    def __init__(self, lower, upper):
+        self.lower = _normalize(lower)
+        self.upper = _normalize(upper)
+
+    def test(self, value) -> bool:
+        try:
+            return self.lower <= value <= self.upper
+        except TypeError:
+            return False
+
+    def index_keys(self, sorted_keys: Callable[[], Optional[list]]) -> Optional[list]:
+        keys = sorted_keys()
+        if keys is None:
+            return None
+        try:
+            return keys[bisect_left(keys, self.lower):bisect_right(keys, self.upper)]
+        except TypeError:
+            return None
+
+    def __repr__(self):
+        return f"Query.between({self.lower!r}, {self.upper!r})"
+
+
+class _In(ValueQuery):
+
+    def __init__(self, values):
+        self.values = [_normalize(value) for value in values]
+        try:
+            self._members = frozenset(self.values)
+        except TypeError:
+            self._members = self.values
+
+    def test(self, value) -> bool:
+        try:
+            return value in self._members
+        except TypeError:
+            return value in self.values
+
+    def index_keys(self, sorted_keys: Callable[[], Optional[list]]) -> Optional[list]:
+        return list(self.values)
+
+    def __repr__(self):
+        return f"Query.in_({self.values!r})"
+
+
+class _Prefix(ValueQuery):
+
+    def __init__(self, prefix: str):
+        if not isinstance(prefix, str):
+            raise ValueError('prefix must be a string')
+        self.prefix = prefix
+
+    def test(self, value) -> bool:
+        return isinstance(value, str) and value.startswith(self.prefix)
+
+    def index_keys(self, sorted_keys: Callable[[], Optional[list]]) -> Optional[list]:
+        keys = sorted_keys()
+        if keys is None:
+            return None
+        try:
+            start = bisect_left(keys, self.prefix)
+        except TypeError:
+            return None
+        end = start
+        # keys starting with the prefix follow it in sorted order
+        while end < len(keys) and isinstance(keys[end], str) and keys[end].startswith(self.prefix):
+            end += 1
+        return keys[start:end]
+
+    def __repr__(self):
+        return f"Query.prefix({self.prefix!r})"
+
+
+class _Regex(ValueQuery):
+
+    def __init__(self, pattern: str):
+        self.pattern = re.compile(pattern)
+
+    def test(self, value) -> bool:
+        return isinstance(value, str) and self.pattern.search(value) is not None
+
+    def __repr__(self):
+        return f"Query.regex({self.pattern.pattern!r})"
+
+
+class _AllValues(ValueQuery):
+
+    def __init__(self, queries: List[ValueQuery]):
+        self.queries = queries
+
+    def test(self, value) -> bool:
+        return all(query.test(value) for query in self.queries)
+
+    def index_keys(self, sorted_keys: Callable[[], Optional[list]]) -> Optional[list]:
+        # the fewest keys of the conditions, the others are checked by test
+        selected = None
+        for query in self.queries:
+            keys = query.index_keys(sorted_keys)
+            if keys is not None and (selected is None or len(keys) < len(selected)):
+                selected = keys
+        return selected
+
+    def __repr__(self):
+        return ' & '.join(repr(query) for query in self.queries)
+
+
+class _AnyValue(ValueQuery):
+
+    def __init__(self, queries: List[ValueQuery]):
+        self.queries = queries
+
+    def test(self, value) -> bool:
+        return any(query.test(value) for query in self.queries)
+
+    def index_keys(self, sorted_keys: Callable[[], Optional[list]]) -> Optional[list]:
+        selected = []
+        for query in self.queries:
+            keys = query.index_keys(sorted_keys)
+            if keys is None:
+                return None
+            selected.extend(keys)
+        return selected
+
+    def __repr__(self):
+        return ' | '.join(repr(query) for query in self.queries)
+
+
+class _NotValue(ValueQuery):
+
+    def __init__(self, query: ValueQuery):
+        self.query = query
+
+    def test(self, value) -> bool:
+        return not self.query.test(value)
+
+    def __repr__(self):
+        return f"~{self.query!r}"
+
+
+class EntityQuery:
+    """
+    A boolean combination of search criteria (dictionaries of attributes and their values,
+    or other entity queries), used instead of a criteria dictionary, e.g.,
+    Query.or_({'name': Query.prefix('PR.VNT')}, {'measure': 'Temperature'})
+    """
+
+    def __init__(self, operator: str, criteria: List[Union[Dict, 'EntityQuery']]):
+        """
+        :param operator: and, or or not
+        :param criteria: the combined criteria, one for not
+        """
+        if operator not in ('and', 'or', 'not'):
+            raise ValueError(f'{operator} is not an entity query operator')
+        if operator == 'not' and len(criteria) != 1:
+            raise ValueError('not negates one criteria')
+        for criterion in criteria:
+            if not isinstance(criterion, (dict, EntityQuery)):
+                raise ValueError(f'{criterion} is not search criteria or an entity query')
+        self.operator = operator
+        self.criteria = criteria
+
+    def __repr__(self):
+        return f"Query.{self.operator}_({', '.join(repr(criterion) for criterion in self.criteria)})"
+
+
+class Query:
+    """
+    Builds the conditions of entity searches, e.g., meters measuring at least every minute,
+    sensors whose name starts with PR.VNT, or rooms larger than 50 m²:
+
+        building.get_meters({'measurement_frequency': Query.le(60)})
+        SensorSearchVisitor({'name': Query.prefix('PR.VNT')})
+        SpaceSearchVisitor(room_criteria={'area.value': Query.gt(50)})
+
+    Conditions are matched wherever criteria are (StructureEntitySearch, the search visitors while
+    they traverse buildings, and BuildingQueryEngine), and are answered with the hash indexes of
+    the searched attributes when they have them: equality and in with lookups, ranges and prefixes
+    with the sorted keys of the indexes. Entities are returned in list order, with or without
+    indexes. Dotted attributes (e.g., area.value) are read through the attributes
+    """
+
+    @staticmethod
+    def eq(value) -> ValueQuery:
+        return _Comparison('eq', value)
+
+    @staticmethod
+    def ne(value) -> ValueQuery:
+        return _Comparison('ne', value)
+
+    @staticmethod
+    def lt(value) -> ValueQuery:
+        return _Comparison('lt', value)
+
+    @staticmethod
+    def le(value) -> ValueQuery:
+        return _Comparison('le', value)
+
+    @staticmethod
+    def gt(value) -> ValueQuery:
+        return _Comparison('gt', value)
+
+    @staticmethod
+    def ge(value) -> ValueQuery:
+        return _Comparison('ge', value)
+
+    @staticmethod
+    def between(lower, upper) -> ValueQuery:
+        """
+        Values from lower to upper, both included
+        """
+        return _Between(lower, upper)
+
+    @staticmethod
+    def in_(values) -> ValueQuery:
+        return _In(values)
+
+    @staticmethod
+    def prefix(prefix: str) -> ValueQuery:
+        return _Prefix(prefix)
+
+    @staticmethod
+    def regex(pattern: str) -> ValueQuery:
+        """
+        String values in which the regular expression is found (re.search)
+        """
+        return _Regex(pattern)
+
+    @staticmethod
+    def and_(*criteria) -> Union[ValueQuery, EntityQuery]:
+        """
+        Combines conditions on one attribute, or criteria on whole entities
+        """
+        if criteria and all(isinstance(criterion, ValueQuery) for criterion in criteria):
+            return _AllValues(list(criteria))
+        return EntityQuery('and', list(criteria))
+
+    @staticmethod
+    def or_(*criteria) -> Union[ValueQuery, EntityQuery]:
+        """
+        Conditions on one attribute, or criteria on whole entities, of which at least one is met
+        """
+        if criteria and all(isinstance(criterion, ValueQuery) for criterion in criteria):
+            return _AnyValue(list(criteria))
+        return EntityQuery('or', list(criteria))
+
+    @staticmethod
+    def not_(criteria) -> Union[ValueQuery, EntityQuery]:
+        """
+        Negates a condition on one attribute, or criteria on whole entities
+        """
+        if isinstance(criteria, ValueQuery):
+            return _NotValue(criteria)
+        return EntityQuery('not', [criteria])
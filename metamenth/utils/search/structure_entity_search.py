@@ -1,14 +1,24 @@
 from typing import Dict
 import sys
 from datetime import datetime
+from itertools import islice
+from typing import Iterable
+from typing import Iterator
 from typing import Union
 from typing import List
+from typing import Tuple
 from metamenth.measure_instruments.sensor_data import SensorData
 from metamenth.measure_instruments.trigger_history import TriggerHistory
 from metamenth.measure_instruments.meter_measure import MeterMeasure
 from metamenth.measure_instruments.weather_data import WeatherData
 from metamenth.misc import Validate
 from metamenth.enumerations.abstract_enum import AbstractEnum
+from metamenth.utils.search.criteria_matcher import CriteriaMatcher
+from metamenth.utils.search.timestamp_index import TimestampIndex
+from metamenth.utils.search.indexed_entity_list import IndexedEntityList
+from metamenth.utils.search.query import EntityQuery
+from metamenth.utils.search.query import ValueQuery
+from functools import lru_cache
 
 
 class StructureEntitySearch:
@@ -40,27 +50,22 @@ class StructureEntitySearch:
         return StructureEntitySearch.search_structure_entity(entity_list, 'name', name)
 
     @staticmethod
-    def search(entity_list, search_terms: Dict):
+    def search(entity_list, search_terms: Union[Dict, EntityQuery]):
         """
         search entities based on attribute values
         :param entity_list: the list of entity to search for a particular entity
-        :param search_terms: key value pair of attributes and their values
+        :param search_terms: key value pair of attributes and their values (or conditions built with Query),
+        or an entity query
         :return:
         """
         results = []
         if search_terms is None:
             return entity_list
 
-        for entity in entity_list:
-            found = True
+        matches = CriteriaMatcher(search_terms, strict=True).matches
+        for entity in StructureEntitySearch.search_candidates(entity_list, search_terms):
             try:
-                for attribute, value in search_terms.items():
-                    att_value = getattr(entity, attribute)
-                    if isinstance(att_value, AbstractEnum):
-                        att_value = att_value.value
-                    if att_value != value:
-                        found = False
-                if found:
+                if matches(entity):
                     results.append(entity)
             except AttributeError as err:
                 # TODO: log errors to file
@@ -68,16 +73,148 @@ class StructureEntitySearch:
 
         return results
 
+    @staticmethod
+    def iter_search(entity_list, search_terms: Dict = None, limit: int = None, offset: int = 0) -> Iterator:
+        """
+        Yields the entities matching search terms one at a time, as search returns them
+        :param entity_list: the entities to search, a list or any iterable (e.g., records of a store)
+        :param search_terms: key value pair of attributes and their values
+        :param limit: the maximum number of entities to yield
+        :param offset: the number of matching entities to skip
+        :return:
+        """
+        if search_terms is None:
+            entities = iter(entity_list)
+        else:
+            matcher = CriteriaMatcher(search_terms, strict=True)
+            entities = (entity for entity in StructureEntitySearch.search_candidates(entity_list, search_terms)
+                        if StructureEntitySearch.matches(entity, matcher))
+        return StructureEntitySearch.paginate(entities, limit, offset)
+
+    @staticmethod
+    def matches(entity, search_terms: Union[Dict, CriteriaMatcher]) -> bool:
+        """
+        Checks if the attributes of an entity have the values of search terms, as search does
+        :param entity: the entity
+        :param search_terms: key value pair of attributes and their values, or a strict matcher compiled from them
+        :return:
+        """
+        if not isinstance(search_terms, CriteriaMatcher):
+            search_terms = CriteriaMatcher(search_terms, strict=True)
+        try:
+            return search_terms.matches(entity)
+        except AttributeError as err:
+            # TODO: log errors to file
+            print(err, file=sys.stderr)
+            return False
+
+    @staticmethod
+    def paginate(entities: Iterable, limit: int = None, offset: int = 0) -> Iterator:
+        """
+        Skips entities then stops after a number of entities, without building lists
+        :param entities: the entities
+        :param limit: the maximum number of entities, None for all the remaining entities
+        :param offset: the number of entities to skip
+        :return:
+        """
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError('limit and offset must not be negative')
+        return islice(entities, offset, None if limit is None else offset + limit)
+
     @staticmethod
     def date_range_search(entity_list: Union[List[SensorData], List[TriggerHistory], List[MeterMeasure],
-                                             List[WeatherData]], from_timestamp: str, to_timestamp: str = None):
+                                             List[WeatherData], TimestampIndex],
+                          from_timestamp: str, to_timestamp: str = None):
+        """
+
+        :param entity_list: a list of sensor, actuator or meter data, or a timestamp index over them.
+        Timestamp indexes are searched with binary search
+        :param from_timestamp: the start timestamp
+        :param to_timestamp: the end timestamp
+        :return:
         """
+        from_tp, to_tp = StructureEntitySearch.parse_date_range(from_timestamp, to_timestamp)
+        if isinstance(entity_list, TimestampIndex):
+            return entity_list.range(from_tp, to_tp)
+        filtered_data = []
+        for data in entity_list:
+            if from_tp <= data.timestamp <= to_tp:
+                filtered_data.append(data)
 
-        :param entity_list: a list of sensor, actuator or meter data
+        return filtered_data
+
+    @staticmethod
+    def iter_date_range(entity_list: Union[Iterable, TimestampIndex], from_timestamp: str, to_timestamp: str = None,
+                        limit: int = None, offset: int = 0) -> Iterator:
+        """
+        Yields the records of a date range one at a time, as date_range_search returns them
+        :param entity_list: records, or a timestamp index over them
         :param from_timestamp: the start timestamp
         :param to_timestamp: the end timestamp
+        :param limit: the maximum number of records to yield
+        :param offset: the number of records to skip
         :return:
         """
+        from_tp, to_tp = StructureEntitySearch.parse_date_range(from_timestamp, to_timestamp)
+        if isinstance(entity_list, TimestampIndex):
+            return StructureEntitySearch.paginate(entity_list.iter_range(from_tp, to_tp, offset), limit)
+        return StructureEntitySearch.paginate((data for data in entity_list if from_tp <= data.timestamp <= to_tp),
+                                              limit, offset)
+
+    @staticmethod
+    def search_candidates(entity_list, search_terms: Union[Dict, EntityQuery]):
+        """
+        Narrows down the entities to compare with search terms. For indexed entity lists,
+        these are the entities matching the most selective indexed search term. Conditions
+        built with Query are answered with the index of their attribute when it can, e.g.,
+        ranges and prefixes with its sorted keys. The candidates are in list order, so indexes
+        do not change the order of search results
+        :param entity_list: the list of entities to search
+        :param search_terms: key value pair of attributes and their values, or an entity query
+        :return: the entities that may match the search terms
+        """
+        if not isinstance(entity_list, IndexedEntityList):
+            return entity_list
+        candidates = StructureEntitySearch._indexed_candidates(entity_list, search_terms)
+        return entity_list if candidates is None else candidates
+
+    @staticmethod
+    def _indexed_candidates(entity_list: IndexedEntityList, search_terms: Union[Dict, EntityQuery]):
+        """
+        Returns the entities of an indexed list that may match search terms, or None if the indexes cannot tell
+        """
+        if isinstance(search_terms, EntityQuery):
+            if search_terms.operator == 'not':
+                return None
+            branches = [StructureEntitySearch._indexed_candidates(entity_list, criteria)
+                        for criteria in search_terms.criteria]
+            if search_terms.operator == 'and':
+                return min((entities for entities in branches if entities is not None), key=len, default=None)
+            if any(entities is None for entities in branches):
+                return None
+            # entities in several branches are compared once, in list order
+            return entity_list.in_list_order(list({id(entity): entity for entities in branches
+                                                   for entity in entities}.values()))
+
+        candidates = None
+        for attribute, value in (search_terms or {}).items():
+            if isinstance(value, ValueQuery):
+                entities = entity_list.lookup_query(attribute, value)
+            else:
+                # enum values are indexed by value
+                entities = entity_list.lookup(attribute, value.value if isinstance(value, AbstractEnum) else value)
+            if entities is not None and (candidates is None or len(entities) < len(candidates)):
+                candidates = entities
+        return candidates
+
+    @staticmethod
+    def parse_date_range(from_timestamp: str, to_timestamp: str = None) -> Tuple[datetime, datetime]:
+        """
+        Parses the bounds of a date range search. Dates without time span the whole day
+        :param from_timestamp: the start timestamp
+        :param to_timestamp: the end timestamp, defaults to now
+        :return: the start and end datetime
+        """
         if len(from_timestamp) == 10:  # Check if only date is provided
             from_timestamp += ' 00:00:00'  # Add default time of midnight
 
@@ -86,14 +223,17 @@ class StructureEntitySearch:
         else:
             if len(to_timestamp) == 10:  # Check if only date is provided
                 to_timestamp += ' 23:59:59'
-            to_tp = Validate.parse_date(to_timestamp)
-        from_tp = Validate.parse_date(from_timestamp)
-        filtered_data = []
-        for data in entity_list:
-            if from_tp <= data.timestamp <= to_tp:
-                filtered_data.append(data)
+            to_tp = StructureEntitySearch._parse_bound(to_timestamp)
+        return StructureEntitySearch._parse_bound(from_timestamp), to_tp
 
-        return filtered_data
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _parse_bound(timestamp: str) -> datetime:
+        """
+        Parses a date range bound. Dashboards repeat the same bounds, hence the cache
+        :param timestamp: the timestamp string
+        """
+        return Validate.parse_date(timestamp)
 
     @staticmethod
     def search_structure_entity(entity_list, search_field, search_value):
@@ -105,7 +245,7 @@ class StructureEntitySearch:
         :return:
         """
 
-        for entity in entity_list:
+        for entity in StructureEntitySearch.search_candidates(entity_list, {search_field: search_value}):
             try:
                 if getattr(entity, search_field) == search_value:
                     return entity
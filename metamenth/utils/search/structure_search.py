@@ -1,6 +1,8 @@
 from typing import Dict
+from typing import Iterator
 import sys
-from metamenth.enumerations.abstract_enum import AbstractEnum
+from metamenth.utils.search.criteria_matcher import CriteriaMatcher
+from metamenth.utils.search.structure_entity_search import StructureEntitySearch
 
 
 class StructureSearch:
@@ -57,19 +59,13 @@ class StructureSearch:
             return structures
 
         results = []
-        for structure in structures:
+        matches = CriteriaMatcher(search_terms, strict=True).matches
+        for structure in StructureEntitySearch.search_candidates(structures, search_terms):
             if not isinstance(structure, AbstractSpace) and not isinstance(structure, Layer) and \
                 not isinstance(structure, Cover):
                 raise ValueError('{} is not a structure, layer or cover type'.format(structure))
-            found = True
             try:
-                for attribute, value in search_terms.items():
-                    att_value = getattr(structure, attribute)
-                    if isinstance(att_value, AbstractEnum):
-                        att_value = att_value.value
-                    if att_value != value:
-                        found = False
-                if found:
+                if matches(structure):
                     results.append(structure)
             except AttributeError as err:
                 # TODO: log errors to file
@@ -77,6 +73,34 @@ class StructureSearch:
 
         return results
 
+    @staticmethod
+    def iter_search(structures, search_terms: Dict = None, limit: int = None, offset: int = 0) -> Iterator:
+        """
+        Yields the structures matching search terms one at a time, as search returns them
+        :param structures: the structures to search: floor, room, open spaces
+        :param search_terms: key value pair of attributes and their values
+        :param limit: the maximum number of structures to yield
+        :param offset: the number of matching structures to skip
+        :return:
+        """
+        if search_terms is None:
+            return StructureEntitySearch.paginate(iter(structures), limit, offset)
+        return StructureEntitySearch.paginate(StructureSearch._iter_matches(structures, search_terms), limit, offset)
+
+    @staticmethod
+    def _iter_matches(structures, search_terms: Dict):
+        from metamenth.structure.interfaces.abstract_space import AbstractSpace
+        from metamenth.structure.layer import Layer
+        from metamenth.structure.cover import Cover
+
+        matcher = CriteriaMatcher(search_terms, strict=True)
+        for structure in StructureEntitySearch.search_candidates(structures, search_terms):
+            if not isinstance(structure, AbstractSpace) and not isinstance(structure, Layer) and \
+                not isinstance(structure, Cover):
+                raise ValueError('{} is not a structure, layer or cover type'.format(structure))
+            if StructureEntitySearch.matches(structure, matcher):
+                yield structure
+
     @staticmethod
     def search_structure(structures, search_field, search_value):
         """
@@ -89,7 +113,7 @@ class StructureSearch:
         from metamenth.structure.interfaces.abstract_space import AbstractSpace
         from metamenth.structure.layer import Layer
         from metamenth.structure.cover import Cover
-        for structure in structures:
+        for structure in StructureEntitySearch.search_candidates(structures, {search_field: search_value}):
             if not isinstance(structure, AbstractSpace) and not isinstance(structure, Layer) and \
                 not isinstance(structure, Cover):
                 raise ValueError('is not a structure, layer or cover type'.format(structure))
@@ -0,0 +1,108 @@
+from bisect import bisect_left
+from bisect import bisect_right
+from datetime import datetime
+from itertools import islice
+from operator import attrgetter
+from operator import le
+from typing import Any
+from typing import Iterator
+from typing import List
+
+
+class TimestampIndex:
+    """
+    Keeps time series records (e.g., sensor data, meter measures, weather data)
+    ordered by timestamp so that date range searches are answered with binary search
+    """
+
+    def __init__(self, records: List[Any] = None):
+        """
+        :param records: the initial records to index
+        """
+        self._timestamps: List[datetime] = []
+        self._records: List[Any] = []
+        if records:
+            self.extend(records)
+
+    def add(self, record):
+        """
+        Adds a record to the index. Records arriving in time order are appended,
+        out of order records are inserted at their sorted position
+        :param record: the record with a timestamp attribute
+        """
+        timestamp = record.timestamp
+        if not self._timestamps or timestamp >= self._timestamps[-1]:
+            self._timestamps.append(timestamp)
+            self._records.append(record)
+        else:
+            position = bisect_right(self._timestamps, timestamp)
+            self._timestamps.insert(position, timestamp)
+            self._records.insert(position, record)
+
+    def extend(self, records: List[Any]):
+        """
+        Adds multiple records to the index
+        :param records: the records to add
+        """
+        timestamps = list(map(attrgetter('timestamp'), records))
+        if timestamps and (not self._timestamps or timestamps[0] >= self._timestamps[-1]) and \
+                all(map(le, timestamps, islice(timestamps, 1, None))):
+            # records in time order after the indexed records (e.g., bulk loads) are appended at once
+            self._timestamps.extend(timestamps)
+            self._records.extend(records)
+            return
+        for record in records:
+            self.add(record)
+
+    def remove(self, record):
+        """
+        Removes a record from the index
+        :param record: the record to remove
+        """
+        start = bisect_left(self._timestamps, record.timestamp)
+        end = bisect_right(self._timestamps, record.timestamp)
+        for position in range(start, end):
+            if self._records[position] is record:
+                break
+        else:
+            position = next((index for index in range(start, end) if self._records[index] == record), None)
+            if position is None:
+                raise ValueError(f'{record} is not in the index')
+        del self._timestamps[position]
+        del self._records[position]
+
+    def range(self, from_timestamp: datetime, to_timestamp: datetime) -> List[Any]:
+        """
+        Returns the records within a time interval (both ends inclusive), ordered by timestamp
+        :param from_timestamp: the start timestamp
+        :param to_timestamp: the end timestamp
+        """
+        start = bisect_left(self._timestamps, from_timestamp)
+        end = bisect_right(self._timestamps, to_timestamp)
+        return self._records[start:end]
+
+    def iter_range(self, from_timestamp: datetime, to_timestamp: datetime, offset: int = 0) -> Iterator[Any]:
+        """
+        Yields the records within a time interval one at a time, as range returns them
+        :param from_timestamp: the start timestamp
+        :param to_timestamp: the end timestamp
+        :param offset: the number of records to skip, without visiting them
+        """
+        start = bisect_left(self._timestamps, from_timestamp)
+        end = bisect_right(self._timestamps, to_timestamp)
+        for position in range(start + offset, end):
+            yield self._records[position]
+
+    def iter_before(self, timestamp: datetime) -> Iterator[Any]:
+        """
+        Yields the records recorded before a timestamp, the latest first
+        :param timestamp: the timestamp
+        """
+        for position in range(bisect_left(self._timestamps, timestamp) - 1, -1, -1):
+            yield self._records[position]
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self._records)
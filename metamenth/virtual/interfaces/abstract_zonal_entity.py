@@ -2,16 +2,19 @@ from abc import ABC
 from metamenth.utils import EntityInsert
 from metamenth.utils import EntityRemover
 from metamenth.utils import StructureEntitySearch
+from metamenth.utils import EntityList
 from typing import Dict
+from typing import Iterator
 from metamenth.enumerations import BuildingEntity
+from metamenth.utils import IndexedEntity
 
 
-class AbstractZonalEntity(ABC):
+class AbstractZonalEntity(IndexedEntity, ABC):
 
     def __init__(self):
         """
         """
-        self._zones = []
+        self._zones = EntityList()
 
     @property
     def zones(self):
@@ -63,4 +66,14 @@ class AbstractZonalEntity(ABC):
         :param search_terms: a dictionary of attributes and their values
         :return:
         """
-        return StructureEntitySearch.search(self._zones, search_terms)
\ No newline at end of file
+        return StructureEntitySearch.search(self._zones, search_terms)
+
+    def iter_zones(self, search_terms: Dict = None, limit: int = None, offset: int = 0) -> Iterator:
+        """
+        Yields the zones matching search terms one at a time, as get_zones returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of zones to yield
+        :param offset: the number of matching zones to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._zones, search_terms, limit, offset)
@@ -2,16 +2,25 @@ from metamenth.enumerations import ZoneType
 from metamenth.enumerations import HVACType
 from uuid import uuid4
 from typing import List
+from typing import Iterator
 from metamenth.structure.interfaces.abstract_space import AbstractSpace
 from metamenth.utils import EntityRemover
 from metamenth.enumerations import BuildingEntity
 from metamenth.utils import EntityInsert
 from metamenth.utils import StructureEntitySearch
 from metamenth.utils import StructureSearch
+from metamenth.utils import IndexedEntityList
+from metamenth.utils import EntityList
 from typing import Dict
+from metamenth.enumerations import MeterType
+from metamenth.enumerations import MeasurementUnit
+from metamenth.measure_instruments.meter import Meter
+from metamenth.datatypes.aligned_readings import AlignedReadings
+from metamenth.utils.aggregation.meter_aggregation import MeterAggregation
+from metamenth.utils import IndexedEntity
 
 
-class Zone:
+class Zone(IndexedEntity):
     """
     A zone in a building e.g. HVAC (thermal) zone
 
@@ -36,9 +45,9 @@ class Zone:
         self._name = None
         self._zone_type = None
         self._hvac_type = None
-        self._adjacent_zones: List['Zone'] = []
-        self._overlapping_zones: List['Zone'] = []
-        self._spaces: List['AbstractSpace'] = []
+        self._adjacent_zones: List['Zone'] = EntityList()
+        self._overlapping_zones: List['Zone'] = EntityList()
+        self._spaces: List['AbstractSpace'] = EntityList()
 
         # Apply validation
         self.name = name
@@ -137,6 +146,15 @@ class Zone:
         EntityInsert.insert_building_entity(self._overlapping_zones, overlapping_zones,
                                             BuildingEntity.OVERLAPPING_ZONE.value, self)
 
+    def enable_search_index(self, attributes: List[str] = None):
+        """
+        Indexes the adjacent zones, overlapping zones and spaces of this zone
+        by UID, name and other attributes for faster searches
+        :param attributes: the attributes indexed in addition to UID and name
+        :return:
+        """
+        IndexedEntityList.index_lists(self, ['_adjacent_zones', '_overlapping_zones', '_spaces'], attributes)
+
     def get_adjacent_zone_by_name(self, name) -> 'Zone':
         """
         Search adjacent zones by name
@@ -161,6 +179,16 @@ class Zone:
         """
         return StructureEntitySearch.search(self._adjacent_zones, search_terms)
 
+    def iter_adjacent_zones(self, search_terms: Dict = None, limit: int = None, offset: int = 0) -> Iterator['Zone']:
+        """
+        Yields the adjacent zones matching search terms one at a time, as get_adjacent_zones returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of adjacent zones to yield
+        :param offset: the number of matching adjacent zones to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._adjacent_zones, search_terms, limit, offset)
+
     def get_overlapping_zone_by_name(self, name) -> 'Zone':
         """
         Search overlapping zones by name
@@ -185,6 +213,16 @@ class Zone:
         """
         return StructureEntitySearch.search(self._overlapping_zones, search_terms)
 
+    def iter_overlapping_zones(self, search_terms: Dict = None, limit: int = None, offset: int = 0) -> Iterator['Zone']:
+        """
+        Yields the overlapping zones matching search terms one at a time, as get_overlapping_zones returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of overlapping zones to yield
+        :param offset: the number of matching overlapping zones to skip
+        :return:
+        """
+        return StructureEntitySearch.iter_search(self._overlapping_zones, search_terms, limit, offset)
+
     def get_space_by_uid(self, uid) -> 'AbstractSpace':
         """
         Search spaces by uid
@@ -201,6 +239,38 @@ class Zone:
         """
         return StructureSearch.search(self._spaces, search_terms)
 
+    def iter_spaces(self, search_terms: Dict = None, limit: int = None, offset: int = 0) -> Iterator['AbstractSpace']:
+        """
+        Yields the spaces matching search terms one at a time, as get_spaces returns them
+        :param search_terms: a dictionary of attributes and their values
+        :param limit: the maximum number of spaces to yield
+        :param offset: the number of matching spaces to skip
+        :return:
+        """
+        return StructureSearch.iter_search(self._spaces, search_terms, limit, offset)
+
+    def aggregate_meter_readings(self, meter_type: MeterType = None, frequency: float = None,
+                                 from_timestamp: str = None, to_timestamp: str = None,
+                                 unit: MeasurementUnit = None) -> AlignedReadings:
+        """
+        Aligns the readings of the meters of the spaces in this zone on a common time grid, e.g., to
+        compute the load curve of the zone with AlignedReadings.total()
+        :param meter_type: the type of the meters, defaults to all the meters
+        :param frequency: the length of the intervals of the grid in seconds, defaults to the
+        longest measurement frequency of the meters
+        :param from_timestamp: the start timestamp, defaults to the first reading
+        :param to_timestamp: the end timestamp
+        :param unit: the unit of the aligned readings, defaults to the unit of the first meter
+        :return: AlignedReadings
+        """
+        meters = []
+        for space in self._spaces:
+            meter = getattr(space, 'meter', None)
+            if (isinstance(meter, Meter) and (meter_type is None or meter.meter_type == meter_type) and
+                    all(meter is not added_meter for added_meter in meters)):
+                meters.append(meter)
+        return MeterAggregation.align(meters, frequency, from_timestamp, to_timestamp, unit)
+
     def __eq__(self, other):
         # zones are equal if they share the same name
         if isinstance(other, Zone):
@@ -0,0 +1,366 @@
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Union
+from operator import attrgetter
+from metamenth.enumerations.abstract_enum import AbstractEnum
+from metamenth.utils.search.query import EntityQuery
+from metamenth.utils.search.query import ValueQuery
+from metamenth.subsystem.hvac_components.duct import Duct
+from metamenth.subsystem.hvac_components.air_volume_box import AirVolumeBox
+from metamenth.visitors.interfaces.abstract_space_visitor import AbstractSpaceVisitor
+
+# marks entries whose inclusion does not depend on another entity
+_NO_GUARD = object()
+
+
+class _Entry:
+    """
+    An entity found while indexing a building, with the floor and space it was found in
+    """
+    __slots__ = ('entity', 'floor', 'space', 'space_kind', 'guard', 'class_name', 'parent_class_name')
+
+    def __init__(self, entity, floor=None, space=None, space_kind=None, guard=_NO_GUARD,
+                 class_name: str = None, parent_class_name: str = None):
+        self.entity = entity
+        self.floor = floor
+        self.space = space
+        # room or open_space, as dispatched by the accept method of the space
+        self.space_kind = space_kind
+        # an entity that must also match the criteria, e.g., the meter of the space of a component meter
+        self.guard = guard
+        self.class_name = class_name
+        self.parent_class_name = parent_class_name
+
+
+class _SpaceKind:
+    """
+    Records whether a space is visited as a room or as an open space
+    """
+
+    def __init__(self):
+        self.kind = None
+
+    def visit_room(self, room):
+        self.kind = 'room'
+
+    def visit_open_space(self, open_space):
+        self.kind = 'open_space'
+
+
+class _AttributeIndex:
+    """
+    Maps the values of an attribute (enum values are indexed by value) to the positions of the entries
+    having them. Entries with list or unhashable values are kept aside and returned by every lookup.
+    Attributes read through dotted names (e.g., area.value) are None when missing, as visitors read them
+    """
+
+    def __init__(self, entries: List[_Entry], attribute: str):
+        self._positions: Dict[Any, List[int]] = {}
+        self._unindexed: List[int] = []
+        self._sorted_keys = False
+        get = attrgetter(attribute)
+        for position, entry in enumerate(entries):
+            try:
+                try:
+                    value = get(entry.entity)
+                except AttributeError:
+                    value = None
+                if isinstance(value, AbstractEnum):
+                    value = value.value
+                if isinstance(value, list):
+                    raise TypeError
+                self._positions.setdefault(value, []).append(position)
+            except (AttributeError, TypeError):
+                self._unindexed.append(position)
+
+    def lookup(self, value) -> set:
+        """
+        Returns the positions of the entries that may have a value, or None if the value is unhashable
+        """
+        try:
+            return set(self._positions.get(value, [])).union(self._unindexed)
+        except TypeError:
+            return None
+
+    def lookup_any(self, values: List) -> set:
+        """
+        Returns the positions of the entries that may have any of the values, or None if a value is unhashable
+        """
+        positions = set(self._unindexed)
+        try:
+            for value in values:
+                positions.update(self._positions.get(value, []))
+        except TypeError:
+            return None
+        return positions
+
+    def sorted_keys(self) -> List:
+        """
+        Returns the sorted values of the index without None, or None if they cannot be sorted
+        """
+        if self._sorted_keys is False:
+            try:
+                self._sorted_keys = sorted(key for key in self._positions.keys() if key is not None)
+            except TypeError:
+                self._sorted_keys = None
+        return self._sorted_keys
+
+
+class BuildingQueryEngine:
+    """
+    Answers the searches of the sensor, meter, hvac component and space search visitors
+    with inverted indexes built once from a building, instead of a traversal per search.
+
+    The indexes are a snapshot of the building; call refresh() after adding or removing floors,
+    spaces, sensors, meters or hvac components.
+    """
+
+    def __init__(self, building):
+        """
+        :param building: the building to search
+        """
+        self._building = building
+        self.refresh()
+
+    @property
+    def building(self):
+        return self._building
+
+    def refresh(self):
+        """
+        Rebuilds the indexes from the current state of the building
+        """
+        self._floors: List[Any] = []
+        self._spaces: List[_Entry] = []
+        self._sensors: List[_Entry] = []
+        self._meters: List[_Entry] = []
+        self._hvac_components: List[_Entry] = []
+        self._space_floors: Dict[int, Any] = {}
+        self._component_classes: Dict[str, List[int]] = {}
+        self._attribute_indexes: Dict[tuple, _AttributeIndex] = {}
+
+        for meter in self._building.get_meters():
+            self._meters.append(_Entry(meter))
+
+        space_kind = _SpaceKind()
+        for floor in self._building.get_floors():
+            self._floors.append(floor)
+            for space in floor.get_rooms() + floor.get_open_spaces():
+                space.accept(space_kind)
+                self._space_floors[id(space)] = floor
+                self._spaces.append(_Entry(space, floor, space, space_kind.kind))
+                self._index_space(space, floor, space_kind.kind)
+
+        for position, entry in enumerate(self._hvac_components):
+            self._component_classes.setdefault(entry.class_name, []).append(position)
+
+    def get_floor(self, space):
+        """
+        Returns the floor of a room or an open space
+        :param space: the room or open space
+        """
+        return self._space_floors.get(id(space))
+
+    def search_sensors(self, sensor_criteria: Dict, floor_criteria: Dict = None, room_criteria: Dict = None,
+                       open_space_criteria: Dict = None) -> List:
+        """
+        Returns the sensors found by a SensorSearchVisitor with the same criteria
+        :param sensor_criteria: the search criteria for sensors
+        :param floor_criteria: criteria to filter down sensor search to specific floors
+        :param room_criteria: criteria to filter down sensor search to specific rooms
+        :param open_space_criteria: criteria to filter down sensor search to specific open spaces
+        """
+        return self._search('sensors', self._sensors, sensor_criteria,
+                            self._space_filter(floor_criteria, room_criteria, open_space_criteria))
+
+    def search_meters(self, meter_criteria: Dict, floor_criteria: Dict = None, room_criteria: Dict = None,
+                      open_space_criteria: Dict = None) -> List:
+        """
+        Returns the meters found by a MeterSearchVisitor with the same criteria
+        :param meter_criteria: the search criteria for meters
+        :param floor_criteria: criteria to filter down meter search to specific floors
+        :param room_criteria: criteria to filter down meter search to specific rooms
+        :param open_space_criteria: criteria to filter down meter search to specific open spaces
+        """
+        return self._search('meters', self._meters, meter_criteria,
+                            self._space_filter(floor_criteria, room_criteria, open_space_criteria))
+
+    def search_hvac_components(self, hvac_component_criteria: Dict, floor_criteria: Dict = None,
+                               room_criteria: Dict = None, open_space_criteria: Dict = None) -> List:
+        """
+        Returns the hvac components found by a HVACComponentSearchVisitor with the same criteria
+        :param hvac_component_criteria: the search criteria for hvac components, with a component_class
+        :param floor_criteria: criteria to filter down the search to specific floors
+        :param room_criteria: criteria to filter down the search to specific rooms
+        :param open_space_criteria: criteria to filter down the search to specific open spaces
+        """
+        if 'component_class' not in hvac_component_criteria:
+            raise ValueError(f'hvac component criteria must have component_class value: {hvac_component_criteria}')
+        component_class = hvac_component_criteria['component_class']
+        try:
+            positions = set(self._component_classes.get(component_class, []))
+        except TypeError:
+            return []
+        return self._search('hvac_components', self._hvac_components, hvac_component_criteria,
+                            self._space_filter(floor_criteria, room_criteria, open_space_criteria),
+                            positions, lambda entry: entry.parent_class_name != component_class)
+
+    def search_spaces(self, floor_criteria: Dict = None, room_criteria: Dict = None,
+                      open_space_criteria: Dict = None, include_floor: bool = True) -> List:
+        """
+        Returns the floors and spaces found by a SpaceSearchVisitor with the same criteria
+        :param floor_criteria: criteria to filter down the search to specific floors
+        :param room_criteria: the search criteria for rooms
+        :param open_space_criteria: the search criteria for open spaces
+        :param include_floor: whether the matching floors are returned
+        """
+        compile_criteria = AbstractSpaceVisitor.compile_criteria
+        floor_matches = compile_criteria(floor_criteria).matches
+        space_matches = {'room': compile_criteria(room_criteria).matches,
+                         'open_space': compile_criteria(open_space_criteria).matches}
+        matching_floors = {id(floor) for floor in self._floors if floor_matches(floor)}
+        spaces_by_floor: Dict[int, List] = {}
+        for entry in self._spaces:
+            if id(entry.floor) not in matching_floors:
+                continue
+            if space_matches[entry.space_kind](entry.space):
+                spaces_by_floor.setdefault(id(entry.floor), []).append(entry.space)
+
+        found_entities = []
+        for floor in self._floors:
+            if id(floor) in matching_floors:
+                if include_floor:
+                    found_entities.append(floor)
+                found_entities.extend(spaces_by_floor.get(id(floor), []))
+        return found_entities
+
+    def _index_space(self, space, floor, space_kind: str):
+        """
+        Adds the sensors, meters and hvac components of a space to the indexes, in visiting order
+        """
+        for transducer in space.get_transducers():
+            self._sensors.append(_Entry(transducer, floor, space, space_kind))
+        for entity in space.get_hvac_components() + space.get_appliances() + space.get_energy_systems():
+            for transducer in entity.get_transducers():
+                self._sensors.append(_Entry(transducer, floor, space, space_kind))
+
+        # meters of components are only searched when the meter of their space matches
+        if space.meter:
+            self._meters.append(_Entry(space.meter, floor, space, space_kind))
+        for entity in space.get_hvac_components() + space.get_energy_systems():
+            # ventilation components (e.g., ducts) do not have meters
+            meter = getattr(entity, 'meter', None)
+            if meter:
+                self._meters.append(_Entry(meter, floor, space, space_kind, space.meter))
+
+        for component in space.get_hvac_components():
+            class_name = component.__class__.__name__
+            self._hvac_components.append(_Entry(component, floor, space, space_kind, class_name=class_name))
+            if isinstance(component, Duct):
+                # duct entities are searched when the duct is not the searched class
+                for duct_entity in (component.get_heat_exchangers() + component.get_fans() +
+                                    component.get_connected_air_volume_boxes() + component.get_dampers() +
+                                    component.get_filters()):
+                    self._hvac_components.append(_Entry(duct_entity, floor, space, space_kind,
+                                                        class_name=duct_entity.__class__.__name__,
+                                                        parent_class_name=class_name))
+            elif isinstance(component, AirVolumeBox) and component.inlet_dampers:
+                # inlet dampers are searched by the class of the first damper
+                damper_class = component.inlet_dampers[0].__class__.__name__
+                for damper in component.inlet_dampers:
+                    self._hvac_components.append(_Entry(damper, floor, space, space_kind, class_name=damper_class,
+                                                        parent_class_name=class_name))
+
+    def _space_filter(self, floor_criteria: Dict, room_criteria: Dict, open_space_criteria: Dict):
+        """
+        Returns a function checking the floor and space of an entry, evaluating the criteria once per floor and space
+        """
+        compile_criteria = AbstractSpaceVisitor.compile_criteria
+        floor_matches = compile_criteria(floor_criteria).matches
+        space_matches = {'room': compile_criteria(room_criteria).matches,
+                         'open_space': compile_criteria(open_space_criteria).matches}
+        results: Dict[int, bool] = {}
+
+        def space_filter(entry: _Entry) -> bool:
+            if entry.floor is None:
+                # building level entities
+                return True
+            if id(entry.floor) not in results:
+                results[id(entry.floor)] = floor_matches(entry.floor)
+            if id(entry.space) not in results:
+                results[id(entry.space)] = space_matches[entry.space_kind](entry.space)
+            return results[id(entry.floor)] and results[id(entry.space)]
+
+        return space_filter
+
+    def _search(self, name: str, entries: List[_Entry], criteria: Dict, space_filter,
+                positions: set = None, entry_filter=None) -> List:
+        """
+        Returns the entities of the entries matching the criteria, in visiting order
+        :param name: the name of the indexed entries
+        :param entries: the indexed entries
+        :param criteria: the search criteria of the entities
+        :param space_filter: checks the floor and space of an entry
+        :param positions: the positions of candidate entries, e.g., from the component class index
+        :param entry_filter: an additional check of the entries
+        """
+        matches = AbstractSpaceVisitor.compile_criteria(criteria).matches
+        candidates = self._candidates(name, entries, criteria)
+        if positions is not None:
+            candidates = positions if candidates is None else candidates & positions
+        selection = range(len(entries)) if candidates is None else sorted(candidates)
+
+        guard_results: Dict[int, bool] = {}
+        found_entities = []
+        for position in selection:
+            entry = entries[position]
+            if entry_filter and not entry_filter(entry):
+                continue
+            if not space_filter(entry):
+                continue
+            if entry.guard is not _NO_GUARD:
+                if id(entry.space) not in guard_results:
+                    guard_results[id(entry.space)] = matches(entry.guard)
+                if not guard_results[id(entry.space)]:
+                    continue
+            if matches(entry.entity):
+                found_entities.append(entry.entity)
+        return found_entities
+
+    def _candidates(self, name: str, entries: List[_Entry], criteria: Union[Dict, EntityQuery]) -> set:
+        """
+        Returns the positions of the entries that may match the criteria, using the smallest
+        attribute index hit, or None if no criterion can be answered by an index. Conditions
+        built with Query are answered from the sorted values of the indexes, e.g., ranges and prefixes
+        """
+        if isinstance(criteria, EntityQuery):
+            if criteria.operator == 'not':
+                return None
+            branches = [self._candidates(name, entries, criterion) for criterion in criteria.criteria]
+            if criteria.operator == 'and':
+                return min((positions for positions in branches if positions is not None), key=len, default=None)
+            if any(positions is None for positions in branches):
+                return None
+            return set().union(*branches)
+
+        candidates = None
+        for key, value in (criteria or {}).items():
+            if key == 'component_class':
+                continue
+            index = self._attribute_indexes.get((name, key))
+            if index is None:
+                index = _AttributeIndex(entries, key)
+                self._attribute_indexes[(name, key)] = index
+            # enum criteria are matched by value, as the attributes are indexed
+            if isinstance(value, ValueQuery):
+                keys = value.index_keys(index.sorted_keys)
+                positions = None if keys is None else index.lookup_any(keys)
+            elif isinstance(value, list):
+                positions = index.lookup_any([item.value if isinstance(item, AbstractEnum) else item
+                                              for item in value])
+            else:
+                positions = index.lookup(value.value if isinstance(value, AbstractEnum) else value)
+            if positions is not None and (candidates is None or len(positions) < len(candidates)):
+                candidates = positions
+        return candidates
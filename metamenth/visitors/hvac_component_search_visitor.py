@@ -20,16 +20,19 @@ class HVACComponentSearchVisitor(AbstractSpaceVisitor):
         if 'component_class' not in hvac_component_criteria:
             raise ValueError(f'hvac component criteria must have component_class value: {hvac_component_criteria}')
         self._hvac_component_criteria = hvac_component_criteria
+        self._hvac_component_matcher = AbstractSpaceVisitor.compile_criteria(hvac_component_criteria)
 
     def visit_room(self, room):
-        if self._match_criteria(room, self._room_criteria):
-            print(f'Visiting room: {room.name}')
+        if self._room_matcher.matches(room):
+            started = self._enter_node('room', room)
             self._search_hvac_components(room)
+            self._exit_node('room', room, started)
 
     def visit_open_space(self, open_space):
-        if self._match_criteria(open_space, self._open_space_criteria):
-            print(f'Visiting open space: {open_space.name}')
+        if self._open_space_matcher.matches(open_space):
+            started = self._enter_node('open space', open_space)
             self._search_hvac_components(open_space)
+            self._exit_node('open space', open_space, started)
 
     def _search_hvac_components(self, space):
         component_class = self._hvac_component_criteria['component_class']
@@ -56,5 +59,5 @@ class HVACComponentSearchVisitor(AbstractSpaceVisitor):
                             self._add_hvac_component(damper)
 
     def _add_hvac_component(self, entity):
-        if self._match_criteria(entity, self._hvac_component_criteria):
+        if self._hvac_component_matcher.matches(entity):
             self.found_entities.append(entity)
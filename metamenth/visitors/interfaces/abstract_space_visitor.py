@@ -1,5 +1,13 @@
-from metamenth.enumerations.abstract_enum import AbstractEnum
+from metamenth.utils.search.criteria_matcher import CriteriaMatcher
+from typing import Any
+from typing import Callable
 from typing import Dict
+from typing import List
+from typing import Union
+import logging
+import time
+
+logger = logging.getLogger(__name__)
 
 
 class AbstractSpaceVisitor:
@@ -19,21 +27,33 @@ class AbstractSpaceVisitor:
         self._floor_criteria = floor_criteria
         self._room_criteria = room_criteria
         self._open_space_criteria = open_space_criteria
+        # criteria are compiled once, then matched against every node
+        self._floor_matcher = AbstractSpaceVisitor.compile_criteria(floor_criteria)
+        self._room_matcher = AbstractSpaceVisitor.compile_criteria(room_criteria)
+        self._open_space_matcher = AbstractSpaceVisitor.compile_criteria(open_space_criteria)
         self.found_entities = []
+        # called with the kind (building, floor, room or open space) and the node when a node is visited
+        self.trace_hook: Callable[[str, Any], None] = None
+        # when set, (kind, node, seconds) tuples are added to node_timings;
+        # the time of a node includes the time of the nodes visited from it
+        self.record_timing = False
+        self.node_timings: List[tuple] = []
 
     def visit_building(self, building):
-        print(f'Visiting building: {building.address}')
+        started = self._enter_node('building', building)
         for floor in building.get_floors():
             floor.accept(self)
+        self._exit_node('building', building, started)
 
     def visit_floor(self, floor):
-        if self._match_criteria(floor, self._floor_criteria):
-            print(f'Visiting floor: {floor.number}')
+        if self._floor_matcher.matches(floor):
+            started = self._enter_node('floor', floor)
             for room in floor.get_rooms():
                 room.accept(self)
 
             for open_space in floor.get_open_spaces():
                 open_space.accept(self)
+            self._exit_node('floor', floor, started)
 
     def visit_room(self, room):
         pass
@@ -41,41 +61,67 @@ class AbstractSpaceVisitor:
     def visit_open_space(self, open_space):
         pass
 
-    def _match_criteria(self, entity, criteria):
+    def _enter_node(self, kind: str, node):
+        """
+        Traces the visit of a node to the debug log of the visitors and the trace hook.
+        Nothing is formatted when debug logging is off
+        :param kind: the kind of node, i.e., building, floor, room or open space
+        :param node: the visited node
+        :return: the start time of the visit if timing is recorded, otherwise None
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Visiting %s: %s', kind, AbstractSpaceVisitor._node_label(kind, node))
+        if self.trace_hook is not None:
+            self.trace_hook(kind, node)
+        return time.perf_counter() if self.record_timing else None
+
+    def _exit_node(self, kind: str, node, started: float):
+        """
+        Records the time spent visiting a node
+        :param kind: the kind of node
+        :param node: the visited node
+        :param started: the start time returned by _enter_node
+        """
+        if started is not None:
+            elapsed = time.perf_counter() - started
+            self.node_timings.append((kind, node, elapsed))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Visited %s: %s in %.6f s', kind, AbstractSpaceVisitor._node_label(kind, node), elapsed)
+
+    @staticmethod
+    def _node_label(kind: str, node):
+        if kind == 'building':
+            return node.address
+        if kind == 'floor':
+            return node.number
+        return node.name
+
+    def _match_criteria(self, entity, criteria: Union[Dict, CriteriaMatcher]):
         """
         Searches for sensors that meet specific criteria
         :param entity: the entity being compare to search criteria
-        :param criteria: the filter criteria
+        :param criteria: the filter criteria, or a matcher compiled from them
+        """
+        return AbstractSpaceVisitor.match_criteria(entity, criteria)
+
+    @staticmethod
+    def compile_criteria(criteria: Dict) -> CriteriaMatcher:
+        """
+        Compiles search criteria into a matcher, as matched by the visitors
+        :param criteria: the filter criteria, the component_class of hvac component criteria is not an attribute
+        """
+        return CriteriaMatcher(criteria, ignored_keys=('component_class',))
+
+    @staticmethod
+    def match_criteria(entity, criteria: Union[Dict, CriteriaMatcher]) -> bool:
+        """
+        Checks if an entity meets search criteria, as done by the visitors. Criteria matched
+        against many entities should be compiled once with compile_criteria
+        :param entity: the entity being compare to search criteria
+        :param criteria: the filter criteria, or a matcher compiled from them
         """
-        if not criteria:
-            return True
-
-        try:
-            for key, value in criteria.items():
-                if key == 'component_class':
-                    continue
-                att_value = entity.get(key)
-                if isinstance(att_value, AbstractEnum):
-                    att_value = att_value.value
-                if isinstance(value, list):
-                    # for list search criteria
-                    if isinstance(att_value, list):
-                        match_found = False
-                        for i in range(len(att_value)):
-                            for j in range(len(value)):
-                                if att_value[i] == value[j]:
-                                    match_found = True
-                        return match_found
-
-                    else:
-                        if att_value not in value:
-                            return False
-                else:
-                    # For single-value criteria
-                    if att_value != value:
-                        return False
-        except AttributeError:
-            # handle attribute errors for None types
-            pass
-
-        return True
+        if not isinstance(criteria, CriteriaMatcher):
+            if not criteria:
+                return True
+            criteria = AbstractSpaceVisitor.compile_criteria(criteria)
+        return criteria.matches(entity)
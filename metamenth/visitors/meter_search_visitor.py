@@ -15,28 +15,32 @@ class MeterSearchVisitor(AbstractSpaceVisitor):
         """
         super().__init__(floor_criteria, room_criteria, open_space_criteria)
         self._meter_criteria = meter_criteria
+        self._meter_matcher = AbstractSpaceVisitor.compile_criteria(meter_criteria)
 
     def visit_building(self, building):
-        print(f'Visiting building: {building.address}')
+        started = self._enter_node('building', building)
         for meter in building.get_meters():
-            if self._match_criteria(meter, self._meter_criteria):
+            if self._meter_matcher.matches(meter):
                 self.found_entities.append(meter)
 
         for floor in building.get_floors():
             floor.accept(self)
+        self._exit_node('building', building, started)
 
     def visit_room(self, room):
-        if self._match_criteria(room, self._room_criteria):
-            print(f'Visiting room: {room.name}')
+        if self._room_matcher.matches(room):
+            started = self._enter_node('room', room)
             self._search_meters(room)
+            self._exit_node('room', room, started)
 
     def visit_open_space(self, open_space):
-        if self._match_criteria(open_space, self._open_space_criteria):
-            print(f'Visiting open space: {open_space.name}')
+        if self._open_space_matcher.matches(open_space):
+            started = self._enter_node('open space', open_space)
             self._search_meters(open_space)
+            self._exit_node('open space', open_space, started)
 
     def _search_meters(self, space):
-        if self._match_criteria(space.meter, self._meter_criteria):
+        if self._meter_matcher.matches(space.meter):
             # compare meter in open space to search criteria
             if space.meter:
                 self.found_entities.append(space.meter)
@@ -48,6 +52,6 @@ class MeterSearchVisitor(AbstractSpaceVisitor):
 
     def _search_entities(self, entities):
         for entity in entities:
-            if self._match_criteria(entity.meter, self._meter_criteria):
+            if self._meter_matcher.matches(entity.meter):
                 if entity.meter:
                     self.found_entities.append(entity.meter)
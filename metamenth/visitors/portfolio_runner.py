@@ -0,0 +1,308 @@
+import pickle
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from datetime import datetime
+from enum import Enum
+from types import FunctionType
+from types import MethodType
+from types import ModuleType
+from typing import Any
+from typing import Dict
+from typing import List
+from uuid import UUID
+from uuid import uuid4
+import numpy as np
+from metamenth.measure_instruments.interfaces.abstract_data_measure import AbstractDataMeasure
+from metamenth.measure_instruments.weather_data import WeatherData
+from metamenth.storage.interfaces.abstract_time_series_store import AbstractTimeSeriesStore
+from metamenth.storage.time_series_rollup import TimeSeriesRollup
+from metamenth.utils.search.timestamp_index import TimestampIndex
+from metamenth.visitors.interfaces.abstract_space_visitor import AbstractSpaceVisitor
+
+# objects that are not walked when numbering the entities of a building: values, and
+# recorded data that visitors do not return (walking them would dominate the cost)
+_LEAF_TYPES = (str, bytes, int, float, complex, bool, type(None), Enum, type, date, datetime, UUID,
+               FunctionType, MethodType, ModuleType, np.ndarray, np.generic,
+               AbstractTimeSeriesStore, TimeSeriesRollup, TimestampIndex, AbstractDataMeasure, WeatherData)
+
+
+class BuildingSnapshot:
+    """
+    A pickled copy of a building, made once and sent to the worker processes of a
+    PortfolioRunner instead of pickling the building for every task. Entities of the
+    building are numbered in the same order in the building and in its copies, so
+    entities found in a copy are mapped back to the entities of the building.
+    """
+
+    def __init__(self, building):
+        """
+        :param building: the building to snapshot
+        """
+        self._building = building
+        self._data = pickle.dumps(building, protocol=pickle.HIGHEST_PROTOCOL)
+        self._entities = BuildingSnapshot.number_entities(building)
+
+    @property
+    def building(self):
+        return self._building
+
+    @property
+    def data(self) -> bytes:
+        return self._data
+
+    def restore(self):
+        """
+        Returns a new copy of the building as it was when the snapshot was made
+        """
+        return pickle.loads(self._data)
+
+    def entity(self, position: int):
+        """
+        Returns the entity of the building with a number
+        :param position: the number of the entity
+        """
+        return self._entities[position]
+
+    @staticmethod
+    def number_entities(building) -> List[Any]:
+        """
+        Returns the objects reachable from a building, in a depth first order that only
+        depends on the structure of the building and is therefore the same in its copies
+        :param building: the building
+        """
+        entities = []
+        visited = set()
+        stack = [building]
+        while stack:
+            entity = stack.pop()
+            if isinstance(entity, _LEAF_TYPES) or id(entity) in visited:
+                continue
+            visited.add(id(entity))
+            if isinstance(entity, (list, tuple)):
+                # entity lists are walked as lists, the structures kept next to them are rebuilt in copies
+                children = list(entity)
+            elif isinstance(entity, dict):
+                children = list(entity.values())
+            elif isinstance(entity, (set, frozenset)):
+                # the order of sets differs between processes
+                continue
+            elif hasattr(entity, '__dict__'):
+                entities.append(entity)
+                children = list(vars(entity).values())
+            elif hasattr(type(entity), '__slots__'):
+                entities.append(entity)
+                children = [getattr(entity, name, None) for name in type(entity).__slots__]
+            else:
+                continue
+            stack.extend(reversed(children))
+        return entities
+
+
+class _BuildingPartition:
+    """
+    A view of a building restricted to some of its floors
+    """
+
+    def __init__(self, building, floors: List):
+        self._building = building
+        self._floors = floors
+
+    def get_floors(self, search_terms: Dict = None) -> List:
+        return self._floors
+
+    def __getattr__(self, name):
+        return getattr(self._building, name)
+
+
+class _WorkerState:
+    """
+    The snapshots of a runner in a process running its tasks, and the buildings restored from them
+    """
+
+    def __init__(self, generation: int, snapshots: List[bytes] = None):
+        self.generation = generation
+        self.snapshots = snapshots
+        self.buildings: Dict[int, tuple] = {}
+
+    def restore_building(self, building_position: int, data: bytes = None) -> tuple:
+        """
+        Returns a building restored from its snapshot, and the numbers of its entities
+        :param building_position: the position of the building in the runner
+        :param data: the snapshot, if it was not given to the process when it started
+        """
+        if building_position not in self.buildings:
+            building = pickle.loads(data if data is not None else self.snapshots[building_position])
+            positions = {id(entity): position
+                         for position, entity in enumerate(BuildingSnapshot.number_entities(building))}
+            self.buildings[building_position] = (building, positions)
+        return self.buildings[building_position]
+
+
+# the state of the runners whose tasks a process runs, by runner key
+_worker_states: Dict[str, _WorkerState] = {}
+
+
+def _initialize_worker(runner_key: str, generation: int, snapshots: List[bytes]):
+    _worker_states[runner_key] = _WorkerState(generation, snapshots)
+
+
+def _get_worker_state(runner_key: str, generation: int) -> _WorkerState:
+    state = _worker_states.get(runner_key)
+    if state is None or state.generation != generation:
+        # the buildings of an older snapshot of the runner are dropped
+        state = _WorkerState(generation)
+        _worker_states[runner_key] = state
+    return state
+
+
+def _run_partition(runner_key: str, generation: int, building_position: int, data: bytes,
+                   floor_positions: List[int], visit_building: bool, visitor_data: bytes) -> List[tuple]:
+    """
+    Runs a visitor on (some floors of) a building in a worker process
+    :return: (True, entity number) for entities of the building, (False, entity) for other found entities
+    """
+    if data is None:
+        building, positions = _get_worker_state(runner_key, generation).restore_building(building_position)
+    else:
+        # tasks of a given executor restore their own copy: the processes of the executor outlive the runner,
+        # and would keep the buildings of every runner that used them
+        building, positions = _WorkerState(generation).restore_building(building_position, data)
+    # each task has its own copy of the visitor, tasks may run in threads of one process
+    visitor = pickle.loads(visitor_data)
+    visitor.found_entities = []
+    if floor_positions is None:
+        building.accept(visitor)
+    else:
+        floors = building.get_floors()
+        partition_floors = [floors[position] for position in floor_positions]
+        if visit_building:
+            # the first partition of a building also does the building level work of the visitor
+            partition = _BuildingPartition(building, partition_floors)
+            visitor.visit_building(partition)
+        else:
+            for floor in partition_floors:
+                floor.accept(visitor)
+    results = []
+    for entity in visitor.found_entities:
+        if isinstance(entity, _BuildingPartition):
+            entity = building
+        position = positions.get(id(entity))
+        results.append((True, position) if position is not None else (False, entity))
+    return results
+
+
+class PortfolioRunner:
+    """
+    Runs space visitors (e.g., SensorSearchVisitor, MeterSearchVisitor) on a portfolio of buildings
+    over a process pool. Buildings, or groups of floors of large buildings, are searched in parallel
+    and the found entities are merged in building and floor order, as if the visitor had been
+    accepted by each building in turn. Found entities are the entities of the given buildings.
+
+    Buildings are snapshot when the runner is created; call refresh() after changing them.
+    The worker processes of the runner receive the snapshots when they start, and restore each
+    building once; with a given executor, each task is sent the snapshot of its building and
+    restores it, so the processes of the executor do not keep the buildings of the runner.
+    Splitting buildings by floors assumes that visit_building does its building level work
+    and then visits the floors returned by get_floors(), as AbstractSpaceVisitor does.
+    """
+
+    def __init__(self, buildings: List, max_workers: int = None, floors_per_partition: int = None,
+                 executor: Executor = None):
+        """
+        :param buildings: the buildings of the portfolio
+        :param max_workers: the number of worker processes, defaults to the number of processors
+        :param floors_per_partition: if set, the floors of each building are searched in groups of this size,
+        otherwise each building is searched by one worker
+        :param executor: an optional executor to use instead of a process pool owned by the runner
+        """
+        if floors_per_partition is not None and floors_per_partition <= 0:
+            raise ValueError('floors_per_partition must be a positive integer')
+        self._buildings = list(buildings)
+        self._max_workers = max_workers
+        self._floors_per_partition = floors_per_partition
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._snapshots: List[BuildingSnapshot] = []
+        # identify the snapshots of this runner in the processes running its tasks
+        self._key = uuid4().hex
+        self._generation = 0
+        self.refresh()
+
+    @property
+    def snapshots(self) -> List[BuildingSnapshot]:
+        return self._snapshots
+
+    def refresh(self):
+        """
+        Snapshots the buildings again, e.g., after adding sensors to them
+        """
+        self._snapshots = [BuildingSnapshot(building) for building in self._buildings]
+        self._generation += 1
+        if self._owns_executor:
+            self._shutdown()
+
+    def run(self, visitor: AbstractSpaceVisitor) -> List:
+        """
+        Runs a visitor on the buildings of the portfolio. The found entities are added
+        to the found_entities of the visitor
+        :param visitor: the visitor
+        :return: the found entities
+        """
+        if not isinstance(visitor, AbstractSpaceVisitor):
+            raise ValueError('visitor must be of type AbstractSpaceVisitor')
+        executor = self._get_executor()
+        partitions = self._partitions()
+        visitor_data = pickle.dumps(visitor, protocol=pickle.HIGHEST_PROTOCOL)
+        futures = [executor.submit(_run_partition, self._key, self._generation, building_position,
+                                   None if self._owns_executor else self._snapshots[building_position].data,
+                                   floor_positions, visit_building, visitor_data)
+                   for building_position, floor_positions, visit_building in partitions]
+        found_entities = []
+        for (building_position, _, _), future in zip(partitions, futures):
+            snapshot = self._snapshots[building_position]
+            for is_building_entity, result in future.result():
+                found_entities.append(snapshot.entity(result) if is_building_entity else result)
+        visitor.found_entities.extend(found_entities)
+        return found_entities
+
+    def close(self):
+        """
+        Stops the worker processes of the runner
+        """
+        if self._owns_executor:
+            self._shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _partitions(self) -> List[tuple]:
+        """
+        Returns (building position, floor positions, visit building) tuples, in the order results are merged
+        """
+        partitions = []
+        for building_position, snapshot in enumerate(self._snapshots):
+            if self._floors_per_partition is None:
+                partitions.append((building_position, None, True))
+                continue
+            floor_count = len(snapshot.building.get_floors())
+            starts = range(0, floor_count, self._floors_per_partition) if floor_count else [0]
+            for start in starts:
+                floor_positions = list(range(start, min(start + self._floors_per_partition, floor_count)))
+                partitions.append((building_position, floor_positions, start == 0))
+        return partitions
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers, initializer=_initialize_worker,
+                                                 initargs=(self._key, self._generation,
+                                                           [snapshot.data for snapshot in self._snapshots]))
+        return self._executor
+
+    def _shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -14,21 +14,24 @@ class SensorSearchVisitor(AbstractSpaceVisitor):
         """
         super().__init__(floor_criteria, room_criteria, open_space_criteria)
         self._sensor_criteria = sensor_criteria
+        self._sensor_matcher = AbstractSpaceVisitor.compile_criteria(sensor_criteria)
 
     def visit_room(self, room):
-        if self._match_criteria(room, self._room_criteria):
-            print(f'Visiting room: {room.name}')
+        if self._room_matcher.matches(room):
+            started = self._enter_node('room', room)
             self._search_sensors(room)
+            self._exit_node('room', room, started)
 
     def visit_open_space(self, open_space):
-        if self._match_criteria(open_space, self._open_space_criteria):
-            print(f'Visiting open space: {open_space.name}')
+        if self._open_space_matcher.matches(open_space):
+            started = self._enter_node('open space', open_space)
             self._search_sensors(open_space)
+            self._exit_node('open space', open_space, started)
 
     def _search_sensors(self, space):
         # search for space sensors
         for sensor in space.get_transducers():
-            if self._match_criteria(sensor, self._sensor_criteria):
+            if self._sensor_matcher.matches(sensor):
                 self.found_entities.append(sensor)
 
         # search for HVAC component sensors
@@ -41,6 +44,6 @@ class SensorSearchVisitor(AbstractSpaceVisitor):
     def _search_entities(self, entities):
         for entity in entities:
             for sensor in entity.get_transducers():
-                if self._match_criteria(sensor, self._sensor_criteria):
+                if self._sensor_matcher.matches(sensor):
                     self.found_entities.append(sensor)
 
@@ -17,8 +17,8 @@ class SpaceSearchVisitor(AbstractSpaceVisitor):
         """
         override visit floor from AbstractSpace Visitor
         """
-        if self._match_criteria(floor, self._floor_criteria):
-            print(f'Visiting floor: {floor.number}')
+        if self._floor_matcher.matches(floor):
+            started = self._enter_node('floor', floor)
             if self._include_floor:
                 self.found_entities.append(floor)
 
@@ -27,11 +27,12 @@ class SpaceSearchVisitor(AbstractSpaceVisitor):
 
             for open_space in floor.get_open_spaces():
                 open_space.accept(self)
+            self._exit_node('floor', floor, started)
 
     def visit_room(self, room):
-        if self._match_criteria(room, self._room_criteria):
+        if self._room_matcher.matches(room):
             self.found_entities.append(room)
 
     def visit_open_space(self, open_space):
-        if self._match_criteria(open_space, self._open_space_criteria):
+        if self._open_space_matcher.matches(open_space):
             self.found_entities.append(open_space)
@@ -8,7 +8,16 @@ from metamenth.measure_instruments.meter_measure import MeterMeasure
 from metamenth.measure_instruments.ev_charging_meter import EVChargingMeter
 from metamenth.measure_instruments.electric_vehicle_connectivity import ElectricVehicleConnectivity
 from metamenth.enumerations import OperationType
+from metamenth.enumerations import DataMeasurementType
+from metamenth.enumerations import RollupResolution
+from metamenth.storage.list_time_series_store import ListTimeSeriesStore
+from metamenth.storage.columnar_time_series_store import ColumnarTimeSeriesStore
+from metamenth.storage.memory_mapped_time_series_store import MemoryMappedTimeSeriesStore
+from datetime import datetime
 from uuid import uuid4
+import numpy as np
+import tempfile
+import os
 
 
 class TestMeter(TestCase):
@@ -50,6 +59,96 @@ class TestMeter(TestCase):
         self.assertEqual(self.meter.get_meter_measures()[0].value, 2.5)
         self.assertIsNotNone(self.meter.get_meter_measures()[0].UID)
 
+    def test_meter_measures_by_date_added_out_of_order(self):
+        for day in [3, 1, 5, 2, 4]:
+            self.meter.add_meter_measure(MeterMeasure(day * 1.5, f"2024-05-0{day} 12:00:00"))
+        measures = self.meter.get_meter_measure_by_date("2024-05-02", "2024-05-04")
+        self.assertEqual([measure.value for measure in measures], [3.0, 4.5, 6.0])
+        self.assertEqual(self.meter.get_meter_measures()[0].value, 4.5)
+        self.assertEqual(self.meter.get_meter_measure_by_date("2024-06-01", "2024-06-30"), [])
+
+    def test_add_meter_measure_arrays(self):
+        timestamps = np.arange(np.datetime64('2024-01-01T00:00'), np.datetime64('2024-01-01T05:00'), np.timedelta64(1, 'h'))
+        self.meter.add_meter_measure_arrays(timestamps, [1.5, 2.5, 3.5, 4.5, 5.5],
+                                            measurement_type=DataMeasurementType.CONSUMED_ELECTRICITY)
+        self.assertEqual(len(self.meter.get_meter_measures()), 5)
+        self.assertIsInstance(self.meter.get_meter_measures()[0], MeterMeasure)
+        self.assertIsNotNone(self.meter.get_meter_measures()[0].UID)
+        self.assertEqual(self.meter.get_meter_measures()[0].measurement_type,
+                         DataMeasurementType.CONSUMED_ELECTRICITY)
+        measures = self.meter.get_meter_measure_by_date("2024-01-01 01:00:00", "2024-01-01 02:00:00")
+        self.assertEqual([measure.value for measure in measures], [2.5, 3.5])
+
+    def test_add_meter_measures_from_csv_with_timestamp_format(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as csv_file:
+            csv_file.write("time;kw\n05/03/2024 10:00;2.5\n05/03/2024 10:15;\n05/03/2024 10:30;3.1\n")
+        try:
+            self.meter.add_meter_measures_from_csv(csv_file.name, timestamp_column='time', value_column='kw',
+                                                   timestamp_format='%d/%m/%Y %H:%M', delimiter=';')
+        finally:
+            os.remove(csv_file.name)
+        self.assertEqual([measure.value for measure in self.meter.get_meter_measures()], [2.5, 3.1])
+        self.assertEqual(len(self.meter.get_meter_measure_by_date("2024-03-05 10:30", "2024-03-05 11:00")), 1)
+
+    def test_add_meter_measure_arrays_with_mismatched_lengths(self):
+        try:
+            self.meter.add_meter_measure_arrays(["2024-01-01 00:00:00"], [1.5, 2.5])
+        except ValueError as err:
+            self.assertEqual(err.__str__(), "timestamps and values must be one dimensional and of the same length")
+        self.assertEqual(len(self.meter.get_meter_measures()), 0)
+
+    def test_meter_rollups(self):
+        for hour, power in [(0, 2.0), (0, 4.0), (1, 3.0), (23, 6.0)]:
+            self.meter.add_meter_measure(MeterMeasure(power, f"2024-01-31 {hour:02d}:30:00"))
+        self.assertEqual([bucket.sum for bucket in self.meter.get_rollups(RollupResolution.HOURLY)], [6.0, 3.0, 6.0])
+
+        # rollups are updated as measures are added
+        self.meter.add_meter_measure(MeterMeasure(5.0, "2024-02-01 00:15:00"))
+        self.meter.add_meter_measure_arrays(["2024-02-10 08:00:00", "2024-02-10 09:00:00"], [1.0, float('nan')])
+        days = self.meter.get_rollups(RollupResolution.DAILY)
+        self.assertEqual([(day.start.day, day.count, day.min, day.max, day.mean) for day in days],
+                         [(31, 4, 2.0, 6.0, 3.75), (1, 1, 5.0, 5.0, 5.0), (10, 1, 1.0, 1.0, 1.0)])
+        months = self.meter.get_rollups(RollupResolution.MONTHLY, "2024-02-01", "2024-12-31")
+        self.assertEqual([(month.start.month, month.sum) for month in months], [(2, 6.0)])
+
+        # measures added out of order are aggregated when rollups are next read
+        self.meter.add_meter_measure(MeterMeasure(10.0, "2024-01-15 12:00:00"))
+        self.assertEqual([month.sum for month in self.meter.get_rollups(RollupResolution.MONTHLY)], [25.0, 6.0])
+
+    def test_accumulated_meter_rollups(self):
+        self.meter.data_accumulated = True
+        self.meter.accumulation_frequency = MeterAccumulationFrequency.DAILY
+        timestamps = np.arange(np.datetime64('2024-01-01T22:00'), np.datetime64('2024-01-02T03:00'),
+                               np.timedelta64(1, 'h'))
+        # the register is reset at midnight
+        self.meter.add_meter_measure_arrays(timestamps, [100.0, 104.0, 1.5, 3.0, 7.0])
+        self.assertEqual([(day.start.day, day.sum) for day in self.meter.get_rollups(RollupResolution.DAILY)],
+                         [(1, 4.0), (2, 7.0)])
+        self.meter.add_meter_measure(MeterMeasure(9.0, "2024-01-02 03:00:00"))
+        self.assertEqual(self.meter.get_rollups(RollupResolution.HOURLY)[-1].sum, 2.0)
+        self.assertEqual(self.meter.get_rollups(RollupResolution.DAILY, "2024-01-02")[0].sum, 9.0)
+
+    def test_meter_measure_before_timestamp(self):
+        timestamps = ["2024-01-01 02:00:00", "2024-01-01 00:00:00", "2024-01-01 01:00:00", "2024-01-01 01:30:00",
+                      "2024-01-01 01:00:00", "2024-01-01 03:00:00"]
+        values = [7.0, 1.0, 3.0, float('nan'), 4.0, 9.0]
+        with tempfile.TemporaryDirectory() as archive_directory:
+            for data_store in [ListTimeSeriesStore(MeterMeasure), ColumnarTimeSeriesStore(MeterMeasure, chunk_size=2),
+                               MemoryMappedTimeSeriesStore(archive_directory, MeterMeasure, chunk_size=2,
+                                                           memory_chunks=1)]:
+                meter = Meter(meter_location="huz.cab.err", measurement_frequency=3600,
+                              measurement_unit=MeasurementUnit.KILOWATTS_PER_HOUR, meter_type=MeterType.ELECTRICITY,
+                              measure_mode=MeterMeasureMode.AUTOMATIC, data_accumulated=True)
+                meter.data_store = data_store
+                for timestamp, value in zip(timestamps, values):
+                    meter.add_meter_measure_arrays([timestamp], [value])
+                # the last of the readings of the latest timestamp, NaN readings skipped
+                self.assertIsNone(data_store.get_value_before(datetime(2024, 1, 1)))
+                self.assertEqual(data_store.get_value_before(datetime(2024, 1, 1, 1)), 1.0)
+                self.assertEqual(data_store.get_value_before(datetime(2024, 1, 1, 2)), 4.0)
+                self.assertEqual(data_store.get_value_before(datetime(2024, 1, 1, 2, 30)), 7.0)
+                self.assertEqual(data_store.get_value_before(datetime(2024, 2, 1)), 9.0)
+
     def test_ev_charging_meter_with_data(self):
         ev_charging_meter = EVChargingMeter("huz.cab.err", MeasurementUnit.KILOWATTS)
         charging_data_one = ElectricVehicleConnectivity(1.5, "2024-06-15 16:00:00",
@@ -72,6 +171,47 @@ class TestMeter(TestCase):
             'operation_type': OperationType.DISCHARGING.value})), 1)
         self.assertEqual(ev_charging_meter.get_connectivity_data({'operation_type': OperationType.DISCHARGING.value})[0],
                          discharging_data)
+        self.assertEqual(ev_charging_meter.get_connectivity_data_by_date("2024-06-15", "2024-06-15"),
+                         [charging_data_two, charging_data_one])
+
+    def test_iterate_meter_measures(self):
+        for day in [3, 1, 5, 2, 4, 2]:
+            self.meter.add_meter_measure(MeterMeasure(day * 1.5, f"2024-05-0{day} 12:00:00"))
+        measures = self.meter.get_meter_measures()
+        self.assertEqual(list(self.meter.iter_meter_measures()), measures)
+        self.assertEqual(list(self.meter.iter_meter_measures(limit=2, offset=1)), measures[1:3])
+        self.assertEqual(list(self.meter.iter_meter_measures({'value': 3.0})),
+                         self.meter.get_meter_measures({'value': 3.0}))
+        self.assertEqual(list(self.meter.iter_meter_measures({'value': 3.0}, offset=1)),
+                         self.meter.get_meter_measures({'value': 3.0})[1:])
 
+        measures = self.meter.get_meter_measure_by_date("2024-05-02", "2024-05-04")
+        self.assertEqual(len(measures), 4)
+        self.assertEqual(list(self.meter.iter_meter_measure_by_date("2024-05-02", "2024-05-04")), measures)
+        self.assertEqual(list(self.meter.iter_meter_measure_by_date("2024-05-02", "2024-05-04", limit=2, offset=1)),
+                         measures[1:3])
+        self.assertEqual(list(self.meter.iter_meter_measure_by_date("2024-05-03")),
+                         self.meter.get_meter_measure_by_date("2024-05-03"))
+
+    def test_iterate_ev_charging_meter_connectivity_data(self):
+        ev_charging_meter = EVChargingMeter("huz.cab.err", MeasurementUnit.KILOWATTS)
+        for value, start, end, operation_type in [
+                (1.5, "2024-06-15 16:00:00", "2024-06-15 18:00:00", OperationType.CHARGING),
+                (2.8, "2024-06-15 13:00:00", "2024-06-15 14:00:00", OperationType.CHARGING),
+                (0.8, "2024-07-09 19:00:00", "2024-07-09 20:00:00", OperationType.DISCHARGING),
+                (1.1, "2024-06-15 09:00:00", "2024-06-15 10:00:00", OperationType.CHARGING)]:
+            ev_charging_meter.add_meter_measure(ElectricVehicleConnectivity(value, start, end, operation_type,
+                                                                            str(uuid4())))
 
+        search_terms = {'operation_type': OperationType.CHARGING.value}
+        data = ev_charging_meter.get_connectivity_data(search_terms)
+        self.assertEqual(len(data), 3)
+        self.assertEqual(list(ev_charging_meter.iter_connectivity_data(search_terms)), data)
+        self.assertEqual(list(ev_charging_meter.iter_connectivity_data(search_terms, limit=1, offset=1)), data[1:2])
+        self.assertEqual(list(ev_charging_meter.iter_connectivity_data()), ev_charging_meter.get_connectivity_data())
 
+        data = ev_charging_meter.get_connectivity_data_by_date("2024-06-15", "2024-06-15")
+        self.assertEqual(len(data), 3)
+        self.assertEqual(list(ev_charging_meter.iter_connectivity_data_by_date("2024-06-15", "2024-06-15")), data)
+        self.assertEqual(list(ev_charging_meter.iter_connectivity_data_by_date("2024-06-15", "2024-06-15",
+                                                                               limit=1, offset=2)), data[2:])
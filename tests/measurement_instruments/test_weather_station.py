@@ -7,6 +7,8 @@ from metamenth.enumerations import RecordingType
 from metamenth.datatypes.measure import Measure
 from metamenth.enumerations import MeasurementUnit
 import copy
+from metamenth.utils import Query
+from datetime import datetime
 
 
 class TestWeatherStation(TestCase):
@@ -50,4 +52,42 @@ class TestWeatherStation(TestCase):
         self.assertEqual(self.station.get_weather_data()[1].data.measurement_unit, MeasurementUnit.METERS_PER_SECOND)
         self.assertEqual(self.station.get_weather_data()[1].data.measure_type, DataMeasurementType.WIND_SPEED)
 
+    def test_weather_station_data_by_date(self):
+        temp_data = WeatherData(self.temp_measure, "2024-02-10 08:00:00")
+        earlier_data = WeatherData(self.temp_measure, "2024-02-09 08:00:00")
+        later_data = WeatherData(self.temp_measure, "2024-02-11 08:00:00")
+        self.station.add_weather_data([temp_data, later_data, earlier_data])
+        self.assertEqual(self.station.get_weather_data_by_date("2024-02-09", "2024-02-10"), [earlier_data, temp_data])
+        self.assertEqual(self.station.get_weather_data_by_date("2024-02-10 09:00:00", "2024-02-11 08:00:00"),
+                         [later_data])
 
+    def test_add_weather_data_arrays(self):
+        self.station.add_weather_data_arrays(["2024-02-10T08:00:00", "2024-02-10T09:00:00"], [-8, -6.5],
+                                             MeasurementUnit.DEGREE_CELSIUS, DataMeasurementType.OUTSIDE_TEMPERATURE)
+        self.assertEqual(len(self.station.get_weather_data()), 2)
+        self.assertIsInstance(self.station.get_weather_data()[0].UID, str)
+        self.assertEqual(self.station.get_weather_data()[1].data.value, -6.5)
+        self.assertEqual(self.station.get_weather_data()[1].data.measure_type, DataMeasurementType.OUTSIDE_TEMPERATURE)
+        self.assertEqual(len(self.station.get_weather_data_by_date("2024-02-10 08:30:00", "2024-02-10 09:00:00")), 1)
+
+    def test_iterate_weather_data(self):
+        wind_measure = copy.deepcopy(self.temp_measure)
+        wind_measure.measure_type = DataMeasurementType.WIND_SPEED
+        self.station.add_weather_data([WeatherData(measure, f"2024-02-{day} 08:00:00")
+                                       for measure, day in [(self.temp_measure, 10), (wind_measure, 11),
+                                                            (self.temp_measure, 9), (wind_measure, 10)]])
+
+        data = self.station.get_weather_data()
+        self.assertEqual(list(self.station.iter_weather_data()), data)
+        self.assertEqual(list(self.station.iter_weather_data(limit=2, offset=1)), data[1:3])
+        search_terms = {'timestamp': Query.between(datetime(2024, 2, 10), datetime(2024, 2, 11))}
+        data = self.station.get_weather_data(search_terms)
+        self.assertEqual(len(data), 2)
+        self.assertEqual(list(self.station.iter_weather_data(search_terms)), data)
+        self.assertEqual(list(self.station.iter_weather_data(search_terms, offset=1)), data[1:])
+
+        data = self.station.get_weather_data_by_date("2024-02-10", "2024-02-11")
+        self.assertEqual(len(data), 3)
+        self.assertEqual(list(self.station.iter_weather_data_by_date("2024-02-10", "2024-02-11")), data)
+        self.assertEqual(list(self.station.iter_weather_data_by_date("2024-02-10", "2024-02-11", limit=1, offset=1)),
+                         data[1:2])
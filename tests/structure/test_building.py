@@ -7,6 +7,8 @@ from datetime import datetime
 from datetime import timedelta
 from metamenth.enumerations import BuildingType
 import copy
+import math
+import threading
 from metamenth.virtual.zone import Zone
 from metamenth.enumerations import ZoneType
 from metamenth.enumerations import HVACType
@@ -17,7 +19,11 @@ from metamenth.structure.cover import Cover
 from metamenth.structure.envelope import Envelope
 from metamenth.enumerations import CoverType
 from metamenth.enumerations import RoomType
+from metamenth.structure.room import Room
 from metamenth.observers.structure_state_change_logger import StructureStateChangeLogger
+from metamenth.observers.queued_dispatcher import QueuedObserverDispatcher
+from metamenth.observers.structure_state_change_journal import StructureStateChangeJournal
+from metamenth.datatypes.observable_message import ObservableMessage
 from metamenth.enumerations import MeterMeasureMode
 from metamenth.measure_instruments.ev_charging_meter import EVChargingMeter
 from metamenth.measure_instruments.electric_vehicle_connectivity import ElectricVehicleConnectivity
@@ -28,6 +34,8 @@ from metamenth.measure_instruments.meter import Meter
 from metamenth.enumerations import MeasurementUnit
 from metamenth.enumerations import MeterType
 from metamenth.enumerations import BuildingOrientation
+from metamenth.utils import Query
+from metamenth.utils.search.query import ValueQuery
 
 
 class TestBuilding(BaseTest):
@@ -130,6 +138,19 @@ class TestBuilding(BaseTest):
         self.assertEqual(floor, first_floor)
         self.assertEqual(floor.floor_type, FloorType.REGULAR)
 
+    def test_iterate_building_floors(self):
+        floors = [Floor(self.floor_area, number, FloorType.REGULAR, rooms=[copy.deepcopy(self.room)])
+                  for number in range(1, 6)]
+        floors[4].floor_type = FloorType.ROOFTOP
+        building = Building(2009, self.height, self.floor_area, self.internal_mass, self.address,
+                            BuildingType.RESIDENTIAL, floors)
+
+        self.assertEqual(list(building.iter_floors()), building.get_floors())
+        self.assertEqual(list(building.iter_floors(limit=2, offset=1)), floors[1:3])
+        self.assertEqual(list(building.iter_floors({'floor_type': FloorType.ROOFTOP.value})), [floors[4]])
+        # searches stop at the first match when only one floor is needed
+        self.assertEqual(next(building.iter_floors({'floor_type': FloorType.REGULAR.value})), floors[0])
+
     def test_get_floor_with_wrong_number(self):
         first_floor = Floor(self.floor_area, 1, FloorType.REGULAR, rooms=[self.room])
 
@@ -444,6 +465,130 @@ class TestBuilding(BaseTest):
         self.building.add_meter(second_meter)
         self.assertEqual(self.building.get_meter_by_type(second_meter.meter_type.value), [second_meter])
 
+    def test_get_meter_by_type_with_search_index(self):
+        self.building.enable_search_index()
+        meters = [Meter(meter_location="huz.cab.err", measurement_frequency=5,
+                        measurement_unit=MeasurementUnit.KILOWATTS_PER_HOUR,
+                        meter_type=meter_type, measure_mode=MeterMeasureMode.AUTOMATIC)
+                  for meter_type in [MeterType.ELECTRICITY, MeterType.POWER, MeterType.ELECTRICITY]]
+        for meter in meters:
+            self.building.add_meter(meter)
+
+        self.assertEqual(self.building.get_meter_by_type(MeterType.ELECTRICITY.value), [meters[0], meters[2]])
+        self.assertEqual(self.building.get_meter_by_uid(meters[1].UID), meters[1])
+        self.assertEqual(self.building.get_meters({'meter_type': MeterType.POWER.value, 'measurement_frequency': 5}),
+                         [meters[1]])
+
+        self.building.remove_meter(meters[0])
+        self.assertEqual(self.building.get_meter_by_type(MeterType.ELECTRICITY.value), [meters[2]])
+        self.assertIsNone(self.building.get_meter_by_uid(meters[0].UID))
+
+    def test_query_meters_with_search_index(self):
+        self.building.enable_search_index(['meter_type', 'measurement_frequency'])
+        meters = [Meter(meter_location=f"huz.cab.{frequency}", measurement_frequency=frequency,
+                        measurement_unit=MeasurementUnit.KILOWATTS_PER_HOUR,
+                        meter_type=meter_type, measure_mode=MeterMeasureMode.AUTOMATIC)
+                  for meter_type, frequency in [(MeterType.ELECTRICITY, 900), (MeterType.POWER, 60),
+                                                (MeterType.ELECTRICITY, 5), (MeterType.POWER, 300)]]
+        for meter in meters:
+            self.building.add_meter(meter)
+
+        # range conditions are answered from the sorted keys of the index, in list order
+        self.assertEqual(self.building.get_meters({'measurement_frequency': Query.le(60)}), [meters[1], meters[2]])
+        self.assertEqual(self.building.get_meters({'measurement_frequency': Query.between(60, 300),
+                                                   'meter_type': MeterType.POWER}), [meters[1], meters[3]])
+        self.assertEqual(self.building.get_meters({'meter_location': Query.prefix('huz.cab.9')}), [meters[0]])
+        self.assertEqual(self.building.get_meters(Query.or_({'measurement_frequency': Query.gt(300)},
+                                                            {'meter_location': Query.regex(r'\.5$')})),
+                         [meters[0], meters[2]])
+        self.assertEqual(self.building.get_meters(Query.not_({'meter_type': Query.in_([MeterType.POWER])})),
+                         [meters[0], meters[2]])
+        self.assertEqual(list(self.building.iter_meters({'measurement_frequency': Query.ne(5)}, limit=2)),
+                         meters[:2])
+
+        self.building.remove_meter(meters[2])
+        self.assertEqual(self.building.get_meters({'measurement_frequency': Query.lt(300)}), [meters[1]])
+        with self.assertRaises(TypeError):
+            ValueQuery()
+        self.building.add_meter(meters[2])
+        self.assertEqual(self.building.get_meters({'measurement_frequency': Query.ge(60)}),
+                         [meters[0], meters[1], meters[3]])
+        self.assertEqual(self.building.get_meters(Query.or_({'measurement_frequency': Query.le(5)},
+                                                            {'meter_type': MeterType.ELECTRICITY})),
+                         [meters[0], meters[2]])
+
+    def test_search_index_keeps_list_order(self):
+        rooms = [Room(self.area, name, RoomType.BEDROOM) for name in ["Z1", "A1", "M1"]]
+        self.floor.add_rooms(rooms)
+        search_terms = {'name': Query.ge('A')}
+        unindexed = [room.name for room in self.floor.get_rooms(search_terms)]
+        self.building.enable_search_index()
+        self.assertEqual([room.name for room in self.floor.get_rooms(search_terms)], unindexed)
+        self.assertEqual([room.name for room in self.floor.get_rooms(search_terms)][1:], ["Z1", "A1", "M1"])
+        self.assertEqual([room.name for room in self.floor.iter_rooms(search_terms, limit=2, offset=1)],
+                         ["Z1", "A1"])
+        self.assertEqual([room.name for room in self.floor.get_rooms(Query.or_({'name': Query.prefix('M')},
+                                                                               {'name': Query.prefix('Z')}))],
+                         ["Z1", "M1"])
+
+    def test_search_floors_and_rooms_with_search_index(self):
+        self.building.enable_search_index()
+        self.assertEqual(self.building.get_floor_by_uid(self.floor.UID), self.floor)
+        self.assertEqual(self.floor.get_room_by_name("Room 145"), self.room)
+
+        self.floor.add_rooms([Room(self.area, "Room 146", RoomType.BEDROOM)])
+        self.assertEqual(len(self.floor.get_rooms({'room_type': RoomType.BEDROOM.value})), 2)
+        self.assertEqual(self.floor.get_room_by_name("Room 146").name, "Room 146")
+        self.assertIsNone(self.floor.get_room_by_name("Room 147"))
+
+    def test_search_index_follows_attribute_changes(self):
+        self.building.enable_search_index(['room_type', 'measurement_frequency'])
+        self.room.name = "Lab"
+        self.assertEqual(self.floor.get_room_by_name("Lab"), self.room)
+        self.assertIsNone(self.floor.get_room_by_name("Room 145"))
+
+        self.room.room_type = RoomType.CLASSROOM
+        self.assertEqual(self.floor.get_rooms({'room_type': RoomType.CLASSROOM.value}), [self.room])
+        self.assertEqual(self.floor.get_rooms({'room_type': RoomType.BEDROOM.value}), [])
+        # a rejected value does not change the indexes
+        with self.assertRaises(ValueError):
+            self.room.room_type = None
+        self.assertEqual(self.floor.get_rooms({'room_type': RoomType.CLASSROOM.value}), [self.room])
+
+        # plain attributes are followed as well
+        meter = Meter(meter_location="huz.cab.err", measurement_frequency=5,
+                      measurement_unit=MeasurementUnit.KILOWATTS_PER_HOUR,
+                      meter_type=MeterType.POWER, measure_mode=MeterMeasureMode.AUTOMATIC)
+        self.building.add_meter(meter)
+        meter.measurement_frequency = 60
+        self.assertEqual(self.building.get_meters({'measurement_frequency': 60}), [meter])
+        self.assertEqual(self.building.get_meters({'measurement_frequency': Query.lt(60)}), [])
+
+    def test_search_index_updates_only_changed_entity(self):
+        rooms = [Room(self.area, f"Lab {number}", RoomType.BEDROOM) for number in range(3)]
+        second_floor = Floor(self.floor_area, 2, FloorType.ROOFTOP, rooms=rooms)
+        self.building.add_floors([second_floor])
+        self.building.enable_search_index()
+        self.floor._rooms.add_indexes(['measurement_frequency'])
+        self.assertIn('measurement_frequency', self.floor._rooms.watched_attributes)
+        self.assertNotIn('measurement_frequency', second_floor._rooms.watched_attributes)
+
+        version = second_floor._rooms.version
+        view = second_floor._rooms.view()
+        self.room.room_type = RoomType.CLASSROOM
+        self.room.name = "Lab 1"
+        self.assertEqual(second_floor._rooms.version, version)
+        self.assertIs(second_floor._rooms.view(), view)
+        self.assertEqual(self.floor.get_room_by_name("Lab 1"), self.room)
+        self.assertEqual(second_floor.get_room_by_name("Lab 1"), rooms[1])
+
+        # the changed entity keeps its place in the list order of the buckets it moves to
+        rooms[2].room_type = RoomType.KITCHEN
+        rooms[0].room_type = RoomType.KITCHEN
+        self.assertEqual(second_floor.get_rooms({'room_type': RoomType.KITCHEN.value}), [rooms[0], rooms[2]])
+        self.assertEqual(second_floor.get_rooms({'room_type': RoomType.BEDROOM.value}), [rooms[1]])
+        self.assertEqual(second_floor.get_rooms({'room_type': RoomType.CLASSROOM.value}), [])
+
     def test_search_meters(self):
         first_meter = Meter(meter_location="huz.cab.err",
                             manufacturer="Honeywell",
@@ -461,6 +606,110 @@ class TestBuilding(BaseTest):
         meters = self.building.get_meters({'manufacturer': 'Honeywell', 'meter_type': MeterType.ELECTRICITY.value})
         self.assertEqual(meters, [first_meter])
 
+    def test_iterate_building_entities(self):
+        for meter_type, frequency in [(MeterType.ELECTRICITY, 900), (MeterType.POWER, 60),
+                                      (MeterType.ELECTRICITY, 5), (MeterType.POWER, 300)]:
+            self.building.add_meter(Meter(meter_location=f"huz.cab.{frequency}", measurement_frequency=frequency,
+                                          measurement_unit=MeasurementUnit.KILOWATTS_PER_HOUR,
+                                          meter_type=meter_type, measure_mode=MeterMeasureMode.AUTOMATIC))
+        for name, location in [('Station One', 'huz.bob.cob'), ('Station Two', 'bob.cob.huz'),
+                               ('Station Three', 'bob.cob.huz')]:
+            self.building.add_weather_station(WeatherStation(name, location=location))
+        second_floor = Floor(self.floor_area, 2, FloorType.ROOFTOP, rooms=[copy.deepcopy(self.room)])
+        self.building.add_floors([second_floor])
+        for floor, zone in [(self.floor, Zone("HVAC_COOLING_ZONE", ZoneType.HVAC, HVACType.PERIMETER)),
+                            (second_floor, Zone("HVAC_HEATING_ZONE", ZoneType.HVAC, HVACType.PERIMETER)),
+                            (second_floor, Zone("DIM_ZONE", ZoneType.LIGHTING))]:
+            floor.add_zone(zone, self.building)
+        self.building.schedulable_entity.add_schedule(OperationalSchedule("WEEKDAYS", datetime.now(),
+                                                                          datetime.now() + timedelta(days=5)))
+        self.building.schedulable_entity.add_schedule(OperationalSchedule("WEEKENDS", datetime.now(),
+                                                                          datetime.now() + timedelta(days=2)))
+
+        searches = [
+            (self.building.get_meters, self.building.iter_meters, None),
+            (self.building.get_meters, self.building.iter_meters, {'meter_type': MeterType.POWER.value}),
+            (self.building.get_meters, self.building.iter_meters, {'measurement_frequency': Query.ge(60)}),
+            (self.building.get_weather_stations, self.building.iter_weather_stations, None),
+            (self.building.get_weather_stations, self.building.iter_weather_stations, {'location': 'bob.cob.huz'}),
+            (self.building.get_floors, self.building.iter_floors, None),
+            (self.building.get_zones, self.building.iter_zones, None),
+            (self.building.get_zones, self.building.iter_zones, {'zone_type': ZoneType.HVAC}),
+            (second_floor.get_zones, second_floor.iter_zones, None),
+            (self.building.schedulable_entity.get_schedules, self.building.schedulable_entity.iter_schedules, None)]
+        for indexed in (False, True):
+            if indexed:
+                self.building.enable_search_index(['meter_type', 'measurement_frequency', 'zone_type'])
+            for get_entities, iter_entities, search_terms in searches:
+                entities = get_entities(search_terms)
+                self.assertTrue(entities)
+                self.assertEqual(list(iter_entities(search_terms)), entities)
+                self.assertEqual(list(iter_entities(search_terms, limit=1, offset=1)), entities[1:2])
+                self.assertEqual(list(iter_entities(search_terms, offset=1)), entities[1:])
+
+    def test_aggregate_building_meter_readings(self):
+        power_meter = Meter(meter_location="huz.cab.err", measurement_frequency=900,
+                            measurement_unit=MeasurementUnit.KILOWATTS, meter_type=MeterType.ELECTRICITY,
+                            measure_mode=MeterMeasureMode.AUTOMATIC)
+        power_meter.add_meter_measure_arrays(["2024-01-01 00:00:00", "2024-01-01 00:15:00", "2024-01-01 00:30:00",
+                                              "2024-01-01 00:45:00"], [4.0, 4.0, 8.0, 8.0])
+        energy_meter = Meter(meter_location="huz.cab.err", measurement_frequency=3600,
+                             measurement_unit=MeasurementUnit.KILOWATTS_PER_HOUR, meter_type=MeterType.ELECTRICITY,
+                             measure_mode=MeterMeasureMode.AUTOMATIC)
+        energy_meter.add_meter_measure_arrays(["2024-01-01 01:00:00"], [3.0])
+        register = Meter(meter_location="huz.cab.err", measurement_frequency=3600,
+                         measurement_unit=MeasurementUnit.KILOWATTS_PER_HOUR, meter_type=MeterType.ELECTRICITY,
+                         measure_mode=MeterMeasureMode.AUTOMATIC, data_accumulated=True)
+        register.add_meter_measure_arrays(["2024-01-01 00:00:00", "2024-01-01 01:00:00"], [100.0, 102.0])
+        gas_meter = Meter(meter_location="huz.cab.err", measurement_frequency=60,
+                          measurement_unit=MeasurementUnit.CUBIC_METER, meter_type=MeterType.GAS,
+                          measure_mode=MeterMeasureMode.AUTOMATIC)
+        for meter in [power_meter, energy_meter, register, gas_meter]:
+            self.building.add_meter(meter)
+
+        # hourly grid, in the unit of the first meter: the kWh readings at 01:00 are the consumption of hour 00
+        readings = self.building.aggregate_meter_readings(MeterType.ELECTRICITY)
+        self.assertEqual(readings.meter_uids, [power_meter.UID, energy_meter.UID, register.UID])
+        self.assertEqual(readings.timestamps.tolist(), [datetime(2024, 1, 1, 0)])
+        self.assertEqual(readings.column(power_meter.UID).tolist(), [6.0])
+        self.assertEqual(readings.total().tolist(), [11.0])
+
+        # the kWh reading covers the hour before it, the kW readings hold for 15 minutes
+        readings = self.building.aggregate_meter_readings(MeterType.ELECTRICITY, 1800, "2024-01-01 00:00:00",
+                                                          "2024-01-01 01:00:00", MeasurementUnit.KILOWATTS_PER_HOUR)
+        self.assertEqual(readings.values.shape, (3, 3))
+        self.assertEqual(readings.column(power_meter.UID)[:2].tolist(), [2.0, 4.0])
+        self.assertEqual(readings.column(energy_meter.UID)[:2].tolist(), [1.5, 1.5])
+        self.assertTrue(math.isnan(readings.column(energy_meter.UID)[2]))
+        self.assertEqual(readings.difference()[1], 1.5)
+        self.assertEqual(readings.mean()[0], 1.5)
+
+        # the consumption of the first register reading of a window is counted from the reading before the window,
+        # and the consumption of the last interval from the reading after it
+        register.add_meter_measure_arrays(["2024-01-01 00:30:00", "2024-01-01 02:00:00", "2024-01-01 03:00:00"],
+                                          [float('nan'), 105.0, 109.0])
+        readings = self.building.aggregate_meter_readings(MeterType.ELECTRICITY, 3600, "2024-01-01 01:30:00",
+                                                          "2024-01-01 02:00:00")
+        self.assertEqual(readings.column(register.UID).tolist(), [3.0, 4.0])
+
+        # grids of any frequency add up to the same hourly consumption
+        hourly = self.building.aggregate_meter_readings(MeterType.ELECTRICITY, 3600, "2024-01-01 00:00:00",
+                                                        "2024-01-01 02:00:00", MeasurementUnit.KILOWATTS_PER_HOUR)
+        quarterly = self.building.aggregate_meter_readings(MeterType.ELECTRICITY, 900, "2024-01-01 00:00:00",
+                                                           "2024-01-01 02:45:00", MeasurementUnit.KILOWATTS_PER_HOUR)
+        self.assertEqual(hourly.column(register.UID).tolist(), [2.0, 3.0, 4.0])
+        self.assertEqual(quarterly.column(register.UID).reshape(3, 4).sum(axis=1).tolist(), [2.0, 3.0, 4.0])
+        self.assertEqual(quarterly.column(register.UID)[:4].tolist(), [0.5] * 4)
+        self.assertEqual(hourly.column(energy_meter.UID)[0], 3.0)
+        self.assertEqual(quarterly.column(energy_meter.UID)[:4].sum(), 3.0)
+        self.assertEqual(hourly.total()[0], 11.0)
+        self.assertEqual(quarterly.total()[:4].sum(), 11.0)
+
+        try:
+            self.building.aggregate_meter_readings(unit=MeasurementUnit.CUBIC_METER)
+        except ValueError as err:
+            self.assertEqual(err.__str__(), "kW readings cannot be converted to m3")
+
     def test_add_weather_stations_to_building(self):
         station_one = WeatherStation('Station One', location="huz.bob.cob")
         station_two = WeatherStation('Station Two', location="bob.cob.huz")
@@ -543,3 +792,139 @@ class TestBuilding(BaseTest):
         self.building.add_weather_station(WeatherStation('Station Two', location="zzz.cob.huz"))
 
         self.assertEqual(structure_change_logger.state_log, [])
+
+    def test_building_state_change_history_with_queued_dispatcher(self):
+        structure_change_logger = StructureStateChangeLogger()
+        self.building.track_state = True
+        self.building.add_observer(structure_change_logger)
+        with QueuedObserverDispatcher(max_queue_size=2, batch_size=2) as dispatcher:
+            self.building.dispatcher = dispatcher
+            for station in range(5):
+                self.building.add_weather_station(WeatherStation(f'Station {station}', location="bob.cob.huz"))
+            dispatcher.flush()
+            self.assertEqual(dispatcher.pending, 0)
+            self.assertEqual(len(structure_change_logger.state_log), 5)
+        self.assertTrue(dispatcher.closed)
+        # states are captured when the messages are queued
+        self.assertEqual([len(state['state']['weather_stations']) for state in structure_change_logger.state_log],
+                         [0, 1, 2, 3, 4])
+        # changes are refused before they are made once the dispatcher is closed
+        old_floor_area = self.building.floor_area
+        with self.assertRaises(ValueError) as err:
+            self.building.floor_area = copy.copy(self.floor_area)
+        self.assertEqual(str(err.exception), 'observer dispatcher is closed')
+        self.assertIs(self.building.floor_area, old_floor_area)
+        with self.assertRaises(ValueError):
+            self.building.add_weather_station(WeatherStation('Station 5', location="bob.cob.huz"))
+        self.assertEqual(len(self.building.get_weather_stations()), 5)
+        self.assertEqual(len(structure_change_logger.state_log), 5)
+
+    def test_rejected_changes_are_not_tracked(self):
+        structure_change_logger = StructureStateChangeLogger()
+        journal = StructureStateChangeJournal()
+        self.building.track_state = True
+        self.building.add_observer(structure_change_logger)
+        self.building.add_observer(journal)
+        old_floor_area = self.building.floor_area
+        with self.assertRaises(ValueError):
+            self.building.floor_area = None
+        self.assertIs(self.building.floor_area, old_floor_area)
+        self.assertEqual(structure_change_logger.state_log, [])
+        self.assertEqual(journal.changes, [])
+
+        new_floor_area = copy.copy(self.floor_area)
+        self.building.floor_area = new_floor_area
+        self.assertIs(journal.entity_state(self.building.UID)['floor_area'], new_floor_area)
+        # the logger copies the state before the change, not the changed value
+        self.assertEqual(list(structure_change_logger.state_log[0].keys()),
+                         ['entity_type', 'entity_id', 'state', 'message', 'operation', 'timestamp'])
+        self.assertEqual(structure_change_logger.state_log[0]['state']['floor_area'].value, old_floor_area.value)
+
+        # the added entities are recorded, not the arguments of the tracked method
+        self.building.add_room(self.floor.UID, "Room 147", self.area, RoomType.OFFICE)
+        self.assertEqual([change.new_value for change in journal.changes if change.operation == 'add'], [])
+
+    def test_queued_dispatcher_list_states_follow_list_changes(self):
+        structure_change_logger = StructureStateChangeLogger()
+        self.building.track_state = True
+        self.building.add_observer(structure_change_logger)
+        stations = [WeatherStation(f'Station {station}', location="bob.cob.huz") for station in range(4)]
+        with QueuedObserverDispatcher() as dispatcher:
+            self.building.dispatcher = dispatcher
+            for station in stations[:3]:
+                self.building.add_weather_station(station)
+            self.building.remove_weather_station(stations[0])
+            with self.assertRaises(ValueError):
+                self.building.remove_weather_station(stations[0])
+            # a station added again, and a station added without tracking
+            self.building.add_weather_station(stations[1])
+            self.building.track_state = False
+            self.building.add_weather_station(stations[3])
+            self.building.track_state = True
+            self.building.remove_weather_station(stations[2])
+        self.assertEqual([[station.name for station in state['state']['weather_stations']]
+                          for state in structure_change_logger.state_log],
+                         [[], ['Station 0'], ['Station 0', 'Station 1'], ['Station 0', 'Station 1', 'Station 2'],
+                          ['Station 1', 'Station 2'], ['Station 1', 'Station 2', 'Station 1', 'Station 3']])
+        self.assertEqual(self.building.get_weather_stations(), [stations[1], stations[1], stations[3]])
+
+    def test_queued_dispatcher_closed_while_dispatching(self):
+        structure_change_logger = StructureStateChangeLogger()
+        dispatcher = QueuedObserverDispatcher(max_queue_size=10, batch_size=5)
+        message = ObservableMessage('Building', self.building.UID, {'floor_area': self.floor_area})
+
+        def dispatch_messages():
+            for _ in range(500):
+                try:
+                    captured = dispatcher.capture(message)
+                except ValueError:
+                    return
+                dispatcher.dispatch(captured, [structure_change_logger])
+
+        threads = [threading.Thread(target=dispatch_messages) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        dispatcher.close()
+        for thread in threads:
+            thread.join()
+        # no message is queued after the dispatch thread stops
+        dispatcher.flush()
+        self.assertEqual(dispatcher.pending, 0)
+
+    def test_building_state_change_journal(self):
+        journal = StructureStateChangeJournal(checkpoint_interval=3)
+        self.building.track_state = True
+        self.building.add_observer(journal)
+        stations = [WeatherStation(f'Station {station}', location="bob.cob.huz") for station in range(4)]
+        for station in stations:
+            self.building.add_weather_station(station)
+        self.building.remove_weather_station(stations[1])
+        old_floor_area = self.building.floor_area
+        self.building.floor_area = copy.copy(self.floor_area)
+        self.building.floor_area.value = 300
+
+        changes = journal.changes
+        self.assertEqual([change.operation for change in changes],
+                         ['initial', 'add', 'add', 'add', 'add', 'remove', 'initial', 'set'])
+        self.assertIs(changes[1].new_value, stations[0])
+        self.assertEqual(changes[5].entity_id, self.building.UID)
+        self.assertIs(changes[7].old_value, old_floor_area)
+        self.assertEqual(journal.checkpoints, [0, 3, 6])
+
+        # replay the journal
+        self.assertEqual(journal.entity_state(self.building.UID, sequence=3), {'weather_stations': stations[:2]})
+        self.assertEqual(journal.entity_state(self.building.UID, sequence=6)['weather_stations'],
+                         [stations[0], stations[2], stations[3]])
+        building_state = journal.entity_state(self.building.UID)
+        self.assertIs(building_state['floor_area'], self.building.floor_area)
+        self.assertEqual(building_state['weather_stations'], self.building.get_weather_stations())
+        self.assertEqual(journal.entity_state(self.building.UID, timestamp=changes[-1].timestamp), building_state)
+        self.assertEqual(journal.state_at(sequence=1), {('Building', self.building.UID): {'weather_stations': []}})
+        with self.assertRaises(ValueError):
+            journal.state_at(sequence=9)
+
+        # each attribute of a message is recorded once before its first change
+        journal.log_state(ObservableMessage('Floor', self.floor.UID, {'rooms': [], 'open_spaces': []},
+                                            operation='add', value=[self.room]))
+        self.assertEqual([(change.operation, change.attribute) for change in journal.changes[8:]],
+                         [('initial', 'rooms'), ('add', 'rooms'), ('initial', 'open_spaces'), ('add', 'open_spaces')])
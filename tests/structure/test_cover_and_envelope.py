@@ -208,3 +208,27 @@ class TestCoverAndEnvelop(BaseTest):
 
         covers = envelope.get_covers({'cover_type': CoverType.WINDOW})
         self.assertEqual(covers, [second_cover])
+
+    def test_iterate_covers_and_layers(self):
+        roof_cover = Cover(CoverType.ROOF, BuildingOrientation.WEST, 1)
+        roof_cover.add_layer(self.layer)
+        barrier_layer = copy.deepcopy(self.layer)
+        barrier_layer.has_vapour_barrier = True
+        roof_cover.add_layer(barrier_layer)
+        roof_cover.add_layer(copy.deepcopy(barrier_layer))
+
+        envelope = Envelope('Tower One')
+        envelope.add_cover(roof_cover)
+        envelope.add_cover(Cover(CoverType.ROOF, BuildingOrientation.SOUTH, 2))
+        envelope.add_cover(Cover(CoverType.ROOF, BuildingOrientation.SOUTH, 3))
+
+        for get_entities, iter_entities, search_term in [
+                (roof_cover.get_layers, roof_cover.iter_layers, None),
+                (roof_cover.get_layers, roof_cover.iter_layers, {'has_vapour_barrier': True}),
+                (envelope.get_covers, envelope.iter_covers, None),
+                (envelope.get_covers, envelope.iter_covers, {'building_orientation': BuildingOrientation.SOUTH})]:
+            entities = get_entities(search_term)
+            self.assertTrue(entities)
+            self.assertEqual(list(iter_entities(search_term)), entities)
+            self.assertEqual(list(iter_entities(search_term, limit=1, offset=1)), entities[1:2])
+            self.assertEqual(list(iter_entities(search_term, limit=1)), entities[:1])
@@ -8,6 +8,15 @@ from tests.structure.base_test import BaseTest
 from metamenth.structure.open_space import OpenSpace
 from metamenth.structure.room import Room
 from metamenth.enumerations import RoomType
+from metamenth.enumerations import PowerState
+from metamenth.enumerations import DuctType
+from metamenth.enumerations import DamperType
+from metamenth.subsystem.hvac_components.fan import Fan
+from metamenth.subsystem.hvac_components.duct import Duct
+from metamenth.subsystem.hvac_components.damper import Damper
+from metamenth.utils import EntityList
+import copy
+import pickle
 
 
 class TestFloor(BaseTest):
@@ -54,6 +63,64 @@ class TestFloor(BaseTest):
         # Assert no rooms
         self.assertEqual(floor.get_rooms(), [])
 
+    def test_add_room_with_existing_name_to_floor(self):
+        floor = Floor(area=self.area, number=1, floor_type=FloorType.REGULAR, rooms=[self.room])
+        floor.add_rooms([Room(self.area, self.room.name, RoomType.OFFICE)])
+        self.assertEqual(floor.get_rooms(), [self.room])
+
+    def test_add_room_after_renaming_room_on_floor(self):
+        floor = Floor(area=self.area, number=1, floor_type=FloorType.REGULAR, rooms=[self.room])
+        self.room.name = "Room 146"
+        floor.add_rooms([Room(self.area, "Room 146", RoomType.OFFICE)])
+        self.assertEqual([room.name for room in floor.get_rooms()], ["Room 146"])
+        floor.add_rooms([Room(self.area, "Room 145", RoomType.OFFICE)])
+        self.assertEqual([room.name for room in floor.get_rooms()], ["Room 146", "Room 145"])
+        floor.add_rooms([Room(self.area, "Room 145", RoomType.OFFICE)])
+        self.assertEqual(len(floor.get_rooms()), 2)
+
+    def test_renaming_entity_updates_only_its_lists(self):
+        room = Room(self.area, "Room 145", RoomType.BEDROOM)
+        floor = Floor(area=self.area, number=1, floor_type=FloorType.REGULAR, rooms=[room])
+        other_room = Room(self.area, "Room 245", RoomType.OFFICE)
+        other_floor = Floor(area=self.area, number=2, floor_type=FloorType.REGULAR, rooms=[other_room])
+        version, view = other_floor._rooms.version, other_floor._rooms.view()
+        # renaming keeps the version and view of the lists holding the room, and does not touch other lists
+        rooms_version = floor._rooms.version
+        room.name = "Room 146"
+        self.assertIn(Room(self.area, "Room 146", RoomType.OFFICE), floor._rooms)
+        self.assertNotIn(Room(self.area, "Room 145", RoomType.OFFICE), floor._rooms)
+        self.assertNotIn(Room(self.area, "Room 146", RoomType.OFFICE), other_floor._rooms)
+        self.assertEqual(floor._rooms.version, rooms_version)
+        self.assertEqual(other_floor._rooms.version, version)
+        self.assertIs(other_floor._rooms.view(), view)
+
+        # removed entities are no longer followed by the list
+        floor.remove_room(room)
+        self.assertNotIn('_listed', vars(room))
+        room.name = "Room 245"
+        floor.add_rooms([Room(self.area, "Room 146", RoomType.OFFICE)])
+        self.assertEqual([room.name for room in floor.get_rooms()], ["Room 146"])
+
+        # copies of lists follow the copies of their entities
+        for floor_copy in [copy.deepcopy(other_floor), pickle.loads(pickle.dumps(other_floor))]:
+            room_copy = floor_copy.get_rooms()[0]
+            room_copy.name = "Room 345"
+            self.assertIn(Room(self.area, "Room 345", RoomType.OFFICE), floor_copy._rooms)
+            self.assertNotIn(Room(self.area, "Room 345", RoomType.OFFICE), other_floor._rooms)
+            self.assertIn(Room(self.area, "Room 245", RoomType.OFFICE), other_floor._rooms)
+
+    def test_entity_list_membership_matches_list_scan(self):
+        fan = Fan("PR.VNT.01", PowerState.ON)
+        duct = Duct("PR.VNT.01", DuctType.AIR)
+        damper = Damper("PR.VNT.01", DamperType.MANUAL_VOLUME)
+        candidates = [Fan("PR.VNT.01", PowerState.OFF), Duct("PR.VNT.01", DuctType.AIR), duct,
+                      damper, Damper("PR.VNT.02", DamperType.MANUAL_VOLUME), self.room, object()]
+        for elements in ([fan], [duct], [damper], [fan, duct], [duct, damper], [self.room, self.hall]):
+            entity_list = EntityList(elements)
+            for candidate in candidates:
+                # e.g., a duct named as a fan of the list is in the list, but not a fan named as a duct
+                self.assertEqual(candidate in entity_list, candidate in list(elements))
+
     def test_remove_open_space_from_floor(self):
         floor = Floor(area=self.area, number=1, floor_type=FloorType.REGULAR, open_spaces=[self.hall])
         self.assertEqual(floor.get_open_space_by_name(self.hall.name), self.hall)
@@ -156,4 +223,28 @@ class TestFloor(BaseTest):
         open_spaces = floor.get_open_spaces({'space_type': OpenSpaceType.HALL.value})
         self.assertEqual(open_spaces, [hall, self.hall])
 
-
+    def test_iterate_floor_entities(self):
+        office = Room(self.area, "Room 146", RoomType.OFFICE)
+        corridor = OpenSpace("CORRIDOR", self.area, OpenSpaceType.CORRIDOR)
+        floor = Floor(area=self.area, number=1, floor_type=FloorType.REGULAR,
+                      rooms=[self.room, office, Room(self.area, "Room 147", RoomType.OFFICE)],
+                      open_spaces=[self.hall, corridor])
+        floor.schedulable_entity.add_schedule(OperationalSchedule("WEEKDAYS", datetime.now(),
+                                                                  datetime.now() + timedelta(days=5)))
+        floor.schedulable_entity.add_schedule(OperationalSchedule("WEEKENDS", datetime.now(),
+                                                                  datetime.now() + timedelta(days=2), recurring=False))
+
+        for get_entities, iter_entities, search_terms in [
+                (floor.get_rooms, floor.iter_rooms, None),
+                (floor.get_rooms, floor.iter_rooms, {'room_type': RoomType.OFFICE.value}),
+                (floor.get_open_spaces, floor.iter_open_spaces, None),
+                (floor.get_open_spaces, floor.iter_open_spaces, {'space_type': OpenSpaceType.CORRIDOR.value}),
+                (floor.schedulable_entity.get_schedules, floor.schedulable_entity.iter_schedules, None),
+                (floor.schedulable_entity.get_schedules, floor.schedulable_entity.iter_schedules,
+                 {'recurring': False})]:
+            entities = get_entities(search_terms)
+            self.assertTrue(entities)
+            self.assertEqual(list(iter_entities(search_terms)), entities)
+            self.assertEqual(list(iter_entities(search_terms, limit=1, offset=1)), entities[1:2])
+            self.assertEqual(list(iter_entities(search_terms, limit=0)), [])
+        self.assertEqual(next(floor.iter_rooms({'room_type': RoomType.OFFICE.value})), office)
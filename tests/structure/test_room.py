@@ -16,6 +16,9 @@ from metamenth.enumerations import ApplianceType
 from metamenth.enumerations import ApplianceCategory
 from metamenth.subsystem.hvac_components.damper import Damper
 from metamenth.enumerations import DamperType
+from metamenth.subsystem.hvac_components.duct import Duct
+from metamenth.enumerations import DuctType
+from metamenth.structure.room import Room
 from metamenth.transducers.actuator import Actuator
 from metamenth.energysystem.electricals.uninterruptible_power_supply import UninterruptiblePowerSupply
 from metamenth.enumerations import UPSPhase
@@ -151,6 +154,27 @@ class TestRoom(BaseTest):
         self.room.remove_transducer(temp_sensor)
         self.assertEqual(len(self.room.get_transducers()), 0)
 
+    def test_room_transducers_view(self):
+        co2_sensor = Sensor("Co2_Sensor", SensorMeasure.CARBON_DIOXIDE,
+                            MeasurementUnit.PARTS_PER_MILLION, SensorMeasureType.PT_100, 5)
+        temp_sensor = Sensor("Temp_Sensor", SensorMeasure.TEMPERATURE,
+                             MeasurementUnit.DEGREE_CELSIUS, SensorMeasureType.PT_100, 5)
+        self.room.add_transducer(co2_sensor)
+        transducers = self.room.transducers
+        # the view is reused until the transducers change
+        self.assertIs(self.room.transducers, transducers)
+        self.assertEqual(transducers, [co2_sensor])
+        with self.assertRaises(AttributeError):
+            transducers.append(temp_sensor)
+
+        self.room.add_transducer(temp_sensor)
+        self.assertEqual(transducers, [co2_sensor])
+        self.assertEqual(self.room.transducers, [co2_sensor, temp_sensor])
+        self.assertEqual(self.room.transducers + [co2_sensor], [co2_sensor, temp_sensor, co2_sensor])
+        for transducer in self.room.transducers:
+            self.room.remove_transducer(transducer)
+        self.assertEqual(self.room.transducers, [])
+
     def test_room_with_thermostat(self):
         co2_sensor = Sensor("Co2_Sensor", SensorMeasure.CARBON_DIOXIDE,
                             MeasurementUnit.PARTS_PER_MILLION, SensorMeasureType.PT_100, 5)
@@ -219,4 +243,42 @@ class TestRoom(BaseTest):
         self.assertEqual(self.room.get_energy_systems({'name': alternator.name})[0].schedulable_entity.get_schedule_by_name("WEEKENDS"), schedule)
 
         self.room.remove_energy_system(ats)
-        self.assertEqual(self.room.get_energy_systems(), [alternator])
\ No newline at end of file
+        self.assertEqual(self.room.get_energy_systems(), [alternator])
+
+    def test_iterate_room_entities(self):
+        self.room.room_type = RoomType.MECHANICAL
+        adjacent_room = Room(self.area, "Room 146", RoomType.OFFICE)
+        self.room.add_adjacent_space(adjacent_room)
+        self.room.add_adjacent_space(self.hall)
+        self.room.add_appliance(self.thermostat)
+        self.room.add_appliance(self.smart_camera)
+        self.room.add_hvac_component(Duct("PR.VNT.01", DuctType.AIR))
+        self.room.add_hvac_component(Duct("PR.VNT.02", DuctType.WATER))
+        self.room.add_hvac_component(Duct("PR.VNT.03", DuctType.AIR))
+        self.room.add_energy_system(AutomaticTransferSwitch("ATS", PowerState.ON))
+        self.room.add_energy_system(Alternator("Alternator"))
+        self.room.add_transducer(self.temp_sensor)
+        self.room.add_transducer(self.presence_sensor)
+
+        for get_entities, iter_entities, search_terms in [
+                (self.room.get_adjacent_spaces, self.room.iter_adjacent_spaces, None),
+                (self.room.get_adjacent_spaces, self.room.iter_adjacent_spaces, {'name': 'Room 146'}),
+                (self.room.get_appliances, self.room.iter_appliances, None),
+                (self.room.get_appliances, self.room.iter_appliances, {'name': 'Thermostat'}),
+                (self.room.get_hvac_components, self.room.iter_hvac_components, None),
+                (self.room.get_hvac_components, self.room.iter_hvac_components, {'duct_type': DuctType.AIR}),
+                (self.room.get_energy_systems, self.room.iter_energy_systems, None),
+                (self.room.get_energy_systems, self.room.iter_energy_systems, {'name': 'ATS'}),
+                (self.room.get_transducers, self.room.iter_transducers, None),
+                (self.room.get_transducers, self.room.iter_transducers, {'measure': SensorMeasure.OCCUPANCY})]:
+            entities = get_entities(search_terms)
+            self.assertTrue(entities)
+            self.assertEqual(list(iter_entities(search_terms)), entities)
+            self.assertEqual(list(iter_entities(search_terms, limit=1, offset=1)), entities[1:2])
+            self.assertEqual(list(iter_entities(search_terms, offset=len(entities))), [])
+
+        # with a search index, the iterator yields the hvac components the search returns
+        self.room.enable_search_index()
+        self.assertEqual(list(self.room.iter_hvac_components({'duct_type': DuctType.AIR})),
+                         self.room.get_hvac_components({'duct_type': DuctType.AIR}))
+        self.assertEqual(len(self.room.get_hvac_components({'duct_type': DuctType.AIR})), 2)
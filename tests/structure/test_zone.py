@@ -12,6 +12,10 @@ from metamenth.enumerations import ZoneType
 from metamenth.enumerations import HVACType
 from metamenth.structure.floor import Floor
 from metamenth.enumerations import FloorType
+from metamenth.enumerations import MeterType
+from metamenth.enumerations import MeterMeasureMode
+from metamenth.measure_instruments.meter import Meter
+from metamenth.utils import Query
 
 
 class TestZone(TestCase):
@@ -133,7 +137,49 @@ class TestZone(TestCase):
         self.assertEqual(zone.get_spaces(), [corridor])
         self.assertEqual(len(zone.get_spaces()), 1)
 
-
-
-
-
+    def test_aggregate_zone_meter_readings(self):
+        zone = Zone("COLD_ZONE", ZoneType.HVAC)
+        meters = []
+        for space_number in range(3):
+            meter = Meter(meter_location="huz.cab.err", measurement_frequency=600,
+                          measurement_unit=MeasurementUnit.WATTS, meter_type=MeterType.ELECTRICITY,
+                          measure_mode=MeterMeasureMode.AUTOMATIC)
+            meter.add_meter_measure_arrays(["2024-01-01 00:00:00", "2024-01-01 00:10:00"],
+                                           [1000.0 * space_number, 500.0])
+            meters.append(meter)
+        rooms = [Room(self.area, f"Room {number}", RoomType.CLASSROOM, location="huz.cab.err") for number in range(3)]
+        for room, meter in zip(rooms, meters):
+            room.meter = meter
+        # spaces sharing a meter count it once
+        corridor = OpenSpace("CORRIDOR_1", self.area, OpenSpaceType.CORRIDOR, location="huz.cab.err")
+        corridor.meter = meters[0]
+        zone.add_spaces(rooms + [corridor])
+
+        readings = zone.aggregate_meter_readings(unit=MeasurementUnit.KILOWATTS)
+        self.assertEqual(readings.meter_uids, [meter.UID for meter in meters])
+        self.assertEqual(readings.total().tolist(), [3.0, 1.5])
+        self.assertEqual(zone.aggregate_meter_readings(MeterType.GAS).values.shape, (0, 0))
+
+    def test_iterate_zone_entities(self):
+        zone = Zone("COLD_ZONE", ZoneType.HVAC)
+        dim_zone = Zone("DIM_ZONE", ZoneType.LIGHTING)
+        warm_zone = Zone("WARM_ZONE", ZoneType.HVAC, HVACType.INTERIOR)
+        data_zone = Zone("DATA_ZONE", ZoneType.HVAC, HVACType.PERIMETER)
+        zone.add_adjacent_zones([dim_zone, warm_zone, data_zone])
+        zone.add_overlapping_zones([warm_zone, data_zone])
+        zone.add_spaces([Room(self.area, "Room 145", RoomType.CLASSROOM),
+                         OpenSpace("CORRIDOR_2", self.area, OpenSpaceType.CORRIDOR),
+                         OpenSpace("CORRIDOR_3", self.area, OpenSpaceType.CORRIDOR)])
+
+        for get_entities, iter_entities, search_terms in [
+                (zone.get_adjacent_zones, zone.iter_adjacent_zones, None),
+                (zone.get_adjacent_zones, zone.iter_adjacent_zones, {'zone_type': ZoneType.HVAC}),
+                (zone.get_overlapping_zones, zone.iter_overlapping_zones, None),
+                (zone.get_overlapping_zones, zone.iter_overlapping_zones, {'hvac_type': HVACType.PERIMETER}),
+                (zone.get_spaces, zone.iter_spaces, None),
+                (zone.get_spaces, zone.iter_spaces, {'name': Query.prefix('CORRIDOR')})]:
+            entities = get_entities(search_terms)
+            self.assertTrue(entities)
+            self.assertEqual(list(iter_entities(search_terms)), entities)
+            self.assertEqual(list(iter_entities(search_terms, limit=1, offset=1)), entities[1:2])
+            self.assertEqual(list(iter_entities(search_terms, offset=1)), entities[1:])
@@ -0,0 +1,144 @@
+from datetime import datetime
+from datetime import timedelta
+import numpy as np
+from metamenth.controls.pid_controls.abstract_pid_controls import AbstractPIDControl
+from metamenth.controls.pid_controls.batch_pid_engine import BatchPIDEngine
+from metamenth.datatypes.measure import Measure
+from metamenth.enumerations import BoilerCategory
+from metamenth.enumerations import MeasurementUnit
+from metamenth.enumerations import PowerState
+from metamenth.enumerations import RecordingType
+from metamenth.enumerations import SensorMeasure
+from metamenth.enumerations import SensorMeasureType
+from metamenth.enumerations import TriggerType
+from metamenth.misc import MeasureFactory
+from metamenth.subsystem.hvac_components.boiler import Boiler
+from metamenth.subsystem.hvac_components.controller import Controller
+from metamenth.transducers.actuator import Actuator
+from metamenth.transducers.sensor import Sensor
+from tests.subsystem.base_test import BaseTest
+
+
+class ValvePIDControl(AbstractPIDControl):
+
+    def acquire_process_value_data(self) -> float:
+        return self.process_value_sensor.current_value
+
+    def execute_control(self, process_value: float):
+        pass
+
+
+class TestBatchPIDEngine(BaseTest):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.controller = Controller('ZONE.CTR')
+        self.output_limits = MeasureFactory.create_measure(RecordingType.CONTINUOUS.value,
+                                                           Measure(MeasurementUnit.PERCENTAGE, 0, 100))
+
+    def _loop(self, position: int, set_point: float, proportional_gain: float, integral_gain: float = 0.0,
+              derivative_gain: float = 0.0, derivative_filter_time: float = 0.0) -> ValvePIDControl:
+        sensor = Sensor(f"TEMP.SENSOR.{position}", SensorMeasure.TEMPERATURE, MeasurementUnit.DEGREE_CELSIUS,
+                        SensorMeasureType.THERMO_COUPLE_TYPE_B, 60)
+        actuator = Actuator(f"VALVE.ACT.{position}",
+                            Boiler(f"BOILER.{position}", BoilerCategory.NATURAL_GAS, PowerState.ON), self.controller)
+        self.controller.add_transducer(sensor)
+        self.controller.add_transducer(actuator)
+        self.controller.add_set_point(MeasureFactory.create_measure(RecordingType.BINARY.value,
+                                                                    Measure(MeasurementUnit.DEGREE_CELSIUS, set_point)),
+                                      (sensor.name, actuator.name))
+        return ValvePIDControl(sensor, actuator, self.output_limits, proportional_gain, integral_gain,
+                               derivative_gain, derivative_filter_time)
+
+    def test_step_matches_scalar_pid(self):
+        gains = [(10.0, 0.0, 0.0, 0.0), (10.0, 0.05, 0.0, 0.0), (8.0, 0.02, 30.0, 0.0), (8.0, 0.02, 30.0, 120.0),
+                 (-10.0, -0.05, 0.0, 0.0)]
+        controls = [self._loop(position, 21.0 + position, *loop_gains) for position, loop_gains in enumerate(gains)]
+        engine = BatchPIDEngine()
+        self.assertEqual(engine.add_controls(controls), 0)
+        self.assertEqual(len(engine), 5)
+        self.assertEqual(engine.set_points.tolist(), [21.0, 22.0, 23.0, 24.0, 25.0])
+
+        # a reference PID evaluating one loop at a time
+        integrals = [0.0] * 5
+        derivatives = [0.0] * 5
+        previous = [None] * 5
+        random = np.random.default_rng(7)
+        elapsed = 60.0
+        for _ in range(50):
+            process_values = random.uniform(15, 30, 5)
+            outputs = engine.step(process_values, elapsed)
+            for position, (kp, ki, kd, tf) in enumerate(gains):
+                value = process_values[position]
+                error = 21.0 + position - value
+                change = 0.0 if previous[position] is None else value - previous[position]
+                derivatives[position] = (tf * derivatives[position] - kd * change) / (tf + elapsed)
+                integral = integrals[position] + ki * error * elapsed
+                unsaturated = kp * error + integral + derivatives[position]
+                output = min(max(unsaturated, 0), 100)
+                if not ((unsaturated > 100 and ki * error > 0) or (unsaturated < 0 and ki * error < 0)):
+                    integrals[position] = integral
+                previous[position] = value
+                self.assertAlmostEqual(outputs[position], output)
+        self.assertTrue(np.allclose(engine.integrals, integrals))
+
+    def test_anti_windup_and_missing_values(self):
+        engine = BatchPIDEngine()
+        engine.add_control(self._loop(0, 21.0, 10.0, 0.1))
+        engine.add_control(self._loop(1, 21.0, 10.0, 0.1))
+        # a long cold spell saturates the first loop, the second loop has no new process values
+        for _ in range(100):
+            outputs = engine.step([15.0, np.nan], 60)
+        self.assertEqual(outputs[0], 100)
+        self.assertTrue(np.isnan(outputs[1]))
+        self.assertLessEqual(engine.integrals[0], 100)
+        self.assertEqual(engine.integrals[1], 0)
+        # the output leaves saturation as soon as the process value overshoots the set point
+        outputs = engine.step([23.0, 20.0], 60)
+        self.assertLess(outputs[0], 100)
+        self.assertAlmostEqual(outputs[1], 10.0 + 0.1 * 60)
+
+        engine.reset()
+        self.assertEqual(engine.integrals.tolist(), [0, 0])
+        self.assertTrue(np.isnan(engine.outputs).all())
+        with self.assertRaises(ValueError):
+            engine.step([20.0], 60)
+        with self.assertRaises(ValueError):
+            engine.step([20.0, 20.0], 0)
+
+    def test_refresh_set_points_and_write_outputs(self):
+        controls = [self._loop(position, 21.0, 10.0) for position in range(3)]
+        engine = BatchPIDEngine()
+        engine.add_controls(controls)
+        timestamp = datetime(2024, 1, 15, 8, 0)
+        for minute in range(4):
+            engine.step([20.0, 21.0, np.nan], 60)
+            engine.record_outputs(timestamp + timedelta(minutes=minute))
+        self.controller.add_set_point(MeasureFactory.create_measure(RecordingType.BINARY.value,
+                                                                    Measure(MeasurementUnit.DEGREE_CELSIUS, 23)),
+                                      (controls[1].process_value_sensor.name, controls[1].process_actuator.name))
+        engine.refresh()
+        self.assertEqual(engine.set_points.tolist(), [21.0, 23.0, 21.0])
+        engine.step([20.0, 21.0, 22.0], 60)
+        engine.record_outputs(timestamp + timedelta(minutes=4))
+
+        self.assertEqual(engine.write_outputs(), 11)
+        self.assertEqual(engine.write_outputs(), 0)
+        history = controls[1].process_actuator.get_data()
+        self.assertEqual([trigger.value for trigger in history], [0.0] * 4 + [20.0])
+        self.assertEqual(history[-1].timestamp, timestamp + timedelta(minutes=4))
+        self.assertEqual(history[-1].trigger_type, TriggerType.OPEN_CLOSE)
+        self.assertEqual(len(controls[2].process_actuator.get_data()), 1)
+
+    def test_add_invalid_controls(self):
+        engine = BatchPIDEngine()
+        control = self._loop(0, 21.0, 10.0)
+        with self.assertRaises(ValueError) as err:
+            engine.add_control(control, Controller('OTHER.CTR'))
+        self.assertEqual(err.exception.__str__(), 'The process variable sensor is not configured for this controller')
+
+        self.controller.remove_set_point(control.process_value_sensor.name, control.process_actuator.name)
+        with self.assertRaises(ValueError) as err:
+            engine.add_control(control)
+        self.assertEqual(err.exception.__str__(), 'There is no set point for sensor TEMP.SENSOR.0 and actuator VALVE.ACT.0')
+        self.assertEqual(len(engine), 0)
@@ -63,10 +63,16 @@ from metamenth.enumerations import FCUType
 from metamenth.enumerations import FCUPipeSystem
 from metamenth.subsystem.hvac_components.fan_coil_unit import FanCoilUnit
 from metamenth.subsystem.hvac_components.controller import Controller
+from metamenth.subsystem.hvac_components.anemometer import Anemometer
+from metamenth.enumerations import AnemometerType
+from metamenth.utils import Query
 from metamenth.enumerations.recording_types import RecordingType
 from tests.subsystem.controls.on_off_control import OnOffControl
 from unittest.mock import patch
 from io import StringIO
+import os
+import tempfile
+from metamenth.storage.snapshot_file import SnapshotFile
 
 class TestBuildingControlSystem(BaseTest):
 
@@ -566,6 +572,76 @@ class TestBuildingControlSystem(BaseTest):
         self.assertIsInstance(hvac_system.ventilation_systems[0].get_components({'name': thermal_storage.name})[0],
                               AbstractVentilationComponent)
 
+    def test_iterate_hvac_component_entities(self):
+        duct = Duct("PR.VNT", DuctType.AIR)
+        for number, filter_type in enumerate([FilterType.PLEATED, FilterType.CARBON, FilterType.PLEATED]):
+            duct.add_filter(Filter(f"PR.VNT.FL.0{number}", filter_type))
+        for number, power_state in enumerate([PowerState.ON, PowerState.OFF, PowerState.ON]):
+            duct.add_fan(Fan(f"PR.VNT.FN.0{number}", power_state))
+        for number, damper_type in enumerate([DamperType.MANUAL_VOLUME, DamperType.BACK_DRAFT]):
+            duct.add_damper(Damper(f"PR.VNT.DMP.0{number}", damper_type))
+        for number, flow_type in enumerate([HeatExchangerFlowType.PARALLEL, HeatExchangerFlowType.PARALLEL]):
+            duct.add_heat_exchanger(HeatExchanger(f"PR.VNT.HE.0{number}", HeatExchangerType.FIN_TUBE, flow_type))
+        for number, anemometer_type in enumerate([AnemometerType.VANE, AnemometerType.HOT_WIRE]):
+            duct.add_anemometer(Anemometer(f"PR.VNT.AN.0{number}", anemometer_type))
+        for number, air_volume_type in enumerate([AirVolumeType.VARIABLE_AIR_VOLUME,
+                                                  AirVolumeType.CONSTANT_AIR_VOLUME]):
+            duct.add_connected_air_volume_box(AirVolumeBox(f"PR.VNT.VAV.0{number}", air_volume_type))
+
+        connections = DuctConnection()
+        for entity in [self.room, self.hall, self.floor]:
+            connections.add_entity(DuctConnectionEntityType.DESTINATION, entity)
+        connections.add_entity(DuctConnectionEntityType.SOURCE, Duct("SUPP.VNT.01", DuctType.AIR))
+        connections.add_entity(DuctConnectionEntityType.SOURCE, Duct("SUPP.VNT.02", DuctType.WATER))
+        duct.connections = connections
+
+        controller = Controller('CTR')
+        for entity in duct.get_fans() + duct.get_dampers():
+            controller.add_controller_entity(entity)
+
+        ventilation_system = VentilationSystem(VentilationType.AIR_HANDLING_UNIT, duct)
+        ventilation_system.add_component(RadiantSlab('PR.VNT.RS.01', RadiantSlabType.AIR_HEATED))
+        ventilation_system.add_component(ThermalStorage('PR.VNT.TS.01'))
+        ventilation_system.add_component(BaseboardHeater('PR.VNT.BH.01', HeatingType.ELECTRIC, PowerState.ON))
+
+        damper = duct.get_dampers()[0]
+        damper.add_spaces([self.room, self.hall, self.floor])
+        for minute, (position, status) in enumerate([(0.7, PowerState.ON), (0.5, PowerState.OFF),
+                                                     (0.5, PowerState.ON), (0.9, PowerState.OFF)]):
+            damper.add_damper_position(DamperPosition(position, f"2024-01-01 00:0{minute}:00"))
+            damper.add_status_measure(StatusMeasure(status.value, f"2024-01-01 00:0{minute}:00"))
+
+        for get_entities, iter_entities, search_terms in [
+                (duct.get_filters, duct.iter_filters, {'filter_type': FilterType.PLEATED}),
+                (duct.get_fans, duct.iter_fans, {'power_state': PowerState.ON}),
+                (duct.get_dampers, duct.iter_dampers, None),
+                (duct.get_heat_exchangers, duct.iter_heat_exchangers, None),
+                (duct.get_anemometers, duct.iter_anemometers, None),
+                (duct.get_connected_air_volume_boxes, duct.iter_connected_air_volume_boxes, None),
+                (connections.get_source_entities, connections.iter_source_entities, None),
+                (connections.get_destination_entities, connections.iter_destination_entities, None),
+                (controller.get_controller_entities, controller.iter_controller_entities, None),
+                (controller.get_controller_entities, controller.iter_controller_entities,
+                 {'name': Query.prefix('PR.VNT.FN')}),
+                (ventilation_system.get_components, ventilation_system.iter_components, None),
+                (damper.get_spaces, damper.iter_spaces, None),
+                (damper.get_damper_positions, damper.iter_damper_positions, {'value': 0.5}),
+                (damper.get_status_measure, damper.iter_status_measure, {'value': PowerState.OFF.value})]:
+            entities = get_entities(search_terms)
+            self.assertTrue(entities)
+            self.assertEqual(list(iter_entities(search_terms)), entities)
+            self.assertEqual(list(iter_entities(search_terms, limit=1, offset=1)), entities[1:2])
+            self.assertEqual(list(iter_entities(search_terms, offset=1)), entities[1:])
+
+        for get_by_date, iter_by_date in [(damper.get_damper_positions_by_date, damper.iter_damper_positions_by_date),
+                                          (damper.get_status_measure_by_date, damper.iter_status_measure_by_date)]:
+            measures = get_by_date("2024-01-01 00:01:00", "2024-01-01 00:03:00")
+            self.assertEqual(len(measures), 3)
+            self.assertEqual(list(iter_by_date("2024-01-01 00:01:00", "2024-01-01 00:03:00")), measures)
+            self.assertEqual(list(iter_by_date("2024-01-01 00:01:00", "2024-01-01 00:03:00", limit=1, offset=1)),
+                             measures[1:2])
+            self.assertEqual(list(iter_by_date("2024-01-01")), get_by_date("2024-01-01"))
+
     def test_building_with_hvac_control_system(self):
         building_control_system = BuildingControlSystem("EV Control System")
 
@@ -591,6 +667,56 @@ class TestBuildingControlSystem(BaseTest):
         self.assertEqual(vent_sys.principal_duct.connections.get_destination_entities()[0]
                          .connections.get_destination_entities(), [self.floor])
 
+    def test_save_and_load_building_snapshot(self):
+        building_control_system = BuildingControlSystem("EV Control System")
+        principal_duct, supply_air_duct, return_air_duct = self._init_ducts()
+        principal_duct, chiller, _, _, _, _ = self._connect_components(principal_duct)
+        chiller.add_status_measure(StatusMeasure(PowerState.ON.value, "2024-01-01 00:00:00"))
+        hvac_system = HVACSystem()
+        hvac_system.add_ventilation_system(VentilationSystem(VentilationType.AIR_HANDLING_UNIT, principal_duct))
+        building_control_system.hvac_system = hvac_system
+        self.building.add_control_system(building_control_system)
+        cold_zone = Zone("HVAC_COOLING_ZONE", ZoneType.HVAC, HVACType.INTERIOR)
+        self.room.add_zone(cold_zone, self.building)
+        self.floor.add_zone(cold_zone, self.building)
+        temp_sensor = Sensor("TEMP.SENSOR", SensorMeasure.TEMPERATURE, MeasurementUnit.DEGREE_CELSIUS,
+                             SensorMeasureType.THERMO_COUPLE_TYPE_B, 900)
+        temp_sensor.add_data_arrays(["2024-01-01 00:00:00", "2024-01-01 00:15:00"], [21.5, 22.0])
+        self.room.add_transducer(temp_sensor)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'building.snapshot')
+            self.assertEqual(SnapshotFile.save(self.building, path), os.path.getsize(path))
+            building = SnapshotFile.load(path)
+
+        floor = building.get_floor_by_uid(self.floor.UID)
+        room = floor.get_room_by_uid(self.room.UID)
+        self.assertIsNot(building, self.building)
+        # shared references are kept
+        self.assertIs(room.zones[0], floor.zones[0])
+        self.assertIs(building.zones[0], room.zones[0])
+        loaded_duct = building.control_systems[0].hvac_system.ventilation_systems[0].principal_duct
+        loaded_supply_duct = loaded_duct.connections.get_destination_entities()[0]
+        self.assertEqual(loaded_supply_duct.UID, supply_air_duct.UID)
+        self.assertIs(loaded_supply_duct.connections.get_destination_entities()[0], floor)
+        self.assertIn(room, loaded_duct.connections.get_source_entities()[0].connections.get_source_entities())
+        # recorded data
+        sensor = room.get_transducer_by_uid(temp_sensor.UID)
+        self.assertEqual([(data.timestamp, data.value) for data in sensor.get_data()],
+                         [(data.timestamp, data.value) for data in temp_sensor.get_data()])
+        self.assertEqual(len(sensor.get_data_by_date("2024-01-01 00:10:00", "2024-01-01 00:20:00")), 1)
+        chiller_tube = loaded_duct.get_heat_exchangers()[0].ducts[0]
+        loaded_chiller = chiller_tube.connections.get_source_entities()[0]
+        self.assertEqual(loaded_chiller.UID, chiller.UID)
+        self.assertIs(loaded_chiller.ducts[0], chiller_tube)
+        self.assertEqual(loaded_chiller.get_status_measure()[0].value, PowerState.ON.value)
+
+        with tempfile.NamedTemporaryFile() as file:
+            file.write(b'not a snapshot')
+            file.flush()
+            with self.assertRaises(ValueError):
+                SnapshotFile.load(file.name)
+
     @patch('sys.stdout', new_callable=StringIO)
     def test_binary_control(self, mock_stdout):
         # create boiler
@@ -0,0 +1,134 @@
+import asyncio
+import time
+from metamenth.controls.binary_controls.abstract_binary_control import AbstractBinaryControl
+from metamenth.controls.control_scheduler import ControlScheduler
+from metamenth.datatypes.measure import Measure
+from metamenth.enumerations import BoilerCategory
+from metamenth.enumerations import MeasurementUnit
+from metamenth.enumerations import PowerState
+from metamenth.enumerations import RecordingType
+from metamenth.enumerations import SensorMeasure
+from metamenth.enumerations import SensorMeasureType
+from metamenth.misc import MeasureFactory
+from metamenth.subsystem.hvac_components.boiler import Boiler
+from metamenth.subsystem.hvac_components.controller import Controller
+from metamenth.transducers.actuator import Actuator
+from metamenth.transducers.sensor import Sensor
+from tests.subsystem.base_test import BaseTest
+
+
+class RecordingControl(AbstractBinaryControl):
+    """
+    Records the process values it acquires and controls with
+    """
+
+    def __init__(self, process_value_sensor, process_actuator, control_thresholds, run_duration=None, delay=0):
+        super().__init__(process_value_sensor, process_actuator, control_thresholds, run_duration)
+        self.delay = delay
+        self.acquired = 0
+        self.controlled = []
+
+    def acquire_process_value_data(self) -> float:
+        self.acquired += 1
+        return 20.0 + self.acquired
+
+    def execute_control(self, process_value: float):
+        if self.delay:
+            time.sleep(self.delay)
+        self.controlled.append(process_value)
+
+
+class TestControlScheduler(BaseTest):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.thresholds = MeasureFactory.create_measure(RecordingType.CONTINUOUS.value,
+                                                        Measure(MeasurementUnit.DEGREE_CELSIUS, 15, 23))
+        self.boiler = Boiler('CTRL.BL', BoilerCategory.NATURAL_GAS, PowerState.ON)
+        self.actuator = Actuator("BOILER.ACT", self.boiler)
+
+    def _sensor(self, name: str, data_frequency: float) -> Sensor:
+        return Sensor(name, SensorMeasure.TEMPERATURE, MeasurementUnit.DEGREE_CELSIUS,
+                      SensorMeasureType.THERMO_COUPLE_TYPE_B, data_frequency)
+
+    def test_controls_sharing_a_sensor(self):
+        sensor = self._sensor("TEMP.SENSOR.01", 0.01)
+        other_sensor = self._sensor("TEMP.SENSOR.02", 0.02)
+        # run durations are in hours
+        first = RecordingControl(sensor, self.actuator, self.thresholds, 0.1 / 3600)
+        second = RecordingControl(sensor, self.actuator, self.thresholds, 0.05 / 3600)
+        third = RecordingControl(other_sensor, self.actuator, self.thresholds, 0.1 / 3600)
+        scheduler = ControlScheduler()
+        for control in [first, second, third]:
+            scheduler.add_control(control)
+        started = time.perf_counter()
+        scheduler.start()
+
+        self.assertLess(time.perf_counter() - started, 1)
+        self.assertEqual(scheduler.get_controls(), [])
+        # the process value of the shared sensor is acquired once per tick
+        metrics = scheduler.metrics[sensor.UID]
+        self.assertEqual(first.acquired, metrics.ticks)
+        self.assertEqual(second.acquired, 0)
+        self.assertEqual(first.controlled, [20.0 + tick for tick in range(1, metrics.ticks + 1)])
+        self.assertEqual(second.controlled, first.controlled[:len(second.controlled)])
+        self.assertLess(len(second.controlled), len(first.controlled))
+        self.assertGreaterEqual(metrics.ticks, 8)
+        self.assertLessEqual(metrics.ticks, 11)
+        self.assertGreaterEqual(scheduler.metrics[other_sensor.UID].ticks, 4)
+        self.assertEqual(scheduler.summary().ticks, metrics.ticks + scheduler.metrics[other_sensor.UID].ticks)
+        self.assertEqual(scheduler.summary().errors, 0)
+
+    def test_overrun_and_stop(self):
+        sensor = self._sensor("TEMP.SENSOR.01", 0.01)
+        slow_control = RecordingControl(sensor, self.actuator, self.thresholds, delay=0.025)
+        scheduler = ControlScheduler()
+        scheduler.add_control(slow_control)
+
+        async def run():
+            asyncio.get_running_loop().call_later(0.2, scheduler.stop)
+            await scheduler.run()
+
+        asyncio.run(run())
+        metrics = scheduler.metrics[sensor.UID]
+        self.assertFalse(scheduler.running)
+        self.assertEqual(metrics.overruns, metrics.ticks)
+        self.assertGreaterEqual(metrics.skipped_ticks, 2 * metrics.ticks)
+        self.assertGreaterEqual(metrics.max_duration, 0.025)
+        # the strategy without a run duration stays scheduled
+        self.assertEqual(scheduler.get_controls(), [slow_control])
+
+    def test_replace_control_while_running(self):
+        sensor = self._sensor("TEMP.SENSOR.01", 0.01)
+        first = RecordingControl(sensor, self.actuator, self.thresholds)
+        second = RecordingControl(sensor, self.actuator, self.thresholds, 0.05 / 3600)
+        scheduler = ControlScheduler()
+        scheduler.add_control(first)
+
+        def replace_control():
+            # the last strategy of the sensor is removed and another one added in the same callback
+            scheduler.remove_control(first)
+            scheduler.add_control(second)
+
+        async def run():
+            asyncio.get_running_loop().call_later(0.05, replace_control)
+            await scheduler.run()
+
+        asyncio.run(run())
+        self.assertGreater(len(first.controlled), 0)
+        self.assertGreaterEqual(len(second.controlled), 3)
+        self.assertEqual(scheduler.get_controls(), [])
+
+    def test_add_invalid_controls(self):
+        controller = Controller('CTR')
+        sensor = self._sensor("TEMP.SENSOR.01", 0.01)
+        scheduler = ControlScheduler()
+        with self.assertRaises(ValueError) as err:
+            scheduler.add_control(RecordingControl(sensor, self.actuator, self.thresholds), controller)
+        self.assertEqual(err.exception.__str__(), 'The process variable sensor is not configured for this controller')
+
+        sensor.data_frequency = 0
+        with self.assertRaises(ValueError):
+            scheduler.add_control(RecordingControl(sensor, self.actuator, self.thresholds))
+        with self.assertRaises(ValueError):
+            scheduler.remove_control(RecordingControl(sensor, self.actuator, self.thresholds))
@@ -0,0 +1,164 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from datetime import timedelta
+import time
+import numpy as np
+from metamenth.controls.binary_controls.abstract_binary_control import AbstractBinaryControl
+from metamenth.controls.replay_harness import ReplayHarness
+from metamenth.controls.simulation_clock import SimulationClock
+from metamenth.datatypes.measure import Measure
+from metamenth.enumerations import BoilerCategory
+from metamenth.enumerations import MeasurementUnit
+from metamenth.enumerations import PowerState
+from metamenth.enumerations import RecordingType
+from metamenth.enumerations import SensorMeasure
+from metamenth.enumerations import SensorMeasureType
+from metamenth.enumerations import TriggerType
+from metamenth.measure_instruments.sensor_data import SensorData
+from metamenth.misc import MeasureFactory
+from metamenth.subsystem.hvac_components.boiler import Boiler
+from metamenth.transducers.actuator import Actuator
+from metamenth.transducers.sensor import Sensor
+from tests.subsystem.base_test import BaseTest
+
+
+class ThermostatControl(AbstractBinaryControl):
+    """
+    Turns a boiler on below the thresholds and off above them, at the time of the harness clock
+    """
+
+    def __init__(self, process_value_sensor, process_actuator, control_thresholds, harness, run_duration=None):
+        super().__init__(process_value_sensor, process_actuator, control_thresholds, run_duration)
+        self.harness = harness
+        self.controlled = []
+
+    def acquire_process_value_data(self) -> float:
+        return self.process_value_sensor.current_value
+
+    def execute_control(self, process_value: float):
+        self.controlled.append((self.harness.clock.now(), process_value))
+        if process_value is None:
+            return None
+        if process_value < self.control_thresholds.minimum:
+            return TriggerType.ON
+        if process_value > self.control_thresholds.maximum:
+            return TriggerType.OFF
+        return None
+
+
+class TestReplayHarness(BaseTest):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.thresholds = MeasureFactory.create_measure(RecordingType.CONTINUOUS.value,
+                                                        Measure(MeasurementUnit.DEGREE_CELSIUS, 19, 23))
+        self.start = datetime(2024, 1, 1)
+
+    def _sensor(self, name: str, data_frequency: float) -> Sensor:
+        return Sensor(name, SensorMeasure.TEMPERATURE, MeasurementUnit.DEGREE_CELSIUS,
+                      SensorMeasureType.THERMO_COUPLE_TYPE_B, data_frequency)
+
+    def _actuator(self, name: str) -> Actuator:
+        return Actuator(name, Boiler(f'{name}.BL', BoilerCategory.NATURAL_GAS, PowerState.ON))
+
+    def test_simulation_clock(self):
+        clock = SimulationClock(self.start)
+        for _ in range(3600):
+            clock.advance(0.1)
+        self.assertEqual(clock.now(), self.start + timedelta(minutes=6))
+        clock.advance_to(3600)
+        self.assertEqual(clock.time(), self.start.timestamp() + 3600)
+        with self.assertRaises(ValueError):
+            clock.advance_to(10)
+        clock.reset()
+        self.assertEqual(clock.now(), self.start)
+
+    def test_replay_recorded_data(self):
+        sensor = self._sensor('TEMP.SENSOR', 900)
+        timestamps = [self.start + timedelta(minutes=30 * position) for position in range(5)]
+        sensor.add_data_arrays(timestamps, [18.0, 21.0, 24.0, 22.0, 17.0])
+        actuator = self._actuator('BOILER.ACT')
+        harness = ReplayHarness()
+        control = ThermostatControl(sensor, actuator, self.thresholds, harness)
+        harness.add_control(control)
+        sensor.current_value = 20.5
+        metrics = harness.run()
+
+        # ticks every 15 minutes over 2 hours, holding the last reading between readings
+        self.assertEqual(control.controlled, [(self.start + timedelta(minutes=15 * tick), value) for tick, value in
+                                              enumerate([18.0, 18.0, 21.0, 21.0, 24.0, 24.0, 22.0, 22.0, 17.0])])
+        self.assertEqual(metrics.ticks, 9)
+        self.assertEqual(metrics.simulated_seconds, 7200)
+        self.assertEqual(metrics.triggers, 5)
+        self.assertEqual(metrics.errors, 0)
+        self.assertGreater(metrics.simulated_hours_per_second, 0)
+        self.assertEqual([(trigger.timestamp, trigger.trigger_type) for trigger in actuator.get_data()],
+                         [(self.start, TriggerType.ON), (self.start + timedelta(minutes=15), TriggerType.ON),
+                          (self.start + timedelta(minutes=60), TriggerType.OFF),
+                          (self.start + timedelta(minutes=75), TriggerType.OFF),
+                          (self.start + timedelta(minutes=120), TriggerType.ON)])
+        # the live sensor holds its value from before the replay
+        self.assertEqual(sensor.current_value, 20.5)
+
+    def test_parallel_replays_are_deterministic(self):
+        random = np.random.default_rng(3)
+        timestamps = [self.start + timedelta(minutes=5 * position) for position in range(2000)]
+        sensors = [self._sensor(f'TEMP.SENSOR.{position}', 300 * (1 + position % 3)) for position in range(6)]
+        for sensor in sensors:
+            sensor.add_data_arrays(timestamps, random.uniform(15, 27, len(timestamps)))
+
+        def replay(executor):
+            harness = ReplayHarness(executor=executor)
+            actuators = [self._actuator(f'BOILER.ACT.{position}') for position in range(12)]
+            for position, actuator in enumerate(actuators):
+                # two strategies per sensor, the second one stops after a day
+                harness.add_control(ThermostatControl(sensors[position % 6], actuator, self.thresholds, harness,
+                                                      None if position < 6 else 24))
+            metrics = harness.run()
+            return metrics, [[(trigger.timestamp, trigger.trigger_type) for trigger in actuator.get_data()]
+                             for actuator in actuators]
+
+        metrics, triggers = replay(None)
+        with ThreadPoolExecutor(4) as executor:
+            parallel_metrics, parallel_triggers = replay(executor)
+        self.assertEqual(triggers, parallel_triggers)
+        self.assertEqual(metrics.ticks, parallel_metrics.ticks)
+        self.assertEqual(metrics.controls_executed, parallel_metrics.controls_executed)
+        self.assertEqual(metrics.controls_executed, 2 * (2000 + 1000 + 667) + 2 * (288 + 144 + 96))
+        self.assertLess(max(trigger[0] for trigger in triggers[11]), self.start + timedelta(days=1))
+
+    def test_history_speed_up_and_errors(self):
+        sensor = self._sensor('TEMP.SENSOR', 60)
+        sensor.add_data_arrays([self.start], [30.0])
+        history = [SensorData(value, (self.start + timedelta(minutes=minute)).strftime('%Y-%m-%d %H:%M:%S'))
+                   for minute, value in [(0, 16.0), (2, 20.0)]]
+        harness = ReplayHarness(speed_up=600)
+        control = ThermostatControl(sensor, self._actuator('BOILER.ACT'), self.thresholds, harness)
+        harness.add_control(control, history=history)
+        with self.assertRaises(ValueError):
+            harness.add_control(control)
+        started = time.perf_counter()
+        metrics = harness.run(end=self.start + timedelta(minutes=3))
+        self.assertGreaterEqual(time.perf_counter() - started, 0.3)
+        self.assertEqual([value for _, value in control.controlled], [16.0, 16.0, 20.0, 20.0])
+        self.assertLessEqual(metrics.speed_up, 600)
+
+        failing = ThermostatControl(sensor, self._actuator('BOILER.ACT.2'), self.thresholds, harness)
+        failing.execute_control = lambda process_value: 'on'
+        harness.add_control(failing)
+        with self.assertLogs('metamenth.controls.replay_harness', 'ERROR'):
+            self.assertEqual(harness.run(self.start, self.start + timedelta(minutes=3)).errors, 4)
+        self.assertIsNone(sensor.current_value)
+
+        # the value is restored when a replay is interrupted
+        sensor.current_value = 21.0
+
+        def interrupt(process_value):
+            raise KeyboardInterrupt
+
+        failing.execute_control = interrupt
+        with self.assertRaises(KeyboardInterrupt):
+            harness.run(self.start, self.start + timedelta(minutes=3))
+        self.assertEqual(sensor.current_value, 21.0)
+        with self.assertRaises(ValueError):
+            ReplayHarness(speed_up=0)
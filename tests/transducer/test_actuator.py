@@ -15,6 +15,7 @@ from metamenth.subsystem.hvac_components.variable_frequency_drive import Variabl
 from metamenth.enumerations import DamperType
 from metamenth.enumerations import PowerState
 from metamenth.subsystem.hvac_components.controller import Controller
+from metamenth.storage.columnar_time_series_store import ColumnarTimeSeriesStore
 
 
 class TestActuator(TestCase):
@@ -128,3 +129,17 @@ class TestActuator(TestCase):
         actuator.remove_data(trigger_his)
         self.assertEqual(actuator.get_data(), [])
         self.assertEqual(len(actuator.get_data()), 0)
+
+    def test_actuator_with_columnar_data_store(self):
+        actuator = Actuator("FILTER.ACT", self.damper)
+        actuator.data_store = ColumnarTimeSeriesStore(TriggerHistory, keep_uids=True,
+                                                      tag_attributes=['trigger_type'])
+        trigger_his = TriggerHistory(TriggerType.OPEN_CLOSE, 1, "2024-03-05 10:00:00")
+        actuator.add_data([trigger_his, TriggerHistory(TriggerType.CLOSE, 0, "2024-03-05 11:00:00")])
+        self.assertEqual(actuator.get_data()[0], trigger_his)
+        self.assertEqual(actuator.get_data()[0].trigger_type, TriggerType.OPEN_CLOSE)
+        self.assertEqual(len(actuator.get_data({'trigger_type': TriggerType.CLOSE})), 1)
+
+        actuator.remove_data(trigger_his)
+        self.assertEqual(len(actuator.get_data()), 1)
+        self.assertEqual(actuator.get_data()[0].trigger_type, TriggerType.CLOSE)
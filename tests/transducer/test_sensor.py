@@ -9,7 +9,14 @@ from metamenth.enumerations import SensorMeasureType
 from metamenth.enumerations import SensorLogType
 from metamenth.measure_instruments.sensor_data import SensorData
 from time import sleep
+import tempfile
 from datetime import datetime, timedelta
+from metamenth.storage.columnar_time_series_store import ColumnarTimeSeriesStore
+from metamenth.storage.memory_mapped_time_series_store import MemoryMappedTimeSeriesStore
+from metamenth.misc import Validate
+from metamenth.enumerations import RollupResolution
+from metamenth.utils import Query
+import numpy as np
 
 
 class TestSensor(TestCase):
@@ -179,3 +186,266 @@ class TestSensor(TestCase):
         self.assertEqual(returned_data[0].timestamp, sensor_data[0].timestamp)
         self.assertEqual(returned_data[2].timestamp, sensor_data[2].timestamp)
 
+    def test_sensor_with_columnar_data_store(self):
+        co2_sensor = Sensor("CO2.SENSOR", SensorMeasure.CARBON_DIOXIDE,
+                            MeasurementUnit.PARTS_PER_MILLION,
+                            SensorMeasureType.THERMO_COUPLE_TYPE_C, 70)
+        co2_sensor.add_data([SensorData(180, "2024-01-01 00:00:00")])
+        co2_sensor.data_store = ColumnarTimeSeriesStore(chunk_size=4)
+        start = datetime(2024, 1, 1)
+        co2_sensor.add_data([SensorData(180 + minute, (start + timedelta(minutes=minute)).strftime("%Y-%m-%d %H:%M:%S"))
+                             for minute in range(1, 10)])
+        self.assertEqual(len(co2_sensor.get_data()), 10)
+        self.assertEqual(co2_sensor.get_data()[0].value, 180)
+        self.assertEqual(co2_sensor.get_data()[9].timestamp, datetime(2024, 1, 1, 0, 9))
+        # uids are generated once and kept for later reads
+        self.assertEqual(co2_sensor.get_data()[3].UID, co2_sensor.get_data()[3].UID)
+
+        returned_data = co2_sensor.get_data_by_date("2024-01-01 00:02:00", "2024-01-01 00:05:00")
+        self.assertEqual([data.value for data in returned_data], [182, 183, 184, 185])
+
+        co2_sensor.remove_data(returned_data[1])
+        timestamps, values = co2_sensor.get_data_arrays("2024-01-01 00:02:00", "2024-01-01 00:05:00")
+        self.assertEqual(values.tolist(), [182, 184, 185])
+        self.assertEqual(timestamps.dtype, 'datetime64[s]')
+        self.assertEqual(len(co2_sensor.get_data_arrays()[1]), 9)
+
+    def test_columnar_data_store_derived_uids(self):
+        store = ColumnarTimeSeriesStore(chunk_size=4)
+        start = datetime(2024, 1, 1)
+        store.add_arrays([start + timedelta(minutes=minute) for minute in range(10)], list(range(10)))
+        records = store.get_records()
+        # uids are derived from the rows rather than generated and kept
+        self.assertEqual([record.UID for record in records], [record.UID for record in store.get_records()])
+        self.assertEqual(len({record.UID for record in records}), 10)
+        self.assertTrue(all(not chunk.uids for chunk in store._chunks))
+
+        # removing a row does not change the uids of the rows after it
+        store.remove(records[5])
+        store.remove(records[6])
+        self.assertEqual([record.UID for record in store.get_records()],
+                         [record.UID for record in records[:5] + records[7:]])
+        store.add_arrays([start + timedelta(minutes=10)], [10])
+        self.assertEqual(len({record.UID for record in store.get_records()}), 9)
+        store.remove(records[9])
+        self.assertEqual([record.value for record in store.get_records()], [0, 1, 2, 3, 4, 7, 8, 10])
+
+    def test_sensor_data_arrays_with_end_timestamp(self):
+        co2_sensor = Sensor("CO2.SENSOR", SensorMeasure.CARBON_DIOXIDE,
+                            MeasurementUnit.PARTS_PER_MILLION,
+                            SensorMeasureType.THERMO_COUPLE_TYPE_C, 70)
+        co2_sensor.data_store = ColumnarTimeSeriesStore(chunk_size=2)
+        co2_sensor.add_data_arrays(["2024-01-01 00:00:00", "2024-01-01 12:00:00", "2024-01-02 00:00:00"],
+                                   [400, 410, 420])
+        self.assertEqual(co2_sensor.get_data_arrays(to_timestamp="2024-01-01 06:00:00")[1].tolist(), [400])
+        self.assertEqual(co2_sensor.get_data_arrays(to_timestamp="2024-01-01")[1].tolist(), [400, 410])
+
+    def test_columnar_data_store_rejects_non_numeric_values(self):
+        store = ColumnarTimeSeriesStore()
+        try:
+            store.add([SensorData("on")])
+        except ValueError as err:
+            self.assertEqual(err.__str__(), "on is not numeric and cannot be kept in a columnar store")
+
+    def test_add_sensor_data_arrays(self):
+        co2_sensor = Sensor("CO2.SENSOR", SensorMeasure.CARBON_DIOXIDE,
+                            MeasurementUnit.PARTS_PER_MILLION,
+                            SensorMeasureType.THERMO_COUPLE_TYPE_C, 70)
+        co2_sensor.add_data_arrays(["2024-01-01 00:00:00", "2024-01-01 00:01:00", "2024-01-01 00:02:00"],
+                                   [400, 410, 420])
+        self.assertIsInstance(co2_sensor.get_data()[0], SensorData)
+        self.assertEqual(co2_sensor.get_data()[1].timestamp, datetime(2024, 1, 1, 0, 1))
+        self.assertEqual(len(co2_sensor.get_data_by_date("2024-01-01 00:01:00", "2024-01-01 00:02:00")), 2)
+
+        # timestamps that are not ISO 8601 are parsed with the formats of Validate.parse_date
+        co2_sensor.data_store = ColumnarTimeSeriesStore(chunk_size=2)
+        co2_sensor.add_data_arrays(["2024/01/01 00:04", "2024/01/01 00:03"], [440, 430])
+        self.assertEqual(len(co2_sensor.get_data()), 5)
+        timestamps, values = co2_sensor.get_data_arrays("2024-01-01 00:02:00", "2024-01-01 00:03:00")
+        self.assertEqual(sorted(values.tolist()), [420, 430])
+
+    def test_sensor_data_timestamp_formats(self):
+        self.assertEqual(SensorData(1, "2024-03-05 10:15:30.250").timestamp, datetime(2024, 3, 5, 10, 15, 30))
+        self.assertEqual(SensorData(1, "2024-03-05 10:15").timestamp, datetime(2024, 3, 5, 10, 15))
+        self.assertEqual(SensorData(1, "2024-03-05").timestamp, datetime(2024, 3, 5))
+        self.assertEqual(SensorData(1, "03/05/2024 10:15").timestamp, datetime(2024, 3, 5, 10, 15))
+        self.assertEqual(SensorData(1, "2024/03/05 10:15:30").timestamp, datetime(2024, 3, 5, 10, 15, 30))
+        try:
+            SensorData(1, "2024-02-30 10:15:30")
+        except ValueError as err:
+            self.assertEqual(err.__str__(), "No valid date format found")
+
+    def test_parse_dates_batch(self):
+        dates = Validate.parse_dates(["03/05/2024 10:15", "03/05/2024 10:30", "2024-03-05 10:45"])
+        self.assertEqual(dates.dtype, 'datetime64[s]')
+        self.assertEqual(dates.tolist(), [datetime(2024, 3, 5, 10, 15), datetime(2024, 3, 5, 10, 30),
+                                          datetime(2024, 3, 5, 10, 45)])
+        self.assertEqual(Validate.parse_dates(["05.03.2024 10:15"], "%d.%m.%Y %H:%M").tolist(),
+                         [datetime(2024, 3, 5, 10, 15)])
+        self.assertEqual(Validate.parse_dates(["2024-03-05", "2024-03-05 10:15", "2024-03-05 10:15:30.250"]).tolist(),
+                         [datetime(2024, 3, 5), datetime(2024, 3, 5, 10, 15), datetime(2024, 3, 5, 10, 15, 30)])
+
+    def test_parse_dates_rejects_dates_parse_date_rejects(self):
+        for date_string in ["2024", "2024-03", "2024-03-05 10", "2024-03-05T10"]:
+            with self.assertRaises(ValueError):
+                Validate.parse_date(date_string)
+            with self.assertRaises(ValueError):
+                Validate.parse_dates(["2024-03-05 10:15", date_string])
+
+    def test_sensor_measure_from_point_names(self):
+        self.assertEqual(SensorMeasure.get_enum_type('temperature'), SensorMeasure.TEMPERATURE)
+        self.assertEqual(SensorMeasure.get_enum_type('Temprature'), SensorMeasure.TEMPERATURE)
+        self.assertEqual(MeasurementUnit.get_enum_type('degree-celsius'), MeasurementUnit.DEGREE_CELSIUS)
+        self.assertEqual(SensorMeasure.get_enum_types(['Temprature', 'humidity', 'Temprature', 'occupancy']),
+                         [SensorMeasure.TEMPERATURE, SensorMeasure.HUMIDITY, SensorMeasure.TEMPERATURE,
+                          SensorMeasure.OCCUPANCY])
+        self.assertEqual(SensorMeasure.get_enum_types([]), [])
+
+    def test_sensor_data_uid(self):
+        sensor_data = SensorData(1.5, "2024-03-05 10:15:30")
+        self.assertEqual(sensor_data.UID, sensor_data.UID)
+        self.assertEqual(len(sensor_data.UID), 36)
+        self.assertNotEqual(sensor_data.UID, SensorData(1.5, "2024-03-05 10:15:30").UID)
+        with self.assertRaises(AttributeError):
+            sensor_data.unit = MeasurementUnit.DEGREE_CELSIUS
+
+    def test_iterate_sensor_data(self):
+        co2_sensor = Sensor("CO2.SENSOR", SensorMeasure.CARBON_DIOXIDE,
+                            MeasurementUnit.PARTS_PER_MILLION,
+                            SensorMeasureType.THERMO_COUPLE_TYPE_C, 70)
+        start = datetime(2024, 1, 1)
+        co2_sensor.add_data([SensorData(400 + minute, (start + timedelta(minutes=minute)).strftime("%Y-%m-%d %H:%M:%S"))
+                             for minute in range(10)])
+        self.assertEqual([data.value for data in co2_sensor.iter_data(limit=3, offset=2)], [402, 403, 404])
+        self.assertEqual([data.value for data in co2_sensor.iter_data({'value': 405})], [405])
+        returned_data = co2_sensor.iter_data_by_date("2024-01-01 00:02:00", "2024-01-01 00:08:00", limit=2, offset=1)
+        self.assertEqual([data.value for data in returned_data], [403, 404])
+
+        co2_sensor.data_store = ColumnarTimeSeriesStore(chunk_size=4)
+        returned_data = co2_sensor.iter_data_by_date("2024-01-01 00:02:00", "2024-01-01 00:08:00", offset=5)
+        self.assertEqual([data.value for data in returned_data], [407, 408])
+        self.assertEqual(next(co2_sensor.iter_data()).value, 400)
+
+        try:
+            co2_sensor.iter_data(offset=-1)
+        except ValueError as err:
+            self.assertEqual(err.__str__(), "limit and offset must not be negative")
+
+    def test_iterate_sensor_data_as_searched(self):
+        co2_sensor = Sensor("CO2.SENSOR", SensorMeasure.CARBON_DIOXIDE,
+                            MeasurementUnit.PARTS_PER_MILLION,
+                            SensorMeasureType.THERMO_COUPLE_TYPE_C, 70)
+        start = datetime(2024, 1, 1)
+        # added out of order, with repeated values
+        co2_sensor.add_data([SensorData(400 + minute % 4,
+                                        (start + timedelta(minutes=minute)).strftime("%Y-%m-%d %H:%M:%S"))
+                             for minute in [5, 1, 9, 0, 3, 8, 2, 7, 4, 6]])
+
+        def readings(data):
+            # columnar stores build the records of their readings when read
+            return [(record.timestamp, record.value) for record in data]
+
+        for data_store in [None, ColumnarTimeSeriesStore(chunk_size=3)]:
+            if data_store is not None:
+                co2_sensor.data_store = data_store
+            for search_terms in [None, {'value': 401}, {'value': Query.gt(401)}]:
+                data = co2_sensor.get_data(search_terms)
+                self.assertTrue(data)
+                self.assertEqual(readings(co2_sensor.iter_data(search_terms)), readings(data))
+                self.assertEqual(readings(co2_sensor.iter_data(search_terms, limit=2, offset=1)), readings(data[1:3]))
+                self.assertEqual(list(co2_sensor.iter_data(search_terms, offset=len(data))), [])
+            for from_timestamp, to_timestamp in [("2024-01-01 00:02:00", "2024-01-01 00:08:00"),
+                                                 ("2024-01-01", None), ("2024-01-02", "2024-01-03")]:
+                data = co2_sensor.get_data_by_date(from_timestamp, to_timestamp)
+                self.assertEqual(readings(co2_sensor.iter_data_by_date(from_timestamp, to_timestamp)), readings(data))
+                returned_data = co2_sensor.iter_data_by_date(from_timestamp, to_timestamp, limit=3, offset=2)
+                self.assertEqual(readings(returned_data), readings(data[2:5]))
+
+    def test_sensor_data_rollups(self):
+        co2_sensor = Sensor("CO2.SENSOR", SensorMeasure.CARBON_DIOXIDE,
+                            MeasurementUnit.PARTS_PER_MILLION,
+                            SensorMeasureType.THERMO_COUPLE_TYPE_C, 70)
+        co2_sensor.add_data_arrays(["2024-01-01 00:00:00", "2024-01-01 00:30:00", "2024-01-01 01:00:00"],
+                                   [400, 420, 500])
+        hours = co2_sensor.get_rollups(RollupResolution.HOURLY)
+        self.assertEqual([(hour.count, hour.mean, hour.max) for hour in hours], [(2, 410, 420), (1, 500, 500)])
+
+        co2_sensor.remove_data(co2_sensor.get_data()[0])
+        co2_sensor.data_store = ColumnarTimeSeriesStore()
+        co2_sensor.add_data([SensorData(480, "2024-01-01 01:30:00")])
+        self.assertEqual([(hour.count, hour.min) for hour in co2_sensor.get_rollups(RollupResolution.HOURLY)],
+                         [(1, 420), (2, 480)])
+
+    def test_sensor_data_rollups_skip_readings_that_are_not_numbers(self):
+        co2_sensor = Sensor("CO2.SENSOR", SensorMeasure.CARBON_DIOXIDE,
+                            MeasurementUnit.PARTS_PER_MILLION,
+                            SensorMeasureType.THERMO_COUPLE_TYPE_C, 70)
+        co2_sensor.add_data([SensorData(400, "2024-01-01 00:00:00"), SensorData("OFFLINE", "2024-01-01 00:10:00"),
+                             SensorData(420, "2024-01-01 00:20:00")])
+        hours = co2_sensor.get_rollups(RollupResolution.HOURLY)
+        self.assertEqual([(hour.count, hour.mean) for hour in hours], [(2, 410)])
+
+        # added to the built buckets, then rebuilt from all the readings after a reading added out of order
+        co2_sensor.add_data([SensorData("OFFLINE", "2024-01-01 01:00:00"), SensorData(500, "2024-01-01 01:10:00")])
+        self.assertEqual([(hour.count, hour.mean) for hour in co2_sensor.get_rollups(RollupResolution.HOURLY)],
+                         [(2, 410), (1, 500)])
+        co2_sensor.add_data([SensorData(380, "2024-01-01 00:30:00")])
+        self.assertEqual([(hour.count, hour.min) for hour in co2_sensor.get_rollups(RollupResolution.HOURLY)],
+                         [(3, 380), (1, 500)])
+
+    def test_sensor_with_memory_mapped_data_store(self):
+        co2_sensor = Sensor("CO2.SENSOR", SensorMeasure.CARBON_DIOXIDE,
+                            MeasurementUnit.PARTS_PER_MILLION,
+                            SensorMeasureType.THERMO_COUPLE_TYPE_C, 70)
+        with tempfile.TemporaryDirectory() as archive_directory:
+            co2_sensor.data_store = MemoryMappedTimeSeriesStore(archive_directory, chunk_size=4, memory_chunks=1)
+            start = datetime(2024, 1, 1)
+            co2_sensor.add_data([SensorData(400 + minute, (start + timedelta(minutes=minute))
+                                            .strftime("%Y-%m-%d %H:%M:%S")) for minute in range(10)])
+            # the two oldest chunks are in the archive files, the last one in memory
+            self.assertEqual(co2_sensor.data_store.archived_size, 8)
+            self.assertEqual(len(co2_sensor.get_data()), 10)
+            returned_data = co2_sensor.get_data_by_date("2024-01-01 00:06:00", "2024-01-01 00:09:00")
+            self.assertEqual([data.value for data in returned_data], [406, 407, 408, 409])
+
+            # arrays of archived records are read-only views of the files
+            timestamps, values = co2_sensor.get_data_arrays("2024-01-01 00:01:00", "2024-01-01 00:03:00")
+            self.assertEqual(values.tolist(), [401, 402, 403])
+            self.assertFalse(values.flags.writeable)
+
+            co2_sensor.remove_data(co2_sensor.get_data()[2])
+            co2_sensor.data_store.flush()
+            reopened_store = MemoryMappedTimeSeriesStore(archive_directory, chunk_size=4)
+            self.assertEqual(len(reopened_store), 9)
+            self.assertEqual([data.value for data in reopened_store.get_records()][:3], [400, 401, 403])
+
+    def test_memory_mapped_data_store_uids(self):
+        start = datetime(2024, 1, 1)
+        with tempfile.TemporaryDirectory() as archive_directory:
+            data_store = MemoryMappedTimeSeriesStore(archive_directory, chunk_size=4, memory_chunks=1)
+            data_store.add_arrays(np.array([start + timedelta(minutes=minute) for minute in range(6)],
+                                           dtype='datetime64[s]'), np.arange(400, 406, dtype=np.float64))
+            uids = [data.UID for data in data_store.get_records()]
+            # a row removed in memory is archived as a removed row, the rows after it keep their UIDs
+            data_store.remove(data_store.get_records()[5])
+            data_store.add_arrays(np.array([start + timedelta(minutes=minute) for minute in range(6, 10)],
+                                           dtype='datetime64[s]'), np.arange(406, 410, dtype=np.float64))
+            uids = uids[:5] + [data.UID for data in data_store.get_records()[5:]]
+            self.assertEqual(data_store.archived_size, 8)
+            self.assertEqual(len(set(uids)), 9)
+
+            # UIDs of archived records are derived from their rows, read again without being kept
+            self.assertEqual([data.UID for data in data_store.get_records()], uids)
+            self.assertEqual([data.UID for data in data_store.get_records()], uids)
+            self.assertEqual(data_store._archive.uids, {})
+
+            # records are removed by UID after they are spilled, the others keep their UIDs
+            data_store.remove(data_store.get_records()[1])
+            self.assertEqual([data.value for data in data_store.get_records()][:3], [400, 402, 403])
+            data_store.flush()
+            reopened_store = MemoryMappedTimeSeriesStore(archive_directory, chunk_size=4)
+            self.assertEqual([data.UID for data in reopened_store.get_records()], uids[:1] + uids[2:])
+            archived = reopened_store.get_records_by_date(start + timedelta(minutes=6), start + timedelta(minutes=6))
+            reopened_store.remove(archived[0])
+            self.assertEqual([data.value for data in reopened_store.get_records()],
+                             [400, 402, 403, 404, 407, 408, 409])
@@ -0,0 +1,165 @@
+from metamenth.structure.floor import Floor
+from metamenth.structure.room import Room
+from metamenth.enumerations import FloorType
+from metamenth.structure.building import Building
+from metamenth.enumerations import BuildingType
+from tests.structure.base_test import BaseTest
+from metamenth.enumerations import RoomType
+from metamenth.enumerations import OpenSpaceType
+from metamenth.enumerations import SensorMeasure
+from metamenth.enumerations import BoilerCategory
+from metamenth.enumerations import PowerState
+from metamenth.enumerations import MeasurementUnit
+from metamenth.enumerations import MeterType
+from metamenth.enumerations import MeterMeasureMode
+from metamenth.enumerations import AirVolumeType
+from metamenth.enumerations import DamperType
+from metamenth.subsystem.hvac_components.boiler import Boiler
+from metamenth.subsystem.hvac_components.air_volume_box import AirVolumeBox
+from metamenth.subsystem.hvac_components.damper import Damper
+from metamenth.measure_instruments.meter import Meter
+from metamenth.visitors.building_query_engine import BuildingQueryEngine
+from metamenth.visitors.sensor_search_visitor import SensorSearchVisitor
+from metamenth.visitors.meter_search_visitor import MeterSearchVisitor
+from metamenth.visitors.hvac_component_search_visitor import HVACComponentSearchVisitor
+from metamenth.visitors.space_search_visitor import SpaceSearchVisitor
+from metamenth.datatypes.measure import Measure
+from metamenth.enumerations import RecordingType
+from metamenth.misc import MeasureFactory
+from metamenth.utils import Query
+
+
+class TestBuildingQueryEngine(BaseTest):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.hall.add_transducer(self.presence_sensor)
+        self.room.add_transducer(self.temp_sensor)
+        self.boiler = Boiler('PR.VNT.BL.01', BoilerCategory.NATURAL_GAS, PowerState.ON)
+        self.boiler.add_transducer(self.temp_sensor)
+        self.mechanical_room = Room(self.area, "Room 146", RoomType.MECHANICAL)
+        self.mechanical_room.add_hvac_component(self.boiler)
+        self.second_floor = Floor(self.floor_area, 2, FloorType.ROOFTOP, rooms=[self.mechanical_room],
+                                  open_spaces=[self.hall])
+        self.building = Building(2009, self.height, self.floor_area, self.internal_mass, self.address,
+                                 BuildingType.RESIDENTIAL, [self.floor, self.second_floor])
+
+    def test_search_sensors_as_visitor(self):
+        engine = BuildingQueryEngine(self.building)
+        criteria = {'measure': [SensorMeasure.TEMPERATURE.value, SensorMeasure.OCCUPANCY.value]}
+        sensor_search = SensorSearchVisitor(sensor_criteria=criteria, floor_criteria={'number': [1, 2]})
+        self.building.accept(sensor_search)
+
+        found_sensors = engine.search_sensors(criteria, floor_criteria={'number': [1, 2]})
+        self.assertEqual(found_sensors, sensor_search.found_entities)
+        self.assertEqual(found_sensors.count(self.temp_sensor), 2)
+        self.assertEqual(engine.search_sensors({'measure': SensorMeasure.OCCUPANCY.value},
+                                               open_space_criteria={'space_type': OpenSpaceType.HALL.value}),
+                         [self.presence_sensor])
+        self.assertEqual(engine.search_sensors({'measure': SensorMeasure.TEMPERATURE.value},
+                                               floor_criteria={'number': 1}), [self.temp_sensor])
+
+    def test_search_with_list_and_enum_criteria(self):
+        engine = BuildingQueryEngine(self.building)
+        # every criterion after a list criterion is checked
+        criteria = {'measure': [SensorMeasure.TEMPERATURE.value, SensorMeasure.OCCUPANCY.value],
+                    'name': self.presence_sensor.name}
+        sensor_search = SensorSearchVisitor(sensor_criteria=criteria, floor_criteria={'number': [1, 2]})
+        self.building.accept(sensor_search)
+        self.assertEqual(sensor_search.found_entities, [self.presence_sensor])
+        self.assertEqual(engine.search_sensors(criteria, floor_criteria={'number': [1, 2]}), [self.presence_sensor])
+
+        # enum criteria match the enum attributes of entities
+        criteria = {'measure': SensorMeasure.TEMPERATURE}
+        sensor_search = SensorSearchVisitor(sensor_criteria=criteria, room_criteria={'room_type': [RoomType.BEDROOM]})
+        self.building.accept(sensor_search)
+        self.assertEqual(sensor_search.found_entities, [self.temp_sensor])
+        self.assertEqual(engine.search_sensors(criteria, room_criteria={'room_type': [RoomType.BEDROOM]}),
+                         [self.temp_sensor])
+        self.assertEqual(self.room.get_transducers({'measure': SensorMeasure.TEMPERATURE}), [self.temp_sensor])
+
+    def test_search_with_query_conditions(self):
+        large_area = MeasureFactory.create_measure(RecordingType.BINARY.value,
+                                                   Measure(MeasurementUnit.SQUARE_METERS, 60))
+        large_room = Room(large_area, "Room 147", RoomType.CLASSROOM)
+        self.second_floor.add_rooms([large_room])
+        engine = BuildingQueryEngine(self.building)
+
+        # rooms with an area over 50 m², read through a dotted attribute
+        space_search = SpaceSearchVisitor(room_criteria={'area.value': Query.gt(50)},
+                                          open_space_criteria={'area.value': Query.gt(50)}, include_floor=False)
+        self.building.accept(space_search)
+        self.assertEqual(space_search.found_entities, [large_room])
+        self.assertEqual(engine.search_spaces(room_criteria={'area.value': Query.gt(50)},
+                                              open_space_criteria={'area.value': Query.gt(50)},
+                                              include_floor=False), [large_room])
+
+        for criteria in [{'name': Query.prefix('PR')}, {'name': Query.regex('^TEMP|^PRES'), 'measure': Query.ne('x')},
+                         Query.or_({'measure': SensorMeasure.OCCUPANCY}, {'name': Query.prefix('TEMPERATURE.')}),
+                         Query.not_({'name': Query.prefix('PR')}),
+                         {'measure': Query.in_([SensorMeasure.OCCUPANCY]) | Query.between('T', 'U')}]:
+            sensor_search = SensorSearchVisitor(sensor_criteria=criteria, floor_criteria={'number': Query.ge(2)})
+            self.building.accept(sensor_search)
+            self.assertEqual(engine.search_sensors(criteria, floor_criteria={'number': Query.ge(2)}),
+                             sensor_search.found_entities)
+        self.assertEqual(engine.search_sensors({'name': Query.prefix('PR')}), [self.presence_sensor])
+        self.assertEqual(engine.search_sensors(Query.not_({'name': Query.prefix('PR')}),
+                                               floor_criteria={'number': Query.ge(2)}), [self.temp_sensor])
+        with self.assertRaises(ValueError):
+            Query.prefix(1)
+
+    def test_search_meters_as_visitor(self):
+        building_meter = Meter(meter_location="huz.cab.err", manufacturer="Honeywell", measurement_frequency=5,
+                               measurement_unit=MeasurementUnit.KILOWATTS_PER_HOUR,
+                               meter_type=MeterType.ELECTRICITY, measure_mode=MeterMeasureMode.AUTOMATIC)
+        boiler_meter = Meter(meter_location="huz.oof.err", manufacturer="Honeywell", measurement_frequency=10,
+                             measurement_unit=MeasurementUnit.KILOWATTS_PER_HOUR,
+                             meter_type=MeterType.POWER, measure_mode=MeterMeasureMode.MANUAL)
+        self.building.add_meter(building_meter)
+        self.boiler.meter = boiler_meter
+        engine = BuildingQueryEngine(self.building)
+
+        for criteria in [{'meter_type': MeterType.ELECTRICITY.value}, {'meter_type': MeterType.POWER.value}, {}]:
+            meter_search = MeterSearchVisitor(meter_criteria=criteria)
+            self.building.accept(meter_search)
+            self.assertEqual(engine.search_meters(criteria), meter_search.found_entities)
+        self.assertEqual(engine.search_meters({'meter_type': MeterType.POWER.value}), [boiler_meter])
+
+    def test_search_hvac_components_as_visitor(self):
+        vav_box = AirVolumeBox('PR.VNT.VAV.01', AirVolumeType.VARIABLE_AIR_VOLUME)
+        damper = Damper('PR.VNT.DMP.01', DamperType.MANUAL_VOLUME)
+        vav_box.inlet_dampers = [damper]
+        self.hall.add_hvac_component(vav_box)
+        engine = BuildingQueryEngine(self.building)
+
+        for criteria in [{'component_class': 'Damper', 'damper_type': DamperType.MANUAL_VOLUME.value},
+                         {'component_class': 'AirVolumeBox'}, {'component_class': 'Boiler'}]:
+            hvac_search = HVACComponentSearchVisitor(hvac_component_criteria=criteria)
+            self.building.accept(hvac_search)
+            self.assertEqual(engine.search_hvac_components(criteria), hvac_search.found_entities)
+        self.assertEqual(engine.search_hvac_components({'component_class': 'Damper'}), [damper])
+        try:
+            engine.search_hvac_components({'power_state': PowerState.ON.value})
+        except ValueError as err:
+            self.assertEqual(err.__str__(),
+                             "hvac component criteria must have component_class value: {'power_state': 'On'}")
+
+    def test_search_spaces_as_visitor(self):
+        engine = BuildingQueryEngine(self.building)
+        space_search = SpaceSearchVisitor(floor_criteria={'floor_type': FloorType.ROOFTOP.value},
+                                          room_criteria={'room_type': RoomType.MECHANICAL.value})
+        self.building.accept(space_search)
+        found_spaces = engine.search_spaces(floor_criteria={'floor_type': FloorType.ROOFTOP.value},
+                                            room_criteria={'room_type': RoomType.MECHANICAL.value})
+        self.assertEqual(found_spaces, space_search.found_entities)
+        self.assertEqual(found_spaces, [self.second_floor, self.mechanical_room, self.hall])
+        self.assertEqual(engine.get_floor(self.hall), self.second_floor)
+
+    def test_refresh_indexes_after_building_change(self):
+        engine = BuildingQueryEngine(self.building)
+        self.assertEqual(engine.search_sensors({'measure': SensorMeasure.OCCUPANCY.value},
+                                               floor_criteria={'number': 1}), [])
+        self.room.add_transducer(self.presence_sensor)
+        engine.refresh()
+        self.assertEqual(engine.search_sensors({'measure': SensorMeasure.OCCUPANCY.value},
+                                               floor_criteria={'number': 1}), [self.presence_sensor])
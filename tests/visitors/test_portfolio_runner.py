@@ -0,0 +1,119 @@
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from metamenth.structure.floor import Floor
+from metamenth.structure.room import Room
+from metamenth.enumerations import FloorType
+from metamenth.structure.building import Building
+from metamenth.enumerations import BuildingType
+from tests.structure.base_test import BaseTest
+from metamenth.enumerations import RoomType
+from metamenth.enumerations import SensorMeasure
+from metamenth.enumerations import BoilerCategory
+from metamenth.enumerations import PowerState
+from metamenth.enumerations import MeasurementUnit
+from metamenth.enumerations import MeterType
+from metamenth.enumerations import MeterMeasureMode
+from metamenth.subsystem.hvac_components.boiler import Boiler
+from metamenth.measure_instruments.meter import Meter
+from metamenth.visitors.portfolio_runner import PortfolioRunner
+from metamenth.visitors.portfolio_runner import _worker_states
+from metamenth.visitors.sensor_search_visitor import SensorSearchVisitor
+from metamenth.visitors.meter_search_visitor import MeterSearchVisitor
+
+
+class TestPortfolioRunner(BaseTest):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.hall.add_transducer(self.presence_sensor)
+        self.room.add_transducer(self.temp_sensor)
+        self.boiler = Boiler('PR.VNT.BL.01', BoilerCategory.NATURAL_GAS, PowerState.ON)
+        self.boiler.add_transducer(self.temp_sensor)
+        self.boiler.meter = Meter(meter_location="huz.oof.err", manufacturer="Honeywell", measurement_frequency=10,
+                                  measurement_unit=MeasurementUnit.KILOWATTS_PER_HOUR,
+                                  meter_type=MeterType.POWER, measure_mode=MeterMeasureMode.MANUAL)
+        self.mechanical_room = Room(self.area, "Room 146", RoomType.MECHANICAL)
+        self.mechanical_room.add_hvac_component(self.boiler)
+        self.second_floor = Floor(self.floor_area, 2, FloorType.ROOFTOP, rooms=[self.mechanical_room])
+        self.building = Building(2009, self.height, self.floor_area, self.internal_mass, self.address,
+                                 BuildingType.RESIDENTIAL, [self.floor, self.second_floor])
+        self.building.add_meter(Meter(meter_location="huz.cab.err", manufacturer="Honeywell",
+                                      measurement_frequency=5, measurement_unit=MeasurementUnit.KILOWATTS_PER_HOUR,
+                                      meter_type=MeterType.ELECTRICITY, measure_mode=MeterMeasureMode.AUTOMATIC))
+        self.other_room = Room(self.area, "Room 201", RoomType.BEDROOM)
+        self.other_room.add_transducer(self.temp_sensor)
+        self.other_building = Building(2012, self.height, self.floor_area, self.internal_mass, self.address,
+                                       BuildingType.COMMERCIAL,
+                                       [Floor(self.floor_area, 1, FloorType.REGULAR, rooms=[self.other_room])])
+
+    def _sequential_search(self, visitor):
+        for building in [self.building, self.other_building]:
+            building.accept(visitor)
+        return visitor.found_entities
+
+    def _assert_same_entities(self, found_entities, expected_entities):
+        self.assertEqual(len(found_entities), len(expected_entities))
+        for found_entity, expected_entity in zip(found_entities, expected_entities):
+            self.assertIs(found_entity, expected_entity)
+
+    def test_run_sensor_search_by_building(self):
+        criteria = {'measure': [SensorMeasure.TEMPERATURE.value, SensorMeasure.OCCUPANCY.value]}
+        expected_entities = self._sequential_search(SensorSearchVisitor(sensor_criteria=criteria))
+        with PortfolioRunner([self.building, self.other_building], max_workers=2) as runner:
+            sensor_search = SensorSearchVisitor(sensor_criteria=criteria)
+            found_entities = runner.run(sensor_search)
+        self._assert_same_entities(found_entities, expected_entities)
+        self.assertEqual(sensor_search.found_entities, found_entities)
+        self.assertEqual(found_entities.count(self.temp_sensor), 3)
+
+    def test_run_meter_search_by_floor(self):
+        expected_entities = self._sequential_search(MeterSearchVisitor(meter_criteria={}))
+        with PortfolioRunner([self.building, self.other_building], max_workers=2,
+                             floors_per_partition=1) as runner:
+            found_entities = runner.run(MeterSearchVisitor(meter_criteria={}))
+            self._assert_same_entities(found_entities, expected_entities)
+            self.assertIs(found_entities[0], self.building.get_meters()[0])
+            self.assertIs(found_entities[1], self.boiler.meter)
+            self.assertEqual(runner.run(MeterSearchVisitor(meter_criteria={'meter_type': MeterType.POWER.value})),
+                             [self.boiler.meter])
+
+    def test_refresh_after_changing_buildings(self):
+        executor = ThreadPoolExecutor(max_workers=2)
+        runner = PortfolioRunner([self.other_building], floors_per_partition=2, executor=executor)
+        criteria = {'measure': SensorMeasure.OCCUPANCY.value}
+        self.assertEqual(runner.run(SensorSearchVisitor(sensor_criteria=criteria)), [])
+        self.other_room.add_transducer(self.presence_sensor)
+        runner.refresh()
+        self._assert_same_entities(runner.run(SensorSearchVisitor(sensor_criteria=criteria)), [self.presence_sensor])
+        executor.shutdown()
+
+    def test_runners_sharing_an_executor(self):
+        criteria = {'measure': SensorMeasure.TEMPERATURE.value}
+        expected_entities = self._sequential_search(SensorSearchVisitor(sensor_criteria=criteria))
+        executor = ThreadPoolExecutor(max_workers=2)
+        runner = PortfolioRunner([self.building, self.other_building], floors_per_partition=1, executor=executor)
+        other_runner = PortfolioRunner([self.other_building], executor=executor)
+        self._assert_same_entities(runner.run(SensorSearchVisitor(sensor_criteria=criteria)), expected_entities)
+        self._assert_same_entities(other_runner.run(SensorSearchVisitor(sensor_criteria=criteria)), [self.temp_sensor])
+        self._assert_same_entities(runner.run(SensorSearchVisitor(sensor_criteria=criteria)), expected_entities)
+        # the buildings restored by the tasks are not kept by the processes (here threads) of the executor
+        self.assertNotIn(runner._key, _worker_states)
+        self.assertNotIn(other_runner._key, _worker_states)
+        runner.close()
+        other_runner.close()
+        executor.shutdown()
+
+    def test_run_with_spawned_worker_processes(self):
+        expected_entities = self._sequential_search(MeterSearchVisitor(meter_criteria={}))
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+            runner = PortfolioRunner([self.building, self.other_building], floors_per_partition=1,
+                                     executor=executor)
+            self._assert_same_entities(runner.run(MeterSearchVisitor(meter_criteria={})), expected_entities)
+
+    def test_runner_with_invalid_arguments(self):
+        with self.assertRaises(ValueError) as err:
+            PortfolioRunner([self.building], floors_per_partition=0)
+        self.assertEqual(str(err.exception), 'floors_per_partition must be a positive integer')
+        with self.assertRaises(ValueError):
+            PortfolioRunner([self.building]).run(None)
@@ -204,3 +204,42 @@ class TestSensorSearchVisitor(BaseTest):
         self.assertEqual(len(sensor_search.found_entities), 1)
         self.assertIn(self.temp_sensor, sensor_search.found_entities)
         self.assertNotIn(self.presence_sensor, sensor_search.found_entities)
+
+        # the criteria after a list criterion on a list attribute are checked too
+        sensor_search = SensorSearchVisitor(sensor_criteria={},
+                                            floor_criteria={'zones': [cooling_zone, heating_zone], 'number': 2})
+        building.accept(sensor_search)
+        self.assertEqual(sensor_search.found_entities, [self.presence_sensor])
+
+    def test_trace_and_time_sensor_search(self):
+        self.hall.add_transducer(self.presence_sensor)
+        self.room.add_transducer(self.temp_sensor)
+        second_floor = Floor(self.floor_area, 2, FloorType.ROOFTOP, open_spaces=[self.hall])
+        building = Building(2009, self.height, self.floor_area, self.internal_mass, self.address,
+                            BuildingType.RESIDENTIAL, [self.floor, second_floor])
+
+        visited_nodes = []
+        sensor_search = SensorSearchVisitor(sensor_criteria={})
+        sensor_search.trace_hook = lambda kind, node: visited_nodes.append((kind, node))
+        sensor_search.record_timing = True
+        with self.assertLogs('metamenth.visitors', level='DEBUG') as logs:
+            building.accept(sensor_search)
+
+        self.assertEqual(visited_nodes, [('building', building), ('floor', self.floor), ('room', self.room),
+                                         ('floor', second_floor), ('open space', self.hall)])
+        self.assertIn('DEBUG:metamenth.visitors.interfaces.abstract_space_visitor:Visiting room: Room 145',
+                      logs.output)
+        # nodes are timed when their visit ends
+        self.assertEqual([(kind, node) for kind, node, _ in sensor_search.node_timings],
+                         [('room', self.room), ('floor', self.floor), ('open space', self.hall),
+                          ('floor', second_floor), ('building', building)])
+        self.assertTrue(all(seconds >= 0 for _, _, seconds in sensor_search.node_timings))
+
+    def test_sensor_search_without_tracing(self):
+        self.room.add_transducer(self.temp_sensor)
+        building = Building(2009, self.height, self.floor_area, self.internal_mass, self.address,
+                            BuildingType.RESIDENTIAL, [self.floor])
+        sensor_search = SensorSearchVisitor(sensor_criteria={})
+        building.accept(sensor_search)
+        self.assertEqual(sensor_search.found_entities, [self.temp_sensor])
+        self.assertEqual(sensor_search.node_timings, [])